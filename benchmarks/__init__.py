@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Module benchmarks : mesures de performance (scripts indépendants de la GUI)
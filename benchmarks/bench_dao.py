@@ -0,0 +1,212 @@
+# =============================================================================
+# benchmarks/bench_dao.py
+# Latences et débits de ClientDAO à plusieurs volumes de données.
+#
+# Pour chaque taille (10k, 100k, 1M clients par défaut) :
+#   1. une base synthétique est générée une fois (seed_data, graine fixe)
+#      et conservée dans benchmarks/donnees/ pour les exécutions suivantes ;
+#   2. les mesures portent sur une copie de cette base (les écritures ne
+#      modifient pas la base de référence) ;
+#   3. chaque opération est appelée de nombreuses fois sur des IDCLIENT /
+#      filtres tirés avec la même graine → percentiles p50/p90/p99 et débit.
+#
+# Les résultats sont écrits en JSON puis comparés à une référence
+# enregistrée (code de sortie 1 en cas de régression au-delà du seuil).
+#
+# Utilisation :
+#   python benchmarks/bench_dao.py [--tailles 10000,100000,1000000]
+#   python benchmarks/bench_dao.py --enregistrer-reference   # fige la référence
+# =============================================================================
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+# Ajouter le répertoire racine au path pour les imports
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from benchmarks.mesures import (
+    afficher_tableau,
+    chronometrer,
+    conclure,
+    lire_resultats,
+    metadonnees,
+    resumer,
+)
+from core.database import GestionnaireBase
+from models.client_model import Client, ClientDAO
+from seed_data import NOMS, PRENOMS, generer_clients, peupler_synthetique
+
+
+DOSSIER_BENCH   = os.path.join(RACINE, "benchmarks")
+DOSSIER_DONNEES = os.path.join(DOSSIER_BENCH, "donnees")
+SORTIE_DEFAUT   = os.path.join(DOSSIER_BENCH, "resultats", "bench_dao.json")
+REFERENCE_DEFAUT = os.path.join(DOSSIER_BENCH, "reference", "bench_dao.json")
+
+# Taille des lots de supprimer_plusieurs
+TAILLE_SUPPRESSION_LOT = 100
+
+# Ordre des champs des tuples de generer_clients (= Client.en_tuple_insertion)
+_CHAMPS = (
+    "nom_client", "numero_telephone", "adresse", "code_postal", "ville",
+    "date_naissance", "credit_disponible", "bon_client", "couleur_cheveux",
+)
+
+
+# ---------------------------------------------------------------------------
+# Bases de test
+# ---------------------------------------------------------------------------
+
+def preparer_base(taille: int, graine: int, dossier: str) -> str:
+    """
+    Retourne le chemin d'une base synthétique de `taille` clients,
+    générée au premier appel puis réutilisée.
+
+    La base est construite sous un nom temporaire puis renommée : une
+    génération interrompue n'est jamais réutilisée.
+    """
+    os.makedirs(dossier, exist_ok=True)
+    chemin = os.path.join(dossier, f"clients_{taille}_g{graine}.sqlite")
+    if not os.path.exists(chemin):
+        provisoire = chemin + ".tmp"
+        if os.path.exists(provisoire):
+            os.remove(provisoire)
+        peupler_synthetique(provisoire, taille, graine=graine, taille_lot=50_000, remplacer=True)
+        os.replace(provisoire, chemin)
+    return chemin
+
+
+# ---------------------------------------------------------------------------
+# Mesures
+# ---------------------------------------------------------------------------
+
+def mesurer_taille(chemin_base: str, taille: int, echantillons: int,
+                   echantillons_recherche: int, graine: int) -> dict:
+    """
+    Mesure toutes les opérations de ClientDAO sur une copie de la base.
+
+    :return: {nom de l'opération: résumé (voir mesures.resumer)}
+    """
+    alea = random.Random(graine)
+    resultats: dict = {}
+
+    with tempfile.TemporaryDirectory() as dossier:
+        copie = os.path.join(dossier, "travail.sqlite")
+        shutil.copyfile(chemin_base, copie)
+        db = GestionnaireBase()
+        db.ouvrir(copie)
+
+        ids = [alea.randint(1, taille) for _ in range(echantillons)]
+        ClientDAO.lire(db, ids[0])  # échauffement (cache de pages)
+
+        # --- Lectures ----------------------------------------------------
+        resultats["lire"] = resumer(
+            chronometrer([lambda i=i: ClientDAO.lire(db, i) for i in ids])
+        )
+        resultats["compter"] = resumer(
+            chronometrer([lambda: ClientDAO.compter(db)] * min(echantillons, 50))
+        )
+
+        # Nom complet (très sélectif) et nom de famille (~1/40 de la table)
+        noms_complets = [f"{alea.choice(NOMS)} {alea.choice(PRENOMS)}" for _ in range(echantillons_recherche)]
+        noms = [alea.choice(NOMS) for _ in range(echantillons_recherche)]
+        resultats["rechercher_nom_complet"] = resumer(
+            chronometrer([lambda n=n: ClientDAO.rechercher(db, n) for n in noms_complets])
+        )
+        resultats["rechercher_nom"] = resumer(
+            chronometrer([lambda n=n: ClientDAO.rechercher(db, n) for n in noms])
+        )
+        # Filtre vide : ce que charge la fenêtre CRUDS à l'ouverture
+        resultats["rechercher_tous"] = resumer(
+            chronometrer([lambda: ClientDAO.rechercher(db, "")] * max(1, echantillons_recherche // 10)),
+            elements=taille,
+        )
+
+        # --- Écritures (une transaction par appel, comme dans la GUI) ----
+        nouveaux = [Client(**dict(zip(_CHAMPS, valeurs)))
+                    for valeurs in generer_clients(echantillons, graine + 1)]
+        ids_crees: list[int] = []
+
+        def creer(client: Client) -> None:
+            ids_crees.append(ClientDAO.creer(db, client))
+
+        resultats["creer"] = resumer(chronometrer([lambda c=c: creer(c) for c in nouveaux]))
+
+        a_modifier = [ClientDAO.lire(db, i) for i in ids]
+        for client in a_modifier:
+            client.credit_disponible = round(client.credit_disponible + 1.0, 2)
+        resultats["modifier"] = resumer(
+            chronometrer([lambda c=c: ClientDAO.modifier(db, c) for c in a_modifier])
+        )
+
+        resultats["supprimer"] = resumer(
+            chronometrer([lambda i=i: ClientDAO.supprimer(db, i) for i in ids_crees])
+        )
+
+        nb_lots = max(1, echantillons // 20)
+        lots = []
+        for numero in range(nb_lots):
+            valeurs = list(generer_clients(TAILLE_SUPPRESSION_LOT, graine + 2 + numero))
+            lots.append(ClientDAO.creer_lot_valeurs(db, valeurs))
+        resultats["supprimer_plusieurs"] = resumer(
+            chronometrer([lambda l=l: ClientDAO.supprimer_plusieurs(db, l) for l in lots]),
+            elements=TAILLE_SUPPRESSION_LOT,
+        )
+
+        db.fermer()
+    return resultats
+
+
+# ---------------------------------------------------------------------------
+# Point d'entrée
+# ---------------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Latences de ClientDAO à plusieurs volumes.")
+    parser.add_argument("--tailles", default="10000,100000,1000000", help="Nombres de clients des bases")
+    parser.add_argument("--echantillons", type=int, default=500, help="Appels mesurés par opération unitaire")
+    parser.add_argument("--echantillons-recherche", type=int, default=20, help="Appels mesurés par recherche")
+    parser.add_argument("--graine", type=int, default=42, help="Graine des données et des tirages")
+    parser.add_argument("--donnees", default=DOSSIER_DONNEES, help="Dossier des bases générées (cache)")
+    parser.add_argument("--sortie", default=SORTIE_DEFAUT, help="Fichier JSON des résultats")
+    parser.add_argument("--reference", default=REFERENCE_DEFAUT, help="Fichier JSON de référence")
+    parser.add_argument("--seuil", type=float, default=0.25, help="Régression tolérée (0.25 = +25 %%)")
+    parser.add_argument("--enregistrer-reference", action="store_true",
+                        help="Écrire aussi les résultats comme nouvelle référence")
+    args = parser.parse_args()
+
+    tailles = [int(t) for t in args.tailles.split(",") if t.strip()]
+    reference = lire_resultats(args.reference)
+    resultats_reference = reference["resultats"] if reference else None
+
+    resultats: dict = {}
+    for taille in tailles:
+        chemin_base = preparer_base(taille, args.graine, args.donnees)
+        resultats[str(taille)] = mesurer_taille(
+            chemin_base, taille, args.echantillons, args.echantillons_recherche, args.graine
+        )
+        afficher_tableau(
+            f"{taille} clients", resultats[str(taille)],
+            (resultats_reference or {}).get(str(taille)),
+        )
+
+    meta = metadonnees(
+        "bench_dao",
+        tailles=tailles,
+        echantillons=args.echantillons,
+        echantillons_recherche=args.echantillons_recherche,
+        graine=args.graine,
+    )
+    return conclure(
+        meta, resultats,
+        args.sortie, args.reference, resultats_reference,
+        args.seuil, args.enregistrer_reference,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
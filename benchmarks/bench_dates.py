@@ -0,0 +1,126 @@
+# =============================================================================
+# benchmarks/bench_dates.py
+# Micro-benchmarks des routines de dates de fonctionsgen.
+#
+# Compare le chemin rapide (découpage par position + mémoïsation) à
+# l'implémentation d'origine basée sur datetime.strptime / strftime.
+#
+# Utilisation :
+#   python benchmarks/bench_dates.py [--nombre 200000] [--repetitions 5]
+# =============================================================================
+
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+
+# Ajouter le répertoire racine au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fonctionsgen.fonctionsgen import (
+    analyser_date_iso,
+    analyser_date_jma,
+    convertir_date_jma_vers_iso,
+    est_date_valide,
+    formater_date_affichage,
+)
+
+
+# ---------------------------------------------------------------------------
+# Implémentations de référence (strptime)
+# ---------------------------------------------------------------------------
+
+def _reference_affichage(date_iso: str) -> str:
+    try:
+        return datetime.strptime(date_iso.strip(), "%Y-%m-%d").strftime("%d/%m/%Y")
+    except ValueError:
+        return date_iso
+
+
+def _reference_validation(date_str: str) -> bool:
+    try:
+        datetime.strptime(date_str.strip(), "%d/%m/%Y")
+        return True
+    except ValueError:
+        return False
+
+
+def _reference_vers_iso(date_jma: str) -> str:
+    return datetime.strptime(date_jma.strip(), "%d/%m/%Y").strftime("%Y-%m-%d")
+
+
+# ---------------------------------------------------------------------------
+# Jeu de données
+# ---------------------------------------------------------------------------
+
+def generer_dates(nombre: int, graine: int = 42) -> tuple[list[str], list[str]]:
+    """
+    Génère des dates de naissance réalistes (1930–2010) aux formats
+    ISO et JJ/MM/AAAA. Les valeurs se répètent comme dans une vraie table.
+    """
+    alea = random.Random(graine)
+    debut = date(1930, 1, 1)
+    etendue = (date(2010, 12, 31) - debut).days
+    dates = [debut + timedelta(days=alea.randrange(etendue)) for _ in range(nombre)]
+    return (
+        [d.isoformat() for d in dates],
+        [d.strftime("%d/%m/%Y") for d in dates],
+    )
+
+
+def _vider_caches() -> None:
+    analyser_date_iso.cache_clear()
+    analyser_date_jma.cache_clear()
+
+
+# ---------------------------------------------------------------------------
+# Mesures
+# ---------------------------------------------------------------------------
+
+def mesurer(fonction, donnees: list[str], repetitions: int, froid: bool) -> float:
+    """
+    Retourne le meilleur temps (secondes) pour appliquer fonction à toutes
+    les données. Si froid est True, les caches sont vidés avant chaque passe.
+    """
+    def passe() -> None:
+        for valeur in donnees:
+            fonction(valeur)
+
+    meilleur = float("inf")
+    for _ in range(repetitions):
+        if froid:
+            _vider_caches()
+        meilleur = min(meilleur, timeit.timeit(passe, number=1))
+    return meilleur
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks des routines de dates.")
+    parser.add_argument("--nombre", type=int, default=200_000, help="Nombre de dates par passe")
+    parser.add_argument("--repetitions", type=int, default=5, help="Nombre de passes (meilleur temps retenu)")
+    args = parser.parse_args()
+
+    dates_iso, dates_jma = generer_dates(args.nombre)
+
+    cas = [
+        ("formater_date_affichage", _reference_affichage, formater_date_affichage, dates_iso),
+        ("est_date_valide",         _reference_validation, est_date_valide,        dates_jma),
+        ("jma -> iso",              _reference_vers_iso,   convertir_date_jma_vers_iso, dates_jma),
+    ]
+
+    print(f"{args.nombre} dates, meilleur de {args.repetitions} passes\n")
+    print(f"{'Routine':<26}{'strptime':>12}{'froid':>12}{'chaud':>12}{'gain froid':>12}{'gain chaud':>12}")
+    for nom, reference, rapide, donnees in cas:
+        t_ref   = mesurer(reference, donnees, args.repetitions, froid=False)
+        t_froid = mesurer(rapide,    donnees, args.repetitions, froid=True)
+        t_chaud = mesurer(rapide,    donnees, args.repetitions, froid=False)
+        print(
+            f"{nom:<26}{t_ref * 1000:>10.1f}ms{t_froid * 1000:>10.1f}ms{t_chaud * 1000:>10.1f}ms"
+            f"{t_ref / t_froid:>11.1f}x{t_ref / t_chaud:>11.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# =============================================================================
+# benchmarks/bench_demarrage.py
+# Temps de démarrage de l'application, mesuré avec `python -X importtime`.
+#
+# Chaque répétition lance un interpréteur neuf qui importe `main` (sans
+# ouvrir de fenêtre : main() n'est appelé que si main.py est exécuté) :
+#   - import_main : durée cumulée de l'import de main (relevé -X importtime)
+#   - processus   : durée totale du processus (interpréteur + imports)
+# Les modules les plus coûteux sont listés pour orienter les optimisations.
+#
+# Le benchmark échoue aussi (code 1) si un module censé être chargé après
+# l'affichage de la fenêtre principale (fenêtres filles, modèles, export...)
+# est importé au démarrage.
+#
+# Utilisation :
+#   python benchmarks/bench_demarrage.py [--repetitions 20] [--modules 15]
+#   python benchmarks/bench_demarrage.py --enregistrer-reference   # fige la référence
+# =============================================================================
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+# Ajouter le répertoire racine au path pour les imports
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from benchmarks.mesures import afficher_tableau, conclure, lire_resultats, metadonnees, resumer
+
+
+SORTIE_DEFAUT = os.path.join(RACINE, "benchmarks", "resultats", "bench_demarrage.json")
+REFERENCE_DEFAUT = os.path.join(RACINE, "benchmarks", "reference", "bench_demarrage.json")
+
+# Modules chargés à la demande ou en temps mort, jamais avant la première fenêtre
+MODULES_DIFFERES = (
+    "views.Win_Client_CRUDS",
+    "views.Win_Client_Fiche",
+    "controllers.cruds_controller",
+    "controllers.fiche_controller",
+    "models.client_model",
+    "models.client_export",
+    "models.client_import",
+    "logging.handlers",
+)
+
+# « import time: <propre µs> | <cumulé µs> | <indentation><module> »
+_LIGNE_IMPORTTIME = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|\s*(\S+)\s*$")
+
+
+# ---------------------------------------------------------------------------
+# Mesure
+# ---------------------------------------------------------------------------
+
+def lancer(module: str, importtime: bool) -> tuple[float, str]:
+    """
+    Importe `module` dans un interpréteur neuf.
+
+    :param module:     Module à importer
+    :param importtime: Activer -X importtime
+    :return:           (durée du processus en s, sortie d'erreur)
+    """
+    commande = [sys.executable]
+    if importtime:
+        commande += ["-X", "importtime"]
+    commande += ["-c", f"import {module}"]
+    debut = time.perf_counter()
+    processus = subprocess.run(commande, cwd=RACINE, capture_output=True, text=True)
+    duree = time.perf_counter() - debut
+    if processus.returncode != 0:
+        raise RuntimeError(f"Échec de l'import de {module} :\n{processus.stderr}")
+    return duree, processus.stderr
+
+
+def analyser_importtime(sortie: str) -> dict[str, tuple[int, int]]:
+    """
+    Analyse la sortie de -X importtime.
+
+    :param sortie: Sortie d'erreur de l'interpréteur
+    :return:       {module: (durée propre µs, durée cumulée µs)}
+    """
+    modules: dict[str, tuple[int, int]] = {}
+    for ligne in sortie.splitlines():
+        correspondance = _LIGNE_IMPORTTIME.match(ligne)
+        if correspondance:
+            propre, cumule, nom = correspondance.groups()
+            modules[nom] = (int(propre), int(cumule))
+    return modules
+
+
+def mesurer(module: str, repetitions: int) -> tuple[dict, dict[str, list[int]], set[str]]:
+    """
+    Répète le démarrage et agrège les mesures.
+
+    :return: ({mesure: résumé}, {module: durées cumulées µs}, modules importés)
+    """
+    # Exécution à blanc : fichiers .pyc et cache disque chauds
+    lancer(module, importtime=False)
+
+    durees_import: list[float] = []
+    durees_processus: list[float] = []
+    cumuls: dict[str, list[int]] = {}
+    importes: set[str] = set()
+    for _ in range(repetitions):
+        duree, _sortie = lancer(module, importtime=False)
+        durees_processus.append(duree)
+
+        _duree, sortie = lancer(module, importtime=True)
+        modules = analyser_importtime(sortie)
+        if module not in modules:
+            raise RuntimeError(f"{module} absent du relevé -X importtime")
+        durees_import.append(modules[module][1] / 1e6)
+        importes.update(modules)
+        for nom, (_propre, cumule) in modules.items():
+            cumuls.setdefault(nom, []).append(cumule)
+
+    mesures = {
+        f"import_{module}": resumer(durees_import),
+        "processus"       : resumer(durees_processus),
+    }
+    return mesures, cumuls, importes
+
+
+def afficher_modules(cumuls: dict[str, list[int]], nombre: int) -> None:
+    """Affiche les modules au coût cumulé médian le plus élevé."""
+    medianes = sorted(
+        ((statistics.median(valeurs) / 1000, nom) for nom, valeurs in cumuls.items()),
+        reverse=True,
+    )
+    print("\n[Modules les plus coûteux (cumulé, médiane)]")
+    for duree_ms, nom in medianes[:nombre]:
+        print(f"{duree_ms:>10.1f} ms  {nom}")
+
+
+# ---------------------------------------------------------------------------
+# Programme principal
+# ---------------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Temps de démarrage de l'application (-X importtime).")
+    parser.add_argument("--module", default="main", help="Module importé au démarrage")
+    parser.add_argument("--repetitions", type=int, default=20, help="Démarrages mesurés")
+    parser.add_argument("--modules", type=int, default=15, help="Modules les plus coûteux à afficher")
+    parser.add_argument("--sortie", default=SORTIE_DEFAUT, help="Fichier JSON des résultats")
+    parser.add_argument("--reference", default=REFERENCE_DEFAUT, help="Fichier JSON de référence")
+    parser.add_argument("--seuil", type=float, default=0.25, help="Régression tolérée (0.25 = +25 %%)")
+    parser.add_argument("--enregistrer-reference", action="store_true",
+                        help="Écrire aussi les résultats comme nouvelle référence")
+    args = parser.parse_args()
+
+    reference = lire_resultats(args.reference)
+    resultats_reference = reference["resultats"] if reference else None
+
+    mesures, cumuls, importes = mesurer(args.module, args.repetitions)
+    resultats = {"demarrage": mesures}
+    afficher_tableau("Démarrage", mesures, (resultats_reference or {}).get("demarrage"))
+    afficher_modules(cumuls, args.modules)
+
+    meta = metadonnees("bench_demarrage", module=args.module, repetitions=args.repetitions)
+    code = conclure(
+        meta, resultats,
+        args.sortie, args.reference, resultats_reference,
+        args.seuil, args.enregistrer_reference,
+    )
+
+    charges_trop_tot = [nom for nom in MODULES_DIFFERES if nom in importes]
+    if charges_trop_tot:
+        print("\nModules importés avant l'affichage de la fenêtre principale :")
+        for nom in charges_trop_tot:
+            print(f"  - {nom}")
+        return 1
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+# =============================================================================
+# benchmarks/bench_gui.py
+# Mesures de performance des fenêtres Tkinter, sans écran (serveur X virtuel).
+#
+# Les fenêtres réelles (FenetreCRUDS, FenetreFiche) sont pilotées par script
+# sur des bases synthétiques de différentes tailles :
+#   - ouverture de FenetreCRUDS jusqu'au premier affichage (tableau rempli) ;
+#   - remplissage du tableau avec toute la table (rafraichir_tableau) ;
+#   - latence frappe → résultats dans le champ de recherche ;
+#   - ouverture / fermeture de FenetreFiche (modification et lecture),
+#     construite à chaque fois puis réutilisée (FenetreFiche.depuis_pool).
+#
+# Sans variable DISPLAY, le script démarre lui-même Xvfb s'il est installé
+# (ou : xvfb-run -a python benchmarks/bench_gui.py). Les résultats utilisent
+# le même format JSON que bench_dao.py et sont comparés à une référence.
+#
+# Utilisation :
+#   python benchmarks/bench_gui.py [--tailles 1000,10000,100000]
+#   python benchmarks/bench_gui.py --enregistrer-reference
+# =============================================================================
+
+import argparse
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Ajouter le répertoire racine au path pour les imports
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from benchmarks.bench_dao import DOSSIER_DONNEES, preparer_base
+from benchmarks.mesures import (
+    afficher_tableau,
+    conclure,
+    lire_resultats,
+    metadonnees,
+    resumer,
+)
+from core.config import MODE_LECTURE, MODE_MODIFICATION
+from core.database import GestionnaireBase
+from models.client_model import ClientDAO
+
+
+DOSSIER_BENCH    = os.path.join(RACINE, "benchmarks")
+SORTIE_DEFAUT    = os.path.join(DOSSIER_BENCH, "resultats", "bench_gui.json")
+REFERENCE_DEFAUT = os.path.join(DOSSIER_BENCH, "reference", "bench_gui.json")
+
+# Saisies simulées dans le champ de recherche (une mesure par caractère)
+SAISIES_RECHERCHE = ("Martin", "Dubois Luc", "Lefebvre")
+
+
+# ---------------------------------------------------------------------------
+# Serveur X virtuel
+# ---------------------------------------------------------------------------
+
+def demarrer_xvfb(affichage: str = ":99", delai: float = 5.0) -> "subprocess.Popen | None":
+    """
+    Démarre Xvfb sur `affichage` et positionne DISPLAY.
+
+    :param affichage: Numéro d'affichage X (ex : ":99")
+    :param delai:     Attente maximale du serveur (secondes)
+    :return:          Processus Xvfb, ou None si Xvfb est introuvable
+    """
+    executable = shutil.which("Xvfb")
+    if executable is None:
+        return None
+    processus = subprocess.Popen(
+        [executable, affichage, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    socket_x = f"/tmp/.X11-unix/X{affichage.lstrip(':')}"
+    limite = time.monotonic() + delai
+    while not os.path.exists(socket_x) and time.monotonic() < limite:
+        if processus.poll() is not None:
+            return None  # affichage déjà utilisé, par exemple
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = affichage
+    return processus
+
+
+# ---------------------------------------------------------------------------
+# Mesures
+# ---------------------------------------------------------------------------
+
+def _attendre_affichage(fenetre) -> None:
+    """Attend que la fenêtre soit visible et que les redessins soient faits."""
+    fenetre.wait_visibility()
+    fenetre.update_idletasks()
+
+
+def _vider_evenements(racine) -> None:
+    """Traite tous les événements en attente (entre deux mesures)."""
+    racine.update()
+
+
+def mesurer_taille(racine, db: GestionnaireBase, taille: int, repetitions: int, graine: int) -> dict:
+    """
+    Mesure les fenêtres sur une base de `taille` clients.
+
+    :return: {nom de la mesure: résumé (voir mesures.resumer)}
+    """
+    # Import ici : tkinter et les vues ne sont chargés qu'une fois l'affichage prêt
+    from views.Win_Client_CRUDS import FenetreCRUDS
+    from views.Win_Client_Fiche import FenetreFiche
+
+    horloge = time.perf_counter
+    resultats: dict = {}
+
+    # --- Ouverture de FenetreCRUDS (construction + premier affichage) ----
+    durees_ouverture: list[float] = []
+    for _ in range(repetitions):
+        debut = horloge()
+        fenetre = FenetreCRUDS(racine, db)
+        _attendre_affichage(fenetre)
+        durees_ouverture.append(horloge() - debut)
+        fenetre._on_fermeture()
+        _vider_evenements(racine)
+    resultats["cruds_premier_affichage"] = resumer(durees_ouverture)
+
+    fenetre = FenetreCRUDS(racine, db)
+    _attendre_affichage(fenetre)
+
+    # --- Remplissage complet du tableau ----------------------------------
+    durees_remplissage: list[float] = []
+    for _ in range(repetitions):
+        _vider_evenements(racine)
+        debut = horloge()
+        fenetre.rafraichir_tableau("")
+        fenetre.update_idletasks()
+        durees_remplissage.append(horloge() - debut)
+    resultats["cruds_remplissage"] = resumer(durees_remplissage, elements=taille)
+
+    # --- Frappe dans le champ de recherche -------------------------------
+    # L'écriture dans la StringVar déclenche la même trace que la saisie
+    # dans le ttk.Entry ; la mesure va jusqu'au tableau redessiné.
+    durees_frappe: list[float] = []
+    for saisie in SAISIES_RECHERCHE:
+        for longueur in list(range(1, len(saisie) + 1)) + list(range(len(saisie) - 1, -1, -1)):
+            _vider_evenements(racine)
+            debut = horloge()
+            fenetre._var_recherche.set(saisie[:longueur])
+            fenetre.update_idletasks()
+            durees_frappe.append(horloge() - debut)
+    resultats["recherche_frappe"] = resumer(durees_frappe)
+
+    # --- Ouverture / fermeture de la fiche -------------------------------
+    # Fiche construite à chaque ouverture, puis fiche réutilisée (pool)
+    def nouvelle_fiche(mode, client):
+        return FenetreFiche(parent=fenetre, db=db, mode=mode, client=client)
+
+    def fiche_du_pool(mode, client):
+        return FenetreFiche.depuis_pool(parent=fenetre, db=db, mode=mode, client=client)
+
+    alea = random.Random(graine)
+    for prefixe, ouvrir in (("fiche", nouvelle_fiche), ("fiche_pool", fiche_du_pool)):
+        for mode, suffixe in ((MODE_MODIFICATION, "modification"), (MODE_LECTURE, "lecture")):
+            durees_ouverture_fiche: list[float] = []
+            durees_fermeture_fiche: list[float] = []
+            for _ in range(repetitions):
+                client = ClientDAO.lire(db, alea.randint(1, taille))
+                _vider_evenements(racine)
+                debut = horloge()
+                fiche = ouvrir(mode, client)
+                _attendre_affichage(fiche)
+                durees_ouverture_fiche.append(horloge() - debut)
+
+                debut = horloge()
+                fiche._on_fermeture()
+                fenetre.update_idletasks()
+                durees_fermeture_fiche.append(horloge() - debut)
+            resultats[f"{prefixe}_ouverture_{suffixe}"] = resumer(durees_ouverture_fiche)
+            resultats[f"{prefixe}_fermeture_{suffixe}"] = resumer(durees_fermeture_fiche)
+
+    fenetre._on_fermeture()
+    _vider_evenements(racine)
+    return resultats
+
+
+# ---------------------------------------------------------------------------
+# Point d'entrée
+# ---------------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Performance des fenêtres Tkinter (sans écran).")
+    parser.add_argument("--tailles", default="1000,10000,100000", help="Nombres de clients des bases")
+    parser.add_argument("--repetitions", type=int, default=5, help="Répétitions des ouvertures / remplissages")
+    parser.add_argument("--graine", type=int, default=42, help="Graine des données et des tirages")
+    parser.add_argument("--donnees", default=DOSSIER_DONNEES, help="Dossier des bases générées (cache)")
+    parser.add_argument("--sortie", default=SORTIE_DEFAUT, help="Fichier JSON des résultats")
+    parser.add_argument("--reference", default=REFERENCE_DEFAUT, help="Fichier JSON de référence")
+    parser.add_argument("--seuil", type=float, default=0.25, help="Régression tolérée (0.25 = +25 %%)")
+    parser.add_argument("--affichage", default=":99", help="Affichage utilisé si Xvfb est démarré")
+    parser.add_argument("--enregistrer-reference", action="store_true",
+                        help="Écrire aussi les résultats comme nouvelle référence")
+    args = parser.parse_args()
+
+    xvfb = None
+    if not os.environ.get("DISPLAY"):
+        xvfb = demarrer_xvfb(args.affichage)
+        if xvfb is None:
+            print("Aucun affichage : définir DISPLAY, installer Xvfb ou lancer via xvfb-run -a.",
+                  file=sys.stderr)
+            return 2
+
+    try:
+        import tkinter as tk
+        from classes.base_window import FenetreBase
+
+        # La racine reste affichée (réduite) : une fenêtre transient d'une
+        # racine masquée (withdraw) ne serait jamais affichée.
+        racine = tk.Tk()
+        racine.geometry("1x1+0+0")
+        FenetreBase.appliquer_style_ttk()
+
+        tailles = [int(t) for t in args.tailles.split(",") if t.strip()]
+        reference = lire_resultats(args.reference)
+        resultats_reference = reference["resultats"] if reference else None
+
+        resultats: dict = {}
+        for taille in tailles:
+            # Copie de travail : ouvrir() met à jour le schéma et les
+            # fiches modifient la base, la référence en cache reste intacte
+            with tempfile.TemporaryDirectory() as dossier:
+                copie = os.path.join(dossier, "travail.sqlite")
+                shutil.copyfile(preparer_base(taille, args.graine, args.donnees), copie)
+                db = GestionnaireBase()
+                db.ouvrir(copie)
+                resultats[str(taille)] = mesurer_taille(racine, db, taille, args.repetitions, args.graine)
+                db.fermer()
+            afficher_tableau(
+                f"{taille} clients", resultats[str(taille)],
+                (resultats_reference or {}).get(str(taille)),
+            )
+        racine.destroy()
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+    meta = metadonnees(
+        "bench_gui",
+        tailles=tailles,
+        repetitions=args.repetitions,
+        graine=args.graine,
+        tk=tk.TkVersion,
+    )
+    return conclure(
+        meta, resultats,
+        args.sortie, args.reference, resultats_reference,
+        args.seuil, args.enregistrer_reference,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+# =============================================================================
+# benchmarks/bench_import.py
+# Mesure du débit d'import CSV (models/client_import.py).
+#
+# Génère un CSV synthétique (avec une proportion de lignes invalides),
+# puis l'importe dans une base neuve pour chaque nombre de processus
+# de validation demandé.
+#
+# Utilisation :
+#   python benchmarks/bench_import.py [--lignes 200000] [--processus 1,2,4]
+# =============================================================================
+
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+
+# Ajouter le répertoire racine au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import COULEURS_CHEVEUX
+from core.database import GestionnaireBase
+from models.client_export import COLONNES_EXPORT
+from models.client_import import importer_csv
+
+
+VILLES = ["Paris", "Lyon", "Marseille", "Toulouse", "Nice", "Nantes", "Lille", "Bordeaux"]
+
+
+def generer_csv(chemin: str, nb_lignes: int, taux_invalides: float, graine: int = 42) -> None:
+    """Écrit un CSV de clients synthétiques au format de l'export."""
+    alea = random.Random(graine)
+    with open(chemin, "w", encoding="utf-8", newline="") as fichier:
+        ecrivain = csv.writer(fichier)
+        ecrivain.writerow(COLONNES_EXPORT)
+        for i in range(nb_lignes):
+            code_postal = f"{alea.randrange(1000, 96000):05d}"
+            if alea.random() < taux_invalides:
+                code_postal = code_postal[:4]  # ligne rejetée par la validation
+            ecrivain.writerow([
+                "",
+                f"Client {i}",
+                f"0{alea.randrange(1, 10)} {alea.randrange(10, 100)} {alea.randrange(10, 100)} "
+                f"{alea.randrange(10, 100)} {alea.randrange(10, 100)}",
+                f"{alea.randrange(1, 200)} rue du Test",
+                code_postal,
+                alea.choice(VILLES),
+                f"{alea.randrange(1930, 2010)}-{alea.randrange(1, 13):02d}-{alea.randrange(1, 29):02d}",
+                f"{alea.uniform(0, 10000):.2f}",
+                alea.choice(["0", "1"]),
+                alea.choice(COULEURS_CHEVEUX),
+            ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Débit de l'import CSV.")
+    parser.add_argument("--lignes", type=int, default=200_000, help="Nombre de lignes du CSV")
+    parser.add_argument("--invalides", type=float, default=0.01, help="Proportion de lignes invalides")
+    parser.add_argument("--processus", default="1,2,4", help="Nombres de processus à comparer")
+    parser.add_argument("--lot", type=int, default=5000, help="Lignes par lot")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin_csv = os.path.join(dossier, "clients.csv")
+        generer_csv(chemin_csv, args.lignes, args.invalides)
+        taille_mo = os.path.getsize(chemin_csv) / 1e6
+        print(f"CSV : {args.lignes} lignes, {taille_mo:.1f} Mo\n")
+        print(f"{'Processus':>10}{'Durée':>10}{'Lignes/s':>12}{'Mo/s':>8}{'Insérées':>10}{'Rejetées':>10}")
+
+        for nb_processus in (int(n) for n in args.processus.split(",")):
+            chemin_base = os.path.join(dossier, f"bench_{nb_processus}.sqlite")
+            db = GestionnaireBase()
+            db.ouvrir(chemin_base)
+            rapport = importer_csv(
+                db, chemin_csv,
+                chemin_rejets=os.path.join(dossier, "rejets.csv"),
+                taille_lot=args.lot,
+                nb_processus=nb_processus,
+            )
+            db.fermer()
+            print(
+                f"{nb_processus:>10}{rapport.duree:>9.2f}s{rapport.debit:>12,.0f}"
+                f"{taille_mo / rapport.duree:>8.1f}{rapport.nb_inserees:>10}{rapport.nb_rejetees:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+# =============================================================================
+# benchmarks/bench_sync.py
+# Durée d'une synchronisation entre deux sites selon le nombre de
+# changements et la taille de la table.
+#
+# Pour chaque taille (10k, 100k, 1M clients par défaut) :
+#   1. la base synthétique de bench_dao (graine fixe, conservée dans
+#      benchmarks/donnees/) est copiée deux fois : sites 1 et 2, configurés
+#      comme copie commune (le premier échange, de chauffe, compare
+#      tous les clients) ;
+#   2. pour chaque volume de changements k, les deux sites reçoivent chacun
+#      k écritures (modifications, ajouts, suppressions tirés avec la même
+#      graine), puis synchroniser() est chronométrée ; l'opération est
+#      répétée pour obtenir des percentiles.
+#
+# Attendu : à k égal, la durée ne dépend pas de la taille de la table
+# (seuls le journal et les clients changés sont lus).
+#
+# Utilisation :
+#   python benchmarks/bench_sync.py [--tailles 10000,100000] [--changements 10,100,1000]
+#   python benchmarks/bench_sync.py --enregistrer-reference   # fige la référence
+# =============================================================================
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Ajouter le répertoire racine au path pour les imports
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from benchmarks.bench_dao import DOSSIER_DONNEES, preparer_base
+from benchmarks.mesures import afficher_tableau, conclure, lire_resultats, metadonnees, resumer
+from core.database import GestionnaireBase, rapporter_par_exception
+from core.schema_clients import COULEURS_CHEVEUX
+from models.client_model import ClientDAO
+from models.client_sync import configurer_site, synchroniser
+from seed_data import generer_clients
+
+
+DOSSIER_BENCH    = os.path.join(RACINE, "benchmarks")
+SORTIE_DEFAUT    = os.path.join(DOSSIER_BENCH, "resultats", "bench_sync.json")
+REFERENCE_DEFAUT = os.path.join(DOSSIER_BENCH, "reference", "bench_sync.json")
+
+# Plages d'IDCLIENT des deux sites (au-delà des bases synthétiques)
+PLAGE_SITE_1 = (1, 9_999_999)
+PLAGE_SITE_2 = (10_000_000, 19_999_999)
+
+# Répartition des changements d'un site : modifications, ajouts, le reste
+# en suppressions
+PART_MODIFICATIONS = 0.6
+PART_AJOUTS        = 0.3
+
+
+# ---------------------------------------------------------------------------
+# Changements
+# ---------------------------------------------------------------------------
+
+def ecrire_changements(db: GestionnaireBase, nombre: int, taille: int, alea: random.Random) -> None:
+    """
+    Applique `nombre` écritures sur un site, par lots comme la GUI et la
+    ligne de commande : modifications de clients existants (tirés dans
+    toute la table), ajouts dans la plage du site, suppressions.
+    """
+    nb_modifications = int(nombre * PART_MODIFICATIONS)
+    nb_ajouts = int(nombre * PART_AJOUTS)
+    nb_suppressions = nombre - nb_modifications - nb_ajouts
+
+    ids = alea.sample(range(1, taille + 1), nb_modifications + nb_suppressions)
+    ClientDAO.modifier_en_masse(
+        db, {"couleur_cheveux": alea.choice(COULEURS_CHEVEUX)}, ids=ids[:nb_modifications]
+    )
+    ClientDAO.creer_lot_valeurs(db, list(generer_clients(nb_ajouts, alea.randrange(1 << 30))))
+    ClientDAO.supprimer_plusieurs(db, ids[nb_modifications:])
+
+
+# ---------------------------------------------------------------------------
+# Mesures
+# ---------------------------------------------------------------------------
+
+def mesurer_taille(chemin_base: str, taille: int, changements: list[int],
+                   repetitions: int, graine: int) -> dict:
+    """
+    Chronomètre synchroniser() pour chaque volume de changements.
+
+    :return: {nom de la mesure: résumé (voir mesures.resumer)}
+    """
+    alea = random.Random(graine)
+    resultats: dict = {}
+
+    with tempfile.TemporaryDirectory() as dossier:
+        sites = []
+        for numero, (debut, fin) in enumerate((PLAGE_SITE_1, PLAGE_SITE_2), start=1):
+            copie = os.path.join(dossier, f"site{numero}.sqlite")
+            shutil.copyfile(chemin_base, copie)
+            db = GestionnaireBase(rapporteur=rapporter_par_exception)
+            db.ouvrir(copie)
+            configurer_site(db, numero, debut, fin, copie_commune=True)
+            sites.append(db)
+        site_1, site_2 = sites
+        synchroniser(site_1, site_2)   # premier échange (complet) et échauffement
+
+        for nombre in changements:
+            durees: list[float] = []
+            for _ in range(repetitions):
+                ecrire_changements(site_1, nombre, taille, alea)
+                ecrire_changements(site_2, nombre, taille, alea)
+                debut = time.perf_counter()
+                synchroniser(site_1, site_2)
+                durees.append(time.perf_counter() - debut)
+            resultats[f"sync_{nombre}"] = resumer(durees, elements=2 * nombre)
+
+        # Contrôle : les deux sites ont convergé
+        if ClientDAO.compter(site_1) != ClientDAO.compter(site_2):
+            print(f"ATTENTION : sites divergents après synchronisation ({taille} clients)")
+        for db in sites:
+            db.fermer()
+    return resultats
+
+
+# ---------------------------------------------------------------------------
+# Point d'entrée
+# ---------------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Durée de synchronisation selon changements et taille.")
+    parser.add_argument("--tailles", default="10000,100000,1000000", help="Nombres de clients des bases")
+    parser.add_argument("--changements", default="10,100,1000", help="Écritures par site entre deux synchronisations")
+    parser.add_argument("--repetitions", type=int, default=10, help="Synchronisations mesurées par volume")
+    parser.add_argument("--graine", type=int, default=42, help="Graine des données et des tirages")
+    parser.add_argument("--donnees", default=DOSSIER_DONNEES, help="Dossier des bases générées (cache)")
+    parser.add_argument("--sortie", default=SORTIE_DEFAUT, help="Fichier JSON des résultats")
+    parser.add_argument("--reference", default=REFERENCE_DEFAUT, help="Fichier JSON de référence")
+    parser.add_argument("--seuil", type=float, default=0.25, help="Régression tolérée (0.25 = +25 %%)")
+    parser.add_argument("--enregistrer-reference", action="store_true",
+                        help="Écrire aussi les résultats comme nouvelle référence")
+    args = parser.parse_args()
+
+    tailles = [int(t) for t in args.tailles.split(",") if t.strip()]
+    changements = [int(c) for c in args.changements.split(",") if c.strip()]
+    reference = lire_resultats(args.reference)
+    resultats_reference = reference["resultats"] if reference else None
+
+    resultats: dict = {}
+    for taille in tailles:
+        chemin_base = preparer_base(taille, args.graine, args.donnees)
+        resultats[str(taille)] = mesurer_taille(
+            chemin_base, taille, changements, args.repetitions, args.graine
+        )
+        afficher_tableau(
+            f"{taille} clients", resultats[str(taille)],
+            (resultats_reference or {}).get(str(taille)),
+        )
+
+    # Le rapport attendu : à k égal, même ordre de grandeur quelle que soit la taille
+    if len(tailles) > 1:
+        petite, grande = str(tailles[0]), str(tailles[-1])
+        print(f"\n[p50 {grande} / p50 {petite} clients, à changements égaux]")
+        for nombre in changements:
+            cle = f"sync_{nombre}"
+            rapport = resultats[grande][cle]["p50_ms"] / max(resultats[petite][cle]["p50_ms"], 1e-9)
+            print(f"{cle:<24}{rapport:>8.2f}×")
+
+    meta = metadonnees(
+        "bench_sync",
+        tailles=tailles,
+        changements=changements,
+        repetitions=args.repetitions,
+        graine=args.graine,
+    )
+    return conclure(
+        meta, resultats,
+        args.sortie, args.reference, resultats_reference,
+        args.seuil, args.enregistrer_reference,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
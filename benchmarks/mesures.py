@@ -0,0 +1,221 @@
+# =============================================================================
+# benchmarks/mesures.py
+# Outils communs aux benchmarks : chronométrage, percentiles, fichiers de
+# résultats JSON et comparaison à une référence enregistrée.
+#
+# Format d'un fichier de résultats :
+#   {
+#     "meta": {"benchmark": ..., "date": ..., "python": ..., ...},
+#     "resultats": {
+#       "<groupe>": {"<mesure>": {"n": ..., "p50_ms": ..., ...}, ...},
+#       ...
+#     }
+#   }
+# Deux fichiers du même benchmark sont comparables mesure par mesure.
+# =============================================================================
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+
+# Mesures comparées à la référence (en millisecondes, plus petit = meilleur)
+CLES_COMPAREES = ("p50_ms", "p90_ms")
+
+# Écart absolu en dessous duquel une variation n'est pas une régression
+# (bruit de l'horloge et de l'ordonnanceur sur les opérations très courtes)
+ECART_MINIMAL_MS = 0.05
+
+
+# ---------------------------------------------------------------------------
+# Chronométrage
+# ---------------------------------------------------------------------------
+
+def percentile(valeurs_triees: list[float], rang: float) -> float:
+    """
+    Percentile par interpolation linéaire.
+
+    :param valeurs_triees: Échantillon trié par ordre croissant
+    :param rang:           Percentile voulu (0–100)
+    :return:               Valeur du percentile (0.0 si échantillon vide)
+    """
+    if not valeurs_triees:
+        return 0.0
+    position = (len(valeurs_triees) - 1) * rang / 100.0
+    bas = int(position)
+    haut = min(bas + 1, len(valeurs_triees) - 1)
+    return valeurs_triees[bas] + (valeurs_triees[haut] - valeurs_triees[bas]) * (position - bas)
+
+
+def resumer(durees: list[float], elements: int = 1) -> dict:
+    """
+    Résume un échantillon de durées (en secondes).
+
+    :param durees:   Durée de chaque appel mesuré
+    :param elements: Éléments traités par appel (pour le débit)
+    :return:         {"n", "p50_ms", "p90_ms", "p99_ms", "max_ms",
+                      "moyenne_ms", "debit_s"}
+    """
+    triees = sorted(durees)
+    total = sum(triees)
+    return {
+        "n"          : len(triees),
+        "p50_ms"     : round(percentile(triees, 50) * 1000, 4),
+        "p90_ms"     : round(percentile(triees, 90) * 1000, 4),
+        "p99_ms"     : round(percentile(triees, 99) * 1000, 4),
+        "max_ms"     : round(triees[-1] * 1000, 4) if triees else 0.0,
+        "moyenne_ms" : round(total / len(triees) * 1000, 4) if triees else 0.0,
+        "debit_s"    : round(len(triees) * elements / total, 1) if total else 0.0,
+    }
+
+
+def chronometrer(appels: list[Callable[[], object]]) -> list[float]:
+    """
+    Exécute chaque appel une fois et retourne sa durée (perf_counter).
+
+    :param appels: Fonctions sans argument à mesurer
+    :return:       Durées en secondes, dans l'ordre des appels
+    """
+    durees: list[float] = []
+    horloge = time.perf_counter
+    for appel in appels:
+        debut = horloge()
+        appel()
+        durees.append(horloge() - debut)
+    return durees
+
+
+# ---------------------------------------------------------------------------
+# Fichiers de résultats
+# ---------------------------------------------------------------------------
+
+def metadonnees(benchmark: str, **parametres) -> dict:
+    """Décrit l'environnement de mesure (pour interpréter les écarts)."""
+    return {
+        "benchmark"  : benchmark,
+        "date"       : datetime.now().isoformat(timespec="seconds"),
+        "python"     : sys.version.split()[0],
+        "sqlite"     : sqlite3.sqlite_version,
+        "plateforme" : platform.platform(),
+        "processeurs": os.cpu_count(),
+        "parametres" : parametres,
+    }
+
+
+def ecrire_resultats(chemin: str, meta: dict, resultats: dict) -> None:
+    """Écrit un fichier de résultats JSON (crée le dossier si besoin)."""
+    dossier = os.path.dirname(os.path.abspath(chemin))
+    os.makedirs(dossier, exist_ok=True)
+    with open(chemin, "w", encoding="utf-8") as fichier:
+        json.dump({"meta": meta, "resultats": resultats}, fichier, ensure_ascii=False, indent=2)
+        fichier.write("\n")
+
+
+def lire_resultats(chemin: str) -> Optional[dict]:
+    """Relit un fichier de résultats (None s'il n'existe pas)."""
+    if not os.path.exists(chemin):
+        return None
+    with open(chemin, encoding="utf-8") as fichier:
+        return json.load(fichier)
+
+
+def comparer(resultats: dict, reference: dict, seuil: float) -> list[str]:
+    """
+    Compare des résultats à une référence, mesure par mesure.
+
+    Seules les mesures présentes des deux côtés sont comparées ; une
+    régression est signalée lorsqu'une latence dépasse la référence de
+    plus de `seuil` (0.25 = +25 %) et d'au moins ECART_MINIMAL_MS.
+
+    :param resultats: Partie "resultats" du fichier courant
+    :param reference: Partie "resultats" du fichier de référence
+    :param seuil:     Dégradation relative tolérée
+    :return:          Descriptions des régressions (liste vide = aucune)
+    """
+    regressions: list[str] = []
+    for groupe, mesures in resultats.items():
+        for nom, valeurs in mesures.items():
+            ancien = reference.get(groupe, {}).get(nom)
+            if not ancien:
+                continue
+            for cle in CLES_COMPAREES:
+                avant, apres = ancien.get(cle), valeurs.get(cle)
+                if not avant or apres is None:
+                    continue
+                ecart = (apres - avant) / avant
+                if ecart > seuil and apres - avant >= ECART_MINIMAL_MS:
+                    regressions.append(
+                        f"{groupe} / {nom} / {cle} : {avant:.3f} → {apres:.3f} ms ({ecart:+.0%})"
+                    )
+    return regressions
+
+
+def afficher_tableau(titre: str, mesures: dict, reference: Optional[dict] = None) -> None:
+    """
+    Affiche les mesures d'un groupe.
+
+    :param titre:     Titre du tableau
+    :param mesures:   {nom: résumé} du groupe
+    :param reference: {nom: résumé} du même groupe dans la référence (écart sur p50)
+    """
+    print(f"\n[{titre}]")
+    print(f"{'Mesure':<24}{'n':>6}{'p50 ms':>11}{'p90 ms':>11}{'p99 ms':>11}{'max ms':>11}{'ops/s':>12}{'Δ p50':>9}")
+    for nom, valeurs in mesures.items():
+        ecart = ""
+        ancien = (reference or {}).get(nom)
+        if ancien and ancien.get("p50_ms"):
+            ecart = f"{(valeurs['p50_ms'] - ancien['p50_ms']) / ancien['p50_ms']:+.0%}"
+        print(
+            f"{nom:<24}{valeurs['n']:>6}{valeurs['p50_ms']:>11.3f}{valeurs['p90_ms']:>11.3f}"
+            f"{valeurs['p99_ms']:>11.3f}{valeurs['max_ms']:>11.3f}{valeurs['debit_s']:>12,.0f}{ecart:>9}"
+        )
+
+
+def conclure(
+    meta: dict,
+    resultats: dict,
+    chemin_sortie: str,
+    chemin_reference: str,
+    reference: Optional[dict],
+    seuil: float,
+    enregistrer_reference: bool = False,
+) -> int:
+    """
+    Écrit les résultats, puis enregistre la référence ou s'y compare.
+
+    :param meta:                  Métadonnées (voir metadonnees)
+    :param resultats:             {groupe: {mesure: résumé}}
+    :param chemin_sortie:         Fichier JSON des résultats
+    :param chemin_reference:      Fichier JSON de la référence
+    :param reference:             Partie "resultats" de la référence (None = aucune)
+    :param seuil:                 Dégradation relative tolérée
+    :param enregistrer_reference: Si True, les résultats deviennent la référence
+    :return:                      Code de sortie (1 si régression, 0 sinon)
+    """
+    ecrire_resultats(chemin_sortie, meta, resultats)
+    print(f"\nRésultats : {chemin_sortie}")
+
+    if enregistrer_reference:
+        ecrire_resultats(chemin_reference, meta, resultats)
+        print(f"Référence enregistrée : {chemin_reference}")
+        return 0
+
+    if reference is None:
+        print("Aucune référence à comparer (--enregistrer-reference pour en créer une).")
+        return 0
+
+    regressions = comparer(resultats, reference, seuil)
+    if regressions:
+        print(f"\n{len(regressions)} régression(s) au-delà de {seuil:.0%} :")
+        for ligne in regressions:
+            print(f"  - {ligne}")
+        return 1
+    print(f"\nAucune régression au-delà de {seuil:.0%} par rapport à la référence.")
+    return 0
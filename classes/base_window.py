@@ -3,18 +3,28 @@
 # Classe de base abstraite pour toutes les fenêtres Toplevel de l'application.
 # Centralise les comportements communs : modalité, thème, chargement d'images.
 #
-# Chargement d'images : utilise tkinter.PhotoImage (natif, sans dépendance).
+# Chargement d'images : utilise tkinter.PhotoImage (natif, sans dépendance),
+# via le registre partagé (classes/registre_images.py) : chaque PNG n'est
+# décodé qu'une fois pour toute l'application.
 # Les images PNG doivent être exactement 60×60 pixels (spec Section 4).
 # =============================================================================
 
 from __future__ import annotations
 
-import os
 import tkinter as tk
-from tkinter import ttk
+from tkinter import messagebox, ttk
 from typing import Optional
 
-from core.config import COULEURS, POLICES, IMAGES_DIR
+from classes.registre_images import registre_images
+from core.config import COULEURS, POLICES
+
+
+def rapporter_par_messagebox(titre: str, message: str, erreur: Optional[Exception] = None) -> None:
+    """
+    Rapporteur d'erreurs de GestionnaireBase pour l'interface graphique :
+    affiche l'erreur dans une boîte de dialogue.
+    """
+    messagebox.showerror(titre, message)
 
 
 class FenetreBase(tk.Toplevel):
@@ -74,9 +84,6 @@ class FenetreBase(tk.Toplevel):
         # Intercepter la fermeture via la croix
         self.protocol("WM_DELETE_WINDOW", self._on_fermeture)
 
-        # Dictionnaire de cache pour les images chargées (évite le GC)
-        self._cache_images: dict[str, tk.PhotoImage] = {}
-
     # ------------------------------------------------------------------
     # Centrage
     # ------------------------------------------------------------------
@@ -129,7 +136,8 @@ class FenetreBase(tk.Toplevel):
         taille: Optional[tuple[int, int]] = None,
     ) -> Optional[tk.PhotoImage]:
         """
-        Charge une image PNG depuis le dossier images/ et la met en cache.
+        Charge une image PNG depuis le dossier images/ (registre partagé :
+        décodée une seule fois, puis réutilisée par toutes les fenêtres).
 
         Utilise tkinter.PhotoImage (natif, aucune dépendance externe).
         Les PNG doivent être exactement à la taille souhaitée (60×60 px
@@ -142,22 +150,7 @@ class FenetreBase(tk.Toplevel):
         :return:            PhotoImage prête à être utilisée dans Tkinter,
                             ou None si le fichier est introuvable ou illisible
         """
-        cle_cache = nom_fichier
-        if cle_cache in self._cache_images:
-            return self._cache_images[cle_cache]
-
-        chemin = os.path.join(IMAGES_DIR, nom_fichier)
-        if not os.path.isfile(chemin):
-            # Image manquante : retourner None sans planter l'application
-            return None
-
-        try:
-            photo = tk.PhotoImage(file=chemin)
-            self._cache_images[cle_cache] = photo
-            return photo
-        except tk.TclError:
-            # Fichier présent mais non lisible par Tkinter (ex: JPEG)
-            return None
+        return registre_images(self).obtenir(nom_fichier)
 
     # ------------------------------------------------------------------
     # Utilitaires d'interface
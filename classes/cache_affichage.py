@@ -0,0 +1,121 @@
+# =============================================================================
+# classes/cache_affichage.py
+# Cache de formatage des lignes clients pour l'affichage dans le tableau.
+#
+# Le remplissage du Treeview formate chaque client (date, crédit, booléen).
+# Sur de grandes listes, ce formatage domine le temps de rafraîchissement :
+#   - les valeurs répétées (dates, montants) sont mémoïsées une seule fois ;
+#   - les tuples d'affichage sont conservés par IDCLIENT et réutilisés
+#     d'une recherche à l'autre tant que le client n'a pas été modifié,
+#     dans la limite de TAILLE_MAX_CACHE lignes (les moins récemment
+#     affichées sont évincées).
+# =============================================================================
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from fonctionsgen.fonctionsgen import formater_booleen, formater_credit, formater_date_affichage
+from models.client_model import Client
+
+
+# Mémoïsation des montants : ils se répètent fortement d'un client à
+# l'autre (l'analyse des dates est déjà mémoïsée dans fonctionsgen).
+_formater_credit = lru_cache(maxsize=16384)(formater_credit)
+_LIBELLES_BOOLEENS = {True: formater_booleen(True), False: formater_booleen(False)}
+
+# Nombre maximal de tuples d'affichage conservés
+TAILLE_MAX_CACHE = 100_000
+
+
+class CacheAffichageClients:
+    """
+    Cache des tuples d'affichage des clients, indexé par IDCLIENT, borné
+    (éviction des lignes les moins récemment affichées).
+
+    Usage :
+        cache = CacheAffichageClients()
+        lignes = cache.formater_lot(clients)   # [valeurs, ...] (valeurs[0] = IDCLIENT)
+        cache.invalider([12, 15])              # après modification
+    """
+
+    def __init__(self, taille_max: int = TAILLE_MAX_CACHE) -> None:
+        """
+        :param taille_max: Nombre maximal de tuples conservés
+        """
+        self._taille_max = taille_max
+        self._lignes: OrderedDict[int, tuple] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._lignes)
+
+    # ------------------------------------------------------------------
+    # Formatage
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def formater(client: Client) -> tuple:
+        """
+        Construit le tuple d'affichage d'un client (ordre des colonnes
+        du tableau de Win_Client_CRUDS), sans passer par le cache.
+
+        :param client: Client à formater
+        :return:       Tuple des valeurs affichées
+        """
+        return (
+            client.idclient,
+            client.nom_client,
+            client.numero_telephone,
+            client.ville,
+            client.code_postal,
+            formater_date_affichage(client.date_naissance),
+            _formater_credit(client.credit_disponible),
+            _LIBELLES_BOOLEENS[bool(client.bon_client)],
+            client.couleur_cheveux,
+        )
+
+    def formater_lot(self, clients: Iterable[Client]) -> list[tuple]:
+        """
+        Formate un lot de clients en réutilisant les tuples déjà calculés,
+        puis ramène le cache à sa taille maximale.
+
+        :param clients: Clients à afficher (dans l'ordre du tableau)
+        :return:        Liste de tuples d'affichage, même ordre que l'entrée
+        """
+        lignes   = self._lignes
+        formater = self.formater
+        recent   = lignes.move_to_end
+        resultat: list[tuple] = []
+        ajouter  = resultat.append
+
+        for client in clients:
+            valeurs = lignes.get(client.idclient)
+            if valeurs is None:
+                valeurs = formater(client)
+                lignes[client.idclient] = valeurs
+            else:
+                recent(client.idclient)
+            ajouter(valeurs)
+
+        while len(lignes) > self._taille_max:
+            lignes.popitem(last=False)
+        return resultat
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def invalider(self, ids: Optional[Iterable[int]] = None) -> None:
+        """
+        Supprime du cache les lignes des clients donnés
+        (ou tout le cache si ids est None).
+
+        :param ids: IDCLIENT modifiés ou supprimés
+        """
+        if ids is None:
+            self._lignes.clear()
+            return
+        for idclient in ids:
+            self._lignes.pop(idclient, None)
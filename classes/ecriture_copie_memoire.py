@@ -0,0 +1,105 @@
+# =============================================================================
+# classes/ecriture_copie_memoire.py
+# Écriture périodique de la copie de travail en mémoire dans son fichier.
+#
+# En mode copie de travail (PROGPYTHONEXPL_COPIE_MEMOIRE, voir
+# core/copie_memoire.py), la base ouverte vit en mémoire. Toutes les
+# `intervalle_s` secondes, si elle a changé, un instantané est pris dans le
+# thread Tk (quelques millisecondes, hors transaction) puis copié dans le
+# fichier par un thread de travail ; le résultat est lu par after() et
+# transmis à la fenêtre. La dernière écriture est faite par db.fermer().
+#
+# Sans copie de travail, rien n'est programmé.
+# =============================================================================
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Optional
+
+from core.database import GestionnaireBase
+
+if TYPE_CHECKING:
+    from core.copie_memoire import RapportEcriture
+
+
+# Période de lecture de l'écriture en cours (et de nouvel essai quand une
+# transaction de l'application est ouverte)
+SUIVI_MS = 200
+
+
+class EcritureCopieMemoire:
+    """
+    Programme les écritures de la copie de travail de la base ouverte.
+
+    Usage :
+        ecriture = EcritureCopieMemoire(racine, db, a_la_fin=vue.on_copie_ecrite)
+        ecriture.demarrer()     # à l'ouverture de la base
+        ecriture.arreter()      # avant sa fermeture (db.fermer() écrit la suite)
+    """
+
+    def __init__(
+        self,
+        widget,
+        db: GestionnaireBase,
+        a_la_fin: Optional[Callable[["RapportEcriture"], None]] = None,
+    ) -> None:
+        """
+        :param widget:   Widget Tk servant à programmer (la racine)
+        :param db:       Gestionnaire de la base ouverte
+        :param a_la_fin: Rappel recevant le RapportEcriture de chaque écriture
+        """
+        self._widget = widget
+        self._db = db
+        self._a_la_fin = a_la_fin
+        self._id_after: Optional[str] = None
+
+    @property
+    def active(self) -> bool:
+        return self._db.copie_memoire is not None
+
+    def demarrer(self) -> None:
+        """Programme les écritures de la base qui vient d'être ouverte."""
+        self.arreter()
+        self._programmer()
+
+    def arreter(self) -> None:
+        """
+        Annule la planification. Une écriture en cours se termine : elle
+        copie un instantané, et db.fermer() l'attend.
+        """
+        if self._id_after is not None:
+            try:
+                self._widget.after_cancel(self._id_after)
+            except Exception:
+                pass  # fenêtre déjà détruite
+            self._id_after = None
+
+    def _programmer(self) -> None:
+        copie = self._db.copie_memoire
+        if copie is not None and copie.intervalle_s > 0:
+            self._id_after = self._widget.after(int(copie.intervalle_s * 1000), self._echeance)
+
+    def _echeance(self) -> None:
+        self._id_after = None
+        copie = self._db.copie_memoire
+        if copie is None:
+            return
+        # Une transaction de l'application est ouverte : repasser juste après
+        if self._db.connexion.in_transaction:
+            self._id_after = self._widget.after(SUIVI_MS, self._echeance)
+        elif copie.ecrire():
+            self._id_after = self._widget.after(SUIVI_MS, self._suivre)
+        else:
+            self._programmer()   # rien de changé depuis l'écriture précédente
+
+    def _suivre(self) -> None:
+        self._id_after = None
+        copie = self._db.copie_memoire
+        if copie is None:
+            return
+        if copie.en_cours:
+            self._id_after = self._widget.after(SUIVI_MS, self._suivre)
+            return
+        if self._a_la_fin is not None and copie.dernier_rapport is not None:
+            self._a_la_fin(copie.dernier_rapport)
+        self._programmer()
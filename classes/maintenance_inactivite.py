@@ -0,0 +1,155 @@
+# =============================================================================
+# classes/maintenance_inactivite.py
+# Maintenance planifiée de la base ouverte, pendant l'inactivité de Tk.
+#
+# Toutes les MAINTENANCE_INTERVALLE_MIN minutes tant qu'une base est
+# ouverte (si le journal des changements a avancé depuis la maintenance
+# précédente), un PlanMaintenance (core/maintenance.py) est exécuté sur la
+# connexion de l'application par tranches de MAINTENANCE_TRANCHE_MS au plus.
+# Chaque tranche attend que la file d'événements soit vide (after_idle) :
+# un clic ou une frappe passe avant, et n'attend jamais plus qu'une tranche.
+# Tout se passe dans le thread Tk : la connexion n'est pas partagée.
+#
+# En mode copie de travail en mémoire, la connexion de l'application est la
+# base en mémoire : seules ses statistiques sont entretenues
+# (TACHES_COPIE_MEMOIRE), et la copie les écrit dans le fichier.
+#
+# core.maintenance n'est importé qu'à la première maintenance (démarrage).
+# =============================================================================
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Optional
+
+from core import journal_changements
+from core.config import (
+    MAINTENANCE_BUDGET_S,
+    MAINTENANCE_INTERVALLE_MIN,
+    MAINTENANCE_PAUSE_MS,
+    MAINTENANCE_TRANCHE_MS,
+)
+from core.database import GestionnaireBase
+
+if TYPE_CHECKING:
+    from core.maintenance import PlanMaintenance, RapportMaintenance
+
+
+class MaintenanceInactivite:
+    """
+    Planifie et exécute par tranches la maintenance de la base ouverte.
+
+    Usage :
+        maintenance = MaintenanceInactivite(racine, db,
+                                            a_la_fin=vue.on_maintenance_terminee)
+        maintenance.demarrer()     # à l'ouverture de la base
+        maintenance.arreter()      # à sa fermeture (maintenance en cours abandonnée)
+    """
+
+    def __init__(
+        self,
+        widget,
+        db: GestionnaireBase,
+        intervalle_min: int = MAINTENANCE_INTERVALLE_MIN,
+        tranche_ms: int = MAINTENANCE_TRANCHE_MS,
+        budget_s: float = MAINTENANCE_BUDGET_S,
+        a_la_fin: Optional[Callable[["RapportMaintenance"], None]] = None,
+    ) -> None:
+        """
+        :param widget:         Widget Tk servant à programmer (la racine)
+        :param db:             Gestionnaire de la base à entretenir
+        :param intervalle_min: Période des maintenances (0 = aucune)
+        :param tranche_ms:     Durée maximale d'une tranche de travail
+        :param budget_s:       Durée totale de travail d'une maintenance
+        :param a_la_fin:       Rappel recevant le RapportMaintenance
+        """
+        self._widget = widget
+        self._db = db
+        self._intervalle_ms = intervalle_min * 60_000
+        self._tranche_s = tranche_ms / 1000
+        self._budget_s = budget_s
+        self._a_la_fin = a_la_fin
+        self._plan: Optional["PlanMaintenance"] = None
+        self._id_after: Optional[str] = None
+        # Séquence du journal à la dernière maintenance (None = jamais)
+        self._sequence_entretenue: Optional[int] = None
+
+    @property
+    def en_cours(self) -> bool:
+        return self._plan is not None
+
+    # ------------------------------------------------------------------
+    # Planification
+    # ------------------------------------------------------------------
+
+    def demarrer(self) -> None:
+        """Programme les maintenances de la base qui vient d'être ouverte."""
+        self.arreter()
+        self._sequence_entretenue = None
+        self._programmer(self._intervalle_ms)
+
+    def arreter(self) -> None:
+        """Annule la planification et abandonne la maintenance en cours."""
+        if self._id_after is not None:
+            try:
+                self._widget.after_cancel(self._id_after)
+            except Exception:
+                pass  # fenêtre déjà détruite
+            self._id_after = None
+        self._plan = None
+
+    def _programmer(self, delai_ms: int) -> None:
+        if delai_ms > 0:
+            self._id_after = self._widget.after(delai_ms, self._echeance)
+
+    def _echeance(self) -> None:
+        self._id_after = None
+        sequence = journal_changements.sequence_courante(self._db)
+        # Rien d'écrit depuis la maintenance précédente : rien à entretenir
+        if sequence == self._sequence_entretenue:
+            self._programmer(self._intervalle_ms)
+            return
+        self.entretenir_maintenant()
+
+    # ------------------------------------------------------------------
+    # Exécution par tranches
+    # ------------------------------------------------------------------
+
+    def entretenir_maintenant(self) -> bool:
+        """
+        Commence une maintenance, exécutée aux prochains moments d'inactivité.
+
+        :return: False si aucune base n'est ouverte ou si une maintenance
+                 est déjà en cours
+        """
+        if not self._db.est_connecte or self.en_cours:
+            return False
+        from core.maintenance import TACHES_COPIE_MEMOIRE, TACHES_DEFAUT, PlanMaintenance
+        if self._id_after is not None:
+            self._widget.after_cancel(self._id_after)
+        self._sequence_entretenue = journal_changements.sequence_courante(self._db)
+        taches = TACHES_DEFAUT if self._db.copie_memoire is None else TACHES_COPIE_MEMOIRE
+        self._plan = PlanMaintenance(
+            self._db.connexion, self._db.chemin_base, taches, budget=self._budget_s
+        )
+        self._id_after = self._widget.after_idle(self._tranche)
+        return True
+
+    def _attendre_inactivite(self) -> None:
+        self._id_after = self._widget.after_idle(self._tranche)
+
+    def _tranche(self) -> None:
+        self._id_after = None
+        plan = self._plan
+        if plan is None or not self._db.est_connecte:
+            self._plan = None
+            return
+        # Une transaction de l'application est ouverte : repasser plus tard
+        if self._db.connexion.in_transaction or not plan.executer_tranche(self._tranche_s):
+            self._id_after = self._widget.after(MAINTENANCE_PAUSE_MS, self._attendre_inactivite)
+            return
+        self._plan = None
+        if plan.rapport.interrompue or not plan.rapport.reussie:
+            self._sequence_entretenue = None   # à reprendre à la prochaine échéance
+        if self._a_la_fin is not None:
+            self._a_la_fin(plan.rapport)
+        self._programmer(self._intervalle_ms)
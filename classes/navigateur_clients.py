@@ -0,0 +1,142 @@
+# =============================================================================
+# classes/navigateur_clients.py
+# Parcours Précédent / Suivant des clients depuis la fiche.
+#
+# Le navigateur reçoit la liste ordonnée des IDCLIENT affichés dans le
+# tableau de Win_Client_CRUDS (filtre et ordre courants) et la position du
+# client ouvert. Les voisins sont lus d'avance, en une seule requête, pour
+# que le passage au client suivant ne touche pas la base : la fiche appelle
+# precharger() pendant les temps morts de la boucle Tk.
+#
+# Ce module n'importe pas Tkinter.
+# =============================================================================
+
+from __future__ import annotations
+
+from typing import Optional
+
+from core.database import GestionnaireBase
+from core.evenements import MODIFICATION, SUPPRESSION, Changement
+from models.client_model import Client, ClientDAO
+
+
+class NavigateurClients:
+    """
+    Position courante dans une liste ordonnée de clients, avec cache des
+    voisins préchargés.
+
+    Usage :
+        nav = NavigateurClients(db, ids_affiches, ids_affiches.index(12))
+        client = nav.aller(+1)     # client suivant (None en fin de liste)
+        nav.precharger()           # lit d'avance les voisins manquants
+    """
+
+    def __init__(
+        self,
+        db: GestionnaireBase,
+        ids: list[int],
+        position: int,
+        rayon: int = 3,
+    ) -> None:
+        """
+        :param db:       Gestionnaire de base connecté
+        :param ids:      IDCLIENT dans l'ordre d'affichage
+        :param position: Indice du client ouvert dans `ids`
+        :param rayon:    Voisins préchargés de chaque côté
+        """
+        self._db = db
+        self._ids = list(ids)
+        self.position = position
+        self._rayon = rayon
+        self._cache: dict[int, Client] = {}
+        # Clients supprimés depuis l'affichage du tableau (à sauter)
+        self._absents: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # ------------------------------------------------------------------
+    # Déplacement
+    # ------------------------------------------------------------------
+
+    @property
+    def a_precedent(self) -> bool:
+        return self.position > 0
+
+    @property
+    def a_suivant(self) -> bool:
+        return self.position < len(self._ids) - 1
+
+    def memoriser(self, client: Client) -> None:
+        """Place un client déjà lu dans le cache (client ouvert, enregistré...)."""
+        self._cache[client.idclient] = client
+
+    def oublier(self, idclient: int) -> None:
+        """Retire un client du cache (modifié ailleurs : il sera relu)."""
+        self._cache.pop(idclient, None)
+
+    def appliquer_changement(self, changement: Changement) -> None:
+        """
+        Tient le cache à jour d'après le bus de changements : les clients
+        modifiés seront relus, les clients supprimés seront sautés.
+        """
+        if changement.operation not in (MODIFICATION, SUPPRESSION):
+            return
+        for idclient in changement.ids:
+            self._cache.pop(idclient, None)
+        if changement.operation == SUPPRESSION:
+            self._absents.update(changement.ids)
+
+    def aller(self, decalage: int) -> Optional[Client]:
+        """
+        Avance (decalage > 0) ou recule (decalage < 0) dans la liste.
+        Les clients supprimés depuis l'affichage du tableau sont sautés.
+
+        :param decalage: Nombre de positions (+1 = suivant, -1 = précédent)
+        :return:         Nouveau client courant, ou None (bord de liste
+                         atteint : la position ne change pas)
+        """
+        pas = 1 if decalage > 0 else -1
+        position = self.position + decalage
+        while 0 <= position < len(self._ids):
+            idclient = self._ids[position]
+            if idclient not in self._absents:
+                client = self._cache.get(idclient) or ClientDAO.lire(self._db, idclient)
+                if client is not None:
+                    self.position = position
+                    self._cache[idclient] = client
+                    return client
+                self._absents.add(idclient)
+            position += pas
+        return None
+
+    # ------------------------------------------------------------------
+    # Préchargement
+    # ------------------------------------------------------------------
+
+    def ids_a_precharger(self) -> list[int]:
+        """IDCLIENT voisins de la position courante absents du cache."""
+        debut = max(0, self.position - self._rayon)
+        fin = min(len(self._ids), self.position + self._rayon + 1)
+        return [
+            idclient for idclient in self._ids[debut:fin]
+            if idclient not in self._cache and idclient not in self._absents
+        ]
+
+    def precharger(self) -> int:
+        """
+        Lit en une requête les voisins manquants, puis oublie les clients
+        trop éloignés de la position courante (cache borné).
+
+        :return: Nombre de clients lus
+        """
+        manquants = self.ids_a_precharger()
+        lus = ClientDAO.lire_plusieurs(self._db, manquants) if manquants else {}
+        self._cache.update(lus)
+        self._absents.update(idclient for idclient in manquants if idclient not in lus)
+
+        debut = max(0, self.position - 2 * self._rayon)
+        proches = set(self._ids[debut:self.position + 2 * self._rayon + 1])
+        for idclient in [i for i in self._cache if i not in proches]:
+            del self._cache[idclient]
+        return len(lus)
@@ -0,0 +1,119 @@
+# =============================================================================
+# classes/registre_images.py
+# Registre d'images partagé par toutes les fenêtres de l'application.
+#
+# Chaque fichier PNG est décodé une seule fois par interpréteur Tk, puis la
+# même PhotoImage est remise à toutes les fenêtres qui le demandent : ouvrir
+# une fiche ou la fenêtre CRUDS ne relit plus le disque. Les icônes peuvent
+# être préchargées une par une pendant les temps morts de la boucle Tk.
+#
+# Le registre conserve les PhotoImage (une PhotoImage sans référence Python
+# est détruite par Tk) ; il disparaît avec la fenêtre racine.
+# =============================================================================
+
+from __future__ import annotations
+
+import os
+import tkinter as tk
+import weakref
+from typing import Iterable, Optional
+
+from core.config import ICONES_PRECHARGEES, IMAGES_DIR
+
+
+# Délai avant le préchargement, puis entre deux images (ms)
+DELAI_PRECHARGEMENT_MS = 50
+
+
+class RegistreImages:
+    """
+    Cache des PhotoImage d'un interpréteur Tk (voir registre_images()).
+
+    Usage :
+        photo = registre_images(fenetre).obtenir("Base_save.png")
+    """
+
+    def __init__(self, racine: tk.Misc, dossier: str = IMAGES_DIR) -> None:
+        """
+        :param racine:  Fenêtre racine de l'interpréteur Tk
+        :param dossier: Dossier des images
+        """
+        # Référence faible : le registre ne doit pas maintenir la racine en vie
+        self._racine = weakref.ref(racine)
+        self._dossier = dossier
+        # Fichiers absents ou illisibles mémorisés aussi (None)
+        self._images: dict[str, Optional[tk.PhotoImage]] = {}
+
+    def obtenir(self, nom_fichier: str) -> Optional[tk.PhotoImage]:
+        """
+        Retourne l'image `nom_fichier`, décodée au premier appel.
+
+        :param nom_fichier: Nom du fichier dans le dossier images (ex: "Base_create.png")
+        :return:            PhotoImage partagée, ou None si le fichier est
+                            introuvable ou illisible par Tkinter
+        """
+        try:
+            return self._images[nom_fichier]
+        except KeyError:
+            pass
+
+        photo: Optional[tk.PhotoImage] = None
+        chemin = os.path.join(self._dossier, nom_fichier)
+        if os.path.isfile(chemin):
+            try:
+                photo = tk.PhotoImage(master=self._racine(), file=chemin)
+            except tk.TclError:
+                photo = None  # Fichier présent mais non lisible (ex: JPEG)
+        self._images[nom_fichier] = photo
+        return photo
+
+    def precharger(self, noms: Iterable[str] = ICONES_PRECHARGEES) -> None:
+        """
+        Décode les images `noms` une par une, quand la boucle Tk est
+        inoccupée (une image par passage, l'interface reste réactive).
+
+        :param noms: Fichiers à précharger (par défaut : icônes des fenêtres)
+        """
+        restants = [nom for nom in noms if nom not in self._images]
+
+        def programmer() -> None:
+            racine = self._racine()
+            if racine is not None:
+                racine.after(DELAI_PRECHARGEMENT_MS, lambda: racine.after_idle(etape))
+
+        def etape() -> None:
+            while restants and restants[0] in self._images:
+                restants.pop(0)  # déjà chargée entre-temps
+            if not restants:
+                return
+            self.obtenir(restants.pop(0))
+            if restants:
+                programmer()
+
+        if restants:
+            programmer()
+
+    def vider(self) -> None:
+        """Oublie toutes les images (elles seront relues au prochain appel)."""
+        self._images.clear()
+
+
+# ---------------------------------------------------------------------------
+# Un registre par interpréteur Tk
+# ---------------------------------------------------------------------------
+
+_registres: "weakref.WeakKeyDictionary[tk.Misc, RegistreImages]" = weakref.WeakKeyDictionary()
+
+
+def registre_images(widget: tk.Misc) -> RegistreImages:
+    """
+    Retourne le registre d'images de l'interpréteur Tk de `widget`
+    (créé au premier appel).
+
+    :param widget: N'importe quel widget de l'application
+    """
+    racine = widget._root()
+    registre = _registres.get(racine)
+    if registre is None:
+        registre = _registres[racine] = RegistreImages(racine)
+    return registre
@@ -0,0 +1,168 @@
+# =============================================================================
+# classes/sauvegarde_planifiee.py
+# Sauvegardes à chaud de la base ouverte, à la demande ou planifiées.
+#
+# La copie tourne dans le thread de ServiceSauvegarde (core/sauvegarde.py),
+# sur sa propre connexion : l'interface reste utilisable pendant la copie.
+# Côté Tk, tout passe par after() : la planification (toutes les
+# SAUVEGARDE_INTERVALLE_MIN minutes tant qu'une base est ouverte, si le
+# journal des changements a avancé depuis la sauvegarde précédente) et le
+# suivi de la copie, lu périodiquement pour afficher l'avancement puis le
+# résultat. Le thread de travail ne touche jamais à Tk.
+#
+# En mode copie de travail en mémoire, le fichier peut être en retard d'un
+# intervalle d'écriture : c'est un instantané de la base en mémoire (ce que
+# voit l'utilisateur) qui est sauvegardé.
+#
+# core.sauvegarde n'est importé qu'à la première sauvegarde (démarrage).
+# =============================================================================
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Optional
+
+from core import journal_changements
+from core.config import SAUVEGARDE_INTERVALLE_MIN
+from core.database import GestionnaireBase
+
+if TYPE_CHECKING:
+    from core.sauvegarde import RapportSauvegarde, ServiceSauvegarde
+
+
+# Période de lecture de l'avancement d'une copie en cours
+SUIVI_MS = 200
+
+
+class SauvegardePlanifiee:
+    """
+    Déclenche et suit les sauvegardes de la base ouverte.
+
+    Usage :
+        sauvegarde = SauvegardePlanifiee(racine, db,
+                                         en_cours=vue.on_sauvegarde_progression,
+                                         a_la_fin=vue.on_sauvegarde_terminee)
+        sauvegarde.demarrer()              # à l'ouverture de la base
+        sauvegarde.sauvegarder_maintenant()
+        sauvegarde.arreter()               # à sa fermeture
+        sauvegarde.fermer()                # à la destruction de la fenêtre
+    """
+
+    def __init__(
+        self,
+        widget,
+        db: GestionnaireBase,
+        intervalle_min: int = SAUVEGARDE_INTERVALLE_MIN,
+        en_cours: Optional[Callable[[int, int], None]] = None,
+        a_la_fin: Optional[Callable[["RapportSauvegarde"], None]] = None,
+    ) -> None:
+        """
+        :param widget:         Widget Tk servant à programmer (la racine)
+        :param db:             Gestionnaire de la base à sauvegarder
+        :param intervalle_min: Période des sauvegardes planifiées (0 = aucune)
+        :param en_cours:       Rappel (pages copiées, total) pendant la copie
+        :param a_la_fin:       Rappel recevant le RapportSauvegarde
+        """
+        self._widget = widget
+        self._db = db
+        self._intervalle_ms = intervalle_min * 60_000
+        self._en_cours = en_cours
+        self._a_la_fin = a_la_fin
+        self._service: Optional["ServiceSauvegarde"] = None
+        self._id_planification: Optional[str] = None
+        self._id_suivi: Optional[str] = None
+        # Séquence du journal à la dernière sauvegarde (None = jamais)
+        self._sequence_sauvegardee: Optional[int] = None
+
+    @property
+    def en_cours(self) -> bool:
+        return self._service is not None and self._service.en_cours
+
+    # ------------------------------------------------------------------
+    # Planification
+    # ------------------------------------------------------------------
+
+    def demarrer(self) -> None:
+        """Programme les sauvegardes périodiques de la base qui vient d'être ouverte."""
+        self._sequence_sauvegardee = None
+        self._programmer()
+
+    def _programmer(self) -> None:
+        self._annuler_planification()
+        if self._intervalle_ms > 0:
+            self._id_planification = self._widget.after(self._intervalle_ms, self._echeance)
+
+    def arreter(self) -> None:
+        """
+        Annule les sauvegardes planifiées. Une copie en cours se termine :
+        elle lit le fichier sur sa propre connexion.
+        """
+        self._annuler_planification()
+
+    def fermer(self) -> None:
+        """Annule la planification et interrompt la copie en cours."""
+        self._annuler_planification()
+        self._annuler(self._id_suivi)
+        self._id_suivi = None
+        if self._service is not None:
+            self._service.annuler()
+
+    def _echeance(self) -> None:
+        self._id_planification = None
+        # Rien d'écrit depuis la sauvegarde précédente : pas de nouvel instantané
+        if journal_changements.sequence_courante(self._db) != self._sequence_sauvegardee:
+            self.sauvegarder_maintenant()
+        self._programmer()
+
+    def _annuler_planification(self) -> None:
+        self._annuler(self._id_planification)
+        self._id_planification = None
+
+    def _annuler(self, id_after: Optional[str]) -> None:
+        if id_after is not None:
+            try:
+                self._widget.after_cancel(id_after)
+            except Exception:
+                pass  # fenêtre déjà détruite
+
+    # ------------------------------------------------------------------
+    # Sauvegarde
+    # ------------------------------------------------------------------
+
+    def sauvegarder_maintenant(self) -> bool:
+        """
+        Lance une sauvegarde de la base ouverte en arrière-plan.
+
+        :return: False si aucune base n'est ouverte ou si une copie est
+                 déjà en cours
+        """
+        if not self._db.est_connecte or self.en_cours:
+            return False
+        if self._service is None:
+            from core.sauvegarde import ServiceSauvegarde
+            self._service = ServiceSauvegarde()
+        sequence = journal_changements.sequence_courante(self._db)
+        source = None
+        copie = self._db.copie_memoire
+        if copie is not None:
+            source = copie.instantane()
+            if source is None:
+                return False   # transaction ouverte : à la prochaine échéance
+        if not self._service.lancer(self._db.chemin_base, source=source):
+            if source is not None:
+                source.close()
+            return False
+        self._sequence_sauvegardee = sequence
+        self._id_suivi = self._widget.after(SUIVI_MS, self._suivre)
+        return True
+
+    def _suivre(self) -> None:
+        self._id_suivi = None
+        service = self._service
+        if service is None:
+            return
+        if service.en_cours:
+            if self._en_cours is not None:
+                self._en_cours(*service.avancement)
+            self._id_suivi = self._widget.after(SUIVI_MS, self._suivre)
+        elif self._a_la_fin is not None and service.dernier_rapport is not None:
+            self._a_la_fin(service.dernier_rapport)
@@ -0,0 +1,93 @@
+# =============================================================================
+# classes/sonde_changements.py
+# Sonde périodique des écritures faites par un autre processus.
+#
+# Programme DetecteurChangementsExternes.verifier() dans la boucle Tk
+# (after), tant qu'une base est ouverte. Sans changement, chaque passage ne
+# coûte qu'un PRAGMA data_version ; les changements trouvés sont diffusés
+# sur db.bus et les fenêtres abonnées mettent à jour leurs lignes.
+#
+# Tout se passe dans le thread Tk : la connexion SQLite n'est jamais
+# partagée avec un autre thread.
+#
+# Limite : en mode copie de travail en mémoire (core/copie_memoire.py),
+# aucun autre programme ne peut écrire dans la base de l'application, et
+# les écritures faites dans le fichier n'y sont pas reportées avant la
+# prochaine ouverture : la sonde n'est pas démarrée.
+# =============================================================================
+
+from __future__ import annotations
+
+from typing import Optional
+
+from core.changements_externes import DetecteurChangementsExternes
+from core.config import SONDE_CHANGEMENTS_MS
+from core.database import GestionnaireBase
+
+
+class SondeChangementsExternes:
+    """
+    Vérification périodique des changements externes d'une base.
+
+    Usage :
+        sonde = SondeChangementsExternes(racine, db)
+        sonde.demarrer()      # après l'ouverture de la base
+        sonde.arreter()       # avant sa fermeture
+    """
+
+    def __init__(
+        self,
+        widget,
+        db: GestionnaireBase,
+        intervalle_ms: int = SONDE_CHANGEMENTS_MS,
+    ) -> None:
+        """
+        :param widget:        Widget Tk servant à programmer la sonde (la racine)
+        :param db:            Gestionnaire de base surveillé
+        :param intervalle_ms: Période de vérification
+        """
+        self._widget = widget
+        self._db = db
+        self._intervalle_ms = intervalle_ms
+        self._detecteur: Optional[DetecteurChangementsExternes] = None
+        self._id_after: Optional[str] = None
+
+    @property
+    def active(self) -> bool:
+        return self._detecteur is not None
+
+    def demarrer(self) -> None:
+        """
+        Mémorise l'état courant de la base et programme la sonde (sauf en
+        mode copie de travail en mémoire).
+        """
+        if self._db.copie_memoire is not None:
+            self.arreter()
+            return
+        if self._detecteur is not None:
+            self._detecteur.reinitialiser()
+            return
+        self._detecteur = DetecteurChangementsExternes(self._db)
+        self._programmer()
+
+    def arreter(self) -> None:
+        """Annule la sonde (à appeler depuis le thread Tk)."""
+        if self._id_after is not None:
+            try:
+                self._widget.after_cancel(self._id_after)
+            except Exception:
+                pass  # fenêtre déjà détruite
+            self._id_after = None
+        if self._detecteur is not None:
+            self._detecteur.fermer()
+            self._detecteur = None
+
+    def _programmer(self) -> None:
+        self._id_after = self._widget.after(self._intervalle_ms, self._verifier)
+
+    def _verifier(self) -> None:
+        self._id_after = None
+        if self._detecteur is None:
+            return
+        self._detecteur.verifier()
+        self._programmer()
@@ -0,0 +1,266 @@
+# =============================================================================
+# classes/surveillance_tk.py
+# Détection des blocages de la boucle principale Tk (« l'application a gelé »).
+#
+# Un battement after() est programmé à intervalle régulier dans la boucle
+# Tk ; un thread de surveillance vérifie qu'il est servi à temps. Si le
+# battement a plus de `seuil_ms` de retard, le thread capture la pile Python
+# du thread principal et la requête SQL en cours, puis consigne le blocage
+# (avec sa durée totale) dans un fichier JSONL de diagnostic.
+#
+# Classement des blocages observés (sans interface graphique) :
+#   python -m classes.surveillance_tk [diagnostics/blocages_ui.jsonl]
+#
+# Le thread de surveillance ne touche jamais à Tk (non thread-safe) : il ne
+# lit que l'horodatage du dernier battement.
+# =============================================================================
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from typing import Callable, Optional
+
+from core.config import BASE_DIR, DIAGNOSTICS_DIR, SURVEILLANCE_FICHIER, VAR_ENV_SURVEILLANCE
+
+
+# Un blocage plus long que ceci est consigné sans attendre sa fin
+# (l'application peut être tuée avant de reprendre la main)
+DUREE_BLOCAGE_LONG = 5.0
+
+# Cadres d'appel retenus pour regrouper les blocages de même origine
+PROFONDEUR_SIGNATURE = 2
+
+
+class SurveillanceBoucleTk:
+    """
+    Chien de garde de la boucle principale Tk.
+
+    Usage :
+        surveillance = SurveillanceBoucleTk(racine, seuil_ms=200,
+                                            fournir_sql=lambda: db.requete_en_cours)
+        surveillance.demarrer()
+    """
+
+    def __init__(
+        self,
+        widget,
+        seuil_ms: float = 200.0,
+        chemin: Optional[str] = None,
+        fournir_sql: Optional[Callable[[], Optional[str]]] = None,
+        intervalle_ms: Optional[int] = None,
+    ) -> None:
+        """
+        :param widget:        Widget Tk servant à programmer le battement (la racine)
+        :param seuil_ms:      Retard du battement au-delà duquel on parle de blocage
+        :param chemin:        Fichier JSONL des blocages
+                              (None = DIAGNOSTICS_DIR/blocages_ui.jsonl)
+        :param fournir_sql:   Rappel retournant la requête SQL en cours (ou None)
+        :param intervalle_ms: Période du battement (None = seuil / 4)
+        """
+        self._widget = widget
+        self.seuil = seuil_ms / 1000.0
+        self.chemin = chemin or os.path.join(DIAGNOSTICS_DIR, SURVEILLANCE_FICHIER)
+        self._fournir_sql = fournir_sql
+        self._intervalle_ms = intervalle_ms or max(10, int(seuil_ms // 4))
+        # Thread de la boucle Tk : celui qui crée la surveillance
+        self._id_thread_tk = threading.get_ident()
+        self._dernier_battement = time.monotonic()
+        self._id_after: Optional[str] = None
+        self._arret = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.nb_blocages = 0
+
+    @classmethod
+    def depuis_environnement(cls, widget, **options) -> Optional["SurveillanceBoucleTk"]:
+        """
+        Surveillance configurée par PROGPYTHONEXPL_SURVEILLANCE_MS, ou None
+        si la variable n'est pas définie (surveillance désactivée).
+        """
+        valeur = os.environ.get(VAR_ENV_SURVEILLANCE, "").strip()
+        if not valeur:
+            return None
+        try:
+            return cls(widget, seuil_ms=float(valeur), **options)
+        except ValueError:
+            return None
+
+    # ------------------------------------------------------------------
+    # Démarrage / arrêt
+    # ------------------------------------------------------------------
+
+    def demarrer(self) -> None:
+        """Programme le battement et lance le thread de surveillance."""
+        if self._thread is not None:
+            return
+        self._arret.clear()
+        self._battement()
+        self._thread = threading.Thread(
+            target=self._surveiller, name="surveillance-boucle-tk", daemon=True
+        )
+        self._thread.start()
+
+    def arreter(self) -> None:
+        """Arrête la surveillance (à appeler depuis le thread Tk)."""
+        self._arret.set()
+        if self._id_after is not None:
+            try:
+                self._widget.after_cancel(self._id_after)
+            except Exception:
+                pass  # fenêtre déjà détruite
+            self._id_after = None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Battement (thread Tk) et surveillance (thread dédié)
+    # ------------------------------------------------------------------
+
+    def _battement(self) -> None:
+        self._dernier_battement = time.monotonic()
+        self._id_after = self._widget.after(self._intervalle_ms, self._battement)
+
+    def _surveiller(self) -> None:
+        intervalle = self._intervalle_ms / 1000.0
+        periode = min(intervalle, self.seuil / 2)
+        blocage: Optional[dict] = None
+
+        while not self._arret.wait(periode):
+            dernier = self._dernier_battement
+            attendu = dernier + intervalle
+            retard = time.monotonic() - attendu
+
+            if blocage is not None:
+                if dernier > blocage["_attendu"]:
+                    # Le battement a repris : durée réelle du blocage
+                    blocage["duree_ms"] = round((dernier - blocage["_attendu"]) * 1000, 1)
+                    blocage["termine"] = True
+                    self._consigner(blocage)
+                    blocage = None
+                    continue
+                if blocage["sql"] is None:
+                    blocage["sql"] = self._sql_en_cours()
+                if not blocage["_consigne"] and retard >= DUREE_BLOCAGE_LONG:
+                    blocage["duree_ms"] = round(retard * 1000, 1)
+                    self._consigner(blocage)
+                    blocage["_consigne"] = True
+                continue
+
+            if retard >= self.seuil:
+                blocage = self._capturer(attendu)
+
+    def _capturer(self, attendu: float) -> dict:
+        """Capture la pile du thread Tk et la requête SQL en cours."""
+        self.nb_blocages += 1
+        cadre = sys._current_frames().get(self._id_thread_tk)
+        pile = traceback.extract_stack(cadre) if cadre is not None else []
+        return {
+            "id"        : f"{os.getpid()}-{self.nb_blocages}",
+            "debut"     : datetime.now().isoformat(timespec="milliseconds"),
+            "duree_ms"  : None,
+            "termine"   : False,
+            "sql"       : self._sql_en_cours(),
+            "signature" : signature_pile(pile),
+            "pile"      : [f"{c.filename}:{c.lineno} ({c.name}) {c.line or ''}".rstrip() for c in pile],
+            "_attendu"  : attendu,
+            "_consigne" : False,
+        }
+
+    def _sql_en_cours(self) -> Optional[str]:
+        if self._fournir_sql is None:
+            return None
+        try:
+            requete = self._fournir_sql()
+        except Exception:
+            return None
+        return " ".join(requete.split()) if requete else None
+
+    def _consigner(self, blocage: dict) -> None:
+        """Ajoute le blocage au fichier JSONL (clés privées exclues)."""
+        entree = {cle: valeur for cle, valeur in blocage.items() if not cle.startswith("_")}
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.chemin)), exist_ok=True)
+            with open(self.chemin, "a", encoding="utf-8") as fichier:
+                fichier.write(json.dumps(entree, ensure_ascii=False) + "\n")
+        except OSError:
+            pass  # le diagnostic ne doit jamais perturber l'application
+
+
+# ---------------------------------------------------------------------------
+# Analyse des blocages consignés
+# ---------------------------------------------------------------------------
+
+def signature_pile(pile: traceback.StackSummary) -> str:
+    """
+    Résume une pile par ses cadres les plus profonds situés dans le code
+    de l'application (hors bibliothèque standard et hors ce module), ou à
+    défaut par ses cadres les plus profonds.
+    """
+    racine = os.path.normcase(BASE_DIR)
+    ce_fichier = os.path.normcase(os.path.abspath(__file__))
+    maillons: list[str] = []
+    for cadre in reversed(pile):
+        fichier = os.path.normcase(os.path.abspath(cadre.filename))
+        if not fichier.startswith(racine) or fichier == ce_fichier:
+            continue
+        maillons.append(f"{os.path.relpath(cadre.filename, BASE_DIR)}:{cadre.lineno} ({cadre.name})")
+        if len(maillons) >= PROFONDEUR_SIGNATURE:
+            break
+    if not maillons:
+        maillons = [
+            f"{os.path.basename(cadre.filename)}:{cadre.lineno} ({cadre.name})"
+            for cadre in list(reversed(pile))[:PROFONDEUR_SIGNATURE]
+        ]
+    return " ← ".join(maillons) or "?"
+
+
+def classer_blocages(chemin: str) -> list[dict]:
+    """
+    Regroupe les blocages consignés par signature et les classe par durée
+    cumulée décroissante.
+
+    :param chemin: Fichier JSONL produit par SurveillanceBoucleTk
+    :return:       [{"signature", "nb", "duree_totale_ms", "duree_max_ms",
+                     "sql"}, ...]
+    """
+    # Dernière entrée de chaque blocage (un blocage long est consigné deux fois)
+    blocages: dict[str, dict] = {}
+    with open(chemin, encoding="utf-8") as fichier:
+        for ligne in fichier:
+            if ligne.strip():
+                entree = json.loads(ligne)
+                blocages[entree["id"]] = entree
+
+    groupes: dict[str, dict] = {}
+    for entree in blocages.values():
+        duree = entree.get("duree_ms") or 0.0
+        groupe = groupes.setdefault(entree["signature"], {
+            "signature"       : entree["signature"],
+            "nb"              : 0,
+            "duree_totale_ms" : 0.0,
+            "duree_max_ms"    : 0.0,
+            "sql"             : None,
+        })
+        groupe["nb"] += 1
+        groupe["duree_totale_ms"] += duree
+        groupe["duree_max_ms"] = max(groupe["duree_max_ms"], duree)
+        groupe["sql"] = groupe["sql"] or entree.get("sql")
+    return sorted(groupes.values(), key=lambda g: g["duree_totale_ms"], reverse=True)
+
+
+if __name__ == "__main__":
+    chemin_blocages = sys.argv[1] if len(sys.argv) > 1 else os.path.join(DIAGNOSTICS_DIR, SURVEILLANCE_FICHIER)
+    if not os.path.exists(chemin_blocages):
+        print(f"Aucun blocage consigné ({chemin_blocages} introuvable).")
+        sys.exit(0)
+    print(f"{'Total ms':>10}{'Max ms':>10}{'Nb':>6}  Origine")
+    for groupe in classer_blocages(chemin_blocages):
+        print(f"{groupe['duree_totale_ms']:>10.0f}{groupe['duree_max_ms']:>10.0f}{groupe['nb']:>6}  {groupe['signature']}")
+        if groupe["sql"]:
+            print(f"{'':>28}SQL : {groupe['sql'][:100]}")
@@ -0,0 +1,164 @@
+# =============================================================================
+# classes/verification_integrite.py
+# Vérification d'intégrité et récupération en arrière-plan, suivies par Tk.
+#
+# Après l'ouverture d'une base, la vérification est lancée avec un court
+# délai (la fenêtre s'affiche d'abord), dans le thread de ServiceIntegrite
+# (core/integrite.py), sur une connexion en lecture seule : l'application
+# reste utilisable pendant le contrôle. Le résultat est lu périodiquement
+# (after) et transmis à la fenêtre, qui l'affiche sans boîte modale. Le
+# thread de travail ne touche jamais à Tk.
+#
+# core.integrite n'est importé qu'à la première vérification (démarrage).
+# =============================================================================
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Optional
+
+from core.config import INTEGRITE_COMPLETE, INTEGRITE_DELAI_MS
+
+if TYPE_CHECKING:
+    from core.integrite import RapportIntegrite, RapportRecuperation, ServiceIntegrite
+
+
+# Période de lecture de l'état de l'opération en cours
+SUIVI_MS = 200
+
+
+class VerificationIntegrite:
+    """
+    Lance et suit les vérifications d'intégrité et les récupérations.
+
+    Usage :
+        integrite = VerificationIntegrite(racine,
+                                          a_la_verification=vue.on_integrite_verifiee,
+                                          a_la_recuperation=vue.on_recuperation_terminee)
+        integrite.verifier(db.chemin_base)           # à l'ouverture de la base
+        integrite.recuperer(source, destination)
+        integrite.annuler()                          # à la fermeture de la fenêtre
+    """
+
+    def __init__(
+        self,
+        widget,
+        a_la_verification: Optional[Callable[["RapportIntegrite"], None]] = None,
+        a_la_recuperation: Optional[Callable[["RapportRecuperation"], None]] = None,
+        en_cours: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        """
+        :param widget:            Widget Tk servant à programmer (la racine)
+        :param a_la_verification: Rappel recevant le RapportIntegrite
+        :param a_la_recuperation: Rappel recevant le RapportRecuperation
+        :param en_cours:          Rappel (lignes lues, total) pendant une récupération
+        """
+        self._widget = widget
+        self._a_la_verification = a_la_verification
+        self._a_la_recuperation = a_la_recuperation
+        self._en_cours = en_cours
+        self._service: Optional["ServiceIntegrite"] = None
+        self._id_after: Optional[str] = None
+        # Rappel de l'opération suivie (None = aucune)
+        self._rappel: Optional[Callable] = None
+        # Opération programmée ou en cours : "verification", "recuperation" ou None
+        self._operation: Optional[str] = None
+
+    @property
+    def en_cours(self) -> bool:
+        return self._operation is not None
+
+    @property
+    def recuperation_en_cours(self) -> bool:
+        return self._operation == "recuperation"
+
+    # ------------------------------------------------------------------
+    # Lancement
+    # ------------------------------------------------------------------
+
+    def verifier(self, chemin_base: str, complete: bool = INTEGRITE_COMPLETE,
+                 delai_ms: int = INTEGRITE_DELAI_MS) -> bool:
+        """
+        Programme la vérification de la base (une vérification en cours est
+        abandonnée).
+
+        :param chemin_base: Base à vérifier
+        :param complete:    integrity_check au lieu de quick_check
+        :param delai_ms:    Attente avant le lancement
+        :return:            False si une récupération est en cours
+        """
+        if self.recuperation_en_cours:
+            return False
+        self.annuler()
+        self._operation = "verification"
+        self._id_after = self._widget.after(
+            delai_ms, lambda: self._lancer_verification(chemin_base, complete)
+        )
+        return True
+
+    def recuperer(self, source: str, destination: str) -> bool:
+        """
+        Lance la récupération des lignes lisibles de `source`.
+
+        :return: False si une opération est déjà en cours
+        """
+        if self.en_cours:
+            return False
+        service = self._obtenir_service()
+        if not service.lancer_recuperation(source, destination):
+            return False
+        self._operation = "recuperation"
+        self._suivre_operation(self._a_la_recuperation)
+        return True
+
+    def annuler(self) -> None:
+        """Abandonne l'opération programmée ou en cours (sans rappel)."""
+        if self._id_after is not None:
+            try:
+                self._widget.after_cancel(self._id_after)
+            except Exception:
+                pass  # fenêtre déjà détruite
+            self._id_after = None
+        self._rappel = None
+        self._operation = None
+        if self._service is not None and self._service.en_cours:
+            self._service.annuler()
+
+    def _obtenir_service(self) -> "ServiceIntegrite":
+        if self._service is None:
+            from core.integrite import ServiceIntegrite
+            self._service = ServiceIntegrite()
+        return self._service
+
+    def _lancer_verification(self, chemin_base: str, complete: bool) -> None:
+        self._id_after = None
+        if self._obtenir_service().lancer_verification(chemin_base, complete):
+            self._suivre_operation(self._a_la_verification)
+        else:
+            # Le thread de la vérification abandonnée n'a pas encore rendu la
+            # main (arrêt demandé par annuler()) : nouvel essai un peu plus tard
+            self._id_after = self._widget.after(
+                SUIVI_MS, lambda: self._lancer_verification(chemin_base, complete)
+            )
+
+    # ------------------------------------------------------------------
+    # Suivi
+    # ------------------------------------------------------------------
+
+    def _suivre_operation(self, rappel: Optional[Callable]) -> None:
+        self._rappel = rappel or (lambda _rapport: None)
+        self._id_after = self._widget.after(SUIVI_MS, self._suivre)
+
+    def _suivre(self) -> None:
+        self._id_after = None
+        service = self._service
+        if service is None or self._rappel is None:
+            return
+        if service.en_cours:
+            if self._en_cours is not None and service.avancement[1]:
+                self._en_cours(*service.avancement)
+            self._id_after = self._widget.after(SUIVI_MS, self._suivre)
+            return
+        rappel, self._rappel = self._rappel, None
+        self._operation = None
+        if service.dernier_rapport is not None:
+            rappel(service.dernier_rapport)
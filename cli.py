@@ -0,0 +1,530 @@
+# =============================================================================
+# cli.py
+# Interface en ligne de commande (traitements par lots) sur la table Clients.
+#
+# Utilisation :
+#   python cli.py BASE.sqlite rechercher [--nom TEXTE] [--format table|csv|jsonl]
+#   python cli.py BASE.sqlite exporter FICHIER[.gz|.xz] [--nom TEXTE] [--format csv|jsonl]
+#   python cli.py BASE.sqlite importer FICHIER.csv [--rejets REJETS.csv] [--processus N]
+#   python cli.py BASE.sqlite modifier --champ ville=Lyon (--nom TEXTE | --ids 1,2,3 | --tous)
+#   python cli.py BASE.sqlite supprimer (--nom TEXTE | --ids 1,2,3)
+#   python cli.py BASE.sqlite stats
+#   python cli.py BASE.sqlite journal [--depuis SEQ] [--compacter [--jusqua SEQ] [--purger-suppressions]]
+#   python cli.py BASE.sqlite site [--numero N --plage DEBUT-FIN [--renumeroter | --copie-commune]]
+#   python cli.py BASE.sqlite synchroniser AUTRE.sqlite
+#   python cli.py BASE.sqlite sauvegarder [--dossier DOSSIER] [--conserver N] [--sans-compression]
+#   python cli.py BASE.sqlite maintenance [--taches statistiques,vide] [--vacuum] [--budget S] [--json]
+#   python cli.py BASE.sqlite verifier [--complet]
+#   python cli.py BASE.sqlite recuperer NOUVELLE.sqlite
+#
+# Ce script n'importe ni Tkinter ni les vues : il démarre rapidement et
+# fonctionne sur un serveur sans affichage. Les modules propres à une seule
+# commande (import, synchronisation, sauvegarde, maintenance, intégrité)
+# ne sont importés que par elle. Les lectures se font au fil de l'eau
+# (mémoire constante) et les écritures par lots transactionnels.
+# =============================================================================
+
+import argparse
+import csv
+import json
+import os
+import sys
+from dataclasses import asdict
+from typing import Optional
+
+# Ajouter le répertoire racine au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core import journal_changements
+from core.config import SAUVEGARDE_CONSERVER, SAUVEGARDE_PAGES_PAR_ETAPE
+from core.database import ErreurBase, GestionnaireBase, rapporter_par_exception
+from core.schema_clients import CHAMPS_CLIENTS, valider_enregistrement
+from models.client_export import COLONNES_EXPORT as COLONNES, COMPRESSIONS, FORMATS_EXPORT, exporter_clients
+from models.client_model import Client, ClientDAO
+
+
+# ---------------------------------------------------------------------------
+# Utilitaires
+# ---------------------------------------------------------------------------
+
+def _ligne_client(client: Client) -> dict:
+    """Représentation « fichier » d'un client (bon_client en 0/1)."""
+    ligne = asdict(client)
+    ligne["bon_client"] = int(client.bon_client)
+    return ligne
+
+
+# Enregistrement valide servant de base à la validation d'un seul champ
+_SAISIE_NEUTRE = {
+    "nom_client"        : "-",
+    "numero_telephone"  : "-",
+    "adresse"           : "-",
+    "code_postal"       : "00000",
+    "ville"             : "-",
+    "date_naissance"    : "2000-01-01",
+    "credit_disponible" : "0",
+    "bon_client"        : "0",
+    "couleur_cheveux"   : "brun",
+}
+
+
+def _liste_ids(texte: str) -> list[int]:
+    """Convertisseur argparse d'une liste d'IDCLIENT « 1,2,3 »."""
+    try:
+        ids = [int(morceau) for morceau in texte.split(",") if morceau.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"liste d'IDCLIENT invalide : {texte!r} (attendu : 1,2,3)")
+    if not ids:
+        raise argparse.ArgumentTypeError("liste d'IDCLIENT vide")
+    return ids
+
+
+# ---------------------------------------------------------------------------
+# Sous-commandes
+# ---------------------------------------------------------------------------
+
+def commande_rechercher(db: GestionnaireBase, args: argparse.Namespace) -> int:
+    """Affiche les clients correspondant au filtre, au fil de l'eau."""
+    clients = ClientDAO.iterer(db, args.nom)
+    sortie = sys.stdout
+
+    if args.format == "csv":
+        ecrivain = csv.DictWriter(sortie, fieldnames=COLONNES)
+        ecrivain.writeheader()
+        for client in clients:
+            ecrivain.writerow(_ligne_client(client))
+    elif args.format == "jsonl":
+        for client in clients:
+            sortie.write(json.dumps(_ligne_client(client), ensure_ascii=False) + "\n")
+    else:
+        for client in clients:
+            sortie.write(
+                f"{client.idclient:>8}  {client.nom_client:<30.30}  {client.ville:<20.20}  "
+                f"{client.date_naissance}  {client.credit_disponible:>12.2f}\n"
+            )
+    return 0
+
+
+def commande_exporter(db: GestionnaireBase, args: argparse.Namespace) -> int:
+    """Exporte les clients filtrés dans un fichier CSV ou JSONL (compressé ou non)."""
+    def afficher_progression(nb: int, total: Optional[int]) -> None:
+        if not args.silencieux:
+            print(f"\r{nb} / {total if total is not None else '?'}", end="", file=sys.stderr)
+
+    try:
+        nb = exporter_clients(
+            db, args.fichier,
+            format_export=args.format,
+            compression=args.compression,
+            nom=args.nom,
+            progression=afficher_progression,
+            intervalle_progression=50000,
+        )
+    except OSError as erreur:
+        print(f"\nErreur : export impossible : {erreur}", file=sys.stderr)
+        return 2
+    print(f"\n{nb} client(s) exporté(s) vers {args.fichier}", file=sys.stderr)
+    return 0
+
+
+def commande_importer(db: GestionnaireBase, args: argparse.Namespace) -> int:
+    """Importe un fichier CSV : lecture, validation parallèle, insertion par lots."""
+    from models.client_import import importer_csv
+    try:
+        rapport = importer_csv(
+            db, args.fichier,
+            chemin_rejets=args.rejets,
+            separateur=args.separateur,
+            taille_lot=args.lot,
+            taille_transaction=args.transaction,
+            nb_processus=args.processus,
+        )
+    except OSError as erreur:
+        print(f"Erreur : import impossible : {erreur}", file=sys.stderr)
+        return 2
+    debit = f"{rapport.debit:,.0f}".replace(",", " ")
+    print(
+        f"{rapport.nb_inserees} client(s) importé(s), {rapport.nb_rejetees} ligne(s) rejetée(s) "
+        f"en {rapport.duree:.1f} s ({debit} lignes/s)",
+        file=sys.stderr,
+    )
+    if rapport.nb_rejetees and args.rejets:
+        print(f"Lignes rejetées et motifs : {args.rejets}", file=sys.stderr)
+    return 0 if rapport.nb_rejetees == 0 else 2
+
+
+def commande_modifier(db: GestionnaireBase, args: argparse.Namespace) -> int:
+    """Affecte des valeurs à tous les clients filtrés."""
+    saisies: dict[str, str] = {}
+    for affectation in args.champ:
+        colonne, _, valeur = affectation.partition("=")
+        if colonne not in CHAMPS_CLIENTS:
+            print(f"Colonne inconnue : {colonne}", file=sys.stderr)
+            return 1
+        saisies[colonne] = valeur
+
+    # Validation des valeurs avec les règles du schéma commun
+    valeurs: dict = {}
+    erreurs: list[str] = []
+    for colonne, valeur in saisies.items():
+        normalisees, erreurs_champ = valider_enregistrement(
+            {**_SAISIE_NEUTRE, colonne: valeur}, tolerant=True
+        )
+        if erreurs_champ:
+            erreurs.extend(erreurs_champ)
+        else:
+            valeurs[colonne] = normalisees[colonne]
+    if erreurs:
+        for erreur in erreurs:
+            print(erreur, file=sys.stderr)
+        return 1
+
+    # --tous : filtre vide (nom_client LIKE '%%'), choisi explicitement
+    nb = ClientDAO.modifier_en_masse(db, valeurs, nom=args.nom or "", ids=args.ids)
+    print(f"{nb} client(s) modifié(s)", file=sys.stderr)
+    return 0
+
+
+def commande_supprimer(db: GestionnaireBase, args: argparse.Namespace) -> int:
+    """Supprime les clients filtrés (par IDs ou par nom)."""
+    if args.ids is None:
+        # Une seule requête DELETE : aucun IDCLIENT chargé en mémoire
+        nb = ClientDAO.supprimer_par_nom(db, args.nom)
+        if nb is None:
+            return 1
+    else:
+        if not ClientDAO.supprimer_plusieurs(db, args.ids):
+            return 1
+        nb = len(args.ids)
+    print(f"{nb} client(s) supprimé(s)", file=sys.stderr)
+    return 0
+
+
+def commande_stats(db: GestionnaireBase, args: argparse.Namespace) -> int:
+    """Affiche les statistiques globales de la table Clients."""
+    stats = ClientDAO.statistiques(db)
+    if args.json:
+        print(json.dumps(stats, ensure_ascii=False, indent=2))
+        return 0
+    print(f"Clients          : {stats['total']}")
+    if not stats["total"]:
+        return 0  # Base vide : ni crédits, ni dates, ni répartitions
+    print(f"Bons clients     : {stats['bons_clients']}")
+    print(f"Crédit total     : {stats['credit_total']:.2f}")
+    print(f"Crédit moyen     : {stats['credit_moyen']:.2f}")
+    print(f"Naissances       : {stats['naissance_min']} → {stats['naissance_max']}")
+    print("Par couleur      : " + ", ".join(f"{c}={n}" for c, n in stats["par_couleur"].items()))
+    print("Villes           : " + ", ".join(f"{v}={n}" for v, n in stats["top_villes"]))
+    return 0
+
+
+def commande_journal(db: GestionnaireBase, args: argparse.Namespace) -> int:
+    """Journal des changements : état, changements depuis une séquence, compactage."""
+    if args.compacter:
+        nb = journal_changements.compacter(db, args.jusqua, args.purger_suppressions)
+        print(f"{nb} entrée(s) retirée(s) du journal", file=sys.stderr)
+    if args.depuis is not None:
+        delta = journal_changements.changements_depuis(db, args.depuis)
+        print(json.dumps({
+            "depuis"   : delta.depuis,
+            "sequence" : delta.sequence,
+            "complet"  : delta.complet,
+            "inseres"  : delta.inseres,
+            "modifies" : delta.modifies,
+            "supprimes": delta.supprimes,
+        }, ensure_ascii=False))
+        return 0 if delta.complet else 2
+    stats = journal_changements.statistiques(db)
+    print(f"Entrées          : {stats['entrees']} ({stats['clients']} client(s))")
+    print(f"Séquences        : {stats['premiere']} → {stats['sequence']}")
+    print(f"Horizon          : {stats['horizon']}")
+    return 0
+
+
+def commande_site(db: GestionnaireBase, args: argparse.Namespace) -> int:
+    """Identité de synchronisation de la base : affichage ou configuration."""
+    from models.client_sync import configurer_site, lire_site
+    if args.numero is not None:
+        if args.plage is None:
+            print("Erreur : --plage DEBUT-FIN est requis avec --numero", file=sys.stderr)
+            return 1
+        try:
+            debut, _, fin = args.plage.partition("-")
+            configurer_site(db, args.numero, int(debut), int(fin),
+                            renumeroter=args.renumeroter, copie_commune=args.copie_commune)
+        except ValueError as erreur:
+            print(f"Erreur : {erreur}", file=sys.stderr)
+            return 1
+    site = lire_site(db)
+    if site is None:
+        print("Base non configurée comme site (--numero N --plage DEBUT-FIN)", file=sys.stderr)
+        return 1
+    print(f"Site             : {site.site}")
+    print(f"Plage d'IDCLIENT : {site.id_debut} → {site.id_fin}")
+    return 0
+
+
+def commande_synchroniser(db: GestionnaireBase, args: argparse.Namespace) -> int:
+    """Synchronisation bidirectionnelle avec une autre base (deltas seulement)."""
+    from models.client_sync import synchroniser
+    if not os.path.exists(args.autre):
+        print(f"Erreur : base introuvable : {args.autre}", file=sys.stderr)
+        return 1
+    autre = GestionnaireBase(rapporteur=rapporter_par_exception)
+    try:
+        autre.ouvrir(args.autre)
+        rapport = synchroniser(db, autre)
+    except ValueError as erreur:
+        print(f"Erreur : {erreur}", file=sys.stderr)
+        return 1
+    finally:
+        autre.fermer()
+
+    print(f"Site {rapport.site_a} → site {rapport.site_b} : "
+          f"{rapport.envoyes_a_b} envoyé(s), {rapport.appliques_b} appliqué(s)")
+    print(f"Site {rapport.site_b} → site {rapport.site_a} : "
+          f"{rapport.envoyes_b_a} envoyé(s), {rapport.appliques_a} appliqué(s)")
+    print(f"Versions rejetées (plus anciennes) : {rapport.rejetes}")
+    print(f"Durée            : {rapport.duree * 1000:.1f} ms")
+    if rapport.initial:
+        print("Premier échange entre ces sites : tous les clients ont été comparés")
+    elif not rapport.complet:
+        print("Journal purgé : échange complet des clients", file=sys.stderr)
+    return 0
+
+
+def commande_sauvegarder(db: GestionnaireBase, args: argparse.Namespace) -> int:
+    """Sauvegarde à chaud : instantané horodaté, rétention des plus récents."""
+    from core import sauvegarde
+    rapport = sauvegarde.sauvegarder(
+        db.chemin_base,
+        dossier         = args.dossier,
+        pages_par_etape = args.pages,
+        compresser      = not args.sans_compression,
+        conserver       = args.conserver,
+    )
+    if not rapport.reussie:
+        print(f"Erreur : {rapport.erreur}", file=sys.stderr)
+        return 1
+    print(f"Instantané       : {rapport.chemin}")
+    print(f"Taille           : {rapport.taille / 1_048_576:.1f} Mo ({rapport.pages} pages)")
+    print(f"Durée            : {rapport.duree:.2f} s ({rapport.reprises} reprise(s))")
+    for chemin in rapport.supprimes:
+        print(f"Supprimé (rétention) : {chemin}", file=sys.stderr)
+    return 0
+
+
+def commande_maintenance(db: GestionnaireBase, args: argparse.Namespace) -> int:
+    """Maintenance sur une connexion dédiée : rapport avant / après."""
+    from core import maintenance
+    if args.taches is None:
+        taches = maintenance.TACHES_DEFAUT
+    else:
+        taches = tuple(t.strip() for t in args.taches.split(",") if t.strip())
+    if args.vacuum:
+        taches += ("vacuum",)
+    try:
+        rapport = maintenance.maintenir(db.chemin_base, taches, budget=args.budget)
+    except ValueError as erreur:
+        print(f"Erreur : {erreur}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(asdict(rapport), ensure_ascii=False, indent=2))
+        return 0 if rapport.reussie else 1
+    if not rapport.reussie:
+        print(f"Erreur : {rapport.erreur}", file=sys.stderr)
+        return 1
+
+    for tache in rapport.taches:
+        etat = tache.detail if tache.terminee or tache.detail else "non terminée (budget épuisé)"
+        print(f"{tache.nom:<17}: {etat} ({tache.duree * 1000:.1f} ms)")
+    avant, apres = rapport.avant, rapport.apres
+    print(f"Taille           : {avant.taille / 1_048_576:.2f} → {apres.taille / 1_048_576:.2f} Mo")
+    print(f"Pages libres     : {avant.pages_libres} → {apres.pages_libres} (sur {apres.pages})")
+    print(f"auto_vacuum      : {avant.auto_vacuum} → {apres.auto_vacuum}")
+    print(f"Statistiques     : {avant.statistiques} → {apres.statistiques} ligne(s) sqlite_stat1")
+    print("Plans des requêtes témoins :")
+    for nom, plan in apres.plans.items():
+        precedent = avant.plans.get(nom)
+        print(f"  {nom:<15}: {plan}" + ("" if plan == precedent else f"  (avant : {precedent})"))
+    print(f"Durée            : {rapport.duree:.2f} s")
+    if rapport.interrompue:
+        print("Budget épuisé : maintenance incomplète", file=sys.stderr)
+    return 0
+
+
+def commande_verifier(db: GestionnaireBase, args: argparse.Namespace) -> int:
+    """Contrôle d'intégrité en lecture seule (code de sortie 2 si endommagée)."""
+    from core import integrite
+    rapport = integrite.verifier(args.base, complete=args.complet)
+    if not rapport.reussie:
+        print(f"Erreur : {rapport.erreur}", file=sys.stderr)
+        return 1
+    controle = "integrity_check" if rapport.complete else "quick_check"
+    if rapport.saine:
+        print(f"Intégrité        : OK ({controle}, {rapport.duree:.2f} s)")
+        return 0
+    print(f"Base endommagée  : {len(rapport.problemes)} problème(s) ({controle})")
+    for probleme in rapport.problemes:
+        print(f"  {probleme}")
+    print(f"Récupération     : python cli.py {args.base} recuperer NOUVELLE.sqlite", file=sys.stderr)
+    return 2
+
+
+def commande_recuperer(db: GestionnaireBase, args: argparse.Namespace) -> int:
+    """Copie les clients lisibles d'une base endommagée dans un nouveau fichier."""
+    from core import integrite
+
+    def afficher(lues: int, total: int) -> None:
+        print(f"\r{lues} / {total} client(s) lu(s)", end="", file=sys.stderr, flush=True)
+
+    rapport = integrite.recuperer(args.base, args.destination, progression=afficher)
+    if rapport.lues:
+        print(file=sys.stderr)
+    if not rapport.reussie:
+        print(f"Erreur : {rapport.erreur}", file=sys.stderr)
+        return 1
+    print(f"Base récupérée   : {rapport.destination}")
+    print(f"Clients          : {rapport.ecrites} écrit(s) sur {rapport.lues} lu(s), {rapport.rejetees} rejeté(s)")
+    for debut, fin in rapport.zones_illisibles:
+        print(f"Zone illisible   : IDCLIENT {debut} → {fin}")
+    print(f"Durée            : {rapport.duree:.2f} s")
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Analyse des arguments
+# ---------------------------------------------------------------------------
+
+def construire_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Traitements par lots sur la table Clients (sans interface graphique).",
+    )
+    parser.add_argument("base", help="Chemin du fichier .sqlite")
+    sous = parser.add_subparsers(dest="commande", required=True)
+
+    p = sous.add_parser("rechercher", aliases=["search"], help="Lister les clients")
+    p.add_argument("--nom", default="", help="Filtre partiel sur le nom")
+    p.add_argument("--format", choices=["table", "csv", "jsonl"], default="table")
+    p.set_defaults(fonction=commande_rechercher)
+
+    p = sous.add_parser("exporter", aliases=["export"], help="Exporter vers un fichier")
+    p.add_argument("fichier", help="Fichier de destination (.csv, .jsonl, + .gz / .xz)")
+    p.add_argument("--nom", default="", help="Filtre partiel sur le nom")
+    p.add_argument("--format", choices=FORMATS_EXPORT, help="Défaut : d'après l'extension")
+    p.add_argument("--compression", choices=COMPRESSIONS, help="Défaut : d'après l'extension")
+    p.add_argument("--silencieux", action="store_true", help="Ne pas afficher la progression")
+    p.set_defaults(fonction=commande_exporter)
+
+    p = sous.add_parser("importer", aliases=["import"], help="Importer un fichier CSV")
+    p.add_argument("fichier", help="Fichier CSV avec ligne d'entête (noms de colonnes), .gz/.xz acceptés")
+    p.add_argument("--rejets", help="Fichier CSV recevant les lignes rejetées et leurs motifs")
+    p.add_argument("--lot", type=int, default=5000, help="Lignes par lot de validation / d'insertion")
+    p.add_argument("--transaction", type=int, default=100_000, help="Lignes par transaction")
+    p.add_argument("--processus", type=int, help="Processus de validation (défaut : nb de CPU)")
+    p.add_argument("--separateur", default=",", help="Séparateur CSV")
+    # Seule commande qui peut créer la base (import dans un nouveau fichier)
+    p.set_defaults(fonction=commande_importer, cree_base=True)
+
+    p = sous.add_parser("modifier", aliases=["update"], help="Modification en masse")
+    p.add_argument("--champ", action="append", required=True, metavar="COLONNE=VALEUR")
+    groupe = p.add_mutually_exclusive_group(required=True)
+    groupe.add_argument("--nom", help="Filtre partiel sur le nom")
+    groupe.add_argument("--ids", type=_liste_ids, help="Liste d'IDCLIENT séparés par des virgules")
+    groupe.add_argument("--tous", action="store_true", help="Modifier tous les clients")
+    p.set_defaults(fonction=commande_modifier)
+
+    p = sous.add_parser("supprimer", aliases=["delete"], help="Suppression en masse")
+    groupe = p.add_mutually_exclusive_group(required=True)
+    groupe.add_argument("--nom", help="Filtre partiel sur le nom")
+    groupe.add_argument("--ids", type=_liste_ids, help="Liste d'IDCLIENT séparés par des virgules")
+    p.set_defaults(fonction=commande_supprimer)
+
+    p = sous.add_parser("stats", help="Statistiques de la table")
+    p.add_argument("--json", action="store_true", help="Sortie au format JSON")
+    p.set_defaults(fonction=commande_stats)
+
+    p = sous.add_parser("journal", aliases=["changelog"], help="Journal des changements")
+    p.add_argument("--depuis", type=int, metavar="SEQ",
+                   help="Afficher (JSON) les changements postérieurs à cette séquence")
+    p.add_argument("--compacter", action="store_true", help="Garder une seule entrée par client")
+    p.add_argument("--jusqua", type=int, metavar="SEQ", help="Dernière séquence compactée (défaut : toutes)")
+    p.add_argument("--purger-suppressions", action="store_true",
+                   help="Retirer aussi les suppressions (avance l'horizon)")
+    p.set_defaults(fonction=commande_journal)
+
+    p = sous.add_parser("site", help="Identité de synchronisation (numéro, plage d'IDCLIENT)")
+    p.add_argument("--numero", type=int, help="Numéro du site (unique dans le réseau)")
+    p.add_argument("--plage", metavar="DEBUT-FIN", help="IDCLIENT attribués par ce site")
+    groupe = p.add_mutually_exclusive_group()
+    groupe.add_argument("--renumeroter", action="store_true",
+                        help="Déplacer dans la plage les clients existants hors plage")
+    groupe.add_argument("--copie-commune", action="store_true",
+                        help="Base copiée d'un autre site : clients hors plage partagés")
+    p.set_defaults(fonction=commande_site)
+
+    p = sous.add_parser("synchroniser", aliases=["sync"], help="Synchroniser avec une autre base")
+    p.add_argument("autre", help="Chemin du fichier .sqlite de l'autre site")
+    p.set_defaults(fonction=commande_synchroniser)
+
+    p = sous.add_parser("sauvegarder", aliases=["backup"], help="Sauvegarde à chaud (instantané horodaté)")
+    p.add_argument("--dossier", help="Dossier des instantanés (défaut : sauvegardes/ à côté de la base)")
+    p.add_argument("--conserver", type=int, default=SAUVEGARDE_CONSERVER,
+                   help="Instantanés gardés, les plus récents (0 = tous)")
+    p.add_argument("--pages", type=int, default=SAUVEGARDE_PAGES_PAR_ETAPE, help="Pages copiées par étape")
+    p.add_argument("--sans-compression", action="store_true", help="Instantané .sqlite non compressé")
+    p.set_defaults(fonction=commande_sauvegarder)
+
+    p = sous.add_parser("maintenance", help="ANALYZE, PRAGMA optimize, pages libres, checkpoint WAL")
+    p.add_argument("--taches",
+                   help="Tâches séparées par des virgules (défaut : toutes les tâches planifiables)")
+    p.add_argument("--vacuum", action="store_true",
+                   help="VACUUM complet en fin de maintenance (bloquant, passe en auto_vacuum incrémental)")
+    p.add_argument("--budget", type=float, default=0, help="Durée maximale en secondes (0 = illimitée)")
+    p.add_argument("--json", action="store_true", help="Rapport au format JSON")
+    p.set_defaults(fonction=commande_maintenance)
+
+    # Ces deux commandes lisent le fichier tel quel, sans l'ouvrir par
+    # GestionnaireBase (qui l'initialise, donc y écrit)
+    p = sous.add_parser("verifier", aliases=["check"], help="Contrôle d'intégrité (lecture seule)")
+    p.add_argument("--complet", action="store_true", help="integrity_check (index compris) au lieu de quick_check")
+    p.set_defaults(fonction=commande_verifier, sans_connexion=True)
+
+    p = sous.add_parser("recuperer", aliases=["recover"], help="Copier les clients lisibles dans une nouvelle base")
+    p.add_argument("destination", help="Nouveau fichier .sqlite (ne doit pas exister)")
+    p.set_defaults(fonction=commande_recuperer, sans_connexion=True)
+
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = construire_parser().parse_args(argv)
+
+    # Un chemin mal saisi créerait une base vide, sur laquelle la commande
+    # « réussirait » sans rien trouver
+    if not getattr(args, "cree_base", False) and not os.path.isfile(args.base):
+        print(f"Erreur : base introuvable : {args.base}", file=sys.stderr)
+        return 1
+
+    # En traitement par lots, toute erreur SQLite interrompt la commande
+    db = GestionnaireBase(rapporteur=rapporter_par_exception)
+    try:
+        if not getattr(args, "sans_connexion", False):
+            db.ouvrir(args.base)
+        return args.fonction(db, args)
+    except ErreurBase as erreur:
+        print(f"Erreur : {erreur}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Sortie fermée par le lecteur (| head...) : le reste est ignoré,
+        # y compris le vidage de stdout à la sortie de l'interpréteur
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    finally:
+        db.fermer()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
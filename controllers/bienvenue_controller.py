@@ -11,8 +11,12 @@ import os
 from tkinter import filedialog, messagebox
 from typing import TYPE_CHECKING
 
+from classes.base_window import rapporter_par_messagebox
+from core import profilage
 from core.config import DB_EXTENSION, MODE_SELECTION_SIMPLE, MODE_SELECTION_MULTI
 from core.database import GestionnaireBase
+from core.evenements import SUPPRESSION, Changement
+from views import classe_vue
 
 if TYPE_CHECKING:
     # Import conditionnel pour éviter les imports circulaires
@@ -24,10 +28,12 @@ class BienvenueController:
     Contrôleur associé à FenetreBienvenue (Win_Bienvenue_Main).
 
     Responsabilités :
-      - Créer / ouvrir / fermer la base de données SQLite
+      - Créer / ouvrir / fermer / sauvegarder la base de données SQLite
+      - Vérifier son intégrité et en récupérer les lignes lisibles
       - Mettre à jour l'état des menus en conséquence
       - Ouvrir les fenêtres filles (Win_Client_CRUDS)
       - Recevoir et afficher les valeurs retournées par les sélections
+        (tenues à jour par le bus de changements de la base)
     """
 
     def __init__(self, vue: "FenetreBienvenue") -> None:
@@ -35,7 +41,11 @@ class BienvenueController:
         :param vue: Référence à la fenêtre principale (FenetreBienvenue)
         """
         self._vue = vue
-        self._db  = GestionnaireBase()
+        # La GUI choisit d'afficher les erreurs SQLite dans une messagebox
+        self._db  = GestionnaireBase(rapporteur=rapporter_par_messagebox)
+        # Dernier résultat de sélection affiché : (id, nom) ou liste de tuples
+        self._selection = None
+        self._db.bus.abonner(self._on_changement)
 
     # ------------------------------------------------------------------
     # Propriétés
@@ -90,6 +100,73 @@ class BienvenueController:
         self._db.fermer()
         self._vue.on_base_fermee()
 
+    def sauvegarder_base(self) -> None:
+        """
+        Sauvegarde à chaud de la base ouverte (copie en arrière-plan,
+        résultat affiché par la fenêtre principale).
+        """
+        if not self._db.est_connecte:
+            return
+        if not self._vue.lancer_sauvegarde():
+            messagebox.showinfo(
+                "Sauvegarde",
+                "Une sauvegarde est déjà en cours.",
+                parent=self._vue,
+            )
+
+    def verifier_integrite(self) -> None:
+        """
+        Vérification complète (integrity_check) de la base ouverte, en
+        arrière-plan ; le résultat s'affiche dans la fenêtre principale.
+        """
+        if not self._db.est_connecte:
+            return
+        if not self._vue.lancer_verification_integrite(complete=True):
+            messagebox.showinfo(
+                "Intégrité",
+                "Une récupération est en cours : vérification possible à sa fin.",
+                parent=self._vue,
+            )
+
+    def recuperer_donnees(self) -> None:
+        """
+        Copie les clients encore lisibles de la base ouverte dans un
+        nouveau fichier choisi par l'utilisateur (en arrière-plan).
+        """
+        if not self._db.est_connecte:
+            return
+        source = self._db.chemin_base
+        nom = os.path.splitext(os.path.basename(source))[0]
+        destination = filedialog.asksaveasfilename(
+            title="Récupérer les données lisibles",
+            initialdir=os.path.dirname(os.path.abspath(source)),
+            initialfile=f"{nom}_recupere{DB_EXTENSION}",
+            defaultextension=DB_EXTENSION,
+            filetypes=[("Base SQLite", f"*{DB_EXTENSION}"), ("Tous les fichiers", "*.*")],
+        )
+        if not destination:
+            return  # L'utilisateur a annulé
+        if os.path.abspath(destination) == os.path.abspath(source):
+            messagebox.showerror(
+                "Récupération",
+                "Choisissez un nouveau fichier : la base ouverte ne peut pas être remplacée.",
+                parent=self._vue,
+            )
+            return
+        try:
+            # Remplacement déjà confirmé dans le sélecteur de fichier
+            if os.path.exists(destination):
+                os.remove(destination)
+        except OSError as erreur:
+            messagebox.showerror("Récupération", f"Impossible de remplacer le fichier :\n{erreur}", parent=self._vue)
+            return
+        if not self._vue.lancer_recuperation(source, destination):
+            messagebox.showinfo(
+                "Récupération",
+                "Une vérification ou une récupération est déjà en cours.",
+                parent=self._vue,
+            )
+
     def quitter_programme(self) -> None:
         """Ferme la connexion SQLite et termine l'application."""
         if self._db.est_connecte:
@@ -102,20 +179,23 @@ class BienvenueController:
 
     def ouvrir_gestion_clients(self) -> None:
         """Ouvre Win_Client_CRUDS en mode standard (CRUD complet)."""
-        from views.Win_Client_CRUDS import FenetreCRUDS
-        FenetreCRUDS(self._vue, self._db, mode="STD")
+        FenetreCRUDS = classe_vue("cruds")
+        with profilage.span("ouvrir_cruds", mode="STD"):
+            FenetreCRUDS(self._vue, self._db, mode="STD")
 
     def ouvrir_selection_simple(self) -> None:
         """
         Ouvre Win_Client_CRUDS en mode sélection simple (S1).
         Le résultat (tuple id, nom) est affiché dans la console.
         """
-        from views.Win_Client_CRUDS import FenetreCRUDS
-        fenetre = FenetreCRUDS(self._vue, self._db, mode=MODE_SELECTION_SIMPLE)
+        FenetreCRUDS = classe_vue("cruds")
+        with profilage.span("ouvrir_cruds", mode=MODE_SELECTION_SIMPLE):
+            fenetre = FenetreCRUDS(self._vue, self._db, mode=MODE_SELECTION_SIMPLE)
         self._vue.wait_window(fenetre)
         resultat = fenetre.resultat_selection
         if resultat:
             print(f"[Sélection simple] Client sélectionné : {resultat}")
+            self._selection = resultat
             self._vue.afficher_resultat_selection(resultat)
 
     def ouvrir_selection_multiple(self) -> None:
@@ -123,10 +203,56 @@ class BienvenueController:
         Ouvre Win_Client_CRUDS en mode sélection multiple (SX).
         La liste de résultats est affichée dans la console.
         """
-        from views.Win_Client_CRUDS import FenetreCRUDS
-        fenetre = FenetreCRUDS(self._vue, self._db, mode=MODE_SELECTION_MULTI)
+        FenetreCRUDS = classe_vue("cruds")
+        with profilage.span("ouvrir_cruds", mode=MODE_SELECTION_MULTI):
+            fenetre = FenetreCRUDS(self._vue, self._db, mode=MODE_SELECTION_MULTI)
         self._vue.wait_window(fenetre)
         resultats = fenetre.resultat_selection
         if resultats:
             print(f"[Sélection multiple] Clients sélectionnés : {resultats}")
+            self._selection = resultats
             self._vue.afficher_resultat_selection(resultats)
+
+    def _on_changement(self, changement: Changement) -> None:
+        """
+        Met à jour le résultat de sélection affiché quand l'un de ses
+        clients est renommé ou supprimé (bus de changements).
+        """
+        if not self._selection:
+            return
+        multiple = isinstance(self._selection, list)
+        selection = self._selection if multiple else [self._selection]
+        touches = [idclient for idclient, _nom in selection if idclient in changement.ids]
+        if not touches:
+            return
+
+        if changement.operation == SUPPRESSION:
+            noms = {idclient: f"{nom} (supprimé)" for idclient, nom in selection if idclient in touches}
+        else:
+            # Chargé au démarrage d'une fenêtre fille : déjà importé ici
+            from models.client_model import ClientDAO
+            noms = {
+                idclient: client.nom_client
+                for idclient, client in ClientDAO.lire_plusieurs(self._db, touches).items()
+            }
+        selection = [(idclient, noms.get(idclient, nom)) for idclient, nom in selection]
+        self._selection = selection if multiple else selection[0]
+        self._vue.afficher_resultat_selection(self._selection)
+
+    # ------------------------------------------------------------------
+    # Profilage (raccourci caché Ctrl+Maj+P)
+    # ------------------------------------------------------------------
+
+    def basculer_profilage(self) -> None:
+        """Active ou désactive le mode profilage (traces + cProfile)."""
+        if profilage.traceur.actif:
+            fichiers = profilage.arreter_profilage()
+            self._vue.on_profilage_change(False)
+            messagebox.showinfo(
+                "Profilage arrêté",
+                "Fichiers enregistrés :\n" + "\n".join(fichiers),
+                parent=self._vue,
+            )
+        else:
+            profilage.demarrer_profilage(avec_cprofile=True)
+            self._vue.on_profilage_change(True)
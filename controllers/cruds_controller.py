@@ -7,17 +7,27 @@
 
 from __future__ import annotations
 
-from tkinter import messagebox
-from typing import TYPE_CHECKING
+import os
+from tkinter import filedialog, messagebox
+from typing import TYPE_CHECKING, Optional
 
+from classes.cache_affichage import CacheAffichageClients
+from classes.navigateur_clients import NavigateurClients
+from core import profilage
 from core.config import MODE_LECTURE, MODE_MODIFICATION
 from core.database import GestionnaireBase
+from models.client_export import ServiceExport, ouvrir_lecture
 from models.client_model import Client, ClientDAO
+from views import classe_vue
 
 if TYPE_CHECKING:
     from views.Win_Client_CRUDS import FenetreCRUDS
 
 
+# Période de lecture de l'avancement d'un export en cours
+SUIVI_MS = 200
+
+
 class CRUDSController:
     """
     Contrôleur associé à FenetreCRUDS (Win_Client_CRUDS).
@@ -27,6 +37,10 @@ class CRUDSController:
       - Ouvrir Win_Client_Fiche en mode création, modification ou lecture
       - Supprimer un ou plusieurs enregistrements
       - Retourner la sélection en mode S1/SX
+
+    Le tableau n'est pas rechargé après une écriture : la vue reçoit les
+    changements par le bus de la base (db.bus) et met à jour les seules
+    lignes concernées (voir lignes_a_jour).
     """
 
     def __init__(self, vue: "FenetreCRUDS", db: GestionnaireBase) -> None:
@@ -36,6 +50,10 @@ class CRUDSController:
         """
         self._vue = vue
         self._db  = db
+        self._cache_affichage = CacheAffichageClients()
+        # Export en arrière-plan (créé au premier export)
+        self._export: Optional[ServiceExport] = None
+        self._id_suivi_export: Optional[str] = None
 
     # ------------------------------------------------------------------
     # Recherche / chargement
@@ -50,22 +68,51 @@ class CRUDSController:
         """
         return ClientDAO.rechercher(self._db, nom)
 
+    def formater_lignes(self, clients: list[Client]) -> list[tuple]:
+        """
+        Retourne les tuples d'affichage des clients (formatage mis en cache).
+
+        :param clients: Clients à afficher dans le tableau
+        :return:        Liste de tuples, dans l'ordre des clients
+        """
+        return self._cache_affichage.formater_lot(clients)
+
+    def lignes_a_jour(self, ids: tuple[int, ...], terme: str = "") -> dict[int, tuple]:
+        """
+        Relit des clients ajoutés ou modifiés et reformate leurs lignes.
+
+        :param ids:   IDCLIENT annoncés par le bus de changements
+        :param terme: Filtre de recherche courant du tableau
+        :return:      {IDCLIENT: tuple d'affichage} des clients qui
+                      correspondent au filtre (les autres sont à retirer)
+        """
+        self._cache_affichage.invalider(ids)
+        clients = ClientDAO.rechercher_parmi(self._db, ids, terme)
+        return {
+            client.idclient: valeurs
+            for client, valeurs in zip(clients, self._cache_affichage.formater_lot(clients))
+        }
+
+    def oublier_lignes(self, ids: tuple[int, ...]) -> None:
+        """Retire du cache d'affichage des clients supprimés."""
+        self._cache_affichage.invalider(ids)
+
     # ------------------------------------------------------------------
     # Ouverture de la fiche client
     # ------------------------------------------------------------------
 
     def ajouter_client(self) -> None:
         """Ouvre Win_Client_Fiche en mode création (enregistrement vierge)."""
-        from views.Win_Client_Fiche import FenetreFiche
-        fenetre = FenetreFiche(
-            parent=self._vue,
-            db=self._db,
-            mode=MODE_MODIFICATION,
-            client=None,
-        )
-        self._vue.wait_window(fenetre)
-        if fenetre.modifications_effectuees:
-            self._vue.rafraichir_tableau()
+        FenetreFiche = classe_vue("fiche")
+        with profilage.span("ouvrir_fiche", mode=MODE_MODIFICATION):
+            fenetre = FenetreFiche.depuis_pool(
+                parent=self._vue,
+                db=self._db,
+                mode=MODE_MODIFICATION,
+                client=None,
+            )
+        # Le nouveau client est ajouté au tableau par le bus de changements
+        fenetre.attendre_fermeture()
 
     def modifier_client(self, client: Client) -> None:
         """
@@ -73,16 +120,18 @@ class CRUDSController:
 
         :param client: Objet Client à modifier
         """
-        from views.Win_Client_Fiche import FenetreFiche
-        fenetre = FenetreFiche(
-            parent=self._vue,
-            db=self._db,
-            mode=MODE_MODIFICATION,
-            client=client,
-        )
-        self._vue.wait_window(fenetre)
-        if fenetre.modifications_effectuees:
-            self._vue.rafraichir_tableau()
+        FenetreFiche = classe_vue("fiche")
+        with profilage.span("ouvrir_fiche", mode=MODE_MODIFICATION):
+            fenetre = FenetreFiche.depuis_pool(
+                parent=self._vue,
+                db=self._db,
+                mode=MODE_MODIFICATION,
+                client=client,
+                navigateur=self._creer_navigateur(client),
+            )
+        fenetre.attendre_fermeture()
+        # La fiche a pu passer à d'autres clients (Précédent / Suivant)
+        self._vue.selectionner_client((fenetre.client or client).idclient)
 
     def consulter_client(self, client: Client) -> None:
         """
@@ -90,13 +139,31 @@ class CRUDSController:
 
         :param client: Objet Client à consulter
         """
-        from views.Win_Client_Fiche import FenetreFiche
-        FenetreFiche(
-            parent=self._vue,
-            db=self._db,
-            mode=MODE_LECTURE,
-            client=client,
-        )
+        FenetreFiche = classe_vue("fiche")
+        with profilage.span("ouvrir_fiche", mode=MODE_LECTURE):
+            fenetre = FenetreFiche.depuis_pool(
+                parent=self._vue,
+                db=self._db,
+                mode=MODE_LECTURE,
+                client=client,
+                navigateur=self._creer_navigateur(client),
+            )
+        fenetre.attendre_fermeture()
+        self._vue.selectionner_client((fenetre.client or client).idclient)
+
+    def _creer_navigateur(self, client: Client) -> Optional[NavigateurClients]:
+        """
+        Navigateur Précédent / Suivant sur les clients du tableau, positionné
+        sur `client` (None si le client n'est pas affiché).
+        """
+        ids = self._vue.ids_affiches()
+        try:
+            position = ids.index(client.idclient)
+        except ValueError:
+            return None
+        navigateur = NavigateurClients(self._db, ids, position)
+        navigateur.memoriser(client)
+        return navigateur
 
     # ------------------------------------------------------------------
     # Suppression
@@ -135,10 +202,102 @@ class CRUDSController:
         if not confirmation:
             return False
 
-        succes = ClientDAO.supprimer_plusieurs(self._db, ids)
-        if succes:
-            self._vue.rafraichir_tableau()
-        return succes
+        with profilage.span("supprimer", nb=nb):
+            return ClientDAO.supprimer_plusieurs(self._db, ids)
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def exporter_clients(self, terme: str = "") -> None:
+        """
+        Exporte le résultat du filtre courant (ou toute la table si le filtre
+        est vide) vers un fichier CSV ou JSONL, compressé selon l'extension.
+
+        L'écriture tourne dans le thread de ServiceExport : la fenêtre reste
+        utilisable, l'avancement s'affiche dans sa barre de titre.
+
+        :param terme: Filtre de recherche appliqué au tableau
+        """
+        if self._export is not None and self._export.en_cours:
+            messagebox.showinfo(
+                "Export en cours",
+                "Un export est déjà en cours : attendez qu'il se termine.",
+                parent=self._vue,
+            )
+            return
+
+        self._vue.grab_release()
+        chemin = filedialog.asksaveasfilename(
+            title="Exporter les clients",
+            defaultextension=".csv",
+            filetypes=[
+                ("CSV", "*.csv"),
+                ("JSON Lines", "*.jsonl"),
+                ("CSV compressé (gzip)", "*.csv.gz"),
+                ("JSON Lines compressé (gzip)", "*.jsonl.gz"),
+                ("CSV compressé (xz)", "*.csv.xz"),
+                ("Tous les fichiers", "*.*"),
+            ],
+            parent=self._vue,
+        )
+        self._vue.grab_set()
+        if not chemin:
+            return  # L'utilisateur a annulé
+
+        source = ouvrir_lecture(self._db)
+        if source is None:
+            messagebox.showwarning(
+                "Export impossible",
+                "Une écriture est en cours dans la base : réessayez dans un instant.",
+                parent=self._vue,
+            )
+            return
+        if self._export is None:
+            self._export = ServiceExport()
+        if not self._export.lancer(source, chemin, terme):
+            source.close()
+            return
+        self._vue.afficher_progression_export(0, None)
+        self._id_suivi_export = self._vue.after(SUIVI_MS, self._suivre_export)
+
+    def _suivre_export(self) -> None:
+        self._id_suivi_export = None
+        service = self._export
+        if service is None:
+            return
+        if service.en_cours:
+            self._vue.afficher_progression_export(*service.avancement)
+            self._id_suivi_export = self._vue.after(SUIVI_MS, self._suivre_export)
+            return
+
+        self._vue.afficher_progression_export(None, None)
+        rapport = service.dernier_rapport
+        if rapport is None:
+            return
+        if not rapport.reussi:
+            messagebox.showerror(
+                "Erreur d'export",
+                f"Impossible d'écrire le fichier :\n{rapport.erreur}",
+                parent=self._vue,
+            )
+            return
+        messagebox.showinfo(
+            "Export terminé",
+            f"{rapport.nombre} client(s) exporté(s) vers :\n{os.path.basename(rapport.chemin)}",
+            parent=self._vue,
+        )
+
+    def fermer(self) -> None:
+        """Interrompt l'export en cours (fenêtre détruite)."""
+        if self._id_suivi_export is not None:
+            try:
+                self._vue.after_cancel(self._id_suivi_export)
+            except Exception:
+                pass  # fenêtre déjà détruite
+            self._id_suivi_export = None
+        if self._export is not None:
+            self._export.annuler()
 
     # ------------------------------------------------------------------
     # Sélection (modes S1 / SX)
@@ -150,4 +309,5 @@ class CRUDSController:
 
         :param clients: Liste des clients sélectionnés
         """
-        self._vue.retourner_selection(clients)
+        with profilage.span("retour_selection", nb=len(clients)):
+            self._vue.retourner_selection(clients)
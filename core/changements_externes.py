@@ -0,0 +1,116 @@
+# =============================================================================
+# core/changements_externes.py
+# Détection des écritures faites par un autre processus sur la même base.
+#
+# Deux programmes (ou deux postes sur un partage réseau) peuvent ouvrir le
+# même fichier .sqlite. Les écritures de l'autre connexion ne passent pas
+# par le bus de cette application : le détecteur les retrouve et les diffuse
+# sur db.bus (Changement.externe = True), pour que les fenêtres ouvertes
+# mettent à jour les seules lignes concernées.
+#
+# Coût d'une vérification sans changement : un PRAGMA data_version (aucune
+# lecture de table). Quand le compteur a bougé, seules les lignes du journal
+# Clients_changements postérieures à la dernière séquence vue sont lues
+# (core/journal_changements.py).
+#
+# Le détecteur ne programme rien lui-même : la GUI appelle verifier() à
+# intervalle régulier (classes/sonde_changements.py), un script peut
+# l'appeler quand il le souhaite. Ce module n'importe pas Tkinter.
+# =============================================================================
+
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+from core import journal_changements
+from core.database import GestionnaireBase
+from core.evenements import INSERTION, MODIFICATION, SUPPRESSION, Changement
+
+journal = logging.getLogger(__name__)
+
+
+class DetecteurChangementsExternes:
+    """
+    Diffuse sur db.bus les changements validés par les autres connexions.
+
+    Usage :
+        detecteur = DetecteurChangementsExternes(db)
+        ...
+        nb = detecteur.verifier()    # à appeler périodiquement
+        detecteur.fermer()
+    """
+
+    def __init__(self, db: GestionnaireBase) -> None:
+        """
+        :param db: Gestionnaire de base connecté (journal des changements créé)
+        """
+        self._db = db
+        self._chemin = ""
+        self._version: Optional[int] = None
+        # Dernière séquence du journal déjà connue de cette application
+        self._sequence = 0
+        self._desabonner = db.bus.abonner(self._on_changement_local)
+        self.reinitialiser()
+
+    def reinitialiser(self) -> None:
+        """Repart de l'état courant de la base (ouverture d'un autre fichier)."""
+        self._chemin = self._db.chemin_base
+        self._version = self._db.version_donnees()
+        self._sequence = journal_changements.sequence_courante(self._db)
+
+    def fermer(self) -> None:
+        """Se désabonne du bus de la base."""
+        self._desabonner()
+
+    # ------------------------------------------------------------------
+    # Vérification
+    # ------------------------------------------------------------------
+
+    def verifier(self) -> int:
+        """
+        Diffuse les changements validés ailleurs depuis l'appel précédent.
+
+        :return: Nombre de clients concernés (0 si rien n'a changé)
+        """
+        if not self._db.est_connecte:
+            return 0
+        if self._db.chemin_base != self._chemin:
+            self.reinitialiser()
+            return 0
+
+        version = self._db.version_donnees()
+        if version is None or version == self._version:
+            return 0
+        self._version = version
+
+        delta = journal_changements.changements_depuis(self._db, self._sequence)
+        self._sequence = delta.sequence
+        if not delta.complet:
+            # Suppressions purgées par un autre programme entre deux passages
+            journal.warning("Journal des changements purgé au-delà de la séquence %s", delta.depuis)
+
+        # Une seule opération par client (la dernière) : un IDCLIENT
+        # supprimé puis réattribué (MAX + 1) est annoncé comme ajouté
+        bus = self._db.bus
+        bus.publier(SUPPRESSION, delta.supprimes, externe=True)
+        bus.publier(INSERTION, delta.inseres, externe=True)
+        bus.publier(MODIFICATION, delta.modifies, externe=True)
+        return len(delta)
+
+    # ------------------------------------------------------------------
+    # Écritures de cette application
+    # ------------------------------------------------------------------
+
+    def _on_changement_local(self, changement: Changement) -> None:
+        """
+        Les écritures de cette connexion sont déjà diffusées : avancer la
+        séquence pour qu'elles ne soient pas annoncées une seconde fois.
+        Si une autre connexion a écrit entre-temps (data_version a bougé),
+        la séquence n'est pas avancée, pour ne pas perdre ses changements ;
+        les écritures locales mêlées seront alors simplement rediffusées.
+        """
+        if changement.externe or self._db.chemin_base != self._chemin:
+            return
+        if self._db.version_donnees() == self._version:
+            self._sequence = journal_changements.sequence_courante(self._db)
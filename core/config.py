@@ -46,6 +46,13 @@ POLICES = {
 # Taille des icônes boutons (pixels)
 ICONE_TAILLE = 60
 
+# Icônes des fenêtres filles, préchargées pendant les temps morts
+ICONES_PRECHARGEES = (
+    "Base_create.png", "Base_update.png", "Base_delete.png", "Base_read.png",
+    "Base_search.png", "Base_select.png", "Base_save.png",
+    "zone_exit.png",
+)
+
 # ---------------------------------------------------------------------------
 # Paramètres des fenêtres
 # ---------------------------------------------------------------------------
@@ -78,6 +85,52 @@ FENETRES = {
 # ---------------------------------------------------------------------------
 DB_EXTENSION = ".sqlite"
 
+# Période de vérification des écritures faites par un autre processus sur
+# la base ouverte (PRAGMA data_version, voir core/changements_externes.py)
+SONDE_CHANGEMENTS_MS = 1000
+
+# Sauvegardes à chaud de la base ouverte (API de sauvegarde SQLite, voir
+# core/sauvegarde.py) : instantanés horodatés dans un sous-dossier de celui
+# de la base
+SAUVEGARDE_SOUS_DOSSIER    = "sauvegardes"
+SAUVEGARDE_PAGES_PAR_ETAPE = 256     # pages copiées par étape
+SAUVEGARDE_PAUSE_S         = 0.01    # pause entre deux étapes (laisse écrire la GUI)
+SAUVEGARDE_COMPRESSER      = True    # instantanés .sqlite.gz
+SAUVEGARDE_CONSERVER       = 10      # instantanés gardés par base (0 = tous)
+SAUVEGARDE_INTERVALLE_MIN  = 60      # sauvegarde planifiée (0 = désactivée)
+
+# Maintenance de la base ouverte (ANALYZE, PRAGMA optimize, incremental
+# vacuum, checkpoint WAL, voir core/maintenance.py) : exécutée par tranches
+# courtes quand la boucle Tk est inactive
+MAINTENANCE_INTERVALLE_MIN   = 30      # maintenance planifiée (0 = désactivée)
+MAINTENANCE_TRANCHE_MS       = 20      # durée maximale d'une tranche (boucle Tk)
+MAINTENANCE_PAUSE_MS         = 100     # attente entre deux tranches
+MAINTENANCE_BUDGET_S         = 2.0     # durée totale d'une maintenance (0 = illimitée)
+MAINTENANCE_PAGES_PAR_ETAPE  = 128     # pages rendues par étape d'incremental_vacuum
+MAINTENANCE_LIMITE_ANALYSE   = 1000    # lignes lues par index (PRAGMA analysis_limit)
+
+# Vérification de l'intégrité de chaque base ouverte (core/integrite.py),
+# sur une connexion en lecture seule dans un thread de travail
+INTEGRITE_A_L_OUVERTURE  = True
+INTEGRITE_COMPLETE       = False   # integrity_check complet plutôt que quick_check
+INTEGRITE_DELAI_MS       = 500     # après l'ouverture : la fenêtre s'affiche d'abord
+INTEGRITE_PROBLEMES_MAX  = 100     # problèmes rapportés au plus
+RECUPERATION_LOT         = 1000    # lignes lues par requête (récupération)
+
+# Copie de travail en mémoire (core/copie_memoire.py), pour les bases sur un
+# partage réseau lent : la base est chargée en mémoire à l'ouverture, puis
+# réécrite dans le fichier périodiquement et à la fermeture. Activée si
+# cette variable d'environnement contient la période d'écriture (en s).
+#   PROGPYTHONEXPL_COPIE_MEMOIRE=60 python main.py
+VAR_ENV_COPIE_MEMOIRE = "PROGPYTHONEXPL_COPIE_MEMOIRE"
+
+# Journal des changements pas encore écrits dans le fichier : sur le disque
+# local (modifiable par variable d'environnement), jamais à côté de la base
+COPIE_MEMOIRE_DOSSIER = os.environ.get(
+    "PROGPYTHONEXPL_COPIES",
+    os.path.join(os.path.expanduser("~"), ".progpythonexpl", "copies_memoire"),
+)
+
 # ---------------------------------------------------------------------------
 # Modes d'ouverture des fenêtres
 # ---------------------------------------------------------------------------
@@ -91,3 +144,33 @@ MODE_MODIFICATION     = "M"    # Modification (fiche client)
 # Couleurs des cheveux (valeurs acceptées par la base)
 # ---------------------------------------------------------------------------
 COULEURS_CHEVEUX = ["brun", "blond", "roux", "chauve"]
+
+# ---------------------------------------------------------------------------
+# Diagnostics (instrumentation SQL, journaux de performance)
+# ---------------------------------------------------------------------------
+# Dossier des fichiers de diagnostic (modifiable par variable d'environnement)
+DIAGNOSTICS_DIR = os.environ.get(
+    "PROGPYTHONEXPL_DIAGNOSTICS", os.path.join(BASE_DIR, "diagnostics")
+)
+
+# Instrumentation des requêtes : activée si cette variable d'environnement
+# contient le seuil (en ms) au-delà duquel une requête est journalisée.
+#   PROGPYTHONEXPL_SQL_LENT_MS=50 python main.py
+VAR_ENV_SQL_LENT = "PROGPYTHONEXPL_SQL_LENT_MS"
+
+# Journal des requêtes lentes (rotation par taille)
+SQL_LENT_FICHIER     = "requetes_lentes.jsonl"
+SQL_LENT_TAILLE_MAX  = 5 * 1024 * 1024   # octets par fichier
+SQL_LENT_NB_ARCHIVES = 5
+
+# Surveillance de la boucle Tk : activée si cette variable contient le seuil
+# (en ms) au-delà duquel un retard du battement est consigné comme blocage.
+#   PROGPYTHONEXPL_SURVEILLANCE_MS=200 python main.py
+VAR_ENV_SURVEILLANCE = "PROGPYTHONEXPL_SURVEILLANCE_MS"
+SURVEILLANCE_FICHIER = "blocages_ui.jsonl"
+
+# Profilage des actions utilisateur (traces Chrome + cProfile en option) :
+#   PROGPYTHONEXPL_PROFILAGE=1         → traces des actions
+#   PROGPYTHONEXPL_PROFILAGE=cprofile  → traces + profil cProfile (.prof)
+# Bascule pendant l'exécution : Ctrl+Maj+P dans la fenêtre principale.
+VAR_ENV_PROFILAGE = "PROGPYTHONEXPL_PROFILAGE"
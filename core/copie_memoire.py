@@ -0,0 +1,440 @@
+# =============================================================================
+# core/copie_memoire.py
+# Copie de travail en mémoire d'une base (bases sur un partage réseau lent).
+#
+# À l'ouverture, le fichier est chargé dans une base « :memory: » par l'API
+# de sauvegarde SQLite (Connection.backup) : toutes les lectures et écritures
+# de l'application se font ensuite en mémoire, sans aller-retour réseau par
+# COMMIT. La copie est réécrite dans le fichier périodiquement
+# (classes/ecriture_copie_memoire.py) et à la fermeture :
+#   - un instantané de la base en mémoire est pris dans le thread de la
+#     connexion (copie mémoire → mémoire, quelques millisecondes) ;
+#   - un thread de travail le copie dans le fichier, en une transaction :
+#     une écriture interrompue laisse le fichier dans son état précédent.
+# Rien n'est écrit si rien n'a changé depuis l'écriture précédente.
+#
+# Sécurité en cas d'arrêt brutal : après chaque COMMIT, l'état des clients
+# modifiés (lu par le journal des changements) est ajouté à un journal local
+# (JSON Lines, fsync), sur le disque de la machine et non sur le partage.
+# Un segment du journal n'est supprimé qu'une fois son contenu écrit dans le
+# fichier ; ceux qui restent à l'ouverture suivante sont réappliqués.
+#
+# Si un autre programme a écrit dans le fichier depuis son chargement
+# (PRAGMA data_version), il n'est pas écrasé : les modifications restent
+# dans le journal local et sont réappliquées, client par client, à la
+# prochaine ouverture. Un client ajouté dont l'identifiant a été pris
+# entre-temps par l'autre programme reçoit un nouvel identifiant.
+#
+# Ce module n'importe pas Tkinter.
+# =============================================================================
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from core.config import COPIE_MEMOIRE_DOSSIER
+from core.evenements import INSERTION, MODIFICATION, SUPPRESSION
+
+journal = logging.getLogger(__name__)
+
+_SQL_SEQUENCE = (
+    "SELECT COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'Clients_changements'), 0);"
+)
+
+# État courant des clients modifiés depuis une séquence (NULL = supprimé),
+# et s'ils ont été ajoutés depuis
+_SQL_CHANGES = """
+    SELECT j.IDCLIENT AS id_journal, j.insere AS insere_journal, c.*
+    FROM (
+        SELECT IDCLIENT, MAX(operation = 'insert') AS insere
+        FROM Clients_changements WHERE sequence > ? GROUP BY IDCLIENT
+    ) AS j
+    LEFT JOIN Clients AS c ON c.IDCLIENT = j.IDCLIENT;
+"""
+
+
+@dataclass
+class RapportEcriture:
+    """Bilan d'une écriture de la copie de travail dans le fichier."""
+    chemin : str
+    pages  : int = 0               # pages écrites
+    duree  : float = 0.0           # secondes
+    conflit: bool = False          # fichier modifié par un autre programme
+    erreur : Optional[str] = None
+
+    @property
+    def reussie(self) -> bool:
+        return self.erreur is None
+
+
+def _pragma(connexion: sqlite3.Connection, nom: str) -> int:
+    return connexion.execute(f"PRAGMA {nom};").fetchone()[0]
+
+
+def nom_journal(chemin_base: str) -> str:
+    """
+    Préfixe des segments du journal d'une base : nom du fichier et empreinte
+    de son chemin absolu (deux bases homonymes ne se mélangent pas).
+    """
+    nom = os.path.splitext(os.path.basename(chemin_base))[0]
+    empreinte = hashlib.sha1(os.path.abspath(chemin_base).encode("utf-8")).hexdigest()[:12]
+    return f"{nom}_{empreinte}"
+
+
+class CopieMemoire:
+    """
+    Copie de travail en mémoire d'un fichier SQLite, tenue par GestionnaireBase.
+
+    Usage (voir GestionnaireBase.ouvrir / fermer) :
+        copie = CopieMemoire(chemin, intervalle_s=60)
+        fichier = copie.ouvrir_fichier()   # tables initialisées sur le fichier
+        memoire = copie.charger()          # connexion de l'application
+        copie.rejouer()                    # journal d'une session interrompue
+        copie.consigner()                  # après chaque COMMIT
+        copie.ecrire()                     # périodiquement (thread de travail)
+        copie.fermer()                     # dernière écriture, attendue
+
+    Toutes les méthodes s'appellent depuis le thread de la connexion en
+    mémoire. La connexion au fichier n'est utilisée que par un thread à la
+    fois : celui-ci au chargement, puis celui de l'écriture en cours.
+    """
+
+    def __init__(self, chemin: str, intervalle_s: float, dossier_journal: str = COPIE_MEMOIRE_DOSSIER) -> None:
+        """
+        :param chemin:          Fichier SQLite de la base
+        :param intervalle_s:    Période des écritures dans le fichier
+        :param dossier_journal: Dossier local des journaux de changements
+        """
+        self.chemin = chemin
+        self.intervalle_s = intervalle_s
+        self.dossier_journal = dossier_journal
+        self._prefixe = os.path.join(dossier_journal, nom_journal(chemin))
+        self._fichier: Optional[sqlite3.Connection] = None
+        self._memoire: Optional[sqlite3.Connection] = None
+        # data_version du fichier au chargement (autre programme = conflit)
+        self._version_fichier: Optional[int] = None
+        self._conflit = False
+        # Dernière séquence du journal des changements consignée localement
+        self._sequence_consignee = 0
+        # (séquence, total_changes) de la base en mémoire à la dernière écriture
+        self._etat_ecrit: Optional[tuple[int, int]] = None
+        # Segments du journal local : courant (ouvert) et en attente d'écriture
+        self._index = 1
+        self._segment = None
+        self._segments_en_attente: list[str] = []
+        self._thread: Optional[threading.Thread] = None
+        self.dernier_rapport: Optional[RapportEcriture] = None
+
+    # ------------------------------------------------------------------
+    # Propriétés
+    # ------------------------------------------------------------------
+
+    @property
+    def en_cours(self) -> bool:
+        """Une écriture dans le fichier est en cours (thread de travail)."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def modifiee(self) -> bool:
+        """La base en mémoire a changé depuis la dernière écriture."""
+        return self._memoire is not None and self._etat() != self._etat_ecrit
+
+    # ------------------------------------------------------------------
+    # Ouverture
+    # ------------------------------------------------------------------
+
+    def ouvrir_fichier(self) -> sqlite3.Connection:
+        """Connexion au fichier, partageable avec le thread d'écriture."""
+        self._fichier = sqlite3.connect(self.chemin, check_same_thread=False)
+        return self._fichier
+
+    def charger(self) -> sqlite3.Connection:
+        """
+        Charge le fichier dans une base en mémoire.
+
+        :return: Connexion à la base en mémoire (mêmes réglages que celle
+                 du fichier : lignes sqlite3.Row, clés étrangères)
+        """
+        memoire = sqlite3.connect(":memory:")
+        try:
+            self._fichier.backup(memoire)
+            memoire.row_factory = sqlite3.Row
+            memoire.execute("PRAGMA foreign_keys = ON;")
+        except sqlite3.Error:
+            memoire.close()
+            raise
+        self._memoire = memoire
+        self._version_fichier = _pragma(self._fichier, "data_version")
+        self._sequence_consignee = self._sequence()
+        self._etat_ecrit = self._etat()
+        self._segments_en_attente = self._segments_existants()
+        if self._segments_en_attente:
+            self._index = self._index_segment(self._segments_en_attente[-1]) + 1
+        return memoire
+
+    def rejouer(self) -> int:
+        """
+        Réapplique à la base en mémoire les segments du journal laissés par
+        une session interrompue (arrêt brutal, ou écriture refusée après un
+        conflit), en une transaction. Ils sont supprimés à la prochaine
+        écriture réussie. En cas d'échec, ils restent sur le disque et ne
+        sont plus supprimés par cette session.
+
+        :return: Nombre d'entrées réappliquées
+        """
+        segments, self._segments_en_attente = self._segments_en_attente, []
+        if not segments:
+            return 0
+        colonnes = {row[1] for row in self._memoire.execute("PRAGMA table_info(Clients);")}
+        renumerotes: dict[int, int] = {}
+        nb = 0
+        with self._memoire:
+            for segment in segments:
+                with open(segment, encoding="utf-8") as entree:
+                    for ligne in entree:
+                        try:
+                            changement = json.loads(ligne)
+                        except ValueError:
+                            break  # dernière ligne tronquée par l'arrêt brutal
+                        self._appliquer(changement, colonnes, renumerotes)
+                        nb += 1
+        journal.info("Copie de %s : %d changement(s) réappliqué(s) depuis le journal local", self.chemin, nb)
+        self._segments_en_attente = segments
+        # Déjà dans les segments en attente : ne pas les consigner à nouveau
+        self._sequence_consignee = self._sequence()
+        return nb
+
+    def _appliquer(self, changement: dict, colonnes: set[str], renumerotes: dict[int, int]) -> None:
+        """
+        Applique une entrée du journal. `renumerotes` associe l'identifiant
+        journalisé d'un client ajouté à celui qu'il a reçu ici, si le sien
+        était déjà pris par un autre client.
+        """
+        idclient = renumerotes.get(changement["id"], changement["id"])
+        operation, ligne = changement["operation"], changement.get("ligne")
+        if operation == SUPPRESSION:
+            self._memoire.execute("DELETE FROM Clients WHERE IDCLIENT = ?;", (idclient,))
+            return
+        noms = [nom for nom in ligne if nom in colonnes and nom != "IDCLIENT"]
+        liste = ", ".join(f'"{nom}"' for nom in noms)
+        marqueurs = ", ".join("?" for _nom in noms)
+        valeurs = tuple(ligne[nom] for nom in noms)
+        if operation == INSERTION and changement["id"] not in renumerotes:
+            existante = self._memoire.execute(
+                f"SELECT {liste} FROM Clients WHERE IDCLIENT = ?;", (idclient,)
+            ).fetchone()
+            # Même contenu : déjà écrit avant l'arrêt (rien à faire de plus)
+            if existante is not None and tuple(existante) != valeurs:
+                curseur = self._memoire.execute(
+                    f"INSERT INTO Clients ({liste}) VALUES ({marqueurs});", valeurs
+                )
+                renumerotes[changement["id"]] = curseur.lastrowid
+                return
+        affectations = ", ".join(f'"{nom}" = excluded."{nom}"' for nom in noms)
+        self._memoire.execute(
+            f"INSERT INTO Clients (IDCLIENT, {liste}) VALUES (?, {marqueurs}) "
+            f"ON CONFLICT(IDCLIENT) DO UPDATE SET {affectations};",
+            (idclient, *valeurs),
+        )
+
+    # ------------------------------------------------------------------
+    # Journal local
+    # ------------------------------------------------------------------
+
+    def consigner(self) -> int:
+        """
+        Ajoute au journal local l'état des clients modifiés depuis la
+        consignation précédente (à appeler après chaque COMMIT). Une
+        ligne par client : {"id": IDCLIENT, "operation": "insert", "update"
+        ou "delete", "ligne": colonnes ou null}.
+
+        :return: Nombre de clients consignés
+        """
+        memoire = self._memoire
+        if memoire is None or memoire.in_transaction:
+            return 0
+        sequence = self._sequence()
+        if sequence <= self._sequence_consignee:
+            return 0
+        lignes = memoire.execute(_SQL_CHANGES, (self._sequence_consignee,)).fetchall()
+        if self._segment is None:
+            os.makedirs(self.dossier_journal, exist_ok=True)
+            chemin = self._chemin_segment(self._index)
+            self._segment = open(chemin, "a", encoding="utf-8")
+            self._segments_en_attente.append(chemin)
+        self._segment.writelines(
+            json.dumps(
+                {
+                    "id"       : row["id_journal"],
+                    "operation": SUPPRESSION if row["IDCLIENT"] is None
+                                 else INSERTION if row["insere_journal"] else MODIFICATION,
+                    "ligne"    : None if row["IDCLIENT"] is None
+                                 else {nom: row[nom] for nom in row.keys() if not nom.endswith("_journal")},
+                },
+                ensure_ascii=False,
+            ) + "\n"
+            for row in lignes
+        )
+        self._segment.flush()
+        os.fsync(self._segment.fileno())
+        self._sequence_consignee = sequence
+        return len(lignes)
+
+    def _fermer_segment(self) -> list[str]:
+        """
+        Ferme le segment courant (les changements suivants iront dans un
+        nouveau) et retourne les segments qui attendent une écriture.
+        """
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+            self._index += 1
+        # Segments supprimés par une écriture réussie depuis le dernier appel
+        self._segments_en_attente = [s for s in self._segments_en_attente if os.path.exists(s)]
+        return list(self._segments_en_attente)
+
+    def _chemin_segment(self, index: int) -> str:
+        return f"{self._prefixe}.{index:06d}.jsonl"
+
+    def _segments_existants(self) -> list[str]:
+        return sorted(glob.glob(glob.escape(self._prefixe) + ".*.jsonl"), key=self._index_segment)
+
+    @staticmethod
+    def _index_segment(chemin: str) -> int:
+        return int(chemin.rsplit(".", 2)[-2])
+
+    # ------------------------------------------------------------------
+    # Écriture dans le fichier
+    # ------------------------------------------------------------------
+
+    def ecrire(self, attendre: bool = False) -> bool:
+        """
+        Écrit la copie de travail dans le fichier si elle a changé.
+
+        :param attendre: Écrire dans ce thread (après l'écriture en cours)
+                         au lieu d'un thread de travail
+        :return:         False si rien n'a changé, si une transaction est
+                         ouverte ou si une écriture est déjà en cours
+        """
+        if attendre:
+            self.attendre()
+        memoire = self._memoire
+        if memoire is None or memoire.in_transaction or self.en_cours:
+            return False
+        try:
+            self.consigner()
+        except OSError as erreur:
+            # Le journal ne sert qu'en cas d'arrêt brutal : l'écriture passe avant
+            journal.warning("Journal local de %s non tenu : %s", self.chemin, erreur)
+        etat = self._etat()
+        if etat == self._etat_ecrit:
+            return False
+        instantane = self.instantane()
+        segments = self._fermer_segment()
+        if attendre:
+            self._executer(instantane, segments, etat)
+        else:
+            self._thread = threading.Thread(
+                target=self._executer, args=(instantane, segments, etat),
+                name="ecriture-copie-memoire", daemon=True,
+            )
+            self._thread.start()
+        return True
+
+    def instantane(self) -> Optional[sqlite3.Connection]:
+        """
+        Copie mémoire → mémoire de la base de travail (quelques
+        millisecondes), utilisable par un thread de travail : écriture
+        dans le fichier, sauvegarde. À fermer par l'utilisateur.
+
+        :return: Connexion sur l'instantané, ou None si une transaction
+                 est ouverte (état non validé)
+        """
+        memoire = self._memoire
+        if memoire is None or memoire.in_transaction:
+            return None
+        instantane = sqlite3.connect(":memory:", check_same_thread=False)
+        memoire.backup(instantane)
+        return instantane
+
+    def attendre(self) -> None:
+        """Attend la fin de l'écriture en cours."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _executer(self, instantane: sqlite3.Connection, segments: list[str], etat: tuple[int, int]) -> None:
+        try:
+            self.dernier_rapport = self._ecrire_instantane(instantane, segments, etat)
+        except Exception as erreur:
+            # Le thread ne doit jamais mourir sans rapport (la GUI l'attend)
+            journal.exception("Écriture de la copie de %s en échec", self.chemin)
+            self.dernier_rapport = RapportEcriture(chemin=self.chemin, erreur=str(erreur))
+        finally:
+            instantane.close()
+
+    def _ecrire_instantane(self, instantane: sqlite3.Connection, segments: list[str],
+                           etat: tuple[int, int]) -> RapportEcriture:
+        debut = time.perf_counter()
+        rapport = RapportEcriture(chemin=self.chemin)
+        try:
+            if self._conflit or _pragma(self._fichier, "data_version") != self._version_fichier:
+                self._conflit = rapport.conflit = True
+                rapport.erreur = (
+                    "fichier modifié par un autre programme depuis son ouverture : il n'est pas "
+                    "écrasé, les modifications seront réappliquées à la prochaine ouverture"
+                )
+            else:
+                instantane.backup(self._fichier)
+                self._version_fichier = _pragma(self._fichier, "data_version")
+                self._etat_ecrit = etat
+                rapport.pages = _pragma(instantane, "page_count")
+                for segment in segments:
+                    try:
+                        os.remove(segment)
+                    except OSError as erreur:
+                        journal.warning("Segment %s non supprimé : %s", segment, erreur)
+        except sqlite3.Error as erreur:
+            rapport.erreur = str(erreur)
+            journal.warning("Écriture de la copie de %s en échec : %s", self.chemin, erreur)
+        rapport.duree = time.perf_counter() - debut
+        return rapport
+
+    # ------------------------------------------------------------------
+    # Fermeture
+    # ------------------------------------------------------------------
+
+    def fermer(self) -> Optional[RapportEcriture]:
+        """
+        Dernière écriture (attendue) et fermeture de la connexion au
+        fichier. La connexion en mémoire reste à fermer par l'appelant.
+
+        :return: Bilan de la dernière écriture, None si rien n'a changé
+        """
+        try:
+            return self.dernier_rapport if self.ecrire(attendre=True) else None
+        finally:
+            self._fermer_segment()
+            if self._fichier is not None:
+                self._fichier.close()
+            self._fichier = None
+            self._memoire = None
+
+    # ------------------------------------------------------------------
+    # Méthodes privées
+    # ------------------------------------------------------------------
+
+    def _sequence(self) -> int:
+        return self._memoire.execute(_SQL_SEQUENCE).fetchone()[0]
+
+    def _etat(self) -> tuple[int, int]:
+        return self._sequence(), self._memoire.total_changes
@@ -2,41 +2,150 @@
 # core/database.py
 # Gestionnaire de connexion à la base de données SQLite
 # Fournit une interface propre et thread-safe pour toute l'application.
+#
+# Ce module n'importe pas Tkinter : les erreurs sont transmises à un
+# « rapporteur » interchangeable (journalisation, exception, ou rappel
+# fourni par l'appelant — la GUI y branche ses boîtes de dialogue).
+# Les scripts et traitements par lots peuvent ainsi tourner sans affichage.
 # =============================================================================
 
+import logging
 import sqlite3
 import os
-from tkinter import messagebox
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional
+
+from core.config import VAR_ENV_COPIE_MEMOIRE, VAR_ENV_SQL_LENT
+from core.evenements import BusChangements, Changement, regrouper
+from core.schema_clients import generer_sql_create_table
+
+if TYPE_CHECKING:
+    from core.copie_memoire import CopieMemoire
+    from core.instrumentation import InstrumentationSQL
+
+
+journal = logging.getLogger(__name__)
 
 
 # ---------------------------------------------------------------------------
-# Requête de création de la table Clients
+# Rapport des erreurs
 # ---------------------------------------------------------------------------
-SQL_CREATE_TABLE_CLIENTS = """
-CREATE TABLE IF NOT EXISTS Clients (
-    IDCLIENT         INTEGER PRIMARY KEY,
-    nom_client       TEXT    NOT NULL,
-    numero_telephone TEXT    NOT NULL,
-    adresse          TEXT    NOT NULL,
-    code_postal      TEXT    NOT NULL
-        CHECK (
-            length(code_postal) = 5
-            AND code_postal GLOB '[0-9][0-9][0-9][0-9][0-9]'
-        ),
-    ville            TEXT    NOT NULL,
-    date_naissance   TEXT    NOT NULL
-        CHECK ( date(date_naissance) IS NOT NULL ),
-    credit_disponible REAL   NOT NULL
-        CHECK (credit_disponible >= 0),
-    bon_client       INTEGER NOT NULL DEFAULT 0
-        CHECK (bon_client IN (0, 1)),
-    couleur_cheveux  TEXT    NOT NULL
-        CHECK (
-            couleur_cheveux IN ('brun', 'blond', 'roux', 'chauve')
-        )
+
+# Signature d'un rapporteur : (titre, message, exception d'origine ou None)
+RapporteurErreurs = Callable[[str, str, Optional[Exception]], None]
+
+
+class ErreurBase(Exception):
+    """Erreur de base de données levée par rapporter_par_exception()."""
+
+    def __init__(self, titre: str, message: str) -> None:
+        super().__init__(f"{titre} : {message}")
+        self.titre   = titre
+        self.message = message
+
+
+def rapporter_par_log(titre: str, message: str, erreur: Optional[Exception] = None) -> None:
+    """Rapporteur par défaut : journalise l'erreur (module logging)."""
+    journal.error("%s : %s", titre, message.replace("\n", " "))
+
+
+def rapporter_par_exception(titre: str, message: str, erreur: Optional[Exception] = None) -> None:
+    """Rapporteur strict : lève ErreurBase (chaînée à l'erreur SQLite)."""
+    raise ErreurBase(titre, message) from erreur
+
+
+# ---------------------------------------------------------------------------
+# Requête de création de la table Clients (générée depuis le schéma)
+# ---------------------------------------------------------------------------
+SQL_CREATE_TABLE_CLIENTS = generer_sql_create_table("Clients")
+
+# ---------------------------------------------------------------------------
+# Journal des changements de la table Clients (tenu par des déclencheurs)
+# ---------------------------------------------------------------------------
+# Chaque écriture sur Clients, quelle que soit la connexion (ou le programme)
+# qui la fait, ajoute une ligne (sequence, IDCLIENT, operation). AUTOINCREMENT
+# garantit une séquence strictement croissante, jamais réutilisée.
+# Clients_changements_horizon (une seule ligne) retient la séquence jusqu'à
+# laquelle des suppressions ont été purgées (voir core/journal_changements.py).
+SQL_JOURNAL_CHANGEMENTS = """
+CREATE TABLE IF NOT EXISTS Clients_changements (
+    sequence  INTEGER PRIMARY KEY AUTOINCREMENT,
+    IDCLIENT  INTEGER NOT NULL,
+    operation TEXT    NOT NULL
+        CHECK (operation IN ('insert', 'update', 'delete'))
+);
+
+CREATE TABLE IF NOT EXISTS Clients_changements_horizon (
+    id       INTEGER PRIMARY KEY CHECK (id = 1),
+    sequence INTEGER NOT NULL
 );
+
+-- Base antérieure au journal : son historique manque. La séquence 1 est
+-- réservée comme horizon, pour qu'un consommateur partant de 0 relise tout.
+INSERT INTO Clients_changements_horizon (id, sequence)
+    SELECT 1, 1
+    WHERE EXISTS (SELECT 1 FROM Clients)
+      AND NOT EXISTS (SELECT 1 FROM Clients_changements_horizon)
+      AND NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'Clients_changements');
+INSERT INTO sqlite_sequence (name, seq)
+    SELECT 'Clients_changements', 1
+    WHERE EXISTS (SELECT 1 FROM Clients_changements_horizon WHERE sequence = 1)
+      AND NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'Clients_changements');
+
+CREATE TRIGGER IF NOT EXISTS Clients_journal_insert AFTER INSERT ON Clients
+BEGIN
+    INSERT INTO Clients_changements (IDCLIENT, operation) VALUES (NEW.IDCLIENT, 'insert');
+END;
+
+CREATE TRIGGER IF NOT EXISTS Clients_journal_update AFTER UPDATE ON Clients
+BEGIN
+    INSERT INTO Clients_changements (IDCLIENT, operation)
+        SELECT OLD.IDCLIENT, 'delete' WHERE OLD.IDCLIENT <> NEW.IDCLIENT;
+    INSERT INTO Clients_changements (IDCLIENT, operation)
+        SELECT NEW.IDCLIENT, CASE WHEN OLD.IDCLIENT <> NEW.IDCLIENT THEN 'insert' ELSE 'update' END;
+END;
+
+CREATE TRIGGER IF NOT EXISTS Clients_journal_delete AFTER DELETE ON Clients
+BEGIN
+    INSERT INTO Clients_changements (IDCLIENT, operation) VALUES (OLD.IDCLIENT, 'delete');
+END;
 """
 
+# ---------------------------------------------------------------------------
+# Identité de la base comme site de synchronisation (models/client_sync.py)
+# ---------------------------------------------------------------------------
+# Une seule ligne, absente tant que la base n'est pas un site. Les IDCLIENT
+# attribués par ClientDAO.creer restent alors dans [id_debut, id_fin] : deux
+# sites aux plages disjointes n'attribuent jamais le même identifiant.
+SQL_SITE_LOCAL = """
+CREATE TABLE IF NOT EXISTS Site_local (
+    id       INTEGER PRIMARY KEY CHECK (id = 1),
+    site     INTEGER NOT NULL CHECK (site > 0),
+    id_debut INTEGER NOT NULL CHECK (id_debut > 0),
+    id_fin   INTEGER NOT NULL CHECK (id_fin >= id_debut)
+);
+"""
+
+
+def _instrumentation_depuis_environnement() -> Optional["InstrumentationSQL"]:
+    """
+    InstrumentationSQL configurée par l'environnement, ou None. Le module
+    n'est importé que si la variable est définie (démarrage plus rapide).
+    """
+    if not os.environ.get(VAR_ENV_SQL_LENT, "").strip():
+        return None
+    from core.instrumentation import InstrumentationSQL
+    return InstrumentationSQL.depuis_environnement()
+
+
+def _copie_memoire_depuis_environnement() -> float:
+    """Période d'écriture de la copie de travail en mémoire (0 = désactivée)."""
+    try:
+        return max(float(os.environ.get(VAR_ENV_COPIE_MEMOIRE, "").strip() or 0), 0.0)
+    except ValueError:
+        return 0.0
+
 
 class GestionnaireBase:
     """
@@ -47,11 +156,60 @@ class GestionnaireBase:
         db.ouvrir("/chemin/vers/base.sqlite")
         conn = db.connexion          # objet sqlite3.Connection
         db.fermer()
+
+    Les erreurs sont transmises au rapporteur (par défaut : journalisation).
+    Tout appelable (titre, message, erreur) peut être fourni, par exemple
+    rapporter_par_exception pour un traitement par lots strict.
+
+    Les requêtes peuvent être mesurées par une InstrumentationSQL (durées,
+    appelants, journal des requêtes lentes) ; par défaut, elle est activée
+    uniquement si la variable d'environnement PROGPYTHONEXPL_SQL_LENT_MS
+    est définie.
+
+    Les écritures validées sont diffusées sur `bus` (voir core.evenements)
+    par la couche d'accès aux données, via publier_changement().
+
+    En mode copie de travail (voir core.copie_memoire), la base est chargée
+    en mémoire à l'ouverture : `connexion` est alors celle de la base en
+    mémoire, réécrite dans le fichier périodiquement et à la fermeture.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        rapporteur: Optional[RapporteurErreurs] = None,
+        instrumentation: Optional["InstrumentationSQL"] = None,
+        copie_memoire: Optional[float] = None,
+    ) -> None:
+        """
+        :param rapporteur:      Stratégie de rapport des erreurs
+                                (None = rapporter_par_log)
+        :param instrumentation: Mesure des requêtes
+                                (None = d'après l'environnement)
+        :param copie_memoire:   Période d'écriture (s) de la copie de travail
+                                en mémoire (0 = désactivée, None = d'après
+                                l'environnement)
+        """
         self._connexion: sqlite3.Connection | None = None
         self._chemin_base: str = ""
+        self.rapporteur: RapporteurErreurs = rapporteur or rapporter_par_log
+        self.instrumentation: Optional["InstrumentationSQL"] = (
+            instrumentation or _instrumentation_depuis_environnement()
+        )
+        # Requête en cours d'exécution (lue par les outils de diagnostic,
+        # depuis un autre thread : None entre deux requêtes)
+        self.requete_en_cours: Optional[str] = None
+        # Profondeur des blocs transaction() imbriqués (0 = commit immédiat)
+        self._profondeur_transaction: int = 0
+        self._echec_transaction: bool = False
+        # Notification des changements aux fenêtres abonnées
+        self.bus = BusChangements()
+        # Changements publiés dans la transaction en cours (diffusés au COMMIT)
+        self._changements_en_attente: list[Changement] = []
+        # Copie de travail en mémoire de la base ouverte (None = fichier direct)
+        self._periode_copie: float = (
+            copie_memoire if copie_memoire is not None else _copie_memoire_depuis_environnement()
+        )
+        self._copie: Optional["CopieMemoire"] = None
 
     # ------------------------------------------------------------------
     # Propriétés
@@ -72,6 +230,11 @@ class GestionnaireBase:
         """Retourne le chemin du fichier SQLite ouvert."""
         return self._chemin_base
 
+    @property
+    def copie_memoire(self) -> Optional["CopieMemoire"]:
+        """Copie de travail en mémoire de la base ouverte, ou None."""
+        return self._copie
+
     # ------------------------------------------------------------------
     # Méthodes publiques
     # ------------------------------------------------------------------
@@ -88,7 +251,12 @@ class GestionnaireBase:
             self.fermer()
 
         try:
-            self._connexion = sqlite3.connect(chemin)
+            if self._periode_copie > 0:
+                from core.copie_memoire import CopieMemoire
+                self._copie = CopieMemoire(chemin, self._periode_copie)
+                self._connexion = self._copie.ouvrir_fichier()
+            else:
+                self._connexion = sqlite3.connect(chemin)
             # Retourner les lignes sous forme de dict-like (sqlite3.Row)
             self._connexion.row_factory = sqlite3.Row
             # Activer les contraintes de clés étrangères
@@ -96,14 +264,22 @@ class GestionnaireBase:
             self._chemin_base = chemin
             # S'assurer que la table Clients existe
             self._initialiser_tables()
+            if self._copie is not None:
+                # Tables créées dans le fichier, puis tout le travail en mémoire
+                self._connexion = self._copie.charger()
+                self._rejouer_copie()
             return True
         except sqlite3.Error as erreur:
-            messagebox.showerror(
-                "Erreur de connexion",
-                f"Impossible d'ouvrir la base de données :\n{erreur}"
-            )
+            if self._copie is not None:
+                self._copie.fermer()
+                self._copie = None
             self._connexion = None
             self._chemin_base = ""
+            self._signaler(
+                "Erreur de connexion",
+                f"Impossible d'ouvrir la base de données :\n{erreur}",
+                erreur,
+            )
             return False
 
     def creer(self, chemin: str) -> bool:
@@ -121,15 +297,20 @@ class GestionnaireBase:
         if self._connexion is not None:
             try:
                 self._connexion.commit()
+                if self._copie is not None:
+                    self._fermer_copie()
                 self._connexion.close()
             except sqlite3.Error as erreur:
-                messagebox.showerror(
+                self._signaler(
                     "Erreur de fermeture",
-                    f"Erreur lors de la fermeture de la base :\n{erreur}"
+                    f"Erreur lors de la fermeture de la base :\n{erreur}",
+                    erreur,
                 )
             finally:
                 self._connexion = None
                 self._chemin_base = ""
+        if self.instrumentation is not None:
+            self.instrumentation.fermer()
 
     def executer(
         self,
@@ -144,29 +325,42 @@ class GestionnaireBase:
         :return: Cursor si succès, None sinon
         """
         if not self.est_connecte:
-            messagebox.showerror(
-                "Erreur",
-                "Aucune connexion à la base de données."
-            )
+            self._signaler("Erreur", "Aucune connexion à la base de données.")
             return None
 
+        instrumentation = self.instrumentation
         try:
+            debut = time.perf_counter() if instrumentation is not None else 0.0
+            self.requete_en_cours = requete
             curseur = self._connexion.cursor()
             curseur.execute(requete, parametres)
-            self._connexion.commit()
+            if not self._profondeur_transaction:
+                self._connexion.commit()
+                self._apres_commit()
+            if instrumentation is not None:
+                instrumentation.enregistrer(
+                    self._connexion, requete, parametres,
+                    time.perf_counter() - debut, curseur.rowcount,
+                )
             return curseur
         except sqlite3.IntegrityError as erreur:
-            messagebox.showerror(
+            self._marquer_echec()
+            self._signaler(
                 "Erreur d'intégrité",
-                f"Contrainte de base de données violée :\n{erreur}"
+                f"Contrainte de base de données violée :\n{erreur}",
+                erreur,
             )
             return None
         except sqlite3.Error as erreur:
-            messagebox.showerror(
+            self._marquer_echec()
+            self._signaler(
                 "Erreur SQL",
-                f"Erreur lors de l'exécution de la requête :\n{erreur}"
+                f"Erreur lors de l'exécution de la requête :\n{erreur}",
+                erreur,
             )
             return None
+        finally:
+            self.requete_en_cours = None
 
     def interroger(
         self,
@@ -181,34 +375,276 @@ class GestionnaireBase:
         :return: Liste de sqlite3.Row (accès par nom de colonne)
         """
         if not self.est_connecte:
-            messagebox.showerror(
-                "Erreur",
-                "Aucune connexion à la base de données."
-            )
+            self._signaler("Erreur", "Aucune connexion à la base de données.")
             return []
 
+        instrumentation = self.instrumentation
         try:
+            debut = time.perf_counter() if instrumentation is not None else 0.0
+            self.requete_en_cours = requete
             curseur = self._connexion.cursor()
             curseur.execute(requete, parametres)
-            return curseur.fetchall()
+            lignes = curseur.fetchall()
+            if instrumentation is not None:
+                instrumentation.enregistrer(
+                    self._connexion, requete, parametres,
+                    time.perf_counter() - debut, len(lignes),
+                )
+            return lignes
         except sqlite3.Error as erreur:
-            messagebox.showerror(
+            self._signaler(
                 "Erreur SQL",
-                f"Erreur lors de la requête :\n{erreur}"
+                f"Erreur lors de la requête :\n{erreur}",
+                erreur,
             )
             return []
+        finally:
+            self.requete_en_cours = None
+
+    def executer_plusieurs(
+        self,
+        requete: str,
+        sequence_parametres: Iterable[tuple],
+    ) -> sqlite3.Cursor | None:
+        """
+        Exécute une même requête pour chaque tuple de paramètres
+        (executemany), en une seule transaction.
+
+        :param requete:             Requête SQL avec marqueurs « ? »
+        :param sequence_parametres: Itérable de tuples de valeurs
+        :return: Cursor si succès (toutes les lignes), None sinon
+        """
+        if not self.est_connecte:
+            self._signaler("Erreur", "Aucune connexion à la base de données.")
+            return None
+
+        instrumentation = self.instrumentation
+        try:
+            debut = time.perf_counter() if instrumentation is not None else 0.0
+            self.requete_en_cours = requete
+            with self.transaction():
+                curseur = self._connexion.cursor()
+                curseur.executemany(requete, sequence_parametres)
+            if instrumentation is not None:
+                instrumentation.enregistrer(
+                    self._connexion, requete, None,
+                    time.perf_counter() - debut, curseur.rowcount,
+                )
+            return curseur
+        except sqlite3.IntegrityError as erreur:
+            self._signaler(
+                "Erreur d'intégrité",
+                f"Contrainte de base de données violée :\n{erreur}",
+                erreur,
+            )
+            return None
+        except sqlite3.Error as erreur:
+            self._signaler(
+                "Erreur SQL",
+                f"Erreur lors de l'exécution de la requête :\n{erreur}",
+                erreur,
+            )
+            return None
+        finally:
+            self.requete_en_cours = None
+
+    def iterer(
+        self,
+        requete: str,
+        parametres: tuple = (),
+        taille_lot: int = 1000,
+    ) -> Iterator[sqlite3.Row]:
+        """
+        Exécute une requête SELECT et parcourt les résultats au fil de l'eau
+        (fetchmany), sans charger toute la table en mémoire.
+
+        :param requete:    Requête SQL SELECT avec marqueurs « ? »
+        :param parametres: Tuple de valeurs à substituer
+        :param taille_lot: Nombre de lignes lues à chaque appel à fetchmany
+        :return: Itérateur de sqlite3.Row
+        """
+        if not self.est_connecte:
+            self._signaler("Erreur", "Aucune connexion à la base de données.")
+            return
+
+        instrumentation = self.instrumentation
+        try:
+            debut = time.perf_counter() if instrumentation is not None else 0.0
+            self.requete_en_cours = requete
+            curseur = self._connexion.cursor()
+            curseur.execute(requete, parametres)
+            nb_lignes = 0
+            while True:
+                self.requete_en_cours = requete
+                lot = curseur.fetchmany(taille_lot)
+                # Entre deux lots, le temps passé est celui du consommateur
+                self.requete_en_cours = None
+                if not lot:
+                    break
+                nb_lignes += len(lot)
+                yield from lot
+            if instrumentation is not None:
+                # Durée du parcours complet (temps du consommateur inclus)
+                instrumentation.enregistrer(
+                    self._connexion, requete, parametres,
+                    time.perf_counter() - debut, nb_lignes,
+                )
+        except sqlite3.Error as erreur:
+            self.requete_en_cours = None
+            self._signaler(
+                "Erreur SQL",
+                f"Erreur lors de la requête :\n{erreur}",
+                erreur,
+            )
+
+    def version_donnees(self) -> Optional[int]:
+        """
+        Valeur de PRAGMA data_version : elle change quand une AUTRE
+        connexion (autre processus) a validé des écritures dans le fichier,
+        jamais pour les écritures de cette connexion. Lecture très peu
+        coûteuse, sans accès à la table.
+
+        :return: Compteur courant, ou None si non connecté
+        """
+        if self._connexion is None:
+            return None
+        try:
+            return self._connexion.execute("PRAGMA data_version;").fetchone()[0]
+        except sqlite3.Error:
+            return None
+
+    @contextmanager
+    def transaction(self) -> Iterator["GestionnaireBase"]:
+        """
+        Regroupe plusieurs écritures dans une seule transaction.
+
+        Dans le bloc, executer() ne valide plus chaque requête :
+        le COMMIT a lieu une seule fois à la sortie du bloc le plus
+        externe. Si une exception s'échappe du bloc, ou si une écriture
+        du bloc a échoué, toute la transaction est annulée (ROLLBACK).
+
+        Usage :
+            with db.transaction():
+                db.executer(...)
+                db.executer(...)
+        """
+        self._profondeur_transaction += 1
+        try:
+            yield self
+        except BaseException:
+            self._echec_transaction = True
+            raise
+        finally:
+            self._profondeur_transaction -= 1
+            if not self._profondeur_transaction:
+                valide = self._terminer_transaction()
+                en_attente, self._changements_en_attente = self._changements_en_attente, []
+                if valide:
+                    for changement in regrouper(en_attente):
+                        self.bus.publier(changement.operation, changement.ids)
+
+    def publier_changement(self, operation: str, ids: Iterable[int]) -> None:
+        """
+        Signale une écriture réussie sur la table Clients aux abonnés de
+        `bus`. Dans une transaction, la diffusion attend le COMMIT (et
+        n'a pas lieu en cas de ROLLBACK).
+
+        :param operation: "insert", "update" ou "delete" (core.evenements)
+        :param ids:       IDCLIENT concernés
+        """
+        if self._profondeur_transaction:
+            self._changements_en_attente.append(Changement(operation, tuple(ids)))
+        else:
+            self.bus.publier(operation, ids)
 
     # ------------------------------------------------------------------
     # Méthodes privées
     # ------------------------------------------------------------------
 
+    def _signaler(self, titre: str, message: str, erreur: Optional[Exception] = None) -> None:
+        """Transmet une erreur au rapporteur configuré."""
+        self.rapporteur(titre, message, erreur)
+
+    def _marquer_echec(self) -> None:
+        """Une écriture a échoué : la transaction en cours sera annulée."""
+        if self._profondeur_transaction:
+            self._echec_transaction = True
+
+    def _terminer_transaction(self) -> bool:
+        """
+        COMMIT (ou ROLLBACK après un échec) de la transaction externe.
+
+        :return: True si la transaction a été validée
+        """
+        echec, self._echec_transaction = self._echec_transaction, False
+        if self._connexion is None:
+            return False
+        try:
+            if echec:
+                self._connexion.rollback()
+                return False
+            self._connexion.commit()
+            self._apres_commit()
+            return True
+        except sqlite3.Error as erreur:
+            self._signaler(
+                "Erreur de transaction",
+                f"Impossible de terminer la transaction :\n{erreur}",
+                erreur,
+            )
+            return False
+
+    def _apres_commit(self) -> None:
+        """COMMIT fait : consigne les changements de la copie de travail."""
+        if self._copie is None:
+            return
+        try:
+            self._copie.consigner()
+        except (sqlite3.Error, OSError) as erreur:
+            self._signaler(
+                "Erreur de journal",
+                f"Impossible de consigner les changements dans le journal local "
+                f"({self._copie.dossier_journal}) :\n{erreur}",
+                erreur,
+            )
+
+    def _rejouer_copie(self) -> None:
+        """Réapplique le journal local d'une session interrompue."""
+        try:
+            self._copie.rejouer()
+        except (sqlite3.Error, OSError, ValueError, KeyError) as erreur:
+            self._signaler(
+                "Erreur de reprise",
+                f"Les modifications d'une session interrompue n'ont pas pu être "
+                f"réappliquées ; elles restent dans {self._copie.dossier_journal} :\n{erreur}",
+                erreur,
+            )
+
+    def _fermer_copie(self) -> None:
+        """Dernière écriture de la copie de travail dans le fichier."""
+        copie, self._copie = self._copie, None
+        rapport = copie.fermer()
+        if rapport is not None and not rapport.reussie:
+            self._signaler(
+                "Erreur d'écriture",
+                f"La copie de travail n'a pas été écrite dans {copie.chemin} :\n{rapport.erreur}\n"
+                f"Les modifications sont conservées dans {copie.dossier_journal}.",
+            )
+
     def _initialiser_tables(self) -> None:
-        """Crée la table Clients si elle n'existe pas encore."""
+        """Crée la table Clients, son journal des changements et Site_local si besoin."""
         try:
-            self._connexion.executescript(SQL_CREATE_TABLE_CLIENTS)
+            # Sans effet sur une base existante : seul un fichier encore vide
+            # passe en auto_vacuum incrémental (pages libres rendues par
+            # core/maintenance.py, sans VACUUM complet)
+            self._connexion.executescript(
+                "PRAGMA auto_vacuum = INCREMENTAL;"
+                + SQL_CREATE_TABLE_CLIENTS + SQL_JOURNAL_CHANGEMENTS + SQL_SITE_LOCAL
+            )
             self._connexion.commit()
         except sqlite3.Error as erreur:
-            messagebox.showerror(
+            self._signaler(
                 "Erreur d'initialisation",
-                f"Impossible de créer la table Clients :\n{erreur}"
+                f"Impossible de créer la table Clients :\n{erreur}",
+                erreur,
             )
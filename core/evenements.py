@@ -0,0 +1,124 @@
+# =============================================================================
+# core/evenements.py
+# Bus de notification des changements de la table Clients.
+#
+# La couche d'accès aux données (ClientDAO) publie un Changement après chaque
+# insertion, modification ou suppression réussie, avec les IDCLIENT touchés.
+# Toute fenêtre peut s'abonner au bus de la base (db.bus) et mettre à jour
+# uniquement les lignes concernées, au lieu de relancer une recherche
+# complète.
+#
+# Dans un bloc db.transaction(), les changements sont retenus jusqu'au
+# COMMIT, puis diffusés ; ils sont abandonnés en cas de ROLLBACK.
+#
+# Les écritures faites par un autre processus sur le même fichier sont
+# diffusées sur le même bus (externe=True) par core.changements_externes.
+#
+# Ce module n'importe pas Tkinter.
+# =============================================================================
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+journal = logging.getLogger(__name__)
+
+# Opérations publiées sur le bus
+INSERTION    = "insert"
+MODIFICATION = "update"
+SUPPRESSION  = "delete"
+OPERATIONS   = (INSERTION, MODIFICATION, SUPPRESSION)
+
+
+@dataclass(frozen=True)
+class Changement:
+    """Changement validé sur la table Clients."""
+    operation: str              # INSERTION, MODIFICATION ou SUPPRESSION
+    ids      : tuple[int, ...]  # IDCLIENT concernés
+    externe  : bool = False     # écrit par une autre connexion (autre processus)
+
+
+# Signature d'un abonné : reçoit chaque Changement diffusé
+Abonne = Callable[[Changement], None]
+
+
+class BusChangements:
+    """
+    Diffusion des changements de la base à des abonnés (publication /
+    abonnement). Les abonnés sont appelés dans l'ordre d'abonnement, dans
+    le thread qui publie ; une erreur chez un abonné est journalisée et
+    n'empêche pas les suivants d'être prévenus.
+
+    Usage :
+        desabonner = db.bus.abonner(lambda changement: ...)
+        ...
+        desabonner()
+    """
+
+    def __init__(self) -> None:
+        self._abonnes: list[Abonne] = []
+
+    def abonner(self, abonne: Abonne) -> Callable[[], None]:
+        """
+        Inscrit un abonné.
+
+        :param abonne: Appelable recevant chaque Changement
+        :return:       Fonction sans argument qui désinscrit l'abonné
+        """
+        self._abonnes.append(abonne)
+        return lambda: self.desabonner(abonne)
+
+    def desabonner(self, abonne: Abonne) -> None:
+        """Désinscrit un abonné (sans effet s'il ne l'est pas)."""
+        try:
+            self._abonnes.remove(abonne)
+        except ValueError:
+            pass
+
+    @property
+    def nb_abonnes(self) -> int:
+        return len(self._abonnes)
+
+    def publier(self, operation: str, ids: Iterable[int], externe: bool = False) -> None:
+        """
+        Diffuse un changement à tous les abonnés.
+
+        :param operation: INSERTION, MODIFICATION ou SUPPRESSION
+        :param ids:       IDCLIENT concernés (rien n'est diffusé si vide)
+        :param externe:   Changement écrit par une autre connexion
+        :raises ValueError: si l'opération est inconnue
+        """
+        if operation not in OPERATIONS:
+            raise ValueError(f"Opération inconnue : {operation}")
+        changement = Changement(operation, tuple(ids), externe)
+        if not changement.ids:
+            return
+        # Copie : un abonné peut se désinscrire pendant la diffusion
+        for abonne in list(self._abonnes):
+            try:
+                abonne(changement)
+            except Exception:
+                journal.exception("Abonné %r en échec sur %s", abonne, changement.operation)
+
+
+def regrouper(changements: Iterable[Changement]) -> list[Changement]:
+    """
+    Fusionne les changements consécutifs de même opération (un seul appel
+    par abonné pour une suppression par lots, par exemple).
+
+    :param changements: Changements dans l'ordre de publication
+    :return:            Changements regroupés, ordre conservé
+    """
+    regroupes: list[Changement] = []
+    for changement in changements:
+        precedent = regroupes[-1] if regroupes else None
+        if (precedent is not None and precedent.operation == changement.operation
+                and precedent.externe == changement.externe):
+            regroupes[-1] = Changement(
+                precedent.operation, precedent.ids + changement.ids, precedent.externe
+            )
+        else:
+            regroupes.append(changement)
+    return regroupes
@@ -0,0 +1,268 @@
+# =============================================================================
+# core/instrumentation.py
+# Instrumentation des requêtes SQL de GestionnaireBase.
+#
+# Pour chaque requête exécutée : texte, nombre de paramètres, durée, nombre
+# de lignes et appelant (premier cadre hors de la couche d'accès aux données).
+# Les mesures sont agrégées par requête et par appelant ; les requêtes plus
+# lentes que le seuil sont écrites dans un journal JSONL à rotation, avec
+# leur plan d'exécution (EXPLAIN QUERY PLAN), capturé une fois par requête.
+#
+# Désactivée, l'instrumentation ne coûte qu'un test « is None » par requête
+# dans GestionnaireBase. Activation sans modifier le code :
+#   PROGPYTHONEXPL_SQL_LENT_MS=50 python main.py
+# Ce module n'importe pas Tkinter.
+# =============================================================================
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+from core.config import (
+    DIAGNOSTICS_DIR,
+    SQL_LENT_FICHIER,
+    SQL_LENT_NB_ARCHIVES,
+    SQL_LENT_TAILLE_MAX,
+    VAR_ENV_SQL_LENT,
+)
+
+if TYPE_CHECKING:
+    from logging.handlers import RotatingFileHandler
+
+
+journal = logging.getLogger(__name__)
+
+# Fichiers ignorés pour déterminer l'appelant d'une requête
+_DOSSIER_CORE = os.path.dirname(os.path.abspath(__file__))
+_FICHIERS_INTERNES = frozenset(
+    os.path.normcase(os.path.join(_DOSSIER_CORE, nom)) for nom in ("database.py", "instrumentation.py")
+)
+
+# Requêtes dont on peut demander le plan d'exécution
+_INSTRUCTIONS_EXPLICABLES = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+
+@dataclass
+class StatistiquesRequete:
+    """Mesures agrégées d'une requête (pour un appelant donné)."""
+    requete     : str
+    appelant    : str
+    nb_appels   : int   = 0
+    duree_totale: float = 0.0
+    duree_max   : float = 0.0
+    nb_lignes   : int   = 0
+    nb_lentes   : int   = 0
+
+    @property
+    def duree_moyenne(self) -> float:
+        return self.duree_totale / self.nb_appels if self.nb_appels else 0.0
+
+
+class InstrumentationSQL:
+    """
+    Collecte les mesures des requêtes d'un GestionnaireBase.
+
+    Usage :
+        db = GestionnaireBase(instrumentation=InstrumentationSQL(seuil_ms=50))
+        ...
+        for stats in db.instrumentation.classement(10):
+            print(stats.requete, stats.duree_totale)
+    """
+
+    def __init__(
+        self,
+        seuil_ms: float = 100.0,
+        chemin_journal: Optional[str] = None,
+        taille_max: int = SQL_LENT_TAILLE_MAX,
+        nb_archives: int = SQL_LENT_NB_ARCHIVES,
+        expliquer: bool = True,
+    ) -> None:
+        """
+        :param seuil_ms:       Durée au-delà de laquelle une requête est « lente »
+        :param chemin_journal: Journal des requêtes lentes
+                               (None = DIAGNOSTICS_DIR/requetes_lentes.jsonl)
+        :param taille_max:     Taille d'un fichier du journal avant rotation (octets)
+        :param nb_archives:    Nombre de fichiers archivés conservés
+        :param expliquer:      Capturer EXPLAIN QUERY PLAN des requêtes lentes
+        """
+        self.seuil = seuil_ms / 1000.0
+        self.expliquer = expliquer
+        self.chemin_journal = chemin_journal or os.path.join(DIAGNOSTICS_DIR, SQL_LENT_FICHIER)
+        self._taille_max = taille_max
+        self._nb_archives = nb_archives
+        self._gestionnaire: Optional[RotatingFileHandler] = None
+        self._plans: dict[str, list[str]] = {}
+        self._statistiques: dict[tuple[str, str], StatistiquesRequete] = {}
+
+    @classmethod
+    def depuis_environnement(cls) -> Optional["InstrumentationSQL"]:
+        """
+        Instrumentation configurée par la variable PROGPYTHONEXPL_SQL_LENT_MS,
+        ou None si elle n'est pas définie (instrumentation désactivée).
+        """
+        valeur = os.environ.get(VAR_ENV_SQL_LENT, "").strip()
+        if not valeur:
+            return None
+        try:
+            return cls(seuil_ms=float(valeur))
+        except ValueError:
+            journal.warning("%s invalide : %r (instrumentation désactivée)", VAR_ENV_SQL_LENT, valeur)
+            return None
+
+    # ------------------------------------------------------------------
+    # Enregistrement
+    # ------------------------------------------------------------------
+
+    def enregistrer(
+        self,
+        connexion: Optional[sqlite3.Connection],
+        requete: str,
+        parametres: Optional[tuple],
+        duree: float,
+        nb_lignes: int,
+    ) -> None:
+        """
+        Enregistre la mesure d'une requête exécutée.
+
+        :param connexion:  Connexion ayant exécuté la requête (pour EXPLAIN)
+        :param requete:    Texte SQL
+        :param parametres: Paramètres (None = executemany, non expliquée)
+        :param duree:      Durée d'exécution (secondes)
+        :param nb_lignes:  Lignes retournées ou modifiées (-1 = inconnu)
+        """
+        appelant = _appelant()
+        cle = (requete, appelant)
+        stats = self._statistiques.get(cle)
+        if stats is None:
+            stats = self._statistiques[cle] = StatistiquesRequete(requete, appelant)
+        stats.nb_appels += 1
+        stats.duree_totale += duree
+        if duree > stats.duree_max:
+            stats.duree_max = duree
+        if nb_lignes > 0:
+            stats.nb_lignes += nb_lignes
+
+        if duree >= self.seuil:
+            stats.nb_lentes += 1
+            self._journaliser_lente(connexion, requete, parametres, duree, nb_lignes, appelant)
+
+    def _journaliser_lente(
+        self,
+        connexion: Optional[sqlite3.Connection],
+        requete: str,
+        parametres: Optional[tuple],
+        duree: float,
+        nb_lignes: int,
+        appelant: str,
+    ) -> None:
+        """Écrit une requête lente (et son plan) dans le journal à rotation."""
+        entree = {
+            "horodatage"   : datetime.now().isoformat(timespec="milliseconds"),
+            "duree_ms"     : round(duree * 1000, 3),
+            "requete"      : " ".join(requete.split()),
+            "nb_parametres": len(parametres) if parametres is not None else None,
+            "nb_lignes"    : nb_lignes,
+            "appelant"     : appelant,
+            "plan"         : self._plan(connexion, requete, parametres),
+        }
+        try:
+            gestionnaire = self._ouvrir_journal()
+            gestionnaire.emit(logging.makeLogRecord({
+                "msg"     : json.dumps(entree, ensure_ascii=False),
+                "levelno" : logging.WARNING,
+                "levelname": "WARNING",
+            }))
+        except OSError as erreur:
+            journal.warning("Journal des requêtes lentes inaccessible : %s", erreur)
+
+    def _plan(
+        self,
+        connexion: Optional[sqlite3.Connection],
+        requete: str,
+        parametres: Optional[tuple],
+    ) -> Optional[list[str]]:
+        """EXPLAIN QUERY PLAN de la requête (mis en cache par texte SQL)."""
+        if not self.expliquer or connexion is None or parametres is None:
+            return None
+        if requete in self._plans:
+            return self._plans[requete]
+        if not requete.lstrip().upper().startswith(_INSTRUCTIONS_EXPLICABLES):
+            return None
+        try:
+            lignes = connexion.execute("EXPLAIN QUERY PLAN " + requete, parametres).fetchall()
+        except sqlite3.Error as erreur:
+            plan = [f"(plan indisponible : {erreur})"]
+        else:
+            # Colonnes : id, parent, notused, detail
+            plan = [str(ligne[3]) for ligne in lignes]
+        self._plans[requete] = plan
+        return plan
+
+    def _ouvrir_journal(self) -> RotatingFileHandler:
+        if self._gestionnaire is None:
+            # Import différé : logging.handlers (socket, pickle...) n'est
+            # chargé qu'à la première requête lente, pas au démarrage
+            from logging.handlers import RotatingFileHandler
+            os.makedirs(os.path.dirname(os.path.abspath(self.chemin_journal)), exist_ok=True)
+            self._gestionnaire = RotatingFileHandler(
+                self.chemin_journal,
+                maxBytes=self._taille_max,
+                backupCount=self._nb_archives,
+                encoding="utf-8",
+                delay=True,
+            )
+            self._gestionnaire.setFormatter(logging.Formatter("%(message)s"))
+        return self._gestionnaire
+
+    # ------------------------------------------------------------------
+    # Consultation
+    # ------------------------------------------------------------------
+
+    def classement(self, nombre: int = 20, critere: str = "duree_totale") -> list[StatistiquesRequete]:
+        """
+        Requêtes les plus coûteuses.
+
+        :param nombre:  Nombre de requêtes retournées
+        :param critere: "duree_totale", "duree_max", "nb_appels" ou "nb_lentes"
+        :return:        Statistiques triées par critère décroissant
+        """
+        return sorted(
+            self._statistiques.values(),
+            key=lambda stats: getattr(stats, critere),
+            reverse=True,
+        )[:nombre]
+
+    def reinitialiser(self) -> None:
+        """Efface les statistiques agrégées (le journal est conservé)."""
+        self._statistiques.clear()
+
+    def fermer(self) -> None:
+        """Ferme le fichier du journal des requêtes lentes."""
+        if self._gestionnaire is not None:
+            self._gestionnaire.close()
+            self._gestionnaire = None
+
+
+def _appelant(profondeur: int = 2) -> str:
+    """
+    Appelants d'une requête, hors de core/database.py :
+    « client_model.py:324 (rechercher) ← cruds_controller.py:55 (rechercher) ».
+
+    :param profondeur: Nombre de cadres d'appel décrits
+    """
+    cadre = sys._getframe(2)
+    while cadre is not None and os.path.normcase(cadre.f_code.co_filename) in _FICHIERS_INTERNES:
+        cadre = cadre.f_back
+    maillons: list[str] = []
+    while cadre is not None and len(maillons) < profondeur:
+        code = cadre.f_code
+        maillons.append(f"{os.path.basename(code.co_filename)}:{cadre.f_lineno} ({code.co_name})")
+        cadre = cadre.f_back
+    return " ← ".join(maillons) or "?"
@@ -0,0 +1,404 @@
+# =============================================================================
+# core/integrite.py
+# Vérification de l'intégrité d'une base et récupération des lignes lisibles.
+#
+# verifier() exécute PRAGMA quick_check (ou integrity_check, plus long : il
+# contrôle aussi le contenu des index) sur une connexion dédiée en lecture
+# seule : la connexion de l'application n'est ni bloquée ni modifiée. La
+# GUI la lance en arrière-plan juste après l'ouverture d'une base
+# (classes/verification_integrite.py) et affiche le résultat sans fenêtre
+# modale ; la ligne de commande par « cli.py BASE verifier ».
+#
+# recuperer() copie les clients encore lisibles d'une base endommagée dans
+# un nouveau fichier (créé par GestionnaireBase : schéma et journal à jour).
+# La table est lue par IDCLIENT croissant, par lots ; les pages illisibles
+# sont contournées (voir _LecteurClients) : une page endommagée ne fait
+# perdre que ses propres lignes. Les lignes lues mais invalides (contraintes
+# CHECK, doublons) sont écartées.
+# L'identité de synchronisation (Site_local et tables de
+# models/client_sync.py) n'est pas recopiée : un site récupéré est
+# reconfiguré par « cli.py BASE site ».
+#
+# Ce module n'importe pas Tkinter.
+# =============================================================================
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from core.config import INTEGRITE_PROBLEMES_MAX, RECUPERATION_LOT
+from core.database import ErreurBase, GestionnaireBase, rapporter_par_exception
+
+journal = logging.getLogger(__name__)
+
+# Opérations de la machine virtuelle SQLite entre deux tests d'annulation
+_OPERATIONS_PAR_TEST = 100_000
+
+# Code d'erreur SQLite « database disk image is malformed »
+_SQLITE_CORRUPT = 11
+
+# Bornes des rowid SQLite (entiers signés sur 64 bits)
+_ROWID_MIN = -(1 << 63)
+_ROWID_MAX = (1 << 63) - 1
+
+
+class _Annulee(Exception):
+    """Opération interrompue par ServiceIntegrite.annuler()."""
+
+
+@dataclass
+class RapportIntegrite:
+    """Bilan d'une vérification d'intégrité."""
+    chemin   : str
+    complete : bool = False                # integrity_check (sinon quick_check)
+    problemes: list[str] = field(default_factory=list)
+    duree    : float = 0.0
+    erreur   : Optional[str] = None        # vérification impossible ou annulée
+
+    @property
+    def reussie(self) -> bool:
+        return self.erreur is None
+
+    @property
+    def saine(self) -> bool:
+        return self.erreur is None and not self.problemes
+
+
+@dataclass
+class RapportRecuperation:
+    """Bilan d'une récupération des lignes lisibles."""
+    source          : str
+    destination     : str
+    lues            : int = 0          # lignes lues dans la source
+    ecrites         : int = 0          # lignes écrites dans la destination
+    rejetees        : int = 0          # lignes lues mais invalides
+    zones_illisibles: list[tuple[int, int]] = field(default_factory=list)   # IDCLIENT perdus (bornes)
+    duree           : float = 0.0
+    erreur          : Optional[str] = None
+
+    @property
+    def reussie(self) -> bool:
+        return self.erreur is None
+
+
+# Rappel de progression : (lignes lues, total estimé ou 0)
+Progression = Callable[[int, int], None]
+
+
+def _connexion_lecture(chemin: str, arret: Optional[threading.Event]) -> sqlite3.Connection:
+    """Connexion en lecture seule, interrompue quand `arret` est levé."""
+    if not os.path.isfile(chemin):
+        raise sqlite3.OperationalError(f"fichier introuvable : {chemin}")
+    connexion = sqlite3.connect(f"file:{os.path.abspath(chemin)}?mode=ro", uri=True)
+    if arret is not None:
+        connexion.set_progress_handler(arret.is_set, _OPERATIONS_PAR_TEST)
+    return connexion
+
+
+# ---------------------------------------------------------------------------
+# Vérification
+# ---------------------------------------------------------------------------
+
+def verifier(
+    chemin_base: str,
+    complete: bool = False,
+    limite: int = INTEGRITE_PROBLEMES_MAX,
+    arret: Optional[threading.Event] = None,
+) -> RapportIntegrite:
+    """
+    Contrôle l'intégrité d'une base sur une connexion dédiée en lecture
+    seule (utilisable depuis n'importe quel thread). Les erreurs sont
+    rapportées dans le résultat, jamais levées.
+
+    :param chemin_base: Base à vérifier (fichier .sqlite)
+    :param complete:    integrity_check (index compris) au lieu de quick_check
+    :param limite:      Nombre maximal de problèmes rapportés
+    :param arret:       Événement qui interrompt la vérification quand il est levé
+    :return:            RapportIntegrite
+    """
+    debut = time.perf_counter()
+    rapport = RapportIntegrite(chemin=chemin_base, complete=complete)
+    pragma = "integrity_check" if complete else "quick_check"
+    try:
+        connexion = _connexion_lecture(chemin_base, arret)
+        try:
+            lignes = [row[0] for row in connexion.execute(f"PRAGMA {pragma}({int(limite)});")]
+        finally:
+            connexion.close()
+        # Un seul message peut regrouper plusieurs lignes, sous l'en-tête
+        # « *** in database main *** »
+        if lignes != ["ok"]:
+            rapport.problemes = [
+                ligne for ligne in "\n".join(lignes).splitlines()
+                if ligne.strip() and not ligne.startswith("*** ")
+            ]
+    except sqlite3.Error as erreur:
+        if arret is not None and arret.is_set():
+            rapport.erreur = "Vérification annulée"
+        elif (getattr(erreur, "sqlite_errorcode", 0) & 0xFF) == _SQLITE_CORRUPT:
+            # Le contrôle lui-même bute sur une page endommagée
+            rapport.problemes = [str(erreur)]
+        else:
+            # Vérification impossible (pas une base SQLite, fichier verrouillé...)
+            rapport.erreur = str(erreur)
+    rapport.duree = time.perf_counter() - debut
+    if rapport.problemes:
+        journal.warning("Base %s endommagée : %d problème(s) (%s)", chemin_base, len(rapport.problemes), pragma)
+    return rapport
+
+
+# ---------------------------------------------------------------------------
+# Récupération
+# ---------------------------------------------------------------------------
+
+def recuperer(
+    source: str,
+    destination: str,
+    lot: int = RECUPERATION_LOT,
+    progression: Optional[Progression] = None,
+    arret: Optional[threading.Event] = None,
+) -> RapportRecuperation:
+    """
+    Copie les clients lisibles de `source` dans une nouvelle base
+    `destination`. La destination ne doit pas exister ; elle est effacée
+    si la récupération échoue ou est annulée. Les erreurs sont rapportées
+    dans le résultat, jamais levées.
+
+    :param source:      Base endommagée (ouverte en lecture seule)
+    :param destination: Nouveau fichier .sqlite
+    :param lot:         Lignes lues par requête
+    :param progression: Rappel (lignes lues, total estimé ou 0)
+    :param arret:       Événement qui interrompt la récupération quand il est levé
+    :return:            RapportRecuperation
+    """
+    debut = time.perf_counter()
+    rapport = RapportRecuperation(source=source, destination=destination)
+    if os.path.exists(destination):
+        rapport.erreur = f"Le fichier de destination existe déjà : {destination}"
+        return rapport
+    if os.path.abspath(source) == os.path.abspath(destination):
+        rapport.erreur = "La destination doit être un nouveau fichier"
+        return rapport
+
+    cible = GestionnaireBase(rapporteur=rapporter_par_exception)
+    lecture: Optional[sqlite3.Connection] = None
+    try:
+        lecture = _connexion_lecture(source, arret)
+        # Source illisible dans son ensemble (pas une base SQLite...) : échec
+        lecture.execute("SELECT COUNT(*) FROM sqlite_master;").fetchone()
+        cible.ouvrir(destination)
+        colonnes = [row["name"] for row in cible.interroger("PRAGMA table_info(Clients);")]
+        liste = ", ".join(colonnes)
+        insertion = f"INSERT OR IGNORE INTO Clients ({liste}) VALUES ({', '.join('?' * len(colonnes))});"
+        lecteur = _LecteurClients(
+            lecture, f"SELECT {liste} FROM Clients WHERE IDCLIENT >= ? ORDER BY IDCLIENT LIMIT ?;",
+            colonnes.index("IDCLIENT"), arret,
+        )
+        total = _compter(lecture)
+
+        bas: Optional[int] = _ROWID_MIN
+        while bas is not None:
+            lignes, bas = lecteur.lire(bas, lot)
+            if lignes:
+                curseur = cible.executer_plusieurs(insertion, lignes)
+                rapport.lues += len(lignes)
+                rapport.ecrites += curseur.rowcount
+                if progression is not None:
+                    progression(rapport.lues, max(total, rapport.lues))
+        rapport.rejetees = rapport.lues - rapport.ecrites
+        rapport.zones_illisibles = lecteur.zones_illisibles
+    except _Annulee:
+        rapport.erreur = "Récupération annulée"
+    except (sqlite3.Error, ErreurBase, OSError) as erreur:
+        if arret is not None and arret.is_set():
+            rapport.erreur = "Récupération annulée"
+        else:
+            rapport.erreur = str(erreur)
+            journal.warning("Récupération de %s en échec : %s", source, erreur)
+    finally:
+        if lecture is not None:
+            lecture.close()
+        cible.fermer()
+        if rapport.erreur is not None and os.path.exists(destination):
+            os.remove(destination)
+    rapport.duree = time.perf_counter() - debut
+    return rapport
+
+
+def _compter(lecture: sqlite3.Connection) -> int:
+    """Nombre de clients annoncé par la source (0 s'il est illisible)."""
+    try:
+        return lecture.execute("SELECT COUNT(*) FROM Clients;").fetchone()[0]
+    except sqlite3.DatabaseError:
+        return 0
+
+
+class _LecteurClients:
+    """
+    Parcours de la table Clients par IDCLIENT croissant (pagination par
+    clé : « IDCLIENT >= bas ORDER BY IDCLIENT LIMIT n »), qui contourne
+    les pages illisibles.
+
+    Un lot illisible est relu par moitiés jusqu'à une seule ligne. Si la
+    ligne suivante elle-même est illisible, le départ avance par sauts
+    doublés jusqu'à une clé lisible, puis revient par dichotomie vers la
+    plus petite : seule la zone illisible est perdue, en O(log) requêtes.
+    Les bornes MIN / MAX de la table ne servent pas : une page intérieure
+    endommagée peut les fausser.
+    """
+
+    def __init__(
+        self,
+        lecture: sqlite3.Connection,
+        selection: str,
+        position_id: int,
+        arret: Optional[threading.Event],
+    ) -> None:
+        self._lecture = lecture
+        self._selection = selection
+        self._position_id = position_id
+        self._arret = arret
+        self.zones_illisibles: list[tuple[int, int]] = []
+
+    def lire(self, bas: int, lot: int) -> tuple[list[tuple], Optional[int]]:
+        """
+        Lignes lisibles à partir de l'IDCLIENT `bas`.
+
+        :return: (lignes, départ de la lecture suivante ou None à la fin)
+        """
+        taille = lot
+        while True:
+            lignes = self._essayer(bas, taille)
+            if lignes is not None:
+                if len(lignes) < taille:
+                    return lignes, None
+                dernier = lignes[-1][self._position_id]
+                return lignes, (dernier + 1 if dernier < _ROWID_MAX else None)
+            if taille > 1:
+                taille //= 2
+                continue
+            # La ligne suivante est illisible : chercher la prochaine clé lisible
+            suivant = self._sauter(bas)
+            self.zones_illisibles.append((bas, (suivant - 1) if suivant is not None else _ROWID_MAX))
+            if suivant is None:
+                return [], None
+            bas = suivant
+
+    def _essayer(self, bas: int, taille: int) -> Optional[list[tuple]]:
+        if self._arret is not None and self._arret.is_set():
+            raise _Annulee()
+        try:
+            return self._lecture.execute(self._selection, (bas, taille)).fetchall()
+        except sqlite3.DatabaseError:
+            if self._arret is not None and self._arret.is_set():
+                raise _Annulee()
+            return None
+
+    def _sauter(self, illisible: int) -> Optional[int]:
+        """Plus petit départ lisible après `illisible` (None : aucun)."""
+        saut = 1
+        while True:
+            candidat = illisible + saut
+            if candidat > _ROWID_MAX:
+                return None
+            if self._essayer(candidat, 1) is not None:
+                break
+            saut *= 2
+        # illisible + saut // 2 échoue, candidat réussit : dichotomie
+        echec, succes = illisible + saut // 2, candidat
+        while succes - echec > 1:
+            milieu = (echec + succes) // 2
+            if self._essayer(milieu, 1) is None:
+                echec = milieu
+            else:
+                succes = milieu
+        return succes
+
+
+# ---------------------------------------------------------------------------
+# Service (thread de travail)
+# ---------------------------------------------------------------------------
+
+class ServiceIntegrite:
+    """
+    Exécute vérifications et récupérations dans un thread de travail,
+    une à la fois.
+
+    Usage :
+        service = ServiceIntegrite()
+        service.lancer_verification(db.chemin_base)   # retourne tout de suite
+        ...
+        if not service.en_cours:
+            rapport = service.dernier_rapport
+        service.annuler()                             # base fermée, application quittée
+    """
+
+    def __init__(self) -> None:
+        self._thread: Optional[threading.Thread] = None
+        self._arret = threading.Event()
+        # Avancement de la récupération en cours (lu depuis le thread Tk)
+        self.avancement: tuple[int, int] = (0, 0)
+        self.dernier_rapport: Optional[RapportIntegrite | RapportRecuperation] = None
+
+    @property
+    def en_cours(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def lancer_verification(self, chemin_base: str, complete: bool = False) -> bool:
+        """
+        Démarre une vérification en arrière-plan.
+
+        :return: False si une opération est déjà en cours
+        """
+        return self._lancer(
+            "verification-integrite",
+            lambda: verifier(chemin_base, complete, arret=self._arret),
+            lambda erreur: RapportIntegrite(chemin=chemin_base, complete=complete, erreur=erreur),
+        )
+
+    def lancer_recuperation(self, source: str, destination: str) -> bool:
+        """
+        Démarre une récupération en arrière-plan.
+
+        :return: False si une opération est déjà en cours
+        """
+        return self._lancer(
+            "recuperation-base",
+            lambda: recuperer(source, destination, progression=self._suivre, arret=self._arret),
+            lambda erreur: RapportRecuperation(source=source, destination=destination, erreur=erreur),
+        )
+
+    def annuler(self, attente: float = 1.0) -> None:
+        """Interrompt l'opération en cours (une récupération partielle est effacée)."""
+        self._arret.set()
+        if self._thread is not None:
+            self._thread.join(timeout=attente)
+
+    def _suivre(self, parcourus: int, total: int) -> None:
+        self.avancement = (parcourus, total)
+
+    def _lancer(self, nom: str, operation: Callable, en_echec: Callable) -> bool:
+        if self.en_cours:
+            return False
+        self._arret.clear()
+        self.avancement = (0, 0)
+        self.dernier_rapport = None
+        self._thread = threading.Thread(
+            target=self._executer, args=(operation, en_echec), name=nom, daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def _executer(self, operation: Callable, en_echec: Callable) -> None:
+        try:
+            self.dernier_rapport = operation()
+        except Exception as erreur:
+            # Le thread ne doit jamais mourir sans rapport (la GUI l'attend)
+            journal.exception("Opération d'intégrité en échec")
+            self.dernier_rapport = en_echec(str(erreur))
@@ -0,0 +1,244 @@
+# =============================================================================
+# core/journal_changements.py
+# Lecture et compactage du journal des changements de la table Clients.
+#
+# Le journal (table Clients_changements, créée avec ses déclencheurs par
+# GestionnaireBase._initialiser_tables) reçoit une ligne par écriture sur
+# Clients : (sequence, IDCLIENT, operation). Un consommateur (fenêtre,
+# cache, export, réplique) retient la dernière séquence traitée et ne lit
+# ensuite que les changements postérieurs : O(changements) au lieu d'une
+# relecture complète de la table.
+#
+# Usage :
+#   delta = changements_depuis(db, derniere_sequence)
+#   if not delta.complet: ...           # journal purgé : tout relire
+#   relire(delta.inseres + delta.modifies); retirer(delta.supprimes)
+#   derniere_sequence = delta.sequence
+#
+# Compactage (compacter) :
+#   - toujours sûr : pour chaque client, seule la dernière entrée est
+#     conservée. Un consommateur resté en arrière peut alors recevoir
+#     « update » pour un client qu'il ne connaît pas : il l'ajoute ;
+#   - purge des suppressions (optionnelle) : les entrées « delete » anciennes
+#     disparaissent et l'horizon avance ; un consommateur plus ancien que
+#     l'horizon reçoit complet=False et doit tout relire.
+#
+# Purge (purger) : après une écriture en masse (seed_data), les entrées
+# qu'elle a produites (ou tout le journal d'une base neuve) sont retirées et
+# l'horizon avance jusqu'à la séquence courante.
+#
+# Ce module n'importe pas Tkinter.
+# =============================================================================
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from core.database import GestionnaireBase
+from core.evenements import INSERTION, MODIFICATION, SUPPRESSION
+
+
+@dataclass(frozen=True)
+class EntreeJournal:
+    """Une ligne du journal des changements."""
+    sequence : int
+    idclient : int
+    operation: str   # INSERTION, MODIFICATION ou SUPPRESSION
+
+
+@dataclass
+class DeltaClients:
+    """Changements nets de la table Clients depuis une séquence."""
+    depuis   : int                    # séquence de départ demandée
+    sequence : int                    # dernière séquence lue (prochain départ)
+    complet  : bool = True            # False : entrées purgées, tout relire
+    inseres  : list[int] = field(default_factory=list)
+    modifies : list[int] = field(default_factory=list)
+    supprimes: list[int] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.inseres) + len(self.modifies) + len(self.supprimes)
+
+
+# ---------------------------------------------------------------------------
+# Lecture
+# ---------------------------------------------------------------------------
+
+def sequence_courante(db: GestionnaireBase) -> int:
+    """
+    Dernière séquence attribuée (0 si le journal n'a jamais servi). Lue dans
+    sqlite_sequence : elle ne recule pas quand les dernières entrées sont
+    retirées par compacter().
+    """
+    rows = db.interroger(
+        "SELECT COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'Clients_changements'), 0) AS sequence;"
+    )
+    return rows[0]["sequence"] if rows else 0
+
+
+def horizon(db: GestionnaireBase) -> int:
+    """
+    Séquence jusqu'à laquelle des suppressions ont été purgées : un
+    consommateur plus ancien ne peut plus se mettre à jour par le journal.
+    """
+    rows = db.interroger("SELECT sequence FROM Clients_changements_horizon WHERE id = 1;")
+    return rows[0]["sequence"] if rows else 0
+
+
+def lire_entrees(db: GestionnaireBase, depuis: int, limite: Optional[int] = None) -> list[EntreeJournal]:
+    """
+    Entrées brutes postérieures à `depuis`, dans l'ordre des séquences.
+
+    :param db:     Gestionnaire de base connecté
+    :param depuis: Dernière séquence déjà traitée (0 = tout le journal)
+    :param limite: Nombre maximal d'entrées (None = toutes)
+    :return:       Entrées du journal
+    """
+    requete = (
+        "SELECT sequence, IDCLIENT, operation FROM Clients_changements "
+        "WHERE sequence > ? ORDER BY sequence"
+    )
+    parametres: tuple = (depuis,)
+    if limite is not None:
+        requete += " LIMIT ?"
+        parametres += (limite,)
+    return [
+        EntreeJournal(row["sequence"], row["IDCLIENT"], row["operation"])
+        for row in db.interroger(requete + ";", parametres)
+    ]
+
+
+def changements_depuis(db: GestionnaireBase, depuis: int) -> DeltaClients:
+    """
+    Changements nets depuis `depuis` : une seule opération par client
+    (la dernière ; un client ajouté puis modifié reste « ajouté »).
+
+    :param db:     Gestionnaire de base connecté
+    :param depuis: Dernière séquence déjà traitée par le consommateur
+    :return:       DeltaClients (sequence = départ du prochain appel)
+    """
+    entrees = lire_entrees(db, depuis)
+    delta = DeltaClients(
+        depuis   = depuis,
+        sequence = entrees[-1].sequence if entrees else depuis,
+        complet  = depuis >= horizon(db),
+    )
+
+    derniere: dict[int, str] = {}
+    for entree in entrees:
+        if derniere.get(entree.idclient) == INSERTION and entree.operation == MODIFICATION:
+            continue
+        derniere[entree.idclient] = entree.operation
+
+    listes = {INSERTION: delta.inseres, MODIFICATION: delta.modifies, SUPPRESSION: delta.supprimes}
+    for idclient, operation in derniere.items():
+        listes[operation].append(idclient)
+    return delta
+
+
+def statistiques(db: GestionnaireBase) -> dict:
+    """Taille et bornes du journal (pour la ligne de commande)."""
+    rows = db.interroger(
+        "SELECT COUNT(*) AS nb, COUNT(DISTINCT IDCLIENT) AS clients, "
+        "COALESCE(MIN(sequence), 0) AS premiere FROM Clients_changements;"
+    )
+    nb, clients, premiere = (rows[0]["nb"], rows[0]["clients"], rows[0]["premiere"]) if rows else (0, 0, 0)
+    return {
+        "entrees"  : nb,
+        "clients"  : clients,
+        "premiere" : premiere,
+        "sequence" : sequence_courante(db),
+        "horizon"  : horizon(db),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Compactage
+# ---------------------------------------------------------------------------
+
+def compacter(
+    db: GestionnaireBase,
+    jusqu_a: Optional[int] = None,
+    purger_suppressions: bool = False,
+) -> Optional[int]:
+    """
+    Réduit le journal jusqu'à la séquence `jusqu_a` comprise (les entrées
+    plus récentes ne sont jamais retirées).
+
+    :param db:                  Gestionnaire de base connecté
+    :param jusqu_a:             Dernière séquence compactable (None = tout)
+    :param purger_suppressions: Retirer aussi les entrées « delete » et
+                                avancer l'horizon jusqu'à `jusqu_a`
+    :return:                    Nombre d'entrées retirées, ou None en cas d'échec
+    """
+    if jusqu_a is None:
+        jusqu_a = sequence_courante(db)
+
+    retirees = 0
+    with db.transaction():
+        # Entrées remplacées par une entrée plus récente du même client
+        curseur = db.executer(
+            """
+            DELETE FROM Clients_changements
+            WHERE sequence <= ?
+              AND sequence NOT IN (
+                  SELECT MAX(sequence) FROM Clients_changements GROUP BY IDCLIENT
+              );
+            """,
+            (jusqu_a,),
+        )
+        if curseur is None:
+            return None
+        retirees += curseur.rowcount
+
+        if purger_suppressions:
+            curseur = db.executer(
+                "DELETE FROM Clients_changements WHERE sequence <= ? AND operation = ?;",
+                (jusqu_a, SUPPRESSION),
+            )
+            if curseur is None:
+                return None
+            retirees += curseur.rowcount
+            if db.executer(
+                """
+                INSERT INTO Clients_changements_horizon (id, sequence) VALUES (1, ?)
+                ON CONFLICT(id) DO UPDATE SET sequence = MAX(sequence, excluded.sequence);
+                """,
+                (jusqu_a,),
+            ) is None:
+                return None
+    return retirees
+
+
+def purger(db: GestionnaireBase, jusqu_a: Optional[int] = None, depuis: int = 0) -> Optional[int]:
+    """
+    Retire les entrées des séquences `depuis` (exclue) à `jusqu_a` (comprise)
+    et avance l'horizon : les consommateurs plus anciens reçoivent
+    complet=False et relisent toute la table. Réservé aux écritures en
+    masse (génération d'une base de test) où le journal n'apporte rien.
+
+    :param db:      Gestionnaire de base connecté
+    :param jusqu_a: Dernière séquence purgée (None = séquence courante)
+    :param depuis:  Dernière séquence conservée (0 = tout le journal)
+    :return:        Nombre d'entrées retirées, ou None en cas d'échec
+    """
+    if jusqu_a is None:
+        jusqu_a = sequence_courante(db)
+
+    with db.transaction():
+        curseur = db.executer(
+            "DELETE FROM Clients_changements WHERE sequence > ? AND sequence <= ?;",
+            (depuis, jusqu_a),
+        )
+        if curseur is None:
+            return None
+        if db.executer(
+            """
+            INSERT INTO Clients_changements_horizon (id, sequence) VALUES (1, ?)
+            ON CONFLICT(id) DO UPDATE SET sequence = MAX(sequence, excluded.sequence);
+            """,
+            (jusqu_a,),
+        ) is None:
+            return None
+    return curseur.rowcount
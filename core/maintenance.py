@@ -0,0 +1,365 @@
+# =============================================================================
+# core/maintenance.py
+# Maintenance de la base : statistiques de l'optimiseur, pages libres,
+# checkpoint du journal WAL.
+#
+# Tâches (exécutées dans cet ordre) :
+#   statistiques  ANALYZE de chaque table, borné par PRAGMA analysis_limit
+#   optimiser     PRAGMA optimize (ANALYZE seulement là où c'est utile)
+#   vide          PRAGMA incremental_vacuum par étapes de N pages : rend au
+#                 système les pages libérées par les suppressions (bases en
+#                 auto_vacuum=INCREMENTAL, le mode des bases créées par
+#                 GestionnaireBase)
+#   vacuum        VACUUM complet, qui passe aussi la base en
+#                 auto_vacuum=INCREMENTAL : bloquant, jamais planifié,
+#                 seulement à la demande (cli.py … maintenance --vacuum)
+#   checkpoint    PRAGMA wal_checkpoint(PASSIVE) (bases en mode WAL)
+#
+# Chaque tâche est découpée en étapes courtes. PlanMaintenance les exécute
+# par tranches de durée bornée, dans la limite d'un budget total : la GUI
+# appelle une tranche quand la boucle Tk est inactive, sur sa propre
+# connexion (classes/maintenance_inactivite.py) ; maintenir() ouvre une
+# connexion dédiée, utilisable depuis un thread de travail ou la ligne de
+# commande. Le rapport donne l'état de la base avant et après : taille du
+# fichier, pages libres, statistiques de l'optimiseur et plans de requêtes
+# témoins.
+#
+# Ce module n'importe pas Tkinter.
+# =============================================================================
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from core.config import (
+    MAINTENANCE_BUDGET_S,
+    MAINTENANCE_LIMITE_ANALYSE,
+    MAINTENANCE_PAGES_PAR_ETAPE,
+)
+
+journal = logging.getLogger(__name__)
+
+# Tâches dans leur ordre d'exécution ; « vacuum » n'est jamais planifié
+TACHES = ("statistiques", "optimiser", "vide", "vacuum", "checkpoint")
+TACHES_DEFAUT = tuple(nom for nom in TACHES if nom != "vacuum")
+
+# Copie de travail en mémoire (core/copie_memoire.py) : seules les
+# statistiques servent. Le fichier est remplacé page à page à chaque
+# écriture de la copie : vider ou compacter la base en mémoire ne lui
+# rendrait rien, et elle n'a pas de WAL.
+TACHES_COPIE_MEMOIRE = ("statistiques", "optimiser")
+
+# Valeurs de PRAGMA auto_vacuum
+_MODES_AUTO_VACUUM = {0: "none", 1: "full", 2: "incremental"}
+
+# Requêtes témoins dont le plan figure dans le rapport (formes des requêtes
+# de la couche d'accès aux données)
+REQUETES_TEMOINS = {
+    "recherche_nom" : "SELECT * FROM Clients WHERE nom_client LIKE 'a%' ORDER BY nom_client",
+    "client_par_id" : "SELECT * FROM Clients WHERE IDCLIENT = 1",
+    "journal_depuis": "SELECT sequence, IDCLIENT, operation FROM Clients_changements "
+                      "WHERE sequence > 0 ORDER BY sequence",
+}
+
+
+@dataclass
+class EtatBase:
+    """Photographie de la base avant ou après la maintenance."""
+    taille      : int              # octets du fichier (+ journal WAL)
+    pages       : int
+    pages_libres: int
+    taille_page : int
+    auto_vacuum : str              # none, full ou incremental
+    mode_journal: str              # delete, wal...
+    statistiques: int              # lignes de sqlite_stat1 (0 = jamais analysée)
+    plans       : dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class ResultatTache:
+    """Bilan d'une tâche de maintenance."""
+    nom     : str
+    etapes  : int = 0
+    duree   : float = 0.0
+    terminee: bool = False         # False : budget épuisé avant la fin
+    detail  : str = ""
+
+
+@dataclass
+class RapportMaintenance:
+    """Bilan d'une maintenance."""
+    chemin     : str
+    avant      : Optional[EtatBase] = None
+    apres      : Optional[EtatBase] = None
+    taches     : list[ResultatTache] = field(default_factory=list)
+    duree      : float = 0.0        # secondes de travail (hors attente entre tranches)
+    interrompue: bool = False       # budget épuisé
+    erreur     : Optional[str] = None
+
+    @property
+    def reussie(self) -> bool:
+        return self.erreur is None
+
+    @property
+    def gain(self) -> int:
+        """Octets rendus au système (négatif si la base a grossi)."""
+        if self.avant is None or self.apres is None:
+            return 0
+        return self.avant.taille - self.apres.taille
+
+
+def verifier_taches(taches: tuple[str, ...]) -> None:
+    """Lève ValueError si une tâche demandée n'existe pas."""
+    inconnues = [nom for nom in taches if nom not in TACHES]
+    if inconnues:
+        raise ValueError(f"Tâche(s) de maintenance inconnue(s) : {', '.join(inconnues)}")
+
+
+# ---------------------------------------------------------------------------
+# État de la base
+# ---------------------------------------------------------------------------
+
+def _pragma(connexion: sqlite3.Connection, nom: str):
+    return connexion.execute(f"PRAGMA {nom};").fetchone()[0]
+
+
+def _plan(connexion: sqlite3.Connection, requete: str) -> str:
+    """Plan d'une requête (EXPLAIN QUERY PLAN), étapes séparées par « ; »."""
+    try:
+        return " ; ".join(row[-1] for row in connexion.execute("EXPLAIN QUERY PLAN " + requete))
+    except sqlite3.Error as erreur:
+        return f"indisponible ({erreur})"
+
+
+def etat_base(connexion: sqlite3.Connection, chemin_base: str) -> EtatBase:
+    """
+    Taille, pages libres, statistiques et plans témoins d'une base.
+
+    :param connexion:   Connexion ouverte sur la base
+    :param chemin_base: Fichier de la base (pour sa taille sur disque)
+    :return:            EtatBase
+    """
+    taille = 0
+    # Base en mémoire (copie de travail) : sa taille, pas celle du fichier
+    if connexion.execute("PRAGMA database_list;").fetchone()[2]:
+        for chemin in (chemin_base, chemin_base + "-wal"):
+            if os.path.exists(chemin):
+                taille += os.path.getsize(chemin)
+    else:
+        taille = _pragma(connexion, "page_count") * _pragma(connexion, "page_size")
+    statistiques = connexion.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1';"
+    ).fetchone()[0]
+    if statistiques:
+        statistiques = connexion.execute("SELECT COUNT(*) FROM sqlite_stat1;").fetchone()[0]
+    return EtatBase(
+        taille       = taille,
+        pages        = _pragma(connexion, "page_count"),
+        pages_libres = _pragma(connexion, "freelist_count"),
+        taille_page  = _pragma(connexion, "page_size"),
+        auto_vacuum  = _MODES_AUTO_VACUUM.get(_pragma(connexion, "auto_vacuum"), "?"),
+        mode_journal = _pragma(connexion, "journal_mode"),
+        statistiques = statistiques,
+        plans        = {nom: _plan(connexion, requete) for nom, requete in REQUETES_TEMOINS.items()},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Plan de maintenance (exécution par tranches)
+# ---------------------------------------------------------------------------
+
+class PlanMaintenance:
+    """
+    Exécute les tâches de maintenance par tranches de durée bornée.
+
+    Usage :
+        plan = PlanMaintenance(db.connexion, db.chemin_base, budget=2.0)
+        while not plan.executer_tranche(0.02):
+            ...                            # laisser la main (boucle Tk)
+        rapport = plan.rapport
+
+    La connexion n'est utilisée que pendant executer_tranche(), entre deux
+    requêtes de l'application : aucune transaction ne doit être ouverte.
+    """
+
+    def __init__(
+        self,
+        connexion: sqlite3.Connection,
+        chemin_base: str,
+        taches: tuple[str, ...] = TACHES_DEFAUT,
+        budget: float = MAINTENANCE_BUDGET_S,
+        pages_par_etape: int = MAINTENANCE_PAGES_PAR_ETAPE,
+        limite_analyse: int = MAINTENANCE_LIMITE_ANALYSE,
+    ) -> None:
+        """
+        :param connexion:       Connexion sur la base à entretenir
+        :param chemin_base:     Fichier de la base (pour le rapport)
+        :param taches:          Tâches à exécuter (voir TACHES)
+        :param budget:          Durée totale de travail, en secondes (0 = illimitée)
+        :param pages_par_etape: Pages rendues par étape d'incremental_vacuum
+        :param limite_analyse:  Lignes lues par index par ANALYZE (0 = toutes)
+        """
+        verifier_taches(taches)
+        self._connexion = connexion
+        self._budget = budget
+        self._pages_par_etape = max(1, pages_par_etape)
+        self._limite_analyse = limite_analyse
+        # Ordre de TACHES, quel que soit l'ordre demandé
+        self.rapport = RapportMaintenance(
+            chemin=chemin_base,
+            taches=[ResultatTache(nom) for nom in TACHES if nom in taches],
+        )
+        self._index = 0
+        self._etapes: Optional[Iterator[None]] = None
+        self.termine = False
+
+    def executer_tranche(self, duree_max: float) -> bool:
+        """
+        Exécute des étapes pendant au plus `duree_max` secondes (une étape
+        commencée va à son terme).
+
+        :param duree_max: Durée de la tranche, en secondes
+        :return:          True quand la maintenance est terminée (toutes les
+                          tâches faites, budget épuisé ou erreur)
+        """
+        if self.termine:
+            return True
+        debut = time.perf_counter()
+        rapport = self.rapport
+        try:
+            if rapport.avant is None:
+                rapport.avant = etat_base(self._connexion, rapport.chemin)
+            while self._index < len(rapport.taches):
+                ecoule = time.perf_counter() - debut
+                if self._budget > 0 and rapport.duree + ecoule >= self._budget:
+                    rapport.interrompue = True
+                    break
+                if ecoule >= duree_max:
+                    rapport.duree += ecoule
+                    return False
+                self._avancer(rapport.taches[self._index])
+            rapport.apres = etat_base(self._connexion, rapport.chemin)
+        except sqlite3.Error as erreur:
+            rapport.erreur = str(erreur)
+            journal.warning("Maintenance de %s en échec : %s", rapport.chemin, erreur)
+        rapport.duree += time.perf_counter() - debut
+        self.termine = True
+        return True
+
+    def _avancer(self, resultat: ResultatTache) -> None:
+        """Une étape de la tâche en cours ; passe à la suivante à sa fin."""
+        debut = time.perf_counter()
+        if self._etapes is None:
+            self._etapes = getattr(self, f"_tache_{resultat.nom}")()
+        try:
+            next(self._etapes)
+            resultat.etapes += 1
+        except StopIteration as fin:
+            resultat.terminee = True
+            resultat.detail = fin.value or ""
+        except sqlite3.Error as erreur:
+            # Une tâche en échec (base verrouillée...) n'empêche pas les suivantes
+            resultat.detail = f"échec : {erreur}"
+            journal.warning("Maintenance de %s, tâche %s : %s", self.rapport.chemin, resultat.nom, erreur)
+        resultat.duree += time.perf_counter() - debut
+        if resultat.terminee or resultat.detail:
+            self._index += 1
+            self._etapes = None
+
+    # ------------------------------------------------------------------
+    # Tâches (générateurs : un « yield » par étape, détail en retour)
+    # ------------------------------------------------------------------
+
+    def _tache_statistiques(self) -> Iterator[None]:
+        self._connexion.execute(f"PRAGMA analysis_limit = {int(self._limite_analyse)};")
+        tables = [
+            row[0] for row in self._connexion.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%';"
+            )
+        ]
+        for table in tables:
+            self._connexion.execute('ANALYZE "{}";'.format(table.replace('"', '""')))
+            yield
+        return f"{len(tables)} table(s) analysée(s)"
+
+    def _tache_optimiser(self) -> Iterator[None]:
+        self._connexion.execute(f"PRAGMA analysis_limit = {int(self._limite_analyse)};")
+        self._connexion.execute("PRAGMA optimize;").fetchall()
+        yield
+        return "PRAGMA optimize"
+
+    def _tache_vide(self) -> Iterator[None]:
+        libres = _pragma(self._connexion, "freelist_count")
+        if not libres:
+            return "aucune page libre"
+        mode = _MODES_AUTO_VACUUM.get(_pragma(self._connexion, "auto_vacuum"), "?")
+        if mode != "incremental":
+            return f"{libres} page(s) libre(s), auto_vacuum={mode} : VACUUM complet requis"
+        pages = _pragma(self._connexion, "page_count")
+        while libres:
+            # executescript mène le PRAGMA à son terme (execute() ne rend qu'une page)
+            self._connexion.executescript(f"PRAGMA incremental_vacuum({self._pages_par_etape});")
+            restantes = _pragma(self._connexion, "freelist_count")
+            if restantes >= libres:
+                break
+            libres = restantes
+            yield
+        rendues = pages - _pragma(self._connexion, "page_count")
+        return f"{rendues} page(s) rendue(s) au système"
+
+    def _tache_checkpoint(self) -> Iterator[None]:
+        mode = _pragma(self._connexion, "journal_mode")
+        if mode != "wal":
+            return f"journal {mode} : sans objet"
+        occupe, trames, recopiees = self._connexion.execute("PRAGMA wal_checkpoint(PASSIVE);").fetchone()
+        yield
+        suffixe = " (lecteurs actifs)" if occupe else ""
+        return f"{max(recopiees, 0)}/{max(trames, 0)} trame(s) recopiée(s){suffixe}"
+
+    def _tache_vacuum(self) -> Iterator[None]:
+        self._connexion.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+        self._connexion.execute("VACUUM;")
+        yield
+        return "base reconstruite (auto_vacuum=incremental)"
+
+
+# ---------------------------------------------------------------------------
+# Maintenance sur une connexion dédiée
+# ---------------------------------------------------------------------------
+
+def maintenir(
+    chemin_base: str,
+    taches: tuple[str, ...] = TACHES_DEFAUT,
+    budget: float = MAINTENANCE_BUDGET_S,
+    pages_par_etape: int = MAINTENANCE_PAGES_PAR_ETAPE,
+    limite_analyse: int = MAINTENANCE_LIMITE_ANALYSE,
+    attente_verrou: float = 5.0,
+) -> RapportMaintenance:
+    """
+    Entretient une base sur sa propre connexion (utilisable depuis
+    n'importe quel thread). Les erreurs sont rapportées dans le résultat.
+
+    :param chemin_base:     Base à entretenir (fichier .sqlite)
+    :param taches:          Tâches à exécuter (voir TACHES)
+    :param budget:          Durée totale de travail, en secondes (0 = illimitée)
+    :param pages_par_etape: Pages rendues par étape d'incremental_vacuum
+    :param limite_analyse:  Lignes lues par index par ANALYZE (0 = toutes)
+    :param attente_verrou:  Attente maximale d'un verrou tenu par une autre connexion
+    :return:                RapportMaintenance
+    """
+    verifier_taches(taches)
+    try:
+        connexion = sqlite3.connect(chemin_base, timeout=attente_verrou)
+    except sqlite3.Error as erreur:
+        return RapportMaintenance(chemin=chemin_base, erreur=str(erreur))
+    try:
+        plan = PlanMaintenance(connexion, chemin_base, taches, budget, pages_par_etape, limite_analyse)
+        plan.executer_tranche(float("inf"))
+        return plan.rapport
+    finally:
+        connexion.close()
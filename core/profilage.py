@@ -0,0 +1,235 @@
+# =============================================================================
+# core/profilage.py
+# Mode profilage : traces des actions utilisateur (et cProfile en option).
+#
+# Chaque action instrumentée (ouverture de la fenêtre CRUDS, recherche,
+# enregistrement, suppression, retour de sélection...) produit un « span »
+# écrit au format Chrome Trace Event (un événement par ligne), lisible par
+# chrome://tracing, https://ui.perfetto.dev ou speedscope. Avec cProfile, les
+# appels Python exécutés pendant les actions sont profilés et enregistrés
+# dans un fichier .prof (pstats, snakeviz...).
+#
+# Activation :
+#   PROGPYTHONEXPL_PROFILAGE=1 python main.py          # traces
+#   PROGPYTHONEXPL_PROFILAGE=cprofile python main.py   # traces + cProfile
+# ou Ctrl+Maj+P dans la fenêtre principale (bascule marche / arrêt).
+#
+# Désactivé, span() retourne un contexte vide partagé : aucune mesure.
+# Ce module n'importe pas Tkinter.
+# =============================================================================
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Callable, Optional, TextIO
+
+from core.config import APP_TITLE, DIAGNOSTICS_DIR, VAR_ENV_PROFILAGE
+
+
+# Contexte retourné par span() lorsque le profilage est désactivé
+_SPAN_INACTIF = nullcontext()
+
+
+class Traceur:
+    """
+    Enregistre des spans (début, durée, attributs) dans un fichier de trace.
+
+    Une seule instance par processus : voir le module (traceur, span,
+    demarrer_profilage, arreter_profilage).
+    """
+
+    def __init__(self) -> None:
+        self.actif: bool = False
+        self.chemin_trace: Optional[str] = None
+        self.chemin_profil: Optional[str] = None
+        self._fichier: Optional[TextIO] = None
+        self._profileur: Optional[cProfile.Profile] = None
+        self._profondeur = 0
+        self._origine_ns = 0
+        self._premier_evenement = True
+        self._verrou = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Démarrage / arrêt
+    # ------------------------------------------------------------------
+
+    def demarrer(self, dossier: Optional[str] = None, avec_cprofile: bool = False) -> str:
+        """
+        Ouvre un nouveau fichier de trace et active le profilage.
+
+        :param dossier:       Dossier des fichiers (None = DIAGNOSTICS_DIR)
+        :param avec_cprofile: Profiler aussi les actions avec cProfile
+        :return:              Chemin du fichier de trace
+        """
+        if self.actif:
+            return self.chemin_trace
+        dossier = dossier or DIAGNOSTICS_DIR
+        os.makedirs(dossier, exist_ok=True)
+        horodatage = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.chemin_trace = os.path.join(dossier, f"trace_{horodatage}.json")
+        self.chemin_profil = os.path.join(dossier, f"profil_{horodatage}.prof") if avec_cprofile else None
+
+        self._fichier = open(self.chemin_trace, "w", encoding="utf-8")
+        # Format « JSON Array » de Chrome : le « ] » final est facultatif,
+        # la trace reste lisible même si l'application est interrompue.
+        self._fichier.write("[")
+        self._premier_evenement = True
+        self._origine_ns = time.perf_counter_ns()
+        self._profileur = cProfile.Profile() if avec_cprofile else None
+        self._profondeur = 0
+        self.actif = True
+
+        self._ecrire({
+            "name": "process_name", "ph": "M", "pid": os.getpid(), "tid": 0,
+            "args": {"name": APP_TITLE},
+        })
+        return self.chemin_trace
+
+    def arreter(self) -> list[str]:
+        """
+        Désactive le profilage et ferme les fichiers.
+
+        :return: Chemins des fichiers produits (trace, puis profil éventuel)
+        """
+        if not self.actif:
+            return []
+        self.actif = False
+        fichiers = [self.chemin_trace]
+        with self._verrou:
+            self._fichier.write("\n]\n")
+            self._fichier.close()
+            self._fichier = None
+        if self._profileur is not None:
+            self._profileur.disable()
+            self._profileur.dump_stats(self.chemin_profil)
+            self._profileur = None
+            fichiers.append(self.chemin_profil)
+        return fichiers
+
+    # ------------------------------------------------------------------
+    # Spans
+    # ------------------------------------------------------------------
+
+    def span(self, nom: str, categorie: str = "action", **attributs) -> "_Span":
+        """Contexte mesurant un span (à n'appeler que si self.actif)."""
+        return _Span(self, nom, categorie, attributs)
+
+    def _entrer(self) -> None:
+        self._profondeur += 1
+        if self._profondeur == 1 and self._profileur is not None:
+            self._profileur.enable()
+
+    def _sortir(self, nom: str, categorie: str, debut_ns: int, attributs: dict) -> None:
+        fin_ns = time.perf_counter_ns()
+        self._profondeur -= 1
+        if self._profondeur == 0 and self._profileur is not None:
+            self._profileur.disable()
+        self._ecrire({
+            "name": nom,
+            "cat" : categorie,
+            "ph"  : "X",
+            "ts"  : (debut_ns - self._origine_ns) / 1000,
+            "dur" : (fin_ns - debut_ns) / 1000,
+            "pid" : os.getpid(),
+            "tid" : threading.get_ident(),
+            "args": attributs,
+        })
+
+    def _ecrire(self, evenement: dict) -> None:
+        ligne = json.dumps(evenement, ensure_ascii=False, default=str)
+        with self._verrou:
+            if self._fichier is None:
+                return
+            self._fichier.write(("\n" if self._premier_evenement else ",\n") + ligne)
+            self._fichier.flush()
+            self._premier_evenement = False
+
+
+class _Span:
+    """Span en cours : les attributs peuvent être complétés dans le bloc."""
+
+    __slots__ = ("_traceur", "nom", "categorie", "attributs", "_debut_ns")
+
+    def __init__(self, traceur: Traceur, nom: str, categorie: str, attributs: dict) -> None:
+        self._traceur = traceur
+        self.nom = nom
+        self.categorie = categorie
+        self.attributs = attributs
+
+    def __enter__(self) -> "_Span":
+        self._traceur._entrer()
+        self._debut_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, type_exc, exc, tb) -> None:
+        if type_exc is not None:
+            self.attributs["exception"] = type_exc.__name__
+        self._traceur._sortir(self.nom, self.categorie, self._debut_ns, self.attributs)
+
+
+# ---------------------------------------------------------------------------
+# Interface du module
+# ---------------------------------------------------------------------------
+
+traceur = Traceur()
+
+
+def span(nom: str, categorie: str = "action", **attributs):
+    """
+    Mesure le bloc `with` comme une action (sans effet si le profilage
+    est désactivé).
+
+    Usage :
+        with span("rechercher", terme=terme) as trace:
+            ...
+            if trace is not None:                     # profilage actif
+                trace.attributs["nb_lignes"] = len(lignes)
+    """
+    if not traceur.actif:
+        return _SPAN_INACTIF
+    return traceur.span(nom, categorie, **attributs)
+
+
+def tracer(nom: Optional[str] = None, categorie: str = "action") -> Callable:
+    """Décorateur : chaque appel de la fonction est un span."""
+    def decorer(fonction: Callable) -> Callable:
+        libelle = nom or fonction.__qualname__
+
+        @functools.wraps(fonction)
+        def enveloppe(*args, **kwargs):
+            if not traceur.actif:
+                return fonction(*args, **kwargs)
+            with traceur.span(libelle, categorie):
+                return fonction(*args, **kwargs)
+        return enveloppe
+    return decorer
+
+
+def demarrer_profilage(dossier: Optional[str] = None, avec_cprofile: bool = False) -> str:
+    """Active le profilage ; retourne le chemin du fichier de trace."""
+    return traceur.demarrer(dossier, avec_cprofile)
+
+
+def arreter_profilage() -> list[str]:
+    """Désactive le profilage ; retourne les fichiers produits."""
+    return traceur.arreter()
+
+
+def demarrer_depuis_environnement() -> Optional[str]:
+    """
+    Active le profilage si PROGPYTHONEXPL_PROFILAGE est définie
+    ("1" = traces, "cprofile" = traces + cProfile).
+
+    :return: Chemin du fichier de trace, ou None si désactivé
+    """
+    valeur = os.environ.get(VAR_ENV_PROFILAGE, "").strip().lower()
+    if valeur in ("", "0", "non", "false"):
+        return None
+    return demarrer_profilage(avec_cprofile=(valeur == "cprofile"))
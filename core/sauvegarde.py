@@ -0,0 +1,349 @@
+# =============================================================================
+# core/sauvegarde.py
+# Sauvegardes à chaud de la base : API de sauvegarde SQLite (Connection.backup).
+#
+# La copie se fait sur une connexion dédiée, en lecture seule, par étapes de
+# quelques pages : entre deux étapes, la connexion de l'interface peut lire
+# et écrire normalement. Si elle écrit pendant la copie, SQLite reprend la
+# copie au début à l'étape suivante : l'instantané est toujours cohérent.
+# Après REPRISES_MAX reprises (écritures continues), la copie est refaite
+# en une seule étape, qui bloque les écritures le temps de la lecture.
+#
+# Chaque instantané est un fichier horodaté, éventuellement compressé :
+#   <dossier>/<nom de la base>_AAAAMMJJ-HHMMSS.sqlite[.gz]
+# La politique de rétention ne garde que les N instantanés les plus récents
+# de chaque base. Une copie en cours s'écrit dans un fichier « .tmp » : un
+# instantané interrompu n'est jamais pris pour une sauvegarde.
+#
+# ServiceSauvegarde exécute la copie dans un thread de travail (la
+# connexion SQLite y est créée : elle n'est jamais partagée). En mode copie
+# de travail en mémoire (core/copie_memoire.py), la source est un instantané
+# de la base en mémoire : le fichier peut être en retard sur l'application. La GUI la
+# déclenche par le menu Fichier ou à intervalle régulier
+# (classes/sauvegarde_planifiee.py) ; la ligne de commande par
+# « cli.py BASE sauvegarder ».
+#
+# Ce module n'importe pas Tkinter.
+# =============================================================================
+
+from __future__ import annotations
+
+import gzip
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+from core.config import (
+    SAUVEGARDE_COMPRESSER,
+    SAUVEGARDE_CONSERVER,
+    SAUVEGARDE_PAGES_PAR_ETAPE,
+    SAUVEGARDE_PAUSE_S,
+    SAUVEGARDE_SOUS_DOSSIER,
+)
+
+journal = logging.getLogger(__name__)
+
+# Horodatage des noms d'instantanés
+FORMAT_HORODATAGE = "%Y%m%d-%H%M%S"
+
+# Reprises de la copie par étapes tolérées avant la copie en une étape
+REPRISES_MAX = 3
+
+
+class SauvegardeAnnulee(Exception):
+    """Copie interrompue par ServiceSauvegarde.annuler()."""
+
+
+class _CopieInstable(Exception):
+    """Copie par étapes reprise trop souvent (écritures continues)."""
+
+
+@dataclass
+class RapportSauvegarde:
+    """Bilan d'une sauvegarde."""
+    source    : str
+    chemin    : str = ""              # instantané écrit ("" en cas d'échec)
+    pages     : int = 0               # pages de la base copiées
+    reprises  : int = 0               # copies reprises au début (écritures concurrentes)
+    taille    : int = 0               # octets de l'instantané
+    duree     : float = 0.0           # secondes
+    supprimes : tuple[str, ...] = ()  # anciens instantanés retirés (rétention)
+    erreur    : Optional[str] = None
+
+    @property
+    def reussie(self) -> bool:
+        return self.erreur is None
+
+
+# Rappel de progression : (pages copiées, pages au total)
+Progression = Callable[[int, int], None]
+
+
+# ---------------------------------------------------------------------------
+# Instantanés
+# ---------------------------------------------------------------------------
+
+def dossier_par_defaut(chemin_base: str) -> str:
+    """Dossier des instantanés d'une base : sous-dossier de son dossier."""
+    return os.path.join(os.path.dirname(os.path.abspath(chemin_base)), SAUVEGARDE_SOUS_DOSSIER)
+
+
+def _motif_instantanes(chemin_base: str) -> re.Pattern:
+    nom = os.path.splitext(os.path.basename(chemin_base))[0]
+    return re.compile(re.escape(nom) + r"_(\d{8}-\d{6})(?:-(\d+))?\.sqlite(?:\.gz)?$")
+
+
+def lister_instantanes(chemin_base: str, dossier: Optional[str] = None) -> list[str]:
+    """
+    Instantanés d'une base, du plus ancien au plus récent.
+
+    :param chemin_base: Chemin de la base sauvegardée
+    :param dossier:     Dossier des instantanés (None = dossier_par_defaut)
+    :return:            Chemins des instantanés
+    """
+    dossier = dossier or dossier_par_defaut(chemin_base)
+    if not os.path.isdir(dossier):
+        return []
+    motif = _motif_instantanes(chemin_base)
+    instantanes = []
+    for nom in os.listdir(dossier):
+        correspondance = motif.match(nom)
+        if correspondance:
+            horodatage, rang = correspondance.groups()
+            instantanes.append((horodatage, int(rang or 1), nom))
+    return [os.path.join(dossier, nom) for _h, _r, nom in sorted(instantanes)]
+
+
+def appliquer_retention(chemin_base: str, conserver: int, dossier: Optional[str] = None) -> list[str]:
+    """
+    Supprime les instantanés les plus anciens au-delà de `conserver`.
+
+    :param chemin_base: Chemin de la base sauvegardée
+    :param conserver:   Nombre d'instantanés gardés (0 = tous)
+    :param dossier:     Dossier des instantanés (None = dossier_par_defaut)
+    :return:            Chemins supprimés
+    """
+    if conserver <= 0:
+        return []
+    supprimes: list[str] = []
+    for chemin in lister_instantanes(chemin_base, dossier)[:-conserver]:
+        try:
+            os.remove(chemin)
+            supprimes.append(chemin)
+        except OSError as erreur:
+            journal.warning("Instantané %s non supprimé : %s", chemin, erreur)
+    return supprimes
+
+
+def _nom_instantane(chemin_base: str, dossier: str, compresser: bool) -> str:
+    """Chemin libre pour un nouvel instantané (suffixe -2, -3... dans la même seconde)."""
+    nom = os.path.splitext(os.path.basename(chemin_base))[0]
+    horodatage = datetime.now().strftime(FORMAT_HORODATAGE)
+    extension = ".sqlite.gz" if compresser else ".sqlite"
+    # Le rang est unique pour les deux extensions : il ordonne les instantanés
+    racine = os.path.join(dossier, f"{nom}_{horodatage}")
+    rang = 2
+    while os.path.exists(racine + ".sqlite") or os.path.exists(racine + ".sqlite.gz"):
+        racine = os.path.join(dossier, f"{nom}_{horodatage}-{rang}")
+        rang += 1
+    return racine + extension
+
+
+def sauvegarder(
+    chemin_base: str,
+    dossier: Optional[str] = None,
+    pages_par_etape: int = SAUVEGARDE_PAGES_PAR_ETAPE,
+    pause: float = SAUVEGARDE_PAUSE_S,
+    compresser: bool = SAUVEGARDE_COMPRESSER,
+    conserver: int = SAUVEGARDE_CONSERVER,
+    progression: Optional[Progression] = None,
+    arret: Optional[threading.Event] = None,
+    source: Optional[sqlite3.Connection] = None,
+) -> RapportSauvegarde:
+    """
+    Copie la base dans un instantané horodaté, sur une connexion dédiée
+    (utilisable depuis n'importe quel thread). Les erreurs sont rapportées
+    dans le résultat, jamais levées.
+
+    :param chemin_base:     Base à sauvegarder (fichier .sqlite)
+    :param dossier:         Dossier des instantanés (None = dossier_par_defaut)
+    :param pages_par_etape: Pages copiées par étape (-1 = tout d'un coup)
+    :param pause:           Pause entre deux étapes, en secondes
+    :param compresser:      Écrire un instantané .sqlite.gz
+    :param conserver:       Instantanés gardés après celui-ci (0 = tous)
+    :param progression:     Rappel (pages copiées, total) après chaque étape
+    :param arret:           Événement qui interrompt la copie quand il est levé
+    :param source:          Connexion copiée au lieu du fichier (instantané de
+                            la copie de travail, fermé à la fin) ; chemin_base
+                            sert alors au nom des instantanés
+    :return:                RapportSauvegarde
+    """
+    debut = time.perf_counter()
+    rapport = RapportSauvegarde(source=chemin_base)
+    dossier = dossier or dossier_par_defaut(chemin_base)
+    provisoires: list[str] = []
+    etat = {"restant": None, "reprises": 0, "par_etapes": pages_par_etape > 0}
+
+    def suivre(_statut: int, restant: int, total: int) -> None:
+        # Le nombre de pages restantes remonte quand la copie repart du début
+        if etat["restant"] is not None and restant > etat["restant"]:
+            etat["reprises"] += 1
+        etat["restant"] = restant
+        if etat["par_etapes"] and etat["reprises"] > REPRISES_MAX:
+            raise _CopieInstable()
+        rapport.pages = total
+        if progression is not None:
+            progression(total - restant, total)
+        if arret is not None and arret.is_set():
+            raise SauvegardeAnnulee()
+        if pause > 0 and restant:
+            time.sleep(pause)
+
+    try:
+        os.makedirs(dossier, exist_ok=True)
+        chemin = _nom_instantane(chemin_base, dossier, compresser)
+        # Copie brute, puis (si demandé) sa version compressée
+        brut = chemin + ".tmp" if not compresser else chemin + ".brut.tmp"
+        provisoires = [brut] if not compresser else [brut, chemin + ".tmp"]
+
+        if source is None:
+            source = sqlite3.connect(f"file:{os.path.abspath(chemin_base)}?mode=ro", uri=True)
+        try:
+            _copier(source, brut, pages_par_etape, suivre)
+        except _CopieInstable:
+            journal.info("Sauvegarde de %s : copie en une étape (écritures continues)", chemin_base)
+            os.remove(brut)
+            etat["restant"], etat["par_etapes"] = None, False
+            _copier(source, brut, -1, suivre)
+        source.close()
+
+        if compresser:
+            with open(brut, "rb") as entree, gzip.open(provisoires[-1], "wb", compresslevel=6) as sortie:
+                shutil.copyfileobj(entree, sortie, 1024 * 1024)
+        os.replace(provisoires[-1], chemin)
+
+        rapport.chemin = chemin
+        rapport.taille = os.path.getsize(chemin)
+        rapport.reprises = etat["reprises"]
+        rapport.supprimes = tuple(appliquer_retention(chemin_base, conserver, dossier))
+    except SauvegardeAnnulee:
+        rapport.erreur = "Sauvegarde annulée"
+    except (sqlite3.Error, OSError) as erreur:
+        rapport.erreur = str(erreur)
+        journal.warning("Sauvegarde de %s en échec : %s", chemin_base, erreur)
+    finally:
+        if source is not None:
+            source.close()
+        for reste in provisoires:
+            if os.path.exists(reste):
+                os.remove(reste)
+    rapport.duree = time.perf_counter() - debut
+    return rapport
+
+
+def _copier(source: sqlite3.Connection, chemin: str, pages: int, suivre: Callable) -> None:
+    copie = sqlite3.connect(chemin)
+    try:
+        source.backup(copie, pages=pages, progress=suivre)
+    finally:
+        copie.close()
+
+
+# ---------------------------------------------------------------------------
+# Service (thread de travail)
+# ---------------------------------------------------------------------------
+
+class ServiceSauvegarde:
+    """
+    Exécute les sauvegardes dans un thread de travail, une à la fois.
+
+    Usage :
+        service = ServiceSauvegarde()
+        service.lancer(db.chemin_base)     # retourne tout de suite
+        ...
+        if not service.en_cours:
+            rapport = service.dernier_rapport
+        service.annuler()                  # à la fermeture de l'application
+    """
+
+    def __init__(
+        self,
+        dossier: Optional[str] = None,
+        pages_par_etape: int = SAUVEGARDE_PAGES_PAR_ETAPE,
+        pause: float = SAUVEGARDE_PAUSE_S,
+        compresser: bool = SAUVEGARDE_COMPRESSER,
+        conserver: int = SAUVEGARDE_CONSERVER,
+    ) -> None:
+        """
+        :param dossier:         Dossier des instantanés (None = à côté de chaque base)
+        :param pages_par_etape: Pages copiées par étape
+        :param pause:           Pause entre deux étapes, en secondes
+        :param compresser:      Écrire des instantanés .sqlite.gz
+        :param conserver:       Instantanés gardés par base (0 = tous)
+        """
+        self.dossier = dossier
+        self.pages_par_etape = pages_par_etape
+        self.pause = pause
+        self.compresser = compresser
+        self.conserver = conserver
+        self._thread: Optional[threading.Thread] = None
+        self._arret = threading.Event()
+        # Avancement de la copie en cours (lu depuis le thread Tk)
+        self.avancement: tuple[int, int] = (0, 0)
+        self.dernier_rapport: Optional[RapportSauvegarde] = None
+
+    @property
+    def en_cours(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def lancer(self, chemin_base: str, source: Optional[sqlite3.Connection] = None) -> bool:
+        """
+        Démarre une sauvegarde en arrière-plan.
+
+        :param chemin_base: Base à sauvegarder
+        :param source:      Instantané à copier au lieu du fichier (voir sauvegarder)
+        :return:            False si une sauvegarde est déjà en cours
+        """
+        if self.en_cours:
+            return False
+        self._arret.clear()
+        self.avancement = (0, 0)
+        self._thread = threading.Thread(
+            target=self._executer, args=(chemin_base, source), name="sauvegarde-base", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def annuler(self, attente: float = 1.0) -> None:
+        """Interrompt la sauvegarde en cours (l'instantané partiel est effacé)."""
+        self._arret.set()
+        if self._thread is not None:
+            self._thread.join(timeout=attente)
+
+    def _executer(self, chemin_base: str, source: Optional[sqlite3.Connection]) -> None:
+        def suivre(copiees: int, total: int) -> None:
+            self.avancement = (copiees, total)
+
+        try:
+            self.dernier_rapport = sauvegarder(
+                chemin_base,
+                dossier         = self.dossier,
+                pages_par_etape = self.pages_par_etape,
+                pause           = self.pause,
+                compresser      = self.compresser,
+                conserver       = self.conserver,
+                progression     = suivre,
+                arret           = self._arret,
+                source          = source,
+            )
+        except Exception as erreur:
+            # Le thread ne doit jamais mourir sans rapport (la GUI l'attend)
+            journal.exception("Sauvegarde de %s en échec", chemin_base)
+            self.dernier_rapport = RapportSauvegarde(source=chemin_base, erreur=str(erreur))
@@ -0,0 +1,334 @@
+# =============================================================================
+# core/schema_clients.py
+# Schéma déclaratif des champs de la table Clients.
+#
+# Source unique des règles de validation, utilisée par :
+#   - la fiche client (validation globale et temps réel),
+#   - les traitements par lots (imports, scripts),
+#   - la base SQLite (génération des contraintes CHECK du CREATE TABLE).
+#
+# Le schéma est « compilé » en une fonction de validation par champ ;
+# la validation d'un lot réutilise ces fonctions sans aucune recherche
+# supplémentaire, ce qui permet de pré-valider des milliers de lignes
+# avant l'insertion plutôt que d'attendre les IntegrityError une à une.
+# =============================================================================
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+from core.config import COULEURS_CHEVEUX
+from fonctionsgen.fonctionsgen import analyser_date_iso, convertir_date_jma_vers_iso
+
+
+# ---------------------------------------------------------------------------
+# Définition d'un champ
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class ChampClient:
+    """
+    Décrit un champ de la table Clients.
+
+      - nom              : nom de la colonne SQLite
+      - type_sql         : type SQLite (TEXT, REAL, INTEGER)
+      - convertir        : saisie → valeur stockée ; lève ValueError(message)
+      - convertir_tolerant : variante acceptant les formats d'import
+                           (None = identique à convertir)
+      - check_sql        : expression de la contrainte CHECK (ou None)
+      - defaut_sql       : valeur DEFAULT SQLite (ou None)
+      - defaut_saisie    : valeur utilisée si le champ est absent
+      - saisie_partielle : validation temps réel d'une saisie en cours
+    """
+    nom                : str
+    type_sql           : str
+    convertir          : Callable[[Any], Any]
+    convertir_tolerant : Optional[Callable[[Any], Any]] = None
+    check_sql          : Optional[str] = None
+    defaut_sql         : Optional[str] = None
+    defaut_saisie      : Any = ""
+    saisie_partielle   : Optional[Callable[[str], bool]] = None
+
+
+# ---------------------------------------------------------------------------
+# Conversions (saisie → valeur stockée)
+# ---------------------------------------------------------------------------
+
+LONGUEUR_CODE_POSTAL = 5
+
+_VALEURS_VRAIES = frozenset({"1", "o", "oui", "y", "yes", "true", "vrai"})
+_VALEURS_FAUSSES = frozenset({"", "0", "n", "non", "no", "false", "faux"})
+
+
+def _texte(valeur: Any) -> str:
+    """Texte saisi sans espaces autour ; None (null JSON, NULL SQL) est vide."""
+    return "" if valeur is None else str(valeur).strip()
+
+
+def _texte_obligatoire(message: str) -> Callable[[Any], str]:
+    """Fabrique un convertisseur de texte non vide."""
+    def convertir(valeur: Any) -> str:
+        texte = _texte(valeur)
+        if not texte:
+            raise ValueError(message)
+        return texte
+    return convertir
+
+
+def _convertir_code_postal(valeur: Any) -> str:
+    texte = _texte(valeur)
+    if len(texte) != LONGUEUR_CODE_POSTAL or not (texte.isascii() and texte.isdigit()):
+        raise ValueError(
+            f"Le code postal doit contenir exactement {LONGUEUR_CODE_POSTAL} chiffres."
+        )
+    return texte
+
+
+def _code_postal_partiel(valeur: str) -> bool:
+    return valeur == "" or (valeur.isdigit() and len(valeur) <= LONGUEUR_CODE_POSTAL)
+
+
+_MESSAGE_DATE = "La date de naissance est invalide (format attendu : JJ/MM/AAAA)."
+
+
+def _convertir_date(valeur: Any) -> str:
+    try:
+        return convertir_date_jma_vers_iso(_texte(valeur))
+    except ValueError:
+        raise ValueError(_MESSAGE_DATE) from None
+
+
+def _convertir_date_tolerant(valeur: Any) -> str:
+    # Les fichiers d'import (et les exports de l'application) utilisent
+    # le format ISO ; la saisie JJ/MM/AAAA reste acceptée.
+    dt = analyser_date_iso(_texte(valeur))
+    if dt is not None:
+        return dt.isoformat()
+    return _convertir_date(valeur)
+
+
+def _convertir_credit(valeur: Any) -> float:
+    try:
+        credit = float(_texte(valeur).replace(",", "."))
+    except ValueError:
+        raise ValueError("Le crédit disponible doit être un nombre décimal valide.") from None
+    # « credit >= 0 » est faux pour NaN : même règle que le CHECK SQLite
+    if not credit >= 0:
+        raise ValueError("Le crédit disponible doit être supérieur ou égal à 0.")
+    return credit
+
+
+def _credit_partiel(valeur: str) -> bool:
+    if valeur in ("", "-", "+"):
+        return True
+    try:
+        float(valeur.replace(",", "."))
+        return True
+    except ValueError:
+        return False
+
+
+def _convertir_bon_client(valeur: Any) -> bool:
+    return bool(valeur)
+
+
+def _convertir_bon_client_tolerant(valeur: Any) -> bool:
+    if isinstance(valeur, (bool, int)):
+        return bool(valeur)
+    texte = _texte(valeur).lower()
+    if texte in _VALEURS_VRAIES:
+        return True
+    if texte in _VALEURS_FAUSSES:
+        return False
+    raise ValueError("Le champ bon client doit valoir Oui ou Non.")
+
+
+def _convertir_couleur(valeur: Any) -> str:
+    if valeur not in COULEURS_CHEVEUX:
+        raise ValueError(f"La couleur des cheveux doit être : {', '.join(COULEURS_CHEVEUX)}.")
+    return valeur
+
+
+def _convertir_couleur_tolerant(valeur: Any) -> str:
+    return _convertir_couleur(_texte(valeur).lower())
+
+
+def _sql_liste(valeurs: Iterable[str]) -> str:
+    return ", ".join(f"'{v}'" for v in valeurs)
+
+
+# ---------------------------------------------------------------------------
+# Schéma de la table Clients (ordre des colonnes)
+# ---------------------------------------------------------------------------
+
+SCHEMA_CLIENTS: tuple[ChampClient, ...] = (
+    ChampClient(
+        nom="nom_client", type_sql="TEXT",
+        convertir=_texte_obligatoire("Le nom du client est obligatoire."),
+    ),
+    ChampClient(
+        nom="numero_telephone", type_sql="TEXT",
+        convertir=_texte_obligatoire("Le numéro de téléphone est obligatoire."),
+    ),
+    ChampClient(
+        nom="adresse", type_sql="TEXT",
+        convertir=_texte_obligatoire("L'adresse est obligatoire."),
+    ),
+    ChampClient(
+        nom="code_postal", type_sql="TEXT",
+        convertir=_convertir_code_postal,
+        check_sql=(
+            f"length(code_postal) = {LONGUEUR_CODE_POSTAL}\n"
+            f"            AND code_postal GLOB '{'[0-9]' * LONGUEUR_CODE_POSTAL}'"
+        ),
+        saisie_partielle=_code_postal_partiel,
+    ),
+    ChampClient(
+        nom="ville", type_sql="TEXT",
+        convertir=_texte_obligatoire("La ville est obligatoire."),
+    ),
+    ChampClient(
+        nom="date_naissance", type_sql="TEXT",
+        convertir=_convertir_date,
+        convertir_tolerant=_convertir_date_tolerant,
+        check_sql="date(date_naissance) IS NOT NULL",
+    ),
+    ChampClient(
+        nom="credit_disponible", type_sql="REAL",
+        convertir=_convertir_credit,
+        check_sql="credit_disponible >= 0",
+        defaut_saisie="0",
+        saisie_partielle=_credit_partiel,
+    ),
+    ChampClient(
+        nom="bon_client", type_sql="INTEGER",
+        convertir=_convertir_bon_client,
+        convertir_tolerant=_convertir_bon_client_tolerant,
+        check_sql="bon_client IN (0, 1)",
+        defaut_sql="0",
+        defaut_saisie=False,
+    ),
+    ChampClient(
+        nom="couleur_cheveux", type_sql="TEXT",
+        convertir=_convertir_couleur,
+        convertir_tolerant=_convertir_couleur_tolerant,
+        check_sql=f"couleur_cheveux IN ({_sql_liste(COULEURS_CHEVEUX)})",
+    ),
+)
+
+# Accès direct par nom de colonne
+CHAMPS_CLIENTS: dict[str, ChampClient] = {champ.nom: champ for champ in SCHEMA_CLIENTS}
+
+
+# ---------------------------------------------------------------------------
+# Génération SQL
+# ---------------------------------------------------------------------------
+
+def generer_sql_create_table(nom_table: str = "Clients") -> str:
+    """
+    Génère la requête CREATE TABLE à partir du schéma, contraintes CHECK
+    comprises.
+
+    :param nom_table: Nom de la table à créer
+    :return:          Requête SQL « CREATE TABLE IF NOT EXISTS ... »
+    """
+    lignes = ["    IDCLIENT         INTEGER PRIMARY KEY"]
+    for champ in SCHEMA_CLIENTS:
+        ligne = f"    {champ.nom:<16} {champ.type_sql:<7} NOT NULL"
+        if champ.defaut_sql is not None:
+            ligne += f" DEFAULT {champ.defaut_sql}"
+        if champ.check_sql is not None:
+            ligne += f"\n        CHECK (\n            {champ.check_sql}\n        )"
+        lignes.append(ligne)
+    colonnes = ",\n".join(lignes)
+    return f"\nCREATE TABLE IF NOT EXISTS {nom_table} (\n{colonnes}\n);\n"
+
+
+# ---------------------------------------------------------------------------
+# Validation compilée
+# ---------------------------------------------------------------------------
+
+ResultatValidation = tuple[Optional[dict], list[str]]
+
+
+@lru_cache(maxsize=None)
+def compiler_validateur(tolerant: bool = False) -> Callable[[Mapping], ResultatValidation]:
+    """
+    Compile le schéma en une fonction de validation d'un enregistrement.
+
+    :param tolerant: Si True, accepte aussi les formats d'import
+                     (dates ISO, « Oui »/« Non », casse des couleurs)
+    :return:         Fonction donnees → (valeurs normalisées ou None, erreurs)
+    """
+    regles = tuple(
+        (
+            champ.nom,
+            (champ.convertir_tolerant or champ.convertir) if tolerant else champ.convertir,
+            champ.defaut_saisie,
+        )
+        for champ in SCHEMA_CLIENTS
+    )
+
+    def valider(donnees: Mapping) -> ResultatValidation:
+        valeurs: dict = {}
+        erreurs: list[str] = []
+        lire = donnees.get
+        for nom, convertir, defaut in regles:
+            try:
+                valeurs[nom] = convertir(lire(nom, defaut))
+            except ValueError as erreur:
+                erreurs.append(str(erreur))
+        if erreurs:
+            return None, erreurs
+        return valeurs, erreurs
+
+    return valider
+
+
+def valider_enregistrement(donnees: Mapping, tolerant: bool = False) -> ResultatValidation:
+    """
+    Valide et normalise un enregistrement.
+
+    :param donnees:  Dictionnaire {nom_colonne: valeur saisie}
+    :param tolerant: Voir compiler_validateur()
+    :return:         (valeurs normalisées, []) si valide, (None, erreurs) sinon
+    """
+    return compiler_validateur(tolerant)(donnees)
+
+
+def valider_lot(
+    enregistrements: Iterable[Mapping],
+    tolerant: bool = True,
+) -> tuple[list[dict], list[tuple[int, list[str]]]]:
+    """
+    Valide un lot d'enregistrements en un seul appel.
+
+    :param enregistrements: Enregistrements à valider
+    :param tolerant:        Voir compiler_validateur() (True par défaut : imports)
+    :return:                (valeurs normalisées des lignes valides,
+                             [(index de la ligne, erreurs), ...] des rejets)
+    """
+    valider = compiler_validateur(tolerant)
+    valides: list[dict] = []
+    rejets: list[tuple[int, list[str]]] = []
+    for index, donnees in enumerate(enregistrements):
+        valeurs, erreurs = valider(donnees)
+        if valeurs is None:
+            rejets.append((index, erreurs))
+        else:
+            valides.append(valeurs)
+    return valides, rejets
+
+
+def saisie_partielle_valide(nom: str, valeur: str) -> bool:
+    """
+    Validation temps réel d'une saisie en cours (validatecommand Tkinter).
+
+    :param nom:    Nom de la colonne
+    :param valeur: Valeur courante du champ
+    :return:       True si la saisie en cours est acceptable
+    """
+    regle = CHAMPS_CLIENTS[nom].saisie_partielle
+    return True if regle is None else regle(valeur)
@@ -8,8 +8,9 @@
 from __future__ import annotations
 
 import re
-from datetime import datetime
-from typing import Any
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Optional
 
 
 # ---------------------------------------------------------------------------
@@ -35,11 +36,10 @@ def formater_date_affichage(date_iso: str) -> str:
     :param date_iso: Date au format YYYY-MM-DD
     :return:         Date au format JJ/MM/AAAA, ou la valeur d'origine si invalide
     """
-    try:
-        dt = datetime.strptime(date_iso.strip(), "%Y-%m-%d")
-        return dt.strftime("%d/%m/%Y")
-    except ValueError:
+    dt = analyser_date_iso(date_iso)
+    if dt is None:
         return date_iso
+    return f"{dt.day:02d}/{dt.month:02d}/{dt.year:04d}"
 
 
 def formater_booleen(valeur: bool) -> str:
@@ -52,6 +52,83 @@ def formater_booleen(valeur: bool) -> str:
     return "Oui" if valeur else "Non"
 
 
+# ---------------------------------------------------------------------------
+# Dates (chemin rapide)
+#
+# Les dates de l'application ont une forme fixe (YYYY-MM-DD en base,
+# JJ/MM/AAAA à la saisie) : un découpage par position suivi de
+# datetime.date() est bien plus rapide que datetime.strptime, et ne dépend
+# pas de la locale. strptime reste utilisé en secours pour les formes
+# tolérées mais non normalisées (ex : "1/2/2000").
+# Les résultats sont mémoïsés (les mêmes dates reviennent très souvent).
+# ---------------------------------------------------------------------------
+
+def _decouper_date(texte: str, i_annee: int, i_mois: int, i_jour: int) -> Optional[date]:
+    """
+    Analyse une date de 10 caractères dont les positions sont connues.
+
+    :return: date, ou None si la forme ou la valeur est invalide
+    """
+    annee = texte[i_annee:i_annee + 4]
+    mois  = texte[i_mois:i_mois + 2]
+    jour  = texte[i_jour:i_jour + 2]
+    chiffres = annee + mois + jour
+    if not (chiffres.isascii() and chiffres.isdigit()):
+        return None
+    try:
+        return date(int(annee), int(mois), int(jour))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=32768)
+def analyser_date_iso(date_iso: str) -> Optional[date]:
+    """
+    Analyse une date au format ISO YYYY-MM-DD.
+
+    :param date_iso: Chaîne à analyser
+    :return:         datetime.date, ou None si la date est invalide
+    """
+    texte = date_iso.strip()
+    if len(texte) == 10 and texte[4] == "-" and texte[7] == "-":
+        return _decouper_date(texte, 0, 5, 8)
+    try:
+        return datetime.strptime(texte, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=32768)
+def analyser_date_jma(date_jma: str) -> Optional[date]:
+    """
+    Analyse une date au format JJ/MM/AAAA.
+
+    :param date_jma: Chaîne à analyser
+    :return:         datetime.date, ou None si la date est invalide
+    """
+    texte = date_jma.strip()
+    if len(texte) == 10 and texte[2] == "/" and texte[5] == "/":
+        return _decouper_date(texte, 6, 3, 0)
+    try:
+        return datetime.strptime(texte, "%d/%m/%Y").date()
+    except ValueError:
+        return None
+
+
+def convertir_date_jma_vers_iso(date_jma: str) -> str:
+    """
+    Convertit une date JJ/MM/AAAA en format ISO YYYY-MM-DD.
+
+    :param date_jma: Date au format JJ/MM/AAAA
+    :return:         Date au format YYYY-MM-DD
+    :raises ValueError: si la date est invalide
+    """
+    dt = analyser_date_jma(date_jma)
+    if dt is None:
+        raise ValueError(f"Date invalide (format attendu JJ/MM/AAAA) : {date_jma!r}")
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+
+
 # ---------------------------------------------------------------------------
 # Validation
 # ---------------------------------------------------------------------------
@@ -74,6 +151,10 @@ def est_date_valide(date_str: str, format_date: str = "%d/%m/%Y") -> bool:
     :param format_date: Format attendu (défaut : JJ/MM/AAAA)
     :return:            True si la date est valide
     """
+    if format_date == "%d/%m/%Y":
+        return analyser_date_jma(date_str) is not None
+    if format_date == "%Y-%m-%d":
+        return analyser_date_iso(date_str) is not None
     try:
         datetime.strptime(date_str.strip(), format_date)
         return True
@@ -0,0 +1,323 @@
+# =============================================================================
+# models/client_export.py
+# Export de la table Clients vers un fichier CSV ou JSONL.
+#
+# L'export parcourt la requête au fil de l'eau (curseur + fetchmany) et
+# écrit chaque lot directement dans le fichier, éventuellement compressé
+# à la volée (gzip ou lzma) : la mémoire utilisée reste constante quelle
+# que soit la taille de la table.
+#
+# La fenêtre Win_Client_CRUDS (bouton Exporter) passe par ServiceExport :
+# l'export tourne dans un thread de travail, sur sa propre connexion
+# (ouvrir_lecture), et l'interface reste utilisable pendant l'écriture.
+# cli.py appelle exporter_clients directement.
+# Ce module n'importe pas Tkinter.
+# =============================================================================
+
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+import logging
+import lzma
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, TextIO
+
+from core.database import GestionnaireBase
+from core.schema_clients import SCHEMA_CLIENTS
+
+
+# ---------------------------------------------------------------------------
+# Constantes
+# ---------------------------------------------------------------------------
+
+FORMATS_EXPORT = ("csv", "jsonl")
+COMPRESSIONS   = ("gzip", "lzma")
+
+# Colonnes des fichiers exportés (relues telles quelles par l'import)
+COLONNES_EXPORT: list[str] = ["idclient"] + [champ.nom for champ in SCHEMA_CLIENTS]
+
+_COLONNES_SQL = ", ".join(["IDCLIENT"] + [champ.nom for champ in SCHEMA_CLIENTS])
+
+# Extensions reconnues pour déduire la compression
+_EXTENSIONS_COMPRESSION = {".gz": "gzip", ".xz": "lzma", ".lzma": "lzma"}
+
+# Signature du rappel de progression : (lignes écrites, total ou None)
+RappelProgression = Callable[[int, Optional[int]], None]
+
+journal = logging.getLogger(__name__)
+
+
+class ExportAnnule(Exception):
+    """Export interrompu par ServiceExport.annuler()."""
+
+
+@dataclass
+class RapportExport:
+    """Bilan d'un export."""
+    chemin : str
+    nombre : int = 0                  # lignes exportées
+    erreur : Optional[str] = None
+
+    @property
+    def reussi(self) -> bool:
+        return self.erreur is None
+
+
+# ---------------------------------------------------------------------------
+# Fichiers
+# ---------------------------------------------------------------------------
+
+def deduire_format(chemin: str) -> tuple[str, Optional[str]]:
+    """
+    Déduit le format et la compression d'après l'extension du fichier.
+
+    Exemples : "clients.csv" → ("csv", None),
+               "clients.jsonl.gz" → ("jsonl", "gzip")
+
+    :param chemin: Chemin du fichier
+    :return:       (format, compression ou None)
+    """
+    base, extension = os.path.splitext(chemin.lower())
+    compression = _EXTENSIONS_COMPRESSION.get(extension)
+    if compression is not None:
+        extension = os.path.splitext(base)[1]
+    format_export = "jsonl" if extension in (".jsonl", ".json", ".ndjson") else "csv"
+    return format_export, compression
+
+
+def ouvrir_fichier_texte(chemin: str, mode: str, compression: Optional[str] = None) -> TextIO:
+    """
+    Ouvre un fichier texte UTF-8, compressé ou non.
+
+    :param chemin:      Chemin du fichier
+    :param mode:        "r" ou "w"
+    :param compression: None, "gzip" ou "lzma"
+    :return:            Objet fichier texte
+    """
+    if compression is None:
+        return open(chemin, mode, encoding="utf-8", newline="")
+    if compression == "gzip":
+        # Niveau 6 : bon compromis débit / taille pour les gros exports
+        return gzip.open(chemin, mode + "t", encoding="utf-8", newline="", compresslevel=6)
+    if compression == "lzma":
+        return lzma.open(chemin, mode + "t", encoding="utf-8", newline="")
+    raise ValueError(f"Compression inconnue : {compression}")
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def exporter_clients(
+    db: Optional[GestionnaireBase],
+    chemin: str,
+    format_export: Optional[str] = None,
+    compression: Optional[str] = None,
+    nom: str = "",
+    progression: Optional[RappelProgression] = None,
+    intervalle_progression: int = 10000,
+    taille_lot: int = 5000,
+    arret: Optional[threading.Event] = None,
+    source: Optional[sqlite3.Connection] = None,
+) -> int:
+    """
+    Exporte les clients (toute la table, ou le résultat du filtre sur le nom).
+
+    Sans filtre, les lignes sont lues dans l'ordre de la clé primaire
+    (aucun tri) ; avec un filtre, dans l'ordre du tableau (par nom).
+
+    :param db:                     Gestionnaire de base connecté (inutilisé avec source)
+    :param chemin:                 Fichier de destination
+    :param format_export:          "csv" ou "jsonl" (None = d'après l'extension)
+    :param compression:            None, "gzip" ou "lzma" (None = d'après l'extension)
+    :param nom:                    Filtre partiel sur le nom (vide = toute la table)
+    :param progression:            Rappel appelé toutes les intervalle_progression lignes
+    :param intervalle_progression: Fréquence des appels au rappel
+    :param taille_lot:             Lignes lues et écrites par lot
+    :param arret:                  Événement qui interrompt l'export quand il est levé
+                                   (vérifié à chaque rappel ; le fichier partiel est effacé)
+    :param source:                 Connexion lue au lieu de db (voir ouvrir_lecture)
+    :return:                       Nombre de lignes exportées
+    :raises ExportAnnule:          Si arret a été levé
+    """
+    format_deduit, compression_deduite = deduire_format(chemin)
+    format_export = format_export or format_deduit
+    compression = compression or compression_deduite
+    if format_export not in FORMATS_EXPORT:
+        raise ValueError(f"Format d'export inconnu : {format_export}")
+
+    if nom:
+        requete = f"SELECT {_COLONNES_SQL} FROM Clients WHERE nom_client LIKE ? ORDER BY nom_client ASC;"
+        parametres: tuple = (f"%{nom}%",)
+        total_requete = ("SELECT COUNT(*) AS total FROM Clients WHERE nom_client LIKE ?;", parametres)
+    else:
+        requete = f"SELECT {_COLONNES_SQL} FROM Clients ORDER BY IDCLIENT;"
+        parametres = ()
+        total_requete = ("SELECT COUNT(*) AS total FROM Clients;", ())
+
+    total: Optional[int] = None
+    if progression is not None:
+        if source is not None:
+            rows = source.execute(*total_requete).fetchall()
+        else:
+            rows = db.interroger(*total_requete)
+        total = rows[0][0] if rows else None
+        progression(0, total)
+
+    if source is not None:
+        lignes = _iterer_connexion(source, requete, parametres, taille_lot)
+    else:
+        lignes = db.iterer(requete, parametres, taille_lot)
+    nb = 0
+    try:
+        with ouvrir_fichier_texte(chemin, "w", compression) as fichier:
+            if format_export == "csv":
+                ecrivain = csv.writer(fichier)
+                ecrivain.writerow(COLONNES_EXPORT)
+                ecrire = ecrivain.writerow
+            else:
+                encodeur = json.JSONEncoder(ensure_ascii=False).encode
+                colonnes = COLONNES_EXPORT
+
+                def ecrire(row) -> None:
+                    fichier.write(encodeur(dict(zip(colonnes, row))))
+                    fichier.write("\n")
+
+            prochain_rappel = intervalle_progression
+            for row in lignes:
+                ecrire(row)
+                nb += 1
+                if nb >= prochain_rappel:
+                    if arret is not None and arret.is_set():
+                        raise ExportAnnule()
+                    if progression is not None:
+                        progression(nb, total)
+                    prochain_rappel += intervalle_progression
+    except ExportAnnule:
+        # Pas de fichier tronqué : il serait relu comme un export complet
+        try:
+            os.remove(chemin)
+        except OSError:
+            pass
+        raise
+
+    if progression is not None:
+        progression(nb, total)
+    return nb
+
+
+def _iterer_connexion(
+    connexion: sqlite3.Connection,
+    requete: str,
+    parametres: tuple,
+    taille_lot: int,
+) -> Iterator[tuple]:
+    """Parcourt une requête par lots (fetchmany) sur une connexion brute."""
+    curseur = connexion.execute(requete, parametres)
+    while True:
+        lot = curseur.fetchmany(taille_lot)
+        if not lot:
+            return
+        yield from lot
+
+
+def ouvrir_lecture(db: GestionnaireBase) -> Optional[sqlite3.Connection]:
+    """
+    Ouvre la connexion d'un export en arrière-plan (à appeler depuis le
+    thread de la base) : un instantané de la copie de travail en mémoire,
+    ou une connexion en lecture seule sur le fichier.
+
+    :param db: Gestionnaire de la base ouverte
+    :return:   Connexion utilisable par un autre thread, à fermer par
+               l'appelant, ou None si une transaction est ouverte
+    """
+    copie = db.copie_memoire
+    if copie is not None:
+        return copie.instantane()
+    if db.connexion is not None and db.connexion.in_transaction:
+        return None
+    return sqlite3.connect(
+        f"file:{os.path.abspath(db.chemin_base)}?mode=ro", uri=True, check_same_thread=False
+    )
+
+
+# ---------------------------------------------------------------------------
+# Service (thread de travail)
+# ---------------------------------------------------------------------------
+
+class ServiceExport:
+    """
+    Exécute un export dans un thread de travail, un à la fois.
+
+    Usage :
+        service = ServiceExport()
+        service.lancer(ouvrir_lecture(db), chemin, nom)   # retourne tout de suite
+        ...
+        if not service.en_cours:
+            rapport = service.dernier_rapport
+        service.annuler()                                 # fenêtre fermée
+    """
+
+    def __init__(self) -> None:
+        self._thread: Optional[threading.Thread] = None
+        self._arret = threading.Event()
+        # Avancement de l'export en cours (lu depuis le thread Tk)
+        self.avancement: tuple[int, Optional[int]] = (0, None)
+        self.dernier_rapport: Optional[RapportExport] = None
+
+    @property
+    def en_cours(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def lancer(self, source: sqlite3.Connection, chemin: str, nom: str = "") -> bool:
+        """
+        Démarre un export en arrière-plan.
+
+        :param source: Connexion lue (voir ouvrir_lecture), fermée à la fin
+        :param chemin: Fichier de destination (format d'après l'extension)
+        :param nom:    Filtre partiel sur le nom (vide = toute la table)
+        :return:       False si un export est déjà en cours (source non fermée)
+        """
+        if self.en_cours:
+            return False
+        self._arret.clear()
+        self.avancement = (0, None)
+        self.dernier_rapport = None
+        self._thread = threading.Thread(
+            target=self._executer, args=(source, chemin, nom), name="export-clients", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def annuler(self, attente: float = 1.0) -> None:
+        """Interrompt l'export en cours (le fichier partiel est effacé)."""
+        self._arret.set()
+        if self._thread is not None:
+            self._thread.join(timeout=attente)
+
+    def _suivre(self, nb: int, total: Optional[int]) -> None:
+        self.avancement = (nb, total)
+
+    def _executer(self, source: sqlite3.Connection, chemin: str, nom: str) -> None:
+        try:
+            nb = exporter_clients(
+                None, chemin,
+                nom         = nom,
+                progression = self._suivre,
+                arret       = self._arret,
+                source      = source,
+            )
+            self.dernier_rapport = RapportExport(chemin=chemin, nombre=nb)
+        except ExportAnnule:
+            self.dernier_rapport = RapportExport(chemin=chemin, erreur="Export annulé.")
+        except Exception as erreur:
+            # Le thread ne doit jamais mourir sans rapport (la GUI l'attend)
+            journal.exception("Export vers %s en échec", chemin)
+            self.dernier_rapport = RapportExport(chemin=chemin, erreur=str(erreur))
+        finally:
+            source.close()
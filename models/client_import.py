@@ -0,0 +1,256 @@
+# =============================================================================
+# models/client_import.py
+# Import de gros fichiers CSV de clients.
+#
+# Pipeline en trois étapes :
+#   1. lecture du CSV au fil de l'eau, découpé en lots de lignes ;
+#   2. validation / normalisation des lots dans un pool de processus,
+#      avec les règles du schéma commun (core.schema_clients : dates,
+#      code postal, crédit — les mêmes que la fiche client) ;
+#   3. insertion des lignes valides par lots (executemany) regroupés
+#      dans de grandes transactions.
+#
+# Les lignes rejetées sont écrites dans un fichier d'erreurs CSV (ligne
+# d'origine + numéro de ligne + motifs du rejet).
+# Ce module n'importe pas Tkinter.
+# =============================================================================
+
+from __future__ import annotations
+
+import csv
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from core.database import GestionnaireBase
+from core.schema_clients import SCHEMA_CLIENTS, compiler_validateur
+from models.client_export import deduire_format, ouvrir_fichier_texte
+from models.client_model import ClientDAO
+
+
+# Une ligne lue : (numéro de ligne dans le fichier, valeurs dans l'ordre de l'entête)
+LigneCSV = tuple[int, list[str]]
+
+# Lot transmis à la validation : (entête, lignes)
+LotCSV = tuple[list[str], list[LigneCSV]]
+
+# Résultat de la validation d'un lot :
+#   (tuples d'insertion des lignes valides,
+#    [(numéro de ligne, valeurs d'origine, erreurs), ...],
+#    (première, dernière ligne du lot dans le fichier))
+ResultatLot = tuple[list[tuple], list[tuple[int, dict, list[str]]], tuple[int, int]]
+
+
+class ErreurImport(Exception):
+    """Échec d'insertion de lignes pourtant validées (erreur SQLite)."""
+
+
+@dataclass
+class RapportImport:
+    """Bilan d'un import."""
+    nb_lues     : int   = 0
+    nb_inserees : int   = 0
+    nb_rejetees : int   = 0
+    duree       : float = 0.0
+    ids         : list[int] = field(default_factory=list, repr=False)
+
+    @property
+    def debit(self) -> float:
+        """Lignes lues par seconde."""
+        return self.nb_lues / self.duree if self.duree else 0.0
+
+
+# ---------------------------------------------------------------------------
+# Étape 1 : lecture
+# ---------------------------------------------------------------------------
+
+def lire_lots_csv(
+    chemin: str,
+    taille_lot: int = 5000,
+    separateur: str = ",",
+    compression: Optional[str] = None,
+) -> Iterator[LotCSV]:
+    """
+    Lit un fichier CSV (avec entête) au fil de l'eau, par lots.
+
+    Les lignes restent des listes (csv.reader) : elles sont plus légères
+    à transmettre aux processus de validation que des dictionnaires.
+
+    :param chemin:      Fichier CSV (éventuellement .gz / .xz)
+    :param taille_lot:  Nombre de lignes par lot
+    :param separateur:  Séparateur de colonnes
+    :param compression: None = d'après l'extension
+    :return:            Itérateur de lots (entête, [(numéro de ligne, valeurs), ...])
+    """
+    if compression is None:
+        _format, compression = deduire_format(chemin)
+    with ouvrir_fichier_texte(chemin, "r", compression) as fichier:
+        lecteur = csv.reader(fichier, delimiter=separateur)
+        entete = next(lecteur, None)
+        if entete is None:
+            return
+        entete = [colonne.strip() for colonne in entete]
+        lot: list[LigneCSV] = []
+        for valeurs in lecteur:
+            if not valeurs:
+                continue  # ligne vide
+            # line_num : ligne physique courante (entête = ligne 1)
+            lot.append((lecteur.line_num, valeurs))
+            if len(lot) >= taille_lot:
+                yield entete, lot
+                lot = []
+        if lot:
+            yield entete, lot
+
+
+# ---------------------------------------------------------------------------
+# Étape 2 : validation (exécutée dans les processus du pool)
+# ---------------------------------------------------------------------------
+
+_COLONNES_INSERTION = tuple(champ.nom for champ in SCHEMA_CLIENTS)
+
+
+def valider_lot_csv(lot: LotCSV) -> ResultatLot:
+    """
+    Valide et normalise un lot de lignes CSV.
+
+    Fonction de niveau module pour pouvoir être transmise à un
+    ProcessPoolExecutor. Les lignes valides sont retournées directement
+    sous forme de tuples d'insertion (ordre de Client.en_tuple_insertion).
+
+    :param lot: (entête, [(numéro de ligne, valeurs), ...])
+    :return:    ResultatLot
+    """
+    entete, lignes = lot
+    etendue = (lignes[0][0], lignes[-1][0]) if lignes else (0, 0)
+    valider = compiler_validateur(tolerant=True)
+    valides: list[tuple] = []
+    rejets: list[tuple[int, dict, list[str]]] = []
+    for numero, valeurs in lignes:
+        donnees = dict(zip(entete, valeurs))
+        normalisees, erreurs = valider(donnees)
+        if normalisees is None:
+            rejets.append((numero, donnees, erreurs))
+            continue
+        normalisees["bon_client"] = int(normalisees["bon_client"])
+        valides.append(tuple(normalisees[nom] for nom in _COLONNES_INSERTION))
+    return valides, rejets, etendue
+
+
+def _valider_en_parallele(lots: Iterator[LotCSV], nb_processus: int) -> Iterator[ResultatLot]:
+    """
+    Valide les lots dans un pool de processus, en conservant l'ordre
+    du fichier et en limitant le nombre de lots en vol (mémoire bornée).
+    """
+    if nb_processus <= 1:
+        for lot in lots:
+            yield valider_lot_csv(lot)
+        return
+
+    en_vol: deque[Future] = deque()
+    max_en_vol = 2 * nb_processus
+    with ProcessPoolExecutor(max_workers=nb_processus) as pool:
+        for lot in lots:
+            en_vol.append(pool.submit(valider_lot_csv, lot))
+            if len(en_vol) >= max_en_vol:
+                yield en_vol.popleft().result()
+        while en_vol:
+            yield en_vol.popleft().result()
+
+
+# ---------------------------------------------------------------------------
+# Pipeline complet
+# ---------------------------------------------------------------------------
+
+def importer_csv(
+    db: GestionnaireBase,
+    chemin: str,
+    chemin_rejets: Optional[str] = None,
+    separateur: str = ",",
+    taille_lot: int = 5000,
+    taille_transaction: int = 100_000,
+    nb_processus: Optional[int] = None,
+    conserver_ids: bool = False,
+) -> RapportImport:
+    """
+    Importe un fichier CSV de clients (lecture → validation → insertion).
+
+    Les colonnes sont reconnues par leur nom (celles de l'export) ; les
+    colonnes inconnues et la colonne idclient sont ignorées, les IDCLIENT
+    étant attribués à la suite de ceux de la base.
+
+    :param db:                 Gestionnaire de base connecté
+    :param chemin:             Fichier CSV à importer (.csv, .csv.gz, .csv.xz)
+    :param chemin_rejets:      Fichier CSV des lignes rejetées (None = aucun)
+    :param separateur:         Séparateur de colonnes
+    :param taille_lot:         Lignes par lot de validation / d'insertion
+    :param taille_transaction: Lignes insérées par transaction (COMMIT)
+    :param nb_processus:       Processus de validation (None = nb de CPU,
+                               0 ou 1 = validation dans le processus courant)
+    :param conserver_ids:      Si True, retourne les IDCLIENT créés dans le rapport
+    :return:                   RapportImport
+    """
+    if nb_processus is None:
+        nb_processus = os.cpu_count() or 1
+
+    rapport = RapportImport()
+    debut = time.perf_counter()
+    fichier_rejets = None
+    ecrivain_rejets = None
+
+    try:
+        resultats = _valider_en_parallele(
+            lire_lots_csv(chemin, taille_lot, separateur), nb_processus
+        )
+        termine = False
+        while not termine:
+            termine = True
+            # IDCLIENT insérés dans la transaction, comptés après son COMMIT
+            ids_tranche: list[int] = []
+            # Une transaction par tranche de taille_transaction lignes :
+            # le COMMIT borne la taille du journal SQLite.
+            with db.transaction():
+                for valides, rejets, (premiere, derniere) in resultats:
+                    rapport.nb_lues += len(valides) + len(rejets)
+
+                    if rejets:
+                        rapport.nb_rejetees += len(rejets)
+                        if chemin_rejets is not None:
+                            if ecrivain_rejets is None:
+                                fichier_rejets = open(chemin_rejets, "w", encoding="utf-8", newline="")
+                                colonnes = ["ligne", "erreurs"] + list(rejets[0][1].keys())
+                                ecrivain_rejets = csv.DictWriter(
+                                    fichier_rejets, fieldnames=colonnes, extrasaction="ignore"
+                                )
+                                ecrivain_rejets.writeheader()
+                            for numero, donnees, erreurs in rejets:
+                                ecrivain_rejets.writerow(
+                                    {**donnees, "ligne": numero, "erreurs": " | ".join(erreurs)}
+                                )
+
+                    if valides:
+                        ids = ClientDAO.creer_lot_valeurs(db, valides)
+                        if len(ids) != len(valides):
+                            # Lignes pourtant validées : erreur SQLite inattendue,
+                            # la transaction en cours est annulée.
+                            raise ErreurImport(
+                                f"Échec de l'insertion d'un lot ({len(valides)} lignes) "
+                                f"des lignes {premiere} à {derniere} du fichier."
+                            )
+                        ids_tranche.extend(ids)
+
+                    if len(ids_tranche) >= taille_transaction:
+                        termine = False
+                        break
+            rapport.nb_inserees += len(ids_tranche)
+            if conserver_ids:
+                rapport.ids.extend(ids_tranche)
+    finally:
+        if fichier_rejets is not None:
+            fichier_rejets.close()
+        rapport.duree = time.perf_counter() - debut
+
+    return rapport
@@ -10,9 +10,11 @@ from __future__ import annotations
 
 import sqlite3
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 from core.database import GestionnaireBase
+from core.evenements import INSERTION, MODIFICATION, SUPPRESSION
+from core.schema_clients import CHAMPS_CLIENTS
 
 
 # ---------------------------------------------------------------------------
@@ -108,6 +110,39 @@ class Client:
         )
 
 
+# ---------------------------------------------------------------------------
+# Requêtes partagées
+# ---------------------------------------------------------------------------
+
+_SQL_PROCHAIN_ID = "SELECT COALESCE(MAX(IDCLIENT), 0) + 1 AS prochain FROM Clients;"
+
+# Base configurée comme site de synchronisation (models/client_sync.py) :
+# les IDCLIENT sont pris dans la plage du site
+_SQL_PLAGE_IDS = "SELECT id_debut, id_fin FROM Site_local WHERE id = 1;"
+_SQL_PROCHAIN_ID_PLAGE = """
+    SELECT COALESCE(MAX(IDCLIENT), ? - 1) + 1 AS prochain
+    FROM Clients WHERE IDCLIENT BETWEEN ? AND ?;
+"""
+
+_SQL_INSERTION = """
+    INSERT INTO Clients (
+        IDCLIENT, nom_client, numero_telephone, adresse,
+        code_postal, ville, date_naissance,
+        credit_disponible, bon_client, couleur_cheveux
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+"""
+
+_SQL_RECHERCHE = """
+    SELECT * FROM Clients
+    WHERE nom_client LIKE ?
+    ORDER BY nom_client ASC;
+"""
+
+# Nombre maximal de marqueurs « ? » par requête IN (...) : reste sous la
+# limite SQLITE_MAX_VARIABLE_NUMBER des anciennes versions (999).
+_TAILLE_LOT_IN = 900
+
+
 # ---------------------------------------------------------------------------
 # DAO – Data Access Object pour la table Clients
 # ---------------------------------------------------------------------------
@@ -131,30 +166,99 @@ class ClientDAO:
         Insère un nouveau client dans la base.
 
         L'IDCLIENT est calculé en Python via SELECT MAX(IDCLIENT) + 1
-        pour rester maître de la valeur (pas d'AUTOINCREMENT SQLite).
+        pour rester maître de la valeur (pas d'AUTOINCREMENT SQLite),
+        dans la plage du site si la base est synchronisée.
 
         :param db:     Gestionnaire de base connecté
         :param client: Objet Client à insérer (idclient ignoré)
         :return:       IDCLIENT attribué, ou None en cas d'échec
         """
-        # Calcul du prochain ID
-        rows = db.interroger("SELECT COALESCE(MAX(IDCLIENT), 0) + 1 AS prochain FROM Clients;")
-        if not rows:
+        prochain_id = ClientDAO._prochain_id(db)
+        if prochain_id is None:
             return None
-        prochain_id: int = rows[0]["prochain"]
 
-        requete = """
-            INSERT INTO Clients (
-                IDCLIENT, nom_client, numero_telephone, adresse,
-                code_postal, ville, date_naissance,
-                credit_disponible, bon_client, couleur_cheveux
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
-        """
-        curseur = db.executer(requete, (prochain_id,) + client.en_tuple_insertion())
+        curseur = db.executer(_SQL_INSERTION, (prochain_id,) + client.en_tuple_insertion())
         if curseur is not None:
+            db.publier_changement(INSERTION, (prochain_id,))
             return prochain_id
         return None
 
+    @staticmethod
+    def creer_lot(db: GestionnaireBase, clients: Iterable[Client]) -> list[int]:
+        """
+        Insère un lot de clients en une seule transaction (executemany).
+
+        Les IDCLIENT sont attribués à la suite du MAX(IDCLIENT) courant
+        (de la plage du site si la base est synchronisée).
+        En cas d'erreur, aucune ligne du lot n'est insérée.
+
+        :param db:      Gestionnaire de base connecté
+        :param clients: Clients à insérer (idclient ignoré)
+        :return:        Liste des IDCLIENT attribués ([] en cas d'échec)
+        """
+        return ClientDAO.creer_lot_valeurs(
+            db, [client.en_tuple_insertion() for client in clients]
+        )
+
+    @staticmethod
+    def creer_lot_valeurs(db: GestionnaireBase, lignes: list[tuple]) -> list[int]:
+        """
+        Variante de creer_lot() recevant directement les tuples d'insertion
+        (même ordre que Client.en_tuple_insertion()), sans objets Client
+        intermédiaires : utilisée par les imports de gros volumes.
+
+        :param db:     Gestionnaire de base connecté
+        :param lignes: Tuples de valeurs à insérer
+        :return:       Liste des IDCLIENT attribués ([] en cas d'échec)
+        """
+        if not lignes:
+            return []
+        with db.transaction():
+            prochain_id = ClientDAO._prochain_id(db, len(lignes))
+            if prochain_id is None:
+                return []
+            parametres = [
+                (prochain_id + i,) + valeurs for i, valeurs in enumerate(lignes)
+            ]
+            curseur = db.executer_plusieurs(_SQL_INSERTION, parametres)
+            ids = list(range(prochain_id, prochain_id + len(parametres)))
+            if curseur is not None:
+                db.publier_changement(INSERTION, ids)
+        if curseur is None:
+            return []
+        return ids
+
+    @staticmethod
+    def _prochain_id(db: GestionnaireBase, nombre: int = 1) -> Optional[int]:
+        """
+        Premier de `nombre` IDCLIENT consécutifs libres : à la suite du
+        MAX(IDCLIENT) de la table, ou de celui de la plage du site
+        (Site_local) quand la base est synchronisée avec d'autres.
+
+        :param db:     Gestionnaire de base connecté
+        :param nombre: Nombre d'identifiants à attribuer
+        :return:       Premier IDCLIENT, ou None en cas d'échec (plage épuisée)
+        """
+        plage = db.interroger(_SQL_PLAGE_IDS)
+        if not plage:
+            rows = db.interroger(_SQL_PROCHAIN_ID)
+            return rows[0]["prochain"] if rows else None
+
+        debut, fin = plage[0]["id_debut"], plage[0]["id_fin"]
+        rows = db.interroger(_SQL_PROCHAIN_ID_PLAGE, (debut, debut, fin))
+        if not rows:
+            return None
+        prochain_id: int = rows[0]["prochain"]
+        if prochain_id + nombre - 1 > fin:
+            db.rapporteur(
+                "Plage d'identifiants épuisée",
+                f"Plus assez d'IDCLIENT libres dans la plage du site ({debut}–{fin}) "
+                f"pour {nombre} client(s).",
+                None,
+            )
+            return None
+        return prochain_id
+
     # ------------------------------------------------------------------
     # READ – lecture d'un seul enregistrement
     # ------------------------------------------------------------------
@@ -176,6 +280,27 @@ class ClientDAO:
             return Client.depuis_row(rows[0])
         return None
 
+    @staticmethod
+    def lire_plusieurs(db: GestionnaireBase, ids: Iterable[int]) -> dict[int, Client]:
+        """
+        Lit plusieurs clients en une requête par lot de _TAILLE_LOT_IN.
+
+        :param db:  Gestionnaire de base connecté
+        :param ids: IDCLIENT à lire
+        :return:    {IDCLIENT: Client} des clients trouvés (les absents
+                    sont simplement omis)
+        """
+        ids = list(ids)
+        clients: dict[int, Client] = {}
+        for debut in range(0, len(ids), _TAILLE_LOT_IN):
+            lot = tuple(ids[debut:debut + _TAILLE_LOT_IN])
+            placeholders = ", ".join("?" * len(lot))
+            rows = db.interroger(f"SELECT * FROM Clients WHERE IDCLIENT IN ({placeholders});", lot)
+            for row in rows:
+                client = Client.depuis_row(row)
+                clients[client.idclient] = client
+        return clients
+
     # ------------------------------------------------------------------
     # UPDATE
     # ------------------------------------------------------------------
@@ -203,7 +328,10 @@ class ClientDAO:
             WHERE IDCLIENT = ?;
         """
         curseur = db.executer(requete, client.en_tuple_modification())
-        return curseur is not None
+        if curseur is None:
+            return False
+        db.publier_changement(MODIFICATION, (client.idclient,))
+        return True
 
     # ------------------------------------------------------------------
     # DELETE
@@ -222,7 +350,10 @@ class ClientDAO:
             "DELETE FROM Clients WHERE IDCLIENT = ?;",
             (idclient,)
         )
-        return curseur is not None
+        if curseur is None:
+            return False
+        db.publier_changement(SUPPRESSION, (idclient,))
+        return True
 
     @staticmethod
     def supprimer_plusieurs(db: GestionnaireBase, ids: list[int]) -> bool:
@@ -235,10 +366,44 @@ class ClientDAO:
         """
         if not ids:
             return True
-        placeholders = ", ".join("?" * len(ids))
-        requete = f"DELETE FROM Clients WHERE IDCLIENT IN ({placeholders});"
-        curseur = db.executer(requete, tuple(ids))
-        return curseur is not None
+        # Découpage en lots pour rester sous la limite de marqueurs SQLite,
+        # le tout dans une seule transaction.
+        with db.transaction():
+            for debut in range(0, len(ids), _TAILLE_LOT_IN):
+                lot = tuple(ids[debut:debut + _TAILLE_LOT_IN])
+                placeholders = ", ".join("?" * len(lot))
+                requete = f"DELETE FROM Clients WHERE IDCLIENT IN ({placeholders});"
+                if db.executer(requete, lot) is None:
+                    return False
+            db.publier_changement(SUPPRESSION, ids)
+        return True
+
+    @staticmethod
+    def supprimer_par_nom(db: GestionnaireBase, nom: str = "") -> Optional[int]:
+        """
+        Supprime les clients dont le nom contient `nom`, en une requête.
+
+        Les IDCLIENT supprimés ne sont relevés que si le bus a des abonnés
+        (fenêtres ouvertes) : sans abonné (ligne de commande), aucune liste
+        n'est chargée en mémoire, quelle que soit la taille du filtre.
+
+        :param db:  Gestionnaire de base connecté
+        :param nom: Filtre partiel sur le nom
+        :return:    Nombre de lignes supprimées, ou None en cas d'échec
+        """
+        motif = f"%{nom}%"
+        with db.transaction():
+            concernes: list[int] = []
+            if db.bus.nb_abonnes:
+                concernes = [
+                    row["IDCLIENT"] for row in db.interroger(
+                        "SELECT IDCLIENT FROM Clients WHERE nom_client LIKE ?;", (motif,)
+                    )
+                ]
+            curseur = db.executer("DELETE FROM Clients WHERE nom_client LIKE ?;", (motif,))
+            if curseur is not None:
+                db.publier_changement(SUPPRESSION, concernes)
+        return None if curseur is None else curseur.rowcount
 
     # ------------------------------------------------------------------
     # SEARCH – recherche partielle sur le nom
@@ -254,14 +419,111 @@ class ClientDAO:
         :param nom: Chaîne de recherche (partielle)
         :return:    Liste d'objets Client correspondants
         """
-        requete = """
-            SELECT * FROM Clients
-            WHERE nom_client LIKE ?
-            ORDER BY nom_client ASC;
-        """
-        rows = db.interroger(requete, (f"%{nom}%",))
+        rows = db.interroger(_SQL_RECHERCHE, (f"%{nom}%",))
         return [Client.depuis_row(row) for row in rows]
 
+    @staticmethod
+    def iterer(db: GestionnaireBase, nom: str = "", taille_lot: int = 1000) -> Iterator[Client]:
+        """
+        Variante de rechercher() qui parcourt les clients au fil de l'eau,
+        en mémoire constante (pour les exports et traitements par lots).
+
+        :param db:         Gestionnaire de base connecté
+        :param nom:        Chaîne de recherche (partielle, vide = tous)
+        :param taille_lot: Nombre de lignes lues à la fois
+        :return:           Itérateur d'objets Client
+        """
+        for row in db.iterer(_SQL_RECHERCHE, (f"%{nom}%",), taille_lot):
+            yield Client.depuis_row(row)
+
+    @staticmethod
+    def rechercher_parmi(db: GestionnaireBase, ids: Iterable[int], nom: str = "") -> list[Client]:
+        """
+        Restreint rechercher() à quelques IDCLIENT : indique, avec la même
+        règle de filtre que le tableau (LIKE %nom%), lesquels des clients
+        donnés y figurent (mise à jour ciblée après un changement).
+
+        :param db:  Gestionnaire de base connecté
+        :param ids: IDCLIENT à examiner
+        :param nom: Chaîne de recherche (partielle, vide = tous)
+        :return:    Clients existants correspondant au filtre
+        """
+        ids = list(ids)
+        clients: list[Client] = []
+        for debut in range(0, len(ids), _TAILLE_LOT_IN):
+            lot = tuple(ids[debut:debut + _TAILLE_LOT_IN])
+            placeholders = ", ".join("?" * len(lot))
+            rows = db.interroger(
+                f"SELECT * FROM Clients WHERE IDCLIENT IN ({placeholders}) AND nom_client LIKE ?;",
+                lot + (f"%{nom}%",),
+            )
+            clients.extend(Client.depuis_row(row) for row in rows)
+        return clients
+
+    # ------------------------------------------------------------------
+    # UPDATE en masse
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def modifier_en_masse(
+        db: GestionnaireBase,
+        valeurs: dict,
+        nom: str = "",
+        ids: Optional[list[int]] = None,
+    ) -> Optional[int]:
+        """
+        Affecte les mêmes valeurs à tous les clients filtrés, en une requête.
+
+        :param db:      Gestionnaire de base connecté
+        :param valeurs: {nom_colonne: valeur déjà normalisée}
+        :param nom:     Filtre partiel sur le nom (ignoré si ids est fourni)
+        :param ids:     Liste explicite d'IDCLIENT à modifier
+        :return:        Nombre de lignes modifiées, ou None en cas d'échec
+        :raises ValueError: si une colonne n'appartient pas à la table
+        """
+        inconnues = set(valeurs) - set(CHAMPS_CLIENTS)
+        if inconnues:
+            raise ValueError(f"Colonnes inconnues : {', '.join(sorted(inconnues))}")
+        if not valeurs:
+            return 0
+
+        affectations = ", ".join(f"{colonne} = ?" for colonne in valeurs)
+        parametres = tuple(
+            int(v) if isinstance(v, bool) else v for v in valeurs.values()
+        )
+
+        if ids is None:
+            with db.transaction():
+                # IDCLIENT touchés, relevés pour la notification des fenêtres
+                concernes = [
+                    row["IDCLIENT"] for row in db.interroger(
+                        "SELECT IDCLIENT FROM Clients WHERE nom_client LIKE ?;",
+                        (f"%{nom}%",),
+                    )
+                ]
+                curseur = db.executer(
+                    f"UPDATE Clients SET {affectations} WHERE nom_client LIKE ?;",
+                    parametres + (f"%{nom}%",),
+                )
+                if curseur is not None:
+                    db.publier_changement(MODIFICATION, concernes)
+            return None if curseur is None else curseur.rowcount
+
+        total = 0
+        with db.transaction():
+            for debut in range(0, len(ids), _TAILLE_LOT_IN):
+                lot = tuple(ids[debut:debut + _TAILLE_LOT_IN])
+                placeholders = ", ".join("?" * len(lot))
+                curseur = db.executer(
+                    f"UPDATE Clients SET {affectations} WHERE IDCLIENT IN ({placeholders});",
+                    parametres + lot,
+                )
+                if curseur is None:
+                    return None
+                total += curseur.rowcount
+            db.publier_changement(MODIFICATION, ids)
+        return total
+
     # ------------------------------------------------------------------
     # Utilitaires
     # ------------------------------------------------------------------
@@ -278,3 +540,40 @@ class ClientDAO:
         if rows:
             return rows[0]["total"]
         return 0
+
+    @staticmethod
+    def statistiques(db: GestionnaireBase, nb_villes: int = 10) -> dict:
+        """
+        Calcule des statistiques globales sur la table Clients.
+
+        :param db:        Gestionnaire de base connecté
+        :param nb_villes: Nombre de villes les plus représentées à retourner
+        :return:          Dictionnaire (total, bons_clients, credit_total,
+                          credit_moyen, par_couleur, top_villes)
+        """
+        rows = db.interroger("""
+            SELECT COUNT(*)                          AS total,
+                   COALESCE(SUM(bon_client), 0)      AS bons_clients,
+                   COALESCE(SUM(credit_disponible), 0) AS credit_total,
+                   COALESCE(AVG(credit_disponible), 0) AS credit_moyen,
+                   MIN(date_naissance)               AS naissance_min,
+                   MAX(date_naissance)               AS naissance_max
+            FROM Clients;
+        """)
+        stats = dict(rows[0]) if rows else {}
+        stats["par_couleur"] = {
+            row["couleur_cheveux"]: row["nb"]
+            for row in db.interroger(
+                "SELECT couleur_cheveux, COUNT(*) AS nb FROM Clients "
+                "GROUP BY couleur_cheveux ORDER BY nb DESC;"
+            )
+        }
+        stats["top_villes"] = [
+            (row["ville"], row["nb"])
+            for row in db.interroger(
+                "SELECT ville, COUNT(*) AS nb FROM Clients "
+                "GROUP BY ville ORDER BY nb DESC, ville LIMIT ?;",
+                (nb_villes,),
+            )
+        ]
+        return stats
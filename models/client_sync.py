@@ -0,0 +1,528 @@
+# =============================================================================
+# models/client_sync.py
+# Synchronisation bidirectionnelle incrémentale de deux bases de clients.
+#
+# Chaque agence travaille sur son propre fichier .sqlite (un « site ») ;
+# synchroniser(db_a, db_b) échange les seuls clients modifiés depuis la
+# synchronisation précédente, dans les deux sens :
+#   - le journal des changements (core/journal_changements.py) donne les
+#     IDCLIENT écrits depuis la dernière séquence reçue par l'autre site :
+#     le coût dépend du nombre de changements, pas de la taille de la table ;
+#   - chaque client écrit porte une estampille (version, site), tenue dans
+#     Clients_versions. La version est une horloge de Lamport : un site qui
+#     a reçu la version v estampille ses modifications suivantes au-delà
+#     de v ;
+#   - conflit (client modifié des deux côtés) : l'estampille la plus grande
+#     l'emporte, puis le numéro de site le plus grand ; à estampille égale
+#     (état de départ commun), le contenu le plus grand. Les deux sites
+#     appliquent la même règle et convergent vers le même état ;
+#   - une suppression est une version comme une autre (pierre tombale dans
+#     Clients_versions, supprime = 1).
+#
+# Identifiants : chaque site reçoit une plage d'IDCLIENT (Site_local) ; les
+# clients créés sur deux sites n'ont jamais le même identifiant.
+#
+# État de départ : à la configuration, les clients déjà présents doivent
+# être dans la plage du site. Des bases créées séparément (chacune
+# numérotée 1..N) sont renumérotées dans leur plage (renumeroter=True) ;
+# une copie d'un autre site déclare ses clients hors plage comme état de
+# départ commun (copie_commune=True). Sinon la configuration est refusée :
+# deux clients sans rapport portant le même IDCLIENT s'écraseraient.
+#
+# Premier échange : la première synchronisation avec un site inconnu envoie
+# tous les clients des deux côtés et compare leurs contenus (les clients
+# identiques ne sont pas réécrits) ; les suivantes n'échangent que les
+# changements.
+#
+# Usage :
+#   configurer_site(db_paris, 1, 1, 999_999)
+#   configurer_site(db_lyon, 2, 1_000_000, 1_999_999, renumeroter=True)
+#   rapport = synchroniser(db_paris, db_lyon)
+#
+# Ce module n'importe pas Tkinter.
+# =============================================================================
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from core import journal_changements
+from core.database import GestionnaireBase
+from core.evenements import MODIFICATION, SUPPRESSION
+from models.client_model import Client, ClientDAO
+
+
+# Estampille des clients jamais modifiés depuis la configuration du site
+# (état de départ commun à tous les sites)
+ESTAMPILLE_INITIALE = (0, 0)
+
+# Nombre maximal de marqueurs « ? » par requête IN (...) (comme ClientDAO)
+_TAILLE_LOT_IN = 900
+
+_SQL_TABLES_SYNC = (
+    """
+    CREATE TABLE IF NOT EXISTS Clients_versions (
+        IDCLIENT INTEGER PRIMARY KEY,
+        version  INTEGER NOT NULL,
+        site     INTEGER NOT NULL,
+        supprime INTEGER NOT NULL DEFAULT 0
+    );
+    """,
+    # horloge : horloge de Lamport du site ; sequence_base : séquence du
+    # journal local à la configuration ; sequence_estampillee : dernière séquence du journal local dont les
+    # écritures ont reçu leur estampille
+    """
+    CREATE TABLE IF NOT EXISTS Sync_etat (
+        id                   INTEGER PRIMARY KEY CHECK (id = 1),
+        horloge              INTEGER NOT NULL,
+        sequence_base        INTEGER NOT NULL,
+        sequence_estampillee INTEGER NOT NULL
+    );
+    """,
+    # Un enregistrement par site partenaire : sa plage d'IDCLIENT et la
+    # dernière séquence de SON journal déjà reçue ici
+    """
+    CREATE TABLE IF NOT EXISTS Sync_pairs (
+        site           INTEGER PRIMARY KEY,
+        id_debut       INTEGER NOT NULL,
+        id_fin         INTEGER NOT NULL,
+        sequence_recue INTEGER NOT NULL DEFAULT 0
+    );
+    """,
+    # Tout client supprimé garde une ligne dans Clients_versions : si le
+    # journal est purgé avant l'estampillage, la suppression s'y retrouve
+    """
+    CREATE TRIGGER IF NOT EXISTS Clients_versions_delete AFTER DELETE ON Clients
+    BEGIN
+        INSERT OR IGNORE INTO Clients_versions (IDCLIENT, version, site, supprime)
+            VALUES (OLD.IDCLIENT, 0, 0, 0);
+    END;
+    """,
+)
+
+_SQL_FUSION = """
+    INSERT INTO Clients (
+        IDCLIENT, nom_client, numero_telephone, adresse,
+        code_postal, ville, date_naissance,
+        credit_disponible, bon_client, couleur_cheveux
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(IDCLIENT) DO UPDATE SET
+        nom_client        = excluded.nom_client,
+        numero_telephone  = excluded.numero_telephone,
+        adresse           = excluded.adresse,
+        code_postal       = excluded.code_postal,
+        ville             = excluded.ville,
+        date_naissance    = excluded.date_naissance,
+        credit_disponible = excluded.credit_disponible,
+        bon_client        = excluded.bon_client,
+        couleur_cheveux   = excluded.couleur_cheveux;
+"""
+
+_SQL_ESTAMPILLE = """
+    INSERT INTO Clients_versions (IDCLIENT, version, site, supprime) VALUES (?, ?, ?, ?)
+    ON CONFLICT(IDCLIENT) DO UPDATE SET
+        version  = excluded.version,
+        site     = excluded.site,
+        supprime = excluded.supprime;
+"""
+
+
+@dataclass(frozen=True)
+class Site:
+    """Identité d'une base synchronisée."""
+    site    : int
+    id_debut: int
+    id_fin  : int
+
+
+@dataclass
+class LigneSync:
+    """État d'un client envoyé à l'autre site."""
+    idclient: int
+    version : int
+    site    : int
+    client  : Optional[Client]   # None : client supprimé
+
+    @property
+    def estampille(self) -> tuple[int, int]:
+        return (self.version, self.site)
+
+
+@dataclass
+class RapportSync:
+    """Bilan d'une synchronisation."""
+    site_a     : int
+    site_b     : int
+    envoyes_a_b: int   = 0      # clients lus dans A et proposés à B
+    envoyes_b_a: int   = 0
+    appliques_a: int   = 0      # clients écrits dans A (ajout, modification ou suppression)
+    appliques_b: int   = 0
+    rejetes    : int   = 0      # versions plus anciennes que la copie locale
+    complet    : bool  = True   # False : un journal purgé a imposé un échange complet
+    initial    : bool  = False  # premier échange entre les deux sites (tous les clients)
+    duree      : float = 0.0    # secondes
+
+
+# ---------------------------------------------------------------------------
+# Configuration des sites
+# ---------------------------------------------------------------------------
+
+def lire_site(db: GestionnaireBase) -> Optional[Site]:
+    """Identité de la base (None si elle n'est pas configurée comme site)."""
+    rows = db.interroger("SELECT site, id_debut, id_fin FROM Site_local WHERE id = 1;")
+    if not rows:
+        return None
+    return Site(rows[0]["site"], rows[0]["id_debut"], rows[0]["id_fin"])
+
+
+def configurer_site(
+    db: GestionnaireBase,
+    site: int,
+    id_debut: int,
+    id_fin: int,
+    renumeroter: bool = False,
+    copie_commune: bool = False,
+) -> bool:
+    """
+    Fait de la base un site de synchronisation : numéro unique dans le
+    réseau et plage des IDCLIENT qu'elle attribuera.
+
+    Les clients déjà présents doivent être dans la plage : sinon ils sont
+    renumérotés (renumeroter), ou acceptés comme état de départ partagé
+    avec les autres sites (copie_commune, base copiée d'un autre site).
+    La plage d'un site déjà synchronisé ne peut plus changer.
+
+    :param db:            Gestionnaire de base connecté
+    :param site:          Numéro du site (> 0, différent sur chaque base)
+    :param id_debut:      Premier IDCLIENT de la plage du site
+    :param id_fin:        Dernier IDCLIENT de la plage du site
+    :param renumeroter:   Déplacer dans la plage les clients hors plage
+    :param copie_commune: Accepter les clients hors plage (copie d'un autre site)
+    :return:              True si la configuration a été enregistrée
+    :raises ValueError: si le numéro ou la plage est invalide, ou si des
+                        clients sont hors plage sans renumeroter ni copie_commune
+    """
+    if site <= 0:
+        raise ValueError(f"Numéro de site invalide : {site}")
+    if not 0 < id_debut <= id_fin:
+        raise ValueError(f"Plage d'IDCLIENT invalide : {id_debut}–{id_fin}")
+    if renumeroter and copie_commune:
+        raise ValueError("renumeroter et copie_commune s'excluent")
+
+    for requete in _SQL_TABLES_SYNC:
+        if db.executer(requete) is None:
+            return False
+    with db.transaction():
+        actuel = lire_site(db)
+        plage_changee = actuel is None or (actuel.id_debut, actuel.id_fin) != (id_debut, id_fin)
+        if plage_changee and not copie_commune:
+            hors_plage = db.interroger(
+                "SELECT COUNT(*) AS nb FROM Clients WHERE IDCLIENT NOT BETWEEN ? AND ?;",
+                (id_debut, id_fin),
+            )[0]["nb"]
+            if hors_plage and actuel is not None and db.interroger("SELECT 1 FROM Sync_pairs LIMIT 1;"):
+                raise ValueError(
+                    "Site déjà synchronisé : sa plage d'IDCLIENT ne peut plus changer"
+                )
+            if hors_plage and not renumeroter:
+                raise ValueError(
+                    f"{hors_plage} client(s) hors de la plage {id_debut}–{id_fin} : "
+                    "les renuméroter, ou déclarer la base copie commune d'un autre site"
+                )
+            if hors_plage and _renumeroter(db, id_debut, id_fin) is None:
+                return False
+
+        curseur = db.executer(
+            """
+            INSERT INTO Site_local (id, site, id_debut, id_fin) VALUES (1, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                site = excluded.site, id_debut = excluded.id_debut, id_fin = excluded.id_fin;
+            """,
+            (site, id_debut, id_fin),
+        )
+        if curseur is None:
+            return False
+        sequence = journal_changements.sequence_courante(db)
+        curseur = db.executer(
+            "INSERT INTO Sync_etat (id, horloge, sequence_base, sequence_estampillee) "
+            "VALUES (1, 0, ?, ?) ON CONFLICT(id) DO NOTHING;",
+            (sequence, sequence),
+        )
+    return curseur is not None
+
+
+def _renumeroter(db: GestionnaireBase, id_debut: int, id_fin: int) -> Optional[int]:
+    """
+    Attribue aux clients hors plage les IDCLIENT libres qui suivent le plus
+    grand de la plage (le journal consigne suppression + ajout).
+
+    :return: Nombre de clients renumérotés, ou None en cas d'échec
+    :raises ValueError: si la plage n'a pas assez d'identifiants libres
+    """
+    hors_plage = [
+        row["IDCLIENT"] for row in db.interroger(
+            "SELECT IDCLIENT FROM Clients WHERE IDCLIENT NOT BETWEEN ? AND ? ORDER BY IDCLIENT;",
+            (id_debut, id_fin),
+        )
+    ]
+    premier = db.interroger(
+        "SELECT COALESCE(MAX(IDCLIENT), ?) + 1 AS premier FROM Clients WHERE IDCLIENT BETWEEN ? AND ?;",
+        (id_debut - 1, id_debut, id_fin),
+    )[0]["premier"]
+    if premier + len(hors_plage) - 1 > id_fin:
+        raise ValueError(
+            f"Plage {id_debut}–{id_fin} trop petite pour renuméroter {len(hors_plage)} client(s)"
+        )
+    curseur = db.executer_plusieurs(
+        "UPDATE Clients SET IDCLIENT = ? WHERE IDCLIENT = ?;",
+        [(premier + rang, idclient) for rang, idclient in enumerate(hors_plage)],
+    )
+    return None if curseur is None else len(hors_plage)
+
+
+# ---------------------------------------------------------------------------
+# Synchronisation
+# ---------------------------------------------------------------------------
+
+def synchroniser(db_a: GestionnaireBase, db_b: GestionnaireBase) -> RapportSync:
+    """
+    Échange dans les deux sens les clients écrits depuis la synchronisation
+    précédente entre deux sites.
+
+    Chaque base est modifiée dans une seule transaction (tout ou rien de
+    son côté). Une synchronisation interrompue entre les deux COMMIT est
+    simplement reprise par la suivante : appliquer deux fois la même
+    version ne change rien.
+
+    :param db_a: Premier site (connecté, configuré)
+    :param db_b: Second site (connecté, configuré)
+    :return:     RapportSync
+    :raises ValueError: si une base n'est pas un site, ou si les deux sites
+                        ont le même numéro ou des plages qui se chevauchent
+    """
+    debut = time.perf_counter()
+    site_a, site_b = _verifier_sites(db_a, db_b)
+    rapport = RapportSync(site_a=site_a.site, site_b=site_b.site)
+
+    with db_a.transaction(), db_b.transaction():
+        # Estampiller d'abord les écritures locales (prend aussi le verrou
+        # d'écriture : aucune autre connexion n'écrit pendant l'échange)
+        _estampiller(db_a, site_a.site)
+        _estampiller(db_b, site_b.site)
+
+        # Tout lire avant d'écrire : les écritures reçues ne repartent pas
+        depuis_a = _sequence_recue(db_b, site_a)
+        depuis_b = _sequence_recue(db_a, site_b)
+        lignes_a, fin_a, complet_a = _collecter(db_a, depuis_a)
+        lignes_b, fin_b, complet_b = _collecter(db_b, depuis_b)
+        rapport.envoyes_a_b, rapport.envoyes_b_a = len(lignes_a), len(lignes_b)
+        rapport.complet = complet_a and complet_b
+        rapport.initial = depuis_a is None or depuis_b is None
+
+        rapport.appliques_b, rejetes_b = _appliquer(db_b, lignes_a)
+        rapport.appliques_a, rejetes_a = _appliquer(db_a, lignes_b)
+        rapport.rejetes = rejetes_a + rejetes_b
+
+        # fin_a / fin_b sont lues avant les écritures reçues : celles-ci
+        # seront renvoyées une fois et ignorées (même estampille). Retenir
+        # la séquence d'après l'application supposerait que l'autre base
+        # a bien validé sa transaction.
+        _memoriser_pair(db_b, site_a, fin_a)
+        _memoriser_pair(db_a, site_b, fin_b)
+        for db in (db_a, db_b):
+            db.executer(
+                "UPDATE Sync_etat SET sequence_estampillee = ? WHERE id = 1;",
+                (journal_changements.sequence_courante(db),),
+            )
+
+    rapport.duree = time.perf_counter() - debut
+    return rapport
+
+
+def _verifier_sites(db_a: GestionnaireBase, db_b: GestionnaireBase) -> tuple[Site, Site]:
+    """Contrôle que les deux bases sont des sites compatibles."""
+    sites = []
+    for db in (db_a, db_b):
+        site = lire_site(db)
+        if site is None:
+            raise ValueError(f"La base {db.chemin_base} n'est pas configurée comme site")
+        sites.append(site)
+    site_a, site_b = sites
+    if site_a.site == site_b.site:
+        raise ValueError(f"Les deux bases portent le même numéro de site ({site_a.site})")
+    if site_a.id_debut <= site_b.id_fin and site_b.id_debut <= site_a.id_fin:
+        raise ValueError(
+            f"Plages d'IDCLIENT qui se chevauchent : {site_a.id_debut}–{site_a.id_fin} "
+            f"et {site_b.id_debut}–{site_b.id_fin}"
+        )
+    return site_a, site_b
+
+
+def _sequence_recue(db: GestionnaireBase, pair: Site) -> Optional[int]:
+    """
+    Dernière séquence du journal de `pair` déjà reçue par `db` ; None pour
+    un nouveau partenaire (premier échange : tous ses clients).
+    """
+    rows = db.interroger("SELECT sequence_recue FROM Sync_pairs WHERE site = ?;", (pair.site,))
+    return rows[0]["sequence_recue"] if rows else None
+
+
+def _memoriser_pair(db: GestionnaireBase, pair: Site, sequence: int) -> None:
+    db.executer(
+        """
+        INSERT INTO Sync_pairs (site, id_debut, id_fin, sequence_recue) VALUES (?, ?, ?, ?)
+        ON CONFLICT(site) DO UPDATE SET
+            id_debut       = excluded.id_debut,
+            id_fin         = excluded.id_fin,
+            sequence_recue = excluded.sequence_recue;
+        """,
+        (pair.site, pair.id_debut, pair.id_fin, sequence),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Estampilles
+# ---------------------------------------------------------------------------
+
+def _lire_estampilles(db: GestionnaireBase, ids: Iterable[int]) -> dict[int, tuple[int, int]]:
+    """{IDCLIENT: (version, site)} des clients estampillés parmi `ids`."""
+    ids = list(ids)
+    estampilles: dict[int, tuple[int, int]] = {}
+    for debut in range(0, len(ids), _TAILLE_LOT_IN):
+        lot = tuple(ids[debut:debut + _TAILLE_LOT_IN])
+        placeholders = ", ".join("?" * len(lot))
+        rows = db.interroger(
+            f"SELECT IDCLIENT, version, site FROM Clients_versions WHERE IDCLIENT IN ({placeholders});",
+            lot,
+        )
+        for row in rows:
+            estampilles[row["IDCLIENT"]] = (row["version"], row["site"])
+    return estampilles
+
+
+def _estampiller(db: GestionnaireBase, site: int) -> None:
+    """
+    Attribue une estampille (horloge + 1, site) aux clients écrits
+    localement depuis la dernière synchronisation.
+    """
+    db.executer("UPDATE Sync_etat SET horloge = horloge + 1 WHERE id = 1;")
+    rows = db.interroger("SELECT horloge, sequence_estampillee FROM Sync_etat WHERE id = 1;")
+    if not rows:
+        return
+    horloge = rows[0]["horloge"]
+
+    delta = journal_changements.changements_depuis(db, rows[0]["sequence_estampillee"])
+    supprimes = list(delta.supprimes)
+    if not delta.complet:
+        # Suppressions purgées du journal : les retrouver dans
+        # Clients_versions (voir le déclencheur Clients_versions_delete)
+        supprimes += [
+            row["IDCLIENT"] for row in db.interroger(
+                "SELECT IDCLIENT FROM Clients_versions WHERE supprime = 0 "
+                "AND IDCLIENT NOT IN (SELECT IDCLIENT FROM Clients);"
+            )
+        ]
+    parametres = (
+        [(idclient, horloge, site, 0) for idclient in delta.inseres + delta.modifies]
+        + [(idclient, horloge, site, 1) for idclient in supprimes]
+    )
+    if parametres:
+        db.executer_plusieurs(_SQL_ESTAMPILLE, parametres)
+
+
+# ---------------------------------------------------------------------------
+# Échange
+# ---------------------------------------------------------------------------
+
+def _collecter(db: GestionnaireBase, depuis: Optional[int]) -> tuple[list[LigneSync], int, bool]:
+    """
+    Clients de `db` écrits après la séquence `depuis`, avec leur estampille.
+
+    :param depuis: Séquence déjà reçue par l'autre site (None = premier
+                   échange : tous les clients, suppressions comprises)
+    :return: (lignes, séquence atteinte, False si le journal était purgé et
+             que tous les clients ont dû être envoyés)
+    """
+    fin = journal_changements.sequence_courante(db)
+    complet = True
+    ids: Optional[list[int]] = None
+    if depuis is not None:
+        delta = journal_changements.changements_depuis(db, depuis)
+        complet = delta.complet
+        if complet:
+            ids = delta.inseres + delta.modifies + delta.supprimes
+    if ids is None:
+        ids = [
+            row["IDCLIENT"] for row in db.interroger(
+                "SELECT IDCLIENT FROM Clients UNION SELECT IDCLIENT FROM Clients_versions;"
+            )
+        ]
+    estampilles = _lire_estampilles(db, ids)
+    clients = ClientDAO.lire_plusieurs(db, ids)
+    lignes = [
+        LigneSync(idclient, *estampilles.get(idclient, ESTAMPILLE_INITIALE), clients.get(idclient))
+        for idclient in ids
+    ]
+    return lignes, fin, complet
+
+
+def _contenu(client: Optional[Client]) -> tuple:
+    """Clé de départage à estampille égale (un client supprimé vaut moins)."""
+    return client.en_tuple_insertion() if client is not None else ()
+
+
+def _appliquer(db: GestionnaireBase, lignes: list[LigneSync]) -> tuple[int, int]:
+    """
+    Applique dans `db` les versions reçues plus récentes que les siennes.
+
+    :return: (clients écrits, versions rejetées car plus anciennes)
+    """
+    if not lignes:
+        return 0, 0
+    locales = _lire_estampilles(db, (ligne.idclient for ligne in lignes))
+    # À estampille égale, le contenu départage : lire les copies locales
+    egales = [
+        ligne.idclient for ligne in lignes
+        if locales.get(ligne.idclient, ESTAMPILLE_INITIALE) == ligne.estampille
+    ]
+    copies = ClientDAO.lire_plusieurs(db, egales) if egales else {}
+
+    fusions: list[tuple] = []
+    suppressions: list[int] = []
+    estampilles: list[tuple] = []
+    rejetes = 0
+    for ligne in lignes:
+        locale = locales.get(ligne.idclient, ESTAMPILLE_INITIALE)
+        if ligne.estampille < locale:
+            rejetes += 1
+            continue
+        if ligne.estampille == locale and _contenu(ligne.client) <= _contenu(copies.get(ligne.idclient)):
+            continue   # déjà à jour (ou la copie locale l'emporte)
+        if ligne.client is None:
+            suppressions.append(ligne.idclient)
+        else:
+            fusions.append((ligne.idclient,) + ligne.client.en_tuple_insertion())
+        estampilles.append((ligne.idclient, ligne.version, ligne.site, int(ligne.client is None)))
+
+    if fusions:
+        db.executer_plusieurs(_SQL_FUSION, fusions)
+        # Ajout ou modification : les abonnés traitent un « update »
+        # inconnu comme un ajout
+        db.publier_changement(MODIFICATION, [parametres[0] for parametres in fusions])
+    for debut in range(0, len(suppressions), _TAILLE_LOT_IN):
+        lot = tuple(suppressions[debut:debut + _TAILLE_LOT_IN])
+        placeholders = ", ".join("?" * len(lot))
+        db.executer(f"DELETE FROM Clients WHERE IDCLIENT IN ({placeholders});", lot)
+    if suppressions:
+        db.publier_changement(SUPPRESSION, suppressions)
+    if estampilles:
+        db.executer_plusieurs(_SQL_ESTAMPILLE, estampilles)
+
+    # Horloge de Lamport : les prochaines écritures locales passeront après
+    db.executer(
+        "UPDATE Sync_etat SET horloge = MAX(horloge, ?) WHERE id = 1;",
+        (max(ligne.version for ligne in lignes),),
+    )
+    return len(estampilles), rejetes
@@ -4,21 +4,40 @@
 #
 # Utilisation :
 #   python seed_data.py [chemin_vers_base.sqlite]
+#       → insère les 10 clients de démonstration
+#   python seed_data.py base.sqlite --nombre 1000000 --graine 42 --oui
+#       → génère 1 million de clients synthétiques (reproductibles)
 #
 # Si aucun chemin n'est fourni, le script crée "demo.sqlite" dans le
-# répertoire courant.
+# répertoire courant. Voir « python seed_data.py --help » pour les options
+# (répartition des villes, dates, crédits, couleurs de cheveux...).
+#
+# Les déclencheurs du journal des changements consignent chaque client
+# inséré : ils doublent environ le coût d'écriture de la génération. Les
+# entrées produites sont retirées à la fin (tout le journal si la base est
+# neuve ou avec --remplacer), ce qui oblige les consommateurs du journal
+# (fenêtres ouvertes, sites synchronisés) à une relecture complète.
 #
 # Ce script est indépendant de l'interface graphique (pas de Tkinter).
 # =============================================================================
 
+import argparse
+import math
+import random
 import sys
 import os
 import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Iterator
 
 # Ajouter le répertoire racine au path pour les imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from core import journal_changements
 from core.database import GestionnaireBase, SQL_CREATE_TABLE_CLIENTS
+from core.config import COULEURS_CHEVEUX
 from models.client_model import Client, ClientDAO
 
 
@@ -144,11 +163,33 @@ CLIENTS_DEMO: list[dict] = [
 # Fonction principale
 # ---------------------------------------------------------------------------
 
-def peupler_base(chemin_base: str) -> None:
+def _confirmer_ajout(db: GestionnaireBase, oui: bool) -> bool:
+    """
+    Demande confirmation si la base contient déjà des clients.
+
+    :param db:  Gestionnaire de base connecté
+    :param oui: Si True, répond « oui » sans poser la question (automatisation)
+    :return:    True si l'ajout peut continuer
+    """
+    nb_existants = ClientDAO.compter(db)
+    if nb_existants == 0 or oui:
+        return True
+    if not sys.stdin.isatty():
+        print(f"La base contient déjà {nb_existants} client(s) : utiliser --oui pour ajouter quand même.")
+        return False
+    reponse = input(
+        f"La base contient déjà {nb_existants} client(s). "
+        "Ajouter quand même les données de démonstration ? (o/N) : "
+    ).strip().lower()
+    return reponse in ("o", "oui", "y", "yes")
+
+
+def peupler_base(chemin_base: str, oui: bool = False) -> None:
     """
     Crée la base SQLite (si inexistante) et insère les clients de démonstration.
 
     :param chemin_base: Chemin vers le fichier .sqlite
+    :param oui:         Si True, ne demande pas de confirmation
     """
     print(f"Base de données cible : {chemin_base}")
 
@@ -157,16 +198,10 @@ def peupler_base(chemin_base: str) -> None:
         print("Erreur : impossible d'ouvrir ou de créer la base.")
         sys.exit(1)
 
-    nb_existants = ClientDAO.compter(db)
-    if nb_existants > 0:
-        reponse = input(
-            f"La base contient déjà {nb_existants} client(s). "
-            "Ajouter quand même les données de démonstration ? (o/N) : "
-        ).strip().lower()
-        if reponse not in ("o", "oui", "y", "yes"):
-            print("Opération annulée.")
-            db.fermer()
-            return
+    if not _confirmer_ajout(db, oui):
+        print("Opération annulée.")
+        db.fermer()
+        return
 
     nb_inseres = 0
     for donnees in CLIENTS_DEMO:
@@ -192,14 +227,286 @@ def peupler_base(chemin_base: str) -> None:
     print(f"\n{nb_inseres}/{len(CLIENTS_DEMO)} clients insérés avec succès.")
 
 
+# ---------------------------------------------------------------------------
+# Génération de clients synthétiques (bases de benchmark)
+# ---------------------------------------------------------------------------
+
+NOMS = [
+    "Martin", "Bernard", "Thomas", "Petit", "Robert", "Richard", "Durand", "Dubois",
+    "Moreau", "Laurent", "Simon", "Michel", "Lefebvre", "Leroy", "Roux", "David",
+    "Bertrand", "Morel", "Fournier", "Girard", "Bonnet", "Dupont", "Lambert", "Fontaine",
+    "Rousseau", "Vincent", "Muller", "Lefevre", "Faure", "Andre", "Mercier", "Blanc",
+    "Guerin", "Boyer", "Garnier", "Chevalier", "Francois", "Legrand", "Gauthier", "Garcia",
+]
+
+PRENOMS = [
+    "Jean", "Marie", "Pierre", "Sophie", "Luc", "Claire", "Anne", "Robert", "Isabelle",
+    "François", "Nathalie", "Philippe", "Catherine", "Nicolas", "Julie", "Michel",
+    "Camille", "Antoine", "Emma", "Louis", "Léa", "Hugo", "Chloé", "Paul", "Manon",
+]
+
+VOIES = [
+    "rue de la Paix", "avenue des Fleurs", "place du Marché", "rue du Commerce",
+    "boulevard Victor Hugo", "chemin des Vignes", "rue Nationale", "allée des Tilleuls",
+    "rue de la Gare", "impasse du Moulin", "rue des Écoles", "avenue Jean Jaurès",
+]
+
+# Ville → (préfixe du code postal, indicatif téléphonique, poids par défaut)
+VILLES: dict[str, tuple[str, str, float]] = {
+    "Paris"       : ("75", "01", 21.0),
+    "Marseille"   : ("13", "04", 8.7),
+    "Lyon"        : ("69", "04", 5.2),
+    "Toulouse"    : ("31", "05", 4.9),
+    "Nice"        : ("06", "04", 3.4),
+    "Nantes"      : ("44", "02", 3.2),
+    "Montpellier" : ("34", "04", 3.0),
+    "Strasbourg"  : ("67", "03", 2.9),
+    "Bordeaux"    : ("33", "05", 2.6),
+    "Lille"       : ("59", "03", 2.3),
+    "Rennes"      : ("35", "02", 2.2),
+    "Reims"       : ("51", "03", 1.8),
+    "Toulon"      : ("83", "04", 1.7),
+    "Grenoble"    : ("38", "04", 1.6),
+    "Dijon"       : ("21", "03", 1.6),
+    "Angers"      : ("49", "02", 1.5),
+    "Bastia"      : ("20", "04", 0.5),
+    "Ajaccio"     : ("20", "04", 0.7),
+}
+
+
+@dataclass
+class RepartitionClients:
+    """
+    Paramètres statistiques de la génération :
+
+      - poids_villes     : {ville: poids} (villes de VILLES)
+      - poids_cheveux    : {couleur: poids}
+      - annee_min/max    : bornes des années de naissance (uniforme)
+      - credit_median    : médiane du crédit disponible (loi log-normale)
+      - credit_sigma     : dispersion (sigma) de la loi log-normale
+      - taux_sans_credit : proportion de clients à crédit nul
+      - taux_bons_clients: proportion de bons clients
+    """
+    poids_villes      : dict[str, float] = field(
+        default_factory=lambda: {ville: poids for ville, (_cp, _tel, poids) in VILLES.items()}
+    )
+    poids_cheveux     : dict[str, float] = field(
+        default_factory=lambda: {"brun": 45.0, "blond": 30.0, "roux": 5.0, "chauve": 20.0}
+    )
+    annee_min         : int   = 1930
+    annee_max         : int   = 2006
+    credit_median     : float = 1200.0
+    credit_sigma      : float = 1.0
+    taux_sans_credit  : float = 0.08
+    taux_bons_clients : float = 0.35
+
+
+def generer_clients(
+    nombre: int,
+    graine: int = 42,
+    repartition: RepartitionClients | None = None,
+) -> Iterator[tuple]:
+    """
+    Génère des clients synthétiques réalistes et déterministes :
+    la même graine produit toujours exactement la même suite de clients.
+
+    :param nombre:      Nombre de clients à générer
+    :param graine:      Graine du générateur pseudo-aléatoire
+    :param repartition: Paramètres statistiques (None = valeurs par défaut)
+    :return:            Itérateur de tuples d'insertion
+                        (ordre de Client.en_tuple_insertion())
+    """
+    repartition = repartition or RepartitionClients()
+    inconnues = set(repartition.poids_villes) - set(VILLES)
+    if inconnues:
+        raise ValueError(f"Villes inconnues : {', '.join(sorted(inconnues))}")
+    inconnues = set(repartition.poids_cheveux) - set(COULEURS_CHEVEUX)
+    if inconnues:
+        raise ValueError(f"Couleurs de cheveux inconnues : {', '.join(sorted(inconnues))}")
+
+    alea = random.Random(graine)
+    villes = list(repartition.poids_villes)
+    cumul_villes = _cumuler(repartition.poids_villes.values())
+    cheveux = list(repartition.poids_cheveux)
+    cumul_cheveux = _cumuler(repartition.poids_cheveux.values())
+
+    jour_min = date(repartition.annee_min, 1, 1).toordinal()
+    jour_max = date(repartition.annee_max, 12, 31).toordinal()
+    mu = math.log(repartition.credit_median)
+
+    for _ in range(nombre):
+        ville = alea.choices(villes, cum_weights=cumul_villes)[0]
+        prefixe_cp, indicatif, _poids = VILLES[ville]
+        nom = f"{alea.choice(NOMS)} {alea.choice(PRENOMS)}"
+        telephone = (
+            f"{indicatif} {alea.randrange(100):02d} {alea.randrange(100):02d} "
+            f"{alea.randrange(100):02d} {alea.randrange(100):02d}"
+        )
+        adresse = f"{alea.randrange(1, 200)} {alea.choice(VOIES)}"
+        code_postal = f"{prefixe_cp}{alea.randrange(1000):03d}"
+        naissance = date.fromordinal(alea.randint(jour_min, jour_max)).isoformat()
+        if alea.random() < repartition.taux_sans_credit:
+            credit = 0.0
+        else:
+            credit = round(alea.lognormvariate(mu, repartition.credit_sigma), 2)
+        bon_client = 1 if alea.random() < repartition.taux_bons_clients else 0
+        couleur = alea.choices(cheveux, cum_weights=cumul_cheveux)[0]
+        yield (nom, telephone, adresse, code_postal, ville, naissance, credit, bon_client, couleur)
+
+
+def _cumuler(poids) -> list[float]:
+    """Poids cumulés (pour random.choices(cum_weights=...))."""
+    cumul: list[float] = []
+    total = 0.0
+    for valeur in poids:
+        total += valeur
+        cumul.append(total)
+    return cumul
+
+
+def peupler_synthetique(
+    chemin_base: str,
+    nombre: int,
+    graine: int = 42,
+    repartition: RepartitionClients | None = None,
+    taille_lot: int = 10000,
+    oui: bool = False,
+    remplacer: bool = False,
+) -> int:
+    """
+    Insère des clients synthétiques par lots (executemany + transactions).
+
+    :param chemin_base: Chemin vers le fichier .sqlite
+    :param nombre:      Nombre de clients à générer
+    :param graine:      Graine du générateur (reproductibilité)
+    :param repartition: Paramètres statistiques
+    :param taille_lot:  Clients insérés par transaction
+    :param oui:         Si True, ne demande pas de confirmation
+    :param remplacer:   Si True, vide la table Clients avant la génération
+    :return:            Nombre de clients insérés
+    """
+    print(f"Base de données cible : {chemin_base}")
+
+    db = GestionnaireBase()
+    if not db.ouvrir(chemin_base):
+        print("Erreur : impossible d'ouvrir ou de créer la base.")
+        sys.exit(1)
+
+    # Journal jamais utilisé : base créée à l'instant, aucun consommateur
+    sequence_avant = journal_changements.sequence_courante(db)
+    if remplacer:
+        db.executer("DELETE FROM Clients;")
+    elif not _confirmer_ajout(db, oui):
+        print("Opération annulée.")
+        db.fermer()
+        return 0
+
+    # Construction d'une base de test : on privilégie le débit d'écriture.
+    # Un arrêt brutal pendant la génération peut laisser une base à refaire.
+    db.connexion.execute("PRAGMA synchronous = OFF;")
+
+    debut = time.perf_counter()
+    nb_inseres = 0
+    progression = ""
+    lot: list[tuple] = []
+    for valeurs in generer_clients(nombre, graine, repartition):
+        lot.append(valeurs)
+        if len(lot) >= taille_lot:
+            nb_inseres += len(ClientDAO.creer_lot_valeurs(db, lot))
+            lot = []
+            progression = f"  {nb_inseres}/{nombre} clients insérés"
+            print(f"\r{progression}", end="", flush=True)
+    if lot:
+        nb_inseres += len(ClientDAO.creer_lot_valeurs(db, lot))
+
+    # Le journal des changements a reçu une entrée par client créé (et par
+    # client supprimé avec --remplacer). Base neuve ou remplacée : tout le
+    # journal est purgé ; sinon seules les entrées de cette génération, les
+    # changements antérieurs restant dus aux autres sites
+    if sequence_avant == 0 or remplacer:
+        journal_changements.purger(db)
+    else:
+        journal_changements.purger(db, depuis=sequence_avant)
+    db.fermer()
+    duree = time.perf_counter() - debut
+    bilan = f"{nb_inseres}/{nombre} clients insérés en {duree:.1f} s (graine {graine})."
+    # Le bilan remplace la ligne de progression (complétée par des espaces)
+    print(f"\r{bilan.ljust(len(progression))}")
+    return nb_inseres
+
+
+def _analyser_poids(texte: str) -> dict[str, float]:
+    """Analyse « brun=4,blond=3,roux=1 » en dictionnaire de poids."""
+    poids: dict[str, float] = {}
+    for element in texte.split(","):
+        cle, _, valeur = element.partition("=")
+        if not cle.strip():
+            continue
+        try:
+            poids[cle.strip()] = float(valeur) if valeur else 1.0
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Poids invalide : {element!r}") from None
+    return poids
+
+
+def _construire_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Peuple une base SQLite avec des clients de démonstration ou synthétiques.",
+    )
+    parser.add_argument("base", nargs="?", help="Fichier .sqlite (défaut : demo.sqlite du projet)")
+    parser.add_argument("--nombre", type=int, help="Générer N clients synthétiques au lieu des 10 clients de démonstration")
+    parser.add_argument("--graine", type=int, default=42, help="Graine du générateur (défaut : 42)")
+    parser.add_argument("--lot", type=int, default=10000, help="Clients par transaction (défaut : 10000)")
+    parser.add_argument("--oui", action="store_true", help="Ne jamais demander de confirmation")
+    parser.add_argument("--remplacer", action="store_true", help="Vider la table Clients avant la génération")
+    parser.add_argument("--villes", type=_analyser_poids, help="Poids des villes, ex : Paris=5,Lyon=2")
+    parser.add_argument("--cheveux", type=_analyser_poids, help="Poids des couleurs, ex : brun=4,blond=3,roux=1,chauve=2")
+    parser.add_argument("--annees", help="Années de naissance, ex : 1940-2005")
+    parser.add_argument("--credit-median", type=float, help="Crédit médian (défaut : 1200)")
+    parser.add_argument("--credit-sigma", type=float, help="Dispersion log-normale du crédit (défaut : 1.0)")
+    parser.add_argument("--taux-bons", type=float, help="Proportion de bons clients (défaut : 0.35)")
+    return parser
+
+
+def _repartition_depuis_arguments(args: argparse.Namespace) -> RepartitionClients:
+    repartition = RepartitionClients()
+    if args.villes:
+        repartition.poids_villes = args.villes
+    if args.cheveux:
+        repartition.poids_cheveux = args.cheveux
+    if args.annees:
+        debut, _, fin = args.annees.partition("-")
+        repartition.annee_min, repartition.annee_max = int(debut), int(fin or debut)
+    if args.credit_median is not None:
+        repartition.credit_median = args.credit_median
+    if args.credit_sigma is not None:
+        repartition.credit_sigma = args.credit_sigma
+    if args.taux_bons is not None:
+        repartition.taux_bons_clients = args.taux_bons
+    return repartition
+
+
 # ---------------------------------------------------------------------------
 # Point d'entrée
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        chemin = sys.argv[1]
-    else:
-        chemin = os.path.join(os.path.dirname(os.path.abspath(__file__)), "demo.sqlite")
+    arguments = _construire_parser().parse_args()
+    chemin = arguments.base or os.path.join(os.path.dirname(os.path.abspath(__file__)), "demo.sqlite")
 
-    peupler_base(chemin)
+    if arguments.nombre is None:
+        peupler_base(chemin, oui=arguments.oui)
+    else:
+        try:
+            peupler_synthetique(
+                chemin,
+                arguments.nombre,
+                graine=arguments.graine,
+                repartition=_repartition_depuis_arguments(arguments),
+                taille_lot=arguments.lot,
+                oui=arguments.oui,
+                remplacer=arguments.remplacer,
+            )
+        except ValueError as erreur:
+            print(f"Erreur : {erreur}")
+            sys.exit(2)
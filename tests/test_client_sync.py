@@ -0,0 +1,81 @@
+# =============================================================================
+# tests/test_client_sync.py
+# Synchronisation de deux bases créées séparément : chacune numérote ses
+# clients à partir de 1, sans copie commune. La configuration doit refuser
+# les clients hors plage (ou les renuméroter), et le premier échange doit
+# transmettre le contenu initial des deux côtés sans rien écraser.
+# =============================================================================
+
+import os
+import sys
+
+import pytest
+
+# Répertoire racine du projet (dossier parent de /tests)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from core.database import GestionnaireBase, rapporter_par_exception
+from models.client_model import ClientDAO
+from models.client_sync import configurer_site, synchroniser
+from seed_data import generer_clients
+
+
+def _base_agence(chemin: str, nombre: int, graine: int) -> GestionnaireBase:
+    """Base d'agence indépendante : clients numérotés 1..nombre."""
+    db = GestionnaireBase(rapporteur=rapporter_par_exception)
+    db.ouvrir(chemin)
+    ClientDAO.creer_lot_valeurs(db, list(generer_clients(nombre, graine)))
+    return db
+
+
+def _contenus(db: GestionnaireBase) -> dict[int, tuple]:
+    return {client.idclient: client.en_tuple_insertion() for client in ClientDAO.rechercher(db)}
+
+
+@pytest.fixture
+def agences(tmp_path):
+    paris = _base_agence(str(tmp_path / "paris.sqlite"), 20, graine=1)
+    lyon = _base_agence(str(tmp_path / "lyon.sqlite"), 15, graine=2)
+    yield paris, lyon
+    paris.fermer()
+    lyon.fermer()
+
+
+def test_configuration_refusee_hors_plage(agences) -> None:
+    _paris, lyon = agences
+    with pytest.raises(ValueError, match="hors de la plage"):
+        configurer_site(lyon, 2, 1000, 1999)
+
+
+def test_synchronisation_de_bases_independantes(agences) -> None:
+    paris, lyon = agences
+    initiaux_paris = _contenus(paris)
+    initiaux_lyon = list(_contenus(lyon).values())
+
+    configurer_site(paris, 1, 1, 999)
+    configurer_site(lyon, 2, 1000, 1999, renumeroter=True)
+    assert sorted(_contenus(lyon)) == list(range(1000, 1015))
+
+    rapport = synchroniser(paris, lyon)
+    assert rapport.initial
+    assert (rapport.envoyes_a_b, rapport.envoyes_b_a) == (20, 15)
+
+    # Aucun client écrasé : les deux sites ont les 35 clients d'origine
+    fusion = _contenus(paris)
+    assert fusion == _contenus(lyon)
+    assert len(fusion) == 35
+    assert all(fusion[idclient] == valeurs for idclient, valeurs in initiaux_paris.items())
+    assert sorted(valeurs for idclient, valeurs in fusion.items() if idclient >= 1000) == sorted(initiaux_lyon)
+
+    # Les clients reçus reviennent une fois, sans être réécrits
+    rapport = synchroniser(paris, lyon)
+    assert not rapport.initial
+    assert (rapport.appliques_a, rapport.appliques_b) == (0, 0)
+
+    # Synchronisations suivantes : seulement les changements
+    ClientDAO.modifier_en_masse(lyon, {"ville": "Lyon"}, ids=[1003])
+    rapport = synchroniser(paris, lyon)
+    assert (rapport.envoyes_a_b, rapport.envoyes_b_a) == (0, 1)
+    assert rapport.appliques_a == 1
+    assert _contenus(paris) == _contenus(lyon)
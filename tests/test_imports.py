@@ -0,0 +1,33 @@
+# =============================================================================
+# tests/test_imports.py
+# Les couches données et modèle s'importent sans Tkinter (serveurs sans
+# affichage, traitements par lots) : chaque import est vérifié dans un
+# processus neuf, où aucun module n'a encore été chargé.
+# =============================================================================
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Répertoire racine du projet (dossier parent de /tests)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _modules_tkinter_apres_import(module: str) -> list[str]:
+    """Modules tkinter chargés par `import module` dans un nouveau processus."""
+    script = (
+        f"import sys, {module}\n"
+        "print(','.join(nom for nom in sys.modules if nom == 'tkinter' or nom.startswith('tkinter.')))"
+    )
+    resultat = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True,
+    )
+    return [nom for nom in resultat.stdout.strip().split(",") if nom]
+
+
+@pytest.mark.parametrize("module", ["models.client_model", "core.database"])
+def test_import_sans_tkinter(module: str) -> None:
+    assert _modules_tkinter_apres_import(module) == []
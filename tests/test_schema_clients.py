@@ -0,0 +1,33 @@
+# =============================================================================
+# tests/test_schema_clients.py
+# Validation commune (saisie, imports) : une valeur absente — null JSON,
+# NULL SQL — est traitée comme un champ vide, donc refusée pour un champ
+# obligatoire, et jamais acceptée sous la forme du texte « None ».
+# =============================================================================
+
+import os
+import sys
+
+import pytest
+
+# Répertoire racine du projet (dossier parent de /tests)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from core.schema_clients import valider_enregistrement
+
+
+@pytest.mark.parametrize("tolerant", [False, True])
+def test_nom_absent_refuse(tolerant: bool) -> None:
+    valeurs, erreurs = valider_enregistrement({"nom_client": None}, tolerant=tolerant)
+    assert valeurs is None
+    assert "Le nom du client est obligatoire." in erreurs
+
+
+@pytest.mark.parametrize("tolerant", [False, True])
+def test_champs_absents_refuses(tolerant: bool) -> None:
+    champs = ("nom_client", "numero_telephone", "adresse", "code_postal", "ville", "date_naissance")
+    valeurs, erreurs = valider_enregistrement(dict.fromkeys(champs), tolerant=tolerant)
+    assert valeurs is None
+    assert len(erreurs) >= len(champs)
+    assert not any("None" in erreur for erreur in erreurs)
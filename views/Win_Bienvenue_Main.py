@@ -9,12 +9,23 @@
 
 from __future__ import annotations
 
+import os
+import time
 import tkinter as tk
 from tkinter import ttk
 
-from core.config import COULEURS, POLICES, FENETRES
+from core import profilage
+from core.config import COULEURS, POLICES, FENETRES, INTEGRITE_A_L_OUVERTURE
 from classes.base_window import FenetreBase
+from classes.ecriture_copie_memoire import EcritureCopieMemoire
+from classes.maintenance_inactivite import MaintenanceInactivite
+from classes.registre_images import registre_images
+from classes.sauvegarde_planifiee import SauvegardePlanifiee
+from classes.sonde_changements import SondeChangementsExternes
+from classes.surveillance_tk import SurveillanceBoucleTk
+from classes.verification_integrite import VerificationIntegrite
 from controllers.bienvenue_controller import BienvenueController
+from views import prechauffer_vues
 
 
 class FenetreBienvenue(tk.Tk):
@@ -22,7 +33,7 @@ class FenetreBienvenue(tk.Tk):
     Fenêtre principale de ProgPythonExpl.
 
     Elle gère :
-      - Le menu déroulant « Fichier » (Créer/Ouvrir/Fermer base, Quitter)
+      - Le menu déroulant « Fichier » (Créer/Ouvrir/Fermer/Sauvegarder base, Quitter)
       - Le menu déroulant « Actions » (Gestion clients, Sélections)
       - Une zone centrale affichant l'état de la connexion
       - Une zone de résultats pour les retours des sélections
@@ -56,6 +67,58 @@ class FenetreBienvenue(tk.Tk):
         # Gestion de la fermeture via la croix
         self.protocol("WM_DELETE_WINDOW", self._ctrl.quitter_programme)
 
+        # Détection des blocages de l'interface (si activée par
+        # PROGPYTHONEXPL_SURVEILLANCE_MS) : pile + requête SQL en cours
+        self._surveillance = SurveillanceBoucleTk.depuis_environnement(
+            self, fournir_sql=lambda: self._ctrl.db.requete_en_cours
+        )
+        if self._surveillance is not None:
+            self._surveillance.demarrer()
+
+        # Écritures d'un autre processus sur la base ouverte : diffusées
+        # aux fenêtres par le bus de changements (voir on_base_ouverte)
+        self._sonde_changements = SondeChangementsExternes(self, self._ctrl.db)
+
+        # Sauvegardes à chaud (menu Fichier et planification), copiées dans
+        # un thread de travail : seul l'avancement est affiché ici
+        self._sauvegarde = SauvegardePlanifiee(
+            self, self._ctrl.db,
+            en_cours=self.on_sauvegarde_progression,
+            a_la_fin=self.on_sauvegarde_terminee,
+        )
+
+        # Maintenance planifiée (ANALYZE, pages libres...), par tranches
+        # courtes quand la boucle Tk est inactive
+        self._maintenance = MaintenanceInactivite(
+            self, self._ctrl.db, a_la_fin=self.on_maintenance_terminee
+        )
+
+        # Intégrité de chaque base ouverte (quick_check en arrière-plan,
+        # connexion en lecture seule) et récupération des lignes lisibles
+        self._integrite = VerificationIntegrite(
+            self,
+            a_la_verification=self.on_integrite_verifiee,
+            a_la_recuperation=self.on_recuperation_terminee,
+            en_cours=self.on_recuperation_progression,
+        )
+
+        # Copie de travail en mémoire (si PROGPYTHONEXPL_COPIE_MEMOIRE est
+        # définie) : réécrite périodiquement dans le fichier, en arrière-plan
+        self._ecriture_copie = EcritureCopieMemoire(
+            self, self._ctrl.db, a_la_fin=self.on_copie_ecrite
+        )
+
+        # Mode profilage : variable PROGPYTHONEXPL_PROFILAGE, ou raccourci
+        # caché Ctrl+Maj+P (bascule marche / arrêt)
+        self.bind_all("<Control-Shift-KeyPress-P>", lambda _e: self._ctrl.basculer_profilage())
+        if profilage.demarrer_depuis_environnement():
+            self.on_profilage_change(True)
+
+        # Fenêtres filles et leurs icônes chargées en arrière-plan,
+        # une fois celle-ci affichée
+        prechauffer_vues(self)
+        registre_images(self).precharger()
+
     # ------------------------------------------------------------------
     # Construction de l'interface
     # ------------------------------------------------------------------
@@ -84,6 +147,21 @@ class FenetreBienvenue(tk.Tk):
             command=self._ctrl.fermer_base,
             state=tk.DISABLED,  # Inactif tant que aucune base n'est ouverte
         )
+        self._menu_fichier.add_command(
+            label="Sauvegarder Base",
+            command=self._ctrl.sauvegarder_base,
+            state=tk.DISABLED,
+        )
+        self._menu_fichier.add_command(
+            label="Vérifier l'intégrité",
+            command=self._ctrl.verifier_integrite,
+            state=tk.DISABLED,
+        )
+        self._menu_fichier.add_command(
+            label="Récupérer les données…",
+            command=self._ctrl.recuperer_donnees,
+            state=tk.DISABLED,
+        )
         self._menu_fichier.add_separator()
         self._menu_fichier.add_command(
             label="Quitter Programme",
@@ -159,6 +237,50 @@ class FenetreBienvenue(tk.Tk):
         )
         self._lbl_statut.pack(side=tk.LEFT, padx=10)
 
+        # ── Dernière sauvegarde (non bloquant, mis à jour par la copie) ─
+        self._lbl_sauvegarde = tk.Label(
+            cadre_principal,
+            text="",
+            font=POLICES["petite"],
+            bg=COULEURS["fond_principal"],
+            fg=COULEURS["texte_principal"],
+            anchor=tk.W,
+        )
+        self._lbl_sauvegarde.pack(fill=tk.X)
+
+        # ── Dernière maintenance (rapport avant / après) ──────────────
+        self._lbl_maintenance = tk.Label(
+            cadre_principal,
+            text="",
+            font=POLICES["petite"],
+            bg=COULEURS["fond_principal"],
+            fg=COULEURS["texte_principal"],
+            anchor=tk.W,
+        )
+        self._lbl_maintenance.pack(fill=tk.X)
+
+        # ── Intégrité de la base (vérifiée en arrière-plan) ───────────
+        self._lbl_integrite = tk.Label(
+            cadre_principal,
+            text="",
+            font=POLICES["petite"],
+            bg=COULEURS["fond_principal"],
+            fg=COULEURS["texte_principal"],
+            anchor=tk.W,
+        )
+        self._lbl_integrite.pack(fill=tk.X)
+
+        # ── Copie de travail en mémoire (dernière écriture du fichier) ─
+        self._lbl_copie = tk.Label(
+            cadre_principal,
+            text="",
+            font=POLICES["petite"],
+            bg=COULEURS["fond_principal"],
+            fg=COULEURS["texte_principal"],
+            anchor=tk.W,
+        )
+        self._lbl_copie.pack(fill=tk.X)
+
         # ── Zone de résultats de sélection ────────────────────────────
         tk.Label(
             cadre_principal,
@@ -222,12 +344,38 @@ class FenetreBienvenue(tk.Tk):
         self._menu_fichier.entryconfig("Créer Base",  state=tk.DISABLED)
         self._menu_fichier.entryconfig("Ouvrir Base", state=tk.DISABLED)
         self._menu_fichier.entryconfig("Fermer Base", state=tk.NORMAL)
+        self._menu_fichier.entryconfig("Sauvegarder Base", state=tk.NORMAL)
+        self._menu_fichier.entryconfig("Vérifier l'intégrité", state=tk.NORMAL)
+        self._menu_fichier.entryconfig("Récupérer les données…", state=tk.NORMAL)
 
         # Activer le menu Actions
         self._barre_menu.entryconfig("Actions", state=tk.NORMAL)
 
+        self._sonde_changements.demarrer()
+        self._sauvegarde.demarrer()
+        self._maintenance.demarrer()
+        self._ecriture_copie.demarrer()
+        if self._ecriture_copie.active:
+            self._lbl_copie.configure(
+                text=f"Copie de travail en mémoire : écrite dans le fichier toutes les "
+                     f"{self._ctrl.db.copie_memoire.intervalle_s:g} s et à la fermeture ; "
+                     f"les écritures des autres programmes ne sont pas suivies",
+                fg=COULEURS["texte_principal"],
+            )
+        if INTEGRITE_A_L_OUVERTURE:
+            self.lancer_verification_integrite()
+
     def on_base_fermee(self) -> None:
         """Met à jour l'interface après la fermeture de la base."""
+        self._sonde_changements.arreter()
+        self._sauvegarde.arreter()
+        self._maintenance.arreter()
+        self._ecriture_copie.arreter()
+        self._lbl_copie.configure(text="")
+        # Une récupération lit le fichier sur sa propre connexion : elle continue
+        if not self._integrite.recuperation_en_cours:
+            self._integrite.annuler()
+            self._lbl_integrite.configure(text="")
         self._lbl_statut.configure(
             text="Aucune base ouverte",
             fg=COULEURS["texte_erreur"],
@@ -237,6 +385,9 @@ class FenetreBienvenue(tk.Tk):
         self._menu_fichier.entryconfig("Créer Base",  state=tk.NORMAL)
         self._menu_fichier.entryconfig("Ouvrir Base", state=tk.NORMAL)
         self._menu_fichier.entryconfig("Fermer Base", state=tk.DISABLED)
+        self._menu_fichier.entryconfig("Sauvegarder Base", state=tk.DISABLED)
+        self._menu_fichier.entryconfig("Vérifier l'intégrité", state=tk.DISABLED)
+        self._menu_fichier.entryconfig("Récupérer les données…", state=tk.DISABLED)
         self._barre_menu.entryconfig("Actions",       state=tk.DISABLED)
 
     def afficher_resultat_selection(self, resultat) -> None:
@@ -256,6 +407,178 @@ class FenetreBienvenue(tk.Tk):
 
         self._txt_resultat.configure(state=tk.DISABLED)
 
+    def lancer_sauvegarde(self) -> bool:
+        """
+        Lance une sauvegarde à chaud de la base ouverte (sans attendre).
+
+        :return: False si une sauvegarde est déjà en cours
+        """
+        if not self._sauvegarde.sauvegarder_maintenant():
+            return False
+        self.on_sauvegarde_progression(0, 0)
+        return True
+
+    def on_sauvegarde_progression(self, copiees: int, total: int) -> None:
+        """Affiche l'avancement de la copie en cours."""
+        avancement = f" {copiees * 100 // total} %" if total else ""
+        self._lbl_sauvegarde.configure(
+            text=f"Sauvegarde en cours…{avancement}",
+            fg=COULEURS["texte_principal"],
+        )
+
+    def on_sauvegarde_terminee(self, rapport) -> None:
+        """
+        Affiche le résultat d'une sauvegarde (RapportSauvegarde).
+
+        :param rapport: Bilan transmis par SauvegardePlanifiee
+        """
+        if rapport.reussie:
+            self._lbl_sauvegarde.configure(
+                text=f"Dernière sauvegarde : {os.path.basename(rapport.chemin)} "
+                     f"({rapport.taille / 1_048_576:.1f} Mo, {rapport.duree:.1f} s)",
+                fg="#27AE60",
+            )
+        else:
+            self._lbl_sauvegarde.configure(
+                text=f"Sauvegarde en échec : {rapport.erreur}",
+                fg=COULEURS["texte_erreur"],
+            )
+
+    def on_maintenance_terminee(self, rapport) -> None:
+        """
+        Affiche le résultat d'une maintenance (RapportMaintenance).
+
+        :param rapport: Bilan transmis par MaintenanceInactivite
+        """
+        if not rapport.reussie:
+            self._lbl_maintenance.configure(
+                text=f"Maintenance en échec : {rapport.erreur}",
+                fg=COULEURS["texte_erreur"],
+            )
+            return
+        faites = sum(1 for tache in rapport.taches if tache.terminee)
+        suite = " (reprise à la prochaine)" if rapport.interrompue else ""
+        self._lbl_maintenance.configure(
+            text=f"Dernière maintenance : {rapport.avant.taille / 1_048_576:.1f} → "
+                 f"{rapport.apres.taille / 1_048_576:.1f} Mo, "
+                 f"{faites}/{len(rapport.taches)} tâche(s), {rapport.duree:.2f} s{suite}",
+            fg=COULEURS["texte_principal"],
+        )
+
+    def lancer_verification_integrite(self, complete: bool = False) -> bool:
+        """
+        Vérifie l'intégrité de la base ouverte en arrière-plan.
+
+        :param complete: integrity_check (index compris) au lieu de quick_check
+        :return:         False si une récupération est en cours
+        """
+        if not self._integrite.verifier(self._ctrl.db.chemin_base, complete=complete):
+            return False
+        self._lbl_integrite.configure(
+            text="Intégrité : vérification en cours…",
+            fg=COULEURS["texte_principal"],
+        )
+        return True
+
+    def lancer_recuperation(self, source: str, destination: str) -> bool:
+        """
+        Copie les lignes lisibles de `source` dans `destination` (sans attendre).
+
+        :return: False si une vérification ou une récupération est en cours
+        """
+        if not self._integrite.recuperer(source, destination):
+            return False
+        self._lbl_integrite.configure(
+            text="Récupération en cours…",
+            fg=COULEURS["texte_principal"],
+        )
+        return True
+
+    def on_integrite_verifiee(self, rapport) -> None:
+        """
+        Affiche le résultat d'une vérification (RapportIntegrite).
+
+        :param rapport: Bilan transmis par VerificationIntegrite
+        """
+        controle = "integrity_check" if rapport.complete else "quick_check"
+        if rapport.saine:
+            self._lbl_integrite.configure(
+                text=f"Intégrité : OK ({controle}, {rapport.duree:.1f} s)",
+                fg="#27AE60",
+            )
+        elif rapport.problemes:
+            self._lbl_integrite.configure(
+                text=f"Base endommagée : {len(rapport.problemes)} problème(s) ({controle}) — "
+                     f"Fichier → Récupérer les données…",
+                fg=COULEURS["texte_erreur"],
+            )
+        else:
+            self._lbl_integrite.configure(
+                text=f"Intégrité non vérifiée : {rapport.erreur}",
+                fg=COULEURS["texte_erreur"],
+            )
+
+    def on_recuperation_progression(self, lues: int, total: int) -> None:
+        """Affiche l'avancement de la récupération en cours."""
+        self._lbl_integrite.configure(
+            text=f"Récupération en cours… {lues * 100 // total} %",
+            fg=COULEURS["texte_principal"],
+        )
+
+    def on_recuperation_terminee(self, rapport) -> None:
+        """
+        Affiche le résultat d'une récupération (RapportRecuperation).
+
+        :param rapport: Bilan transmis par VerificationIntegrite
+        """
+        if rapport.reussie:
+            self._lbl_integrite.configure(
+                text=f"Récupération : {rapport.ecrites} client(s) → {os.path.basename(rapport.destination)} "
+                     f"({len(rapport.zones_illisibles)} zone(s) illisible(s), {rapport.rejetees} rejeté(s))",
+                fg="#27AE60",
+            )
+        else:
+            self._lbl_integrite.configure(
+                text=f"Récupération en échec : {rapport.erreur}",
+                fg=COULEURS["texte_erreur"],
+            )
+
+    def on_copie_ecrite(self, rapport) -> None:
+        """
+        Affiche le résultat d'une écriture de la copie de travail (RapportEcriture).
+
+        :param rapport: Bilan transmis par EcritureCopieMemoire
+        """
+        if rapport.reussie:
+            self._lbl_copie.configure(
+                text=f"Copie de travail écrite dans le fichier à {time.strftime('%H:%M:%S')} "
+                     f"({rapport.pages} pages, {rapport.duree:.1f} s)",
+                fg="#27AE60",
+            )
+        else:
+            self._lbl_copie.configure(
+                text=f"Copie de travail non écrite : {rapport.erreur}",
+                fg=COULEURS["texte_erreur"],
+            )
+
+    def on_profilage_change(self, actif: bool) -> None:
+        """Signale le mode profilage dans la barre de titre."""
+        titre = FENETRES["bienvenue"]["titre"]
+        self.title(f"{titre} [profilage]" if actif else titre)
+
+    def destroy(self) -> None:
+        """Arrête sondes, tâches de fond et profilage avant de détruire la fenêtre."""
+        self._sonde_changements.arreter()
+        self._sauvegarde.fermer()
+        self._maintenance.arreter()
+        self._integrite.annuler()
+        self._ecriture_copie.arreter()
+        if self._surveillance is not None:
+            self._surveillance.arreter()
+            self._surveillance = None
+        profilage.arreter_profilage()
+        super().destroy()
+
     # ------------------------------------------------------------------
     # Utilitaires
     # ------------------------------------------------------------------
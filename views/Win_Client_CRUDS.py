@@ -2,22 +2,29 @@
 # views/Win_Client_CRUDS.py
 # Fenêtre de gestion des clients : Win_Client_CRUDS
 # Titre affiché : "Opérations Possibles"
+#
+# La fenêtre est abonnée au bus de changements de la base (db.bus) : après
+# un ajout, une modification ou une suppression (par cette fenêtre, une
+# fiche ou toute autre fenêtre), seules les lignes concernées du tableau
+# sont mises à jour ; la recherche n'est pas relancée.
 # =============================================================================
 
 from __future__ import annotations
 
+import bisect
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Optional
 
+from core import profilage
 from core.config import (
     COULEURS, POLICES, FENETRES, ICONE_TAILLE,
     MODE_STANDARD, MODE_SELECTION_SIMPLE, MODE_SELECTION_MULTI,
 )
 from core.database import GestionnaireBase
+from core.evenements import SUPPRESSION, Changement
 from classes.base_window import FenetreBase
 from controllers.cruds_controller import CRUDSController
-from fonctionsgen.fonctionsgen import formater_credit, formater_date_affichage, formater_booleen
 
 
 # Colonnes affichées dans le tableau (nom_colonne, libellé, largeur_px)
@@ -33,6 +40,13 @@ COLONNES_TABLEAU = [
     ("couleur_cheveux",   "Cheveux",      80),
 ]
 
+# Lignes recolorées (alternance pair / impair) par passage en temps mort
+TAILLE_TRANCHE_COULEURS = 2000
+
+# Au-delà de ce nombre de clients changés d'un coup (modification en masse,
+# synchronisation, import), le tableau est rechargé en une seule recherche
+SEUIL_RECHARGEMENT = 500
+
 
 class FenetreCRUDS(FenetreBase):
     """
@@ -60,6 +74,16 @@ class FenetreCRUDS(FenetreBase):
         self._ctrl = CRUDSController(self, db)
 
         self.resultat_selection = None
+        # IDCLIENT du tableau, dans l'ordre d'affichage (navigation de la fiche),
+        # et noms correspondants (position d'insertion d'un client)
+        self._ids_affiches: list[int] = []
+        self._noms_affiches: list[str] = []
+        # IDCLIENT -> indice dans _ids_affiches
+        self._positions: dict[int, int] = {}
+        self._terme = ""
+        # Recoloration différée après une mise à jour ciblée
+        self._coloration_depuis: Optional[int] = None
+        self._id_coloration: Optional[str] = None
         self._images_boutons: dict[str, Optional[tk.PhotoImage]] = {}
 
         # Compteur de clics pour détecter le double-clic manuellement
@@ -69,6 +93,9 @@ class FenetreCRUDS(FenetreBase):
         self._construire_interface()
         self.rafraichir_tableau()
 
+        self._desabonner = db.bus.abonner(self._on_changement)
+        self.bind("<Destroy>", self._on_destruction, add="+")
+
     # ------------------------------------------------------------------
     # Construction de l'interface
     # ------------------------------------------------------------------
@@ -173,6 +200,7 @@ class FenetreCRUDS(FenetreBase):
             ("Base_delete.png", "Supprimer",     self._on_supprimer,         True,  False),
             ("Base_read.png",   "Consulter",     self._on_consulter,         True,  True),
             ("Base_search.png", "Rechercher",    self._on_rechercher,        True,  True),
+            ("Base_save.png",   "Exporter",      self._on_exporter,          True,  False),
             ("Base_select.png", "Selectionner",  self._on_selectionner,      False, True),
             ("zone_exit.png",   "Quitter",       self._on_fermeture,         True,  True),
         ]
@@ -230,29 +258,175 @@ class FenetreCRUDS(FenetreBase):
     # ------------------------------------------------------------------
 
     def rafraichir_tableau(self, terme: str = "") -> None:
-        for item in self._tableau.get_children():
-            self._tableau.delete(item)
-
-        clients = self._ctrl.rechercher(terme)
-
-        for i, client in enumerate(clients):
-            tag = "pair" if i % 2 == 0 else "impair"
-            self._tableau.insert(
-                "", tk.END,
-                iid=str(client.idclient),
-                values=(
-                    client.idclient,
-                    client.nom_client,
-                    client.numero_telephone,
-                    client.ville,
-                    client.code_postal,
-                    formater_date_affichage(client.date_naissance),
-                    formater_credit(client.credit_disponible),
-                    formater_booleen(client.bon_client),
-                    client.couleur_cheveux,
-                ),
-                tags=(tag,),
-            )
+        self._terme = terme
+        self._coloration_depuis = None
+        with profilage.span("rechercher", terme=terme) as trace:
+            for item in self._tableau.get_children():
+                self._tableau.delete(item)
+
+            clients = self._ctrl.rechercher(terme)
+            lignes  = self._ctrl.formater_lignes(clients)
+
+            for i, valeurs in enumerate(lignes):
+                tag = "pair" if i % 2 == 0 else "impair"
+                self._tableau.insert(
+                    "", tk.END,
+                    iid=str(valeurs[0]),
+                    values=valeurs,
+                    tags=(tag,),
+                )
+            self._ids_affiches = [valeurs[0] for valeurs in lignes]
+            self._noms_affiches = [valeurs[1] for valeurs in lignes]
+            self._indexer_positions()
+            if trace is not None:
+                trace.attributs["nb_lignes"] = len(lignes)
+
+    def ids_affiches(self) -> list[int]:
+        """IDCLIENT affichés, dans l'ordre du tableau (filtre courant)."""
+        return self._ids_affiches
+
+    def selectionner_client(self, idclient: int) -> None:
+        """Sélectionne la ligne du client et la fait défiler à l'écran."""
+        iid = str(idclient)
+        if self._tableau.exists(iid):
+            self._tableau.selection_set(iid)
+            self._tableau.focus(iid)
+            self._tableau.see(iid)
+
+    # ------------------------------------------------------------------
+    # Mise à jour ciblée (bus de changements de la base)
+    # ------------------------------------------------------------------
+
+    def _on_changement(self, changement: Changement) -> None:
+        """
+        Applique au tableau un changement publié sur db.bus : les lignes
+        des clients concernés sont retirées, modifiées sur place ou
+        insérées à leur rang (ordre du nom), selon le filtre courant.
+        Au-delà de SEUIL_RECHARGEMENT clients, le tableau est rechargé.
+        """
+        with profilage.span("maj_tableau", operation=changement.operation, nb=len(changement.ids)):
+            if len(changement.ids) > SEUIL_RECHARGEMENT:
+                self._recharger(changement.ids)
+                return
+            if changement.operation == SUPPRESSION:
+                self._ctrl.oublier_lignes(changement.ids)
+                lignes: dict[int, tuple] = {}
+            else:
+                lignes = self._ctrl.lignes_a_jour(changement.ids, self._terme)
+
+            a_retirer: set[int] = set()
+            a_inserer: list[tuple] = []
+            for idclient in dict.fromkeys(changement.ids):
+                valeurs = lignes.get(idclient)
+                index = self._positions.get(idclient)
+                if index is not None:
+                    if valeurs is not None and valeurs[1] == self._noms_affiches[index]:
+                        self._tableau.item(str(idclient), values=valeurs)
+                        continue
+                    a_retirer.add(idclient)
+                if valeurs is not None:
+                    a_inserer.append(valeurs)
+            if a_retirer or a_inserer:
+                self._colorer_lignes(self._deplacer_lignes(a_retirer, a_inserer))
+
+    def _recharger(self, ids: list[int]) -> None:
+        """Recharge le tableau après un changement massif, sélection conservée."""
+        selection = self._tableau.selection()
+        self._ctrl.oublier_lignes(ids)
+        self.rafraichir_tableau(self._terme)
+        restantes = [iid for iid in selection if self._tableau.exists(iid)]
+        if restantes:
+            self._tableau.selection_set(restantes)
+
+    def _deplacer_lignes(self, a_retirer: set[int], a_inserer: list[tuple]) -> int:
+        """
+        Retire puis insère des lignes en une passe sur les listes affichées
+        (fusion des nouvelles lignes triées par nom), au lieu d'une recherche
+        et d'un décalage de liste par client.
+
+        :param a_retirer: IDCLIENT dont la ligne est retirée
+        :param a_inserer: Tuples d'affichage à insérer à leur rang
+        :return:          Indice de la première ligne décalée
+        """
+        selection = set(self._tableau.selection())
+        ids, noms = self._ids_affiches, self._noms_affiches
+        decalee = len(ids)
+
+        if a_retirer:
+            decalee = min(self._positions.pop(idclient) for idclient in a_retirer)
+            self._tableau.delete(*(str(idclient) for idclient in a_retirer))
+            gardes = [i for i in range(decalee, len(ids)) if ids[i] not in a_retirer]
+            ids[decalee:] = [ids[i] for i in gardes]
+            noms[decalee:] = [noms[i] for i in gardes]
+
+        if a_inserer:
+            a_inserer.sort(key=lambda valeurs: valeurs[1])
+            rangs = [bisect.bisect_right(noms, valeurs[1]) for valeurs in a_inserer]
+            decalee = min(decalee, rangs[0])
+            fusion_ids: list[int] = ids[:rangs[0]]
+            fusion_noms: list[str] = noms[:rangs[0]]
+            for j, (rang, valeurs) in enumerate(zip(rangs, a_inserer)):
+                precedent = rangs[j - 1] if j else rang
+                fusion_ids.extend(ids[precedent:rang])
+                fusion_noms.extend(noms[precedent:rang])
+                fusion_ids.append(valeurs[0])
+                fusion_noms.append(valeurs[1])
+                # Rang final : les lignes déjà insérées le précèdent
+                iid = str(valeurs[0])
+                self._tableau.insert("", rang + j, iid=iid, values=valeurs)
+                if iid in selection:
+                    self._tableau.selection_add(iid)
+            fusion_ids.extend(ids[rangs[-1]:])
+            fusion_noms.extend(noms[rangs[-1]:])
+            ids[:] = fusion_ids
+            noms[:] = fusion_noms
+
+        self._indexer_positions(decalee)
+        return decalee
+
+    def _indexer_positions(self, debut: int = 0) -> None:
+        """Met à jour l'index IDCLIENT -> ligne à partir de la ligne `debut`."""
+        if debut == 0:
+            self._positions = {idclient: i for i, idclient in enumerate(self._ids_affiches)}
+            return
+        for i in range(debut, len(self._ids_affiches)):
+            self._positions[self._ids_affiches[i]] = i
+
+    def _colorer_lignes(self, debut: int) -> None:
+        """
+        Rétablit l'alternance des couleurs à partir de la ligne `debut`,
+        par tranches, pendant les temps morts de la boucle Tk.
+        """
+        if debut >= len(self._ids_affiches):
+            return
+        if self._coloration_depuis is not None:
+            debut = min(debut, self._coloration_depuis)
+        self._coloration_depuis = debut
+        if self._id_coloration is None:
+            self._id_coloration = self.after_idle(self._colorer_tranche)
+
+    def _colorer_tranche(self) -> None:
+        self._id_coloration = None
+        debut = self._coloration_depuis
+        if debut is None:
+            return  # tableau reconstruit entre-temps
+        fin = min(debut + TAILLE_TRANCHE_COULEURS, len(self._ids_affiches))
+        for i in range(debut, fin):
+            self._tableau.item(str(self._ids_affiches[i]), tags=("pair" if i % 2 == 0 else "impair",))
+        if fin < len(self._ids_affiches):
+            self._coloration_depuis = fin
+            self._id_coloration = self.after_idle(self._colorer_tranche)
+        else:
+            self._coloration_depuis = None
+
+    def _on_destruction(self, event: tk.Event) -> None:
+        if event.widget is not self:
+            return  # <Destroy> est aussi reçu pour chaque widget enfant
+        self._desabonner()
+        self._ctrl.fermer()
+        if self._id_coloration is not None:
+            self.after_cancel(self._id_coloration)
+            self._id_coloration = None
 
     # ------------------------------------------------------------------
     # Sélection dans le tableau
@@ -360,6 +534,10 @@ class FenetreCRUDS(FenetreBase):
     def _on_rechercher(self) -> None:
         self.rafraichir_tableau(self._var_recherche.get())
 
+    def _on_exporter(self) -> None:
+        # Le filtre appliqué au tableau, pas le texte en cours de saisie
+        self._ctrl.exporter_clients(self._terme)
+
     def _on_selectionner(self) -> None:
         clients = self._obtenir_clients_selectionnes()
         if not clients:
@@ -371,6 +549,20 @@ class FenetreCRUDS(FenetreBase):
             return
         self._ctrl.valider_selection(clients)
 
+    # ------------------------------------------------------------------
+    # Progression de l'export (appelé par le contrôleur)
+    # ------------------------------------------------------------------
+
+    def afficher_progression_export(self, nb: Optional[int], total: Optional[int]) -> None:
+        """
+        Affiche l'avancement de l'export dans la barre de titre
+        (nb=None : export terminé, titre d'origine rétabli).
+        """
+        titre = FENETRES["cruds"]["titre"]
+        if nb is not None:
+            titre += f" – Export : {nb}" + (f" / {total}" if total else "")
+        self.title(titre)
+
     # ------------------------------------------------------------------
     # Retour de sélection (appelé par le contrôleur)
     # ------------------------------------------------------------------
@@ -7,22 +7,43 @@
 # Elle s'ouvre en 2 modes via le flag passé au constructeur :
 #   - MODE_LECTURE (L)      : lecture seule, aucune modification possible
 #   - MODE_MODIFICATION (M) : saisie et enregistrement possibles
+#
+# Avec un NavigateurClients, les boutons Précédent / Suivant (ou Page
+# préc. / Page suiv.) parcourent les clients dans l'ordre du tableau CRUDS ;
+# les voisins sont préchargés pendant les temps morts de la boucle Tk.
+#
+# Réutilisation : FenetreFiche.depuis_pool() remet une fiche déjà construite
+# (masquée par withdraw à la fermeture, réaffichée par deiconify) au lieu
+# d'en construire une nouvelle à chaque ouverture. Les appelants attendent
+# la fermeture par attendre_fermeture() (wait_window ne rend pas la main
+# sur une fenêtre seulement masquée).
+#
+# La fiche affichée suit le bus de changements de la base (db.bus) : un
+# client modifié ailleurs est rechargé (sauf saisie en cours, signalée) ;
+# un client supprimé ailleurs est signalé et ne peut plus être enregistré.
 # =============================================================================
 
 from __future__ import annotations
 
 import tkinter as tk
+import weakref
 from tkinter import ttk
 from typing import Optional
 
 from core.config import COULEURS, POLICES, FENETRES, MODE_LECTURE, COULEURS_CHEVEUX
 from core.database import GestionnaireBase
+from core.evenements import MODIFICATION, SUPPRESSION, Changement
 from classes.base_window import FenetreBase
+from classes.navigateur_clients import NavigateurClients
 from controllers.fiche_controller import FicheController
 from models.client_model import Client
 from fonctionsgen.fonctionsgen import formater_date_affichage
 
 
+# Fiches réutilisables disponibles, par fenêtre racine (interpréteur Tk)
+_fiches_libres: "weakref.WeakKeyDictionary[tk.Misc, list[FenetreFiche]]" = weakref.WeakKeyDictionary()
+
+
 class FenetreFiche(FenetreBase):
     """
     Fenêtre de consultation / modification d'une fiche client.
@@ -39,7 +60,14 @@ class FenetreFiche(FenetreBase):
         db: GestionnaireBase,
         mode: str,
         client: Optional[Client],
+        reutilisable: bool = False,
+        navigateur: Optional[NavigateurClients] = None,
     ) -> None:
+        """
+        :param reutilisable: Fiche du pool (voir depuis_pool) : masquée et
+                             non détruite à la fermeture
+        :param navigateur:   Parcours Précédent / Suivant (None = sans navigation)
+        """
         cfg = FENETRES["fiche"]
         super().__init__(
             parent,
@@ -48,14 +76,23 @@ class FenetreFiche(FenetreBase):
             hauteur=cfg["hauteur"],
             min_largeur=cfg["min_largeur"],
             min_hauteur=cfg["min_hauteur"],
+            modale=not reutilisable,
         )
 
         self._mode   = mode
         self._db     = db
         self._client = client
         self._ctrl   = FicheController(self, db)
+        self._reutilisable = reutilisable
+        self._navigateur   = navigateur
+        self._id_prechargement: Optional[str] = None
+        # Vrai pendant l'enregistrement par cette fiche (son propre
+        # changement, reçu par le bus, est alors ignoré)
+        self._enregistrement_en_cours = False
 
         self.modifications_effectuees: bool = False
+        # Passe à True à chaque fermeture (voir attendre_fermeture)
+        self._var_fermee = tk.BooleanVar(self, value=False)
 
         self._var_nom        = tk.StringVar()
         self._var_telephone  = tk.StringVar()
@@ -68,19 +105,216 @@ class FenetreFiche(FenetreBase):
         self._var_cheveux    = tk.StringVar(value=COULEURS_CHEVEUX[0])
 
         self._construire_interface()
+        self._charger_client(client)
+        self._desabonner = db.bus.abonner(self._on_changement)
+
+        # Touche Echap : tenter une fermeture avec confirmation si nécessaire
+        self.bind("<Escape>", lambda _e: self._on_fermeture())
+        # Page préc. / Page suiv. : client précédent / suivant
+        self.bind("<Prior>", lambda _e: self._naviguer(-1))
+        self.bind("<Next>",  lambda _e: self._naviguer(+1))
+        # Destruction (y compris par la racine) : libérer attendre_fermeture()
+        self.bind("<Destroy>", self._on_destruction, add="+")
+
+    # ------------------------------------------------------------------
+    # Réutilisation (pool de fiches)
+    # ------------------------------------------------------------------
 
+    @classmethod
+    def depuis_pool(
+        cls,
+        parent: tk.Widget,
+        db: GestionnaireBase,
+        mode: str,
+        client: Optional[Client],
+        navigateur: Optional[NavigateurClients] = None,
+    ) -> "FenetreFiche":
+        """
+        Ouvre une fiche en réutilisant une fenêtre déjà construite si une
+        est disponible (sinon, une nouvelle fiche réutilisable est créée).
+
+        Les fiches du pool sont filles de la racine et rattachées à
+        `parent` (transient) à chaque ouverture : elles survivent à la
+        fermeture de la fenêtre CRUDS qui les a ouvertes.
+
+        :return: Fiche affichée ; attendre_fermeture() pour l'attente modale
+        """
+        racine = parent._root()
+        libres = _fiches_libres.setdefault(racine, [])
+        if libres:
+            fiche = libres.pop()
+        else:
+            fiche = cls(racine, db, mode, client, reutilisable=True)
+        fiche.ouvrir(parent, db, mode, client, navigateur)
+        return fiche
+
+    def ouvrir(
+        self,
+        parent: tk.Widget,
+        db: GestionnaireBase,
+        mode: str,
+        client: Optional[Client],
+        navigateur: Optional[NavigateurClients] = None,
+    ) -> None:
+        """
+        Réaffiche la fiche pour un autre client et/ou un autre mode.
+
+        :param parent:     Fenêtre au-dessus de laquelle la fiche est modale
+        :param db:         Gestionnaire de base
+        :param mode:       MODE_LECTURE ou MODE_MODIFICATION
+        :param client:     Client à afficher (None = création)
+        :param navigateur: Parcours Précédent / Suivant (None = sans navigation)
+        """
+        if db is not self._db:
+            self._desabonner()
+            self._db   = db
+            self._ctrl = FicheController(self, db)
+            self._desabonner = db.bus.abonner(self._on_changement)
+        self._mode = mode
+        self._navigateur = navigateur
+        self.modifications_effectuees = False
+        self._var_fermee.set(False)
+        self._charger_client(client)
+
+        cfg = FENETRES["fiche"]
+        self.transient(parent)
+        self._centrer(parent, cfg["largeur"], cfg["hauteur"])
+        self.deiconify()
+        self.grab_set()
+        self._entry_nom.focus_set()
+
+    @property
+    def client(self) -> Optional[Client]:
+        """Client affiché (le dernier consulté si l'on a navigué)."""
+        return self._client
+
+    def attendre_fermeture(self) -> None:
+        """Attente modale : rend la main quand la fiche est fermée (ou détruite)."""
+        try:
+            if not self._var_fermee.get():
+                self.wait_variable(self._var_fermee)
+        except tk.TclError:
+            pass  # fenêtre déjà détruite
+
+    def _charger_client(self, client: Optional[Client]) -> None:
+        """Remplit le formulaire et l'adapte au mode courant."""
+        self._client = client
+        self._cadre_erreurs.grid_remove()
         if client:
             self._remplir_champs(client)
-
-        if mode == MODE_LECTURE:
-            self._desactiver_champs()
+        else:
+            self._vider_champs()
+        self._appliquer_mode()
+        self._actualiser_navigation()
 
         # Mémoriser l'état initial des champs pour détecter les modifications
         # (uniquement utile en mode modification/création)
         self._etat_initial = self._lire_etat_champs()
 
-        # Touche Echap : tenter une fermeture avec confirmation si nécessaire
-        self.bind("<Escape>", lambda _e: self._on_fermeture())
+    def _fermer(self) -> None:
+        """Libère le grab puis masque (fiche du pool) ou détruit la fenêtre."""
+        self._annuler_prechargement()
+        self.grab_release()
+        if self._reutilisable:
+            maitre = str(self.transient())
+            self.withdraw()
+            if maitre:
+                # Rendre le focus à la fenêtre qui a ouvert la fiche
+                try:
+                    self.nametowidget(maitre).focus_set()
+                except (KeyError, tk.TclError):
+                    pass
+            _fiches_libres.setdefault(self._root(), []).append(self)
+            self._var_fermee.set(True)
+        else:
+            self._var_fermee.set(True)
+            self.destroy()
+
+    def _on_destruction(self, event: tk.Event) -> None:
+        if event.widget is not self:
+            return  # <Destroy> est aussi reçu pour chaque widget enfant
+        self._desabonner()
+        libres = _fiches_libres.get(self._root(), [])
+        if self in libres:
+            libres.remove(self)
+        try:
+            self._var_fermee.set(True)
+        except tk.TclError:
+            pass
+
+    # ------------------------------------------------------------------
+    # Changements faits ailleurs (bus de changements de la base)
+    # ------------------------------------------------------------------
+
+    def _on_changement(self, changement: Changement) -> None:
+        """
+        Tient la fiche affichée à jour quand son client est modifié ou
+        supprimé par une autre fenêtre (ou un traitement par lots).
+        """
+        if self._var_fermee.get() or self._enregistrement_en_cours:
+            return  # fiche masquée (pool), ou changement fait par cette fiche
+        if self._navigateur is not None:
+            self._navigateur.appliquer_changement(changement)
+        if self._client is None or self._client.idclient not in changement.ids:
+            return
+
+        if changement.operation == SUPPRESSION:
+            self._btn_valider.configure(state=tk.DISABLED)
+            self.afficher_erreurs(["Ce client a été supprimé depuis l'ouverture de la fiche."])
+        elif changement.operation == MODIFICATION:
+            if self._mode != MODE_LECTURE and self._champs_modifies():
+                # Ne pas écraser la saisie : prévenir seulement
+                self.afficher_erreurs([
+                    "Ce client a été modifié depuis l'ouverture de la fiche : "
+                    "l'enregistrement remplacera ces modifications."
+                ])
+                return
+            client = self._ctrl.relire(self._client.idclient)
+            if client is not None:
+                if self._navigateur is not None:
+                    self._navigateur.memoriser(client)
+                self._charger_client(client)
+
+    # ------------------------------------------------------------------
+    # Navigation Précédent / Suivant
+    # ------------------------------------------------------------------
+
+    def _naviguer(self, decalage: int) -> None:
+        """Affiche le client précédent (-1) ou suivant (+1) du tableau."""
+        if self._navigateur is None:
+            return
+        if not self._confirmer_abandon(
+            "Des modifications ont été effectuées.\n"
+            "Voulez-vous vraiment changer de client sans enregistrer ?"
+        ):
+            return
+        client = self._navigateur.aller(decalage)
+        if client is not None:
+            self._charger_client(client)
+
+    def _actualiser_navigation(self) -> None:
+        """Affiche la barre de navigation et précharge les voisins."""
+        if self._navigateur is None or self._client is None:
+            self._cadre_navigation.grid_remove()
+            return
+        nav = self._navigateur
+        self._btn_precedent.configure(state=tk.NORMAL if nav.a_precedent else tk.DISABLED)
+        self._btn_suivant.configure(state=tk.NORMAL if nav.a_suivant else tk.DISABLED)
+        self._lbl_position.configure(text=f"{nav.position + 1} / {len(nav)}")
+        self._cadre_navigation.grid()
+
+        self._annuler_prechargement()
+        self._id_prechargement = self.after_idle(self._precharger)
+
+    def _precharger(self) -> None:
+        self._id_prechargement = None
+        if self._navigateur is not None:
+            self._navigateur.precharger()
+
+    def _annuler_prechargement(self) -> None:
+        if self._id_prechargement is not None:
+            self.after_cancel(self._id_prechargement)
+            self._id_prechargement = None
 
     # ------------------------------------------------------------------
     # Construction de l'interface
@@ -93,21 +327,14 @@ class FenetreFiche(FenetreBase):
         cadre.pack(fill=tk.BOTH, expand=True)
         cadre.columnconfigure(1, weight=1)
 
-        # Titre du mode
-        if self._mode == MODE_LECTURE:
-            libelle_mode = "Consultation (lecture seule)"
-        elif self._client is None:
-            libelle_mode = "Nouveau client"
-        else:
-            libelle_mode = "Modification client"
-
-        tk.Label(
+        # Titre du mode (texte fixé par _appliquer_mode)
+        self._lbl_mode = tk.Label(
             cadre,
-            text=libelle_mode,
             font=POLICES["sous_titre"],
             bg=COULEURS["fond_principal"],
             fg=COULEURS["texte_principal"],
-        ).grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 12))
+        )
+        self._lbl_mode.grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 12))
 
         # Validations temps réel
         vcmd_cp     = (self.register(self._ctrl.valider_code_postal_rt), "%P")
@@ -233,33 +460,67 @@ class FenetreFiche(FenetreBase):
         self._cadre_erreurs.grid_remove()
         self._ligne += 1
 
-        # Boutons
+        # Navigation (masquée sans navigateur : voir _actualiser_navigation)
+        self._cadre_navigation = tk.Frame(cadre, bg=COULEURS["fond_principal"])
+        style_navigation = {
+            "font"             : POLICES["normale"],
+            "bg"               : COULEURS["fond_secondaire"],
+            "fg"               : COULEURS["texte_principal"],
+            "activebackground" : COULEURS["fond_principal"],
+            "relief"           : tk.GROOVE,
+            "padx"             : 8,
+            "cursor"           : "hand2",
+        }
+        self._btn_precedent = tk.Button(
+            self._cadre_navigation,
+            text="◀ Précédent",
+            command=lambda: self._naviguer(-1),
+            **style_navigation,
+        )
+        self._btn_precedent.pack(side=tk.LEFT)
+        self._lbl_position = tk.Label(
+            self._cadre_navigation,
+            font=POLICES["petite"],
+            bg=COULEURS["fond_principal"],
+            fg=COULEURS["texte_principal"],
+            width=14,
+        )
+        self._lbl_position.pack(side=tk.LEFT, padx=8)
+        self._btn_suivant = tk.Button(
+            self._cadre_navigation,
+            text="Suivant ▶",
+            command=lambda: self._naviguer(+1),
+            **style_navigation,
+        )
+        self._btn_suivant.pack(side=tk.LEFT)
+        self._cadre_navigation.grid(row=self._ligne, column=0, columnspan=2, pady=(0, 6))
+        self._cadre_navigation.grid_remove()
+        self._ligne += 1
+
+        # Boutons (Valider n'est affiché qu'en mode modification :
+        # voir _appliquer_mode)
         cadre_boutons = tk.Frame(cadre, bg=COULEURS["fond_principal"])
         cadre_boutons.grid(row=self._ligne, column=0, columnspan=2, pady=5)
 
-        if self._mode != MODE_LECTURE:
-            photo_save = self.charger_image("Base_save.png")
-            btn_valider = tk.Button(
-                cadre_boutons,
-                text="  Valider",
-                image=photo_save,
-                compound=tk.LEFT,
-                font=POLICES["normale"],
-                bg=COULEURS["fond_bouton"],
-                fg=COULEURS["texte_clair"],
-                activebackground=COULEURS["fond_bouton_hover"],
-                relief=tk.FLAT,
-                padx=12, pady=6,
-                cursor="hand2",
-                command=self._on_valider,
-            )
-            btn_valider.pack(side=tk.LEFT, padx=8)
+        photo_save = self.charger_image("Base_save.png")
+        self._btn_valider = tk.Button(
+            cadre_boutons,
+            text="  Valider",
+            image=photo_save,
+            compound=tk.LEFT,
+            font=POLICES["normale"],
+            bg=COULEURS["fond_bouton"],
+            fg=COULEURS["texte_clair"],
+            activebackground=COULEURS["fond_bouton_hover"],
+            relief=tk.FLAT,
+            padx=12, pady=6,
+            cursor="hand2",
+            command=self._on_valider,
+        )
 
         photo_exit = self.charger_image("zone_exit.png")
-        libelle_annuler = "Fermer" if self._mode == MODE_LECTURE else "Annuler"
-        btn_annuler = tk.Button(
+        self._btn_annuler = tk.Button(
             cadre_boutons,
-            text="  " + libelle_annuler,
             image=photo_exit,
             compound=tk.LEFT,
             font=POLICES["normale"],
@@ -271,10 +532,10 @@ class FenetreFiche(FenetreBase):
             cursor="hand2",
             command=self._on_fermeture,
         )
-        btn_annuler.pack(side=tk.LEFT, padx=8)
+        self._btn_annuler.pack(side=tk.LEFT, padx=8)
 
     # ------------------------------------------------------------------
-    # Pré-remplissage et désactivation
+    # Pré-remplissage et mode (L/M)
     # ------------------------------------------------------------------
 
     def _remplir_champs(self, client: Client) -> None:
@@ -289,13 +550,47 @@ class FenetreFiche(FenetreBase):
         self._var_bon_client.set(client.bon_client)
         self._var_cheveux.set(client.couleur_cheveux)
 
-    def _desactiver_champs(self) -> None:
-        """Désactive tous les widgets de saisie (mode lecture seule)."""
+    def _vider_champs(self) -> None:
+        """Remet tous les champs à leur valeur par défaut (création)."""
+        for variable in (self._var_nom, self._var_telephone, self._var_adresse,
+                         self._var_cp, self._var_ville, self._var_date):
+            variable.set("")
+        self._var_credit.set("0.00")
+        self._var_bon_client.set(False)
+        self._var_cheveux.set(COULEURS_CHEVEUX[0])
+
+    def _appliquer_mode(self) -> None:
+        """
+        Adapte titre, boutons et état des champs au mode courant :
+        lecture seule (L) ou modification / création (M).
+        """
+        lecture = self._mode == MODE_LECTURE
+        if lecture:
+            libelle_mode = "Consultation (lecture seule)"
+        elif self._client is None:
+            libelle_mode = "Nouveau client"
+        else:
+            libelle_mode = "Modification client"
+        self._lbl_mode.configure(text=libelle_mode)
+
+        if lecture:
+            self._btn_valider.pack_forget()
+        else:
+            self._btn_valider.configure(state=tk.NORMAL)
+            self._btn_valider.pack(side=tk.LEFT, padx=8, before=self._btn_annuler)
+        self._btn_annuler.configure(text="  " + ("Fermer" if lecture else "Annuler"))
+
         for widget in self._champs_widgets:
+            if lecture:
+                etat = tk.DISABLED
+            elif widget is self._combo_cheveux:
+                etat = "readonly"
+            else:
+                etat = tk.NORMAL
             try:
-                widget.configure(state=tk.DISABLED)
+                widget.configure(state=etat)
             except tk.TclError:
-                pass
+                pass  # cadres (date, crédit) : pas d'option state
 
     # ------------------------------------------------------------------
     # Callbacks
@@ -308,19 +603,26 @@ class FenetreFiche(FenetreBase):
         champs ont été modifiés depuis l'ouverture de la fenêtre.
         En mode lecture : fermeture directe sans confirmation.
         """
-        if self._mode != MODE_LECTURE and self._champs_modifies():
-            self.grab_release()
-            reponse = tk.messagebox.askyesno(
-                "Confirmation",
-                "Des modifications ont été effectuées.\nVoulez-vous vraiment quitter sans enregistrer ?",
-                icon="warning",
-                parent=self,
-            )
-            self.grab_set()
-            if not reponse:
-                return  # L'utilisateur annule la fermeture
+        if not self._confirmer_abandon(
+            "Des modifications ont été effectuées.\nVoulez-vous vraiment quitter sans enregistrer ?"
+        ):
+            return  # L'utilisateur annule la fermeture
+        self._fermer()
+
+    def _confirmer_abandon(self, question: str) -> bool:
+        """
+        Demande confirmation avant d'abandonner des champs modifiés
+        (mode modification ou création uniquement).
+
+        :param question: Texte de la boîte de confirmation
+        :return:         True si l'on peut poursuivre
+        """
+        if self._mode == MODE_LECTURE or not self._champs_modifies():
+            return True
         self.grab_release()
-        self.destroy()
+        reponse = tk.messagebox.askyesno("Confirmation", question, icon="warning", parent=self)
+        self.grab_set()
+        return reponse
 
     def _lire_etat_champs(self) -> dict:
         """Retourne un instantané des valeurs actuelles de tous les champs."""
@@ -353,7 +655,11 @@ class FenetreFiche(FenetreBase):
             "bon_client"        : self._var_bon_client.get(),
             "couleur_cheveux"   : self._var_cheveux.get(),
         }
-        self._ctrl.enregistrer(donnees, self._client)
+        self._enregistrement_en_cours = True
+        try:
+            self._ctrl.enregistrer(donnees, self._client)
+        finally:
+            self._enregistrement_en_cours = False
 
     # ------------------------------------------------------------------
     # Méthodes appelées par le contrôleur
@@ -371,4 +677,5 @@ class FenetreFiche(FenetreBase):
         """Appelé par le contrôleur après un enregistrement réussi."""
         self.modifications_effectuees = True
         self._cadre_erreurs.grid_remove()
-        self._on_fermeture()
+        # Tout est enregistré : fermer sans demander de confirmation
+        self._fermer()
@@ -1,2 +1,56 @@
 # views/__init__.py
 # Module views : fenêtres de l'interface graphique (Tkinter)
+#
+# Les fenêtres filles (CRUDS, Fiche) ne sont pas importées au démarrage :
+# la fenêtre principale s'affiche d'abord, puis ces modules sont chargés
+# pendant les temps morts de la boucle Tk (prechauffer_vues), ou à la
+# première utilisation (classe_vue) si l'utilisateur est plus rapide.
+
+from __future__ import annotations
+
+import importlib
+
+# Nom logique → (module, classe) des fenêtres chargées à la demande
+VUES_DIFFEREES: dict[str, tuple[str, str]] = {
+    "cruds": ("views.Win_Client_CRUDS", "FenetreCRUDS"),
+    "fiche": ("views.Win_Client_Fiche", "FenetreFiche"),
+}
+
+# Délai avant le préchauffage, puis entre deux modules (ms) : laisse
+# la fenêtre principale se dessiner et rester réactive
+DELAI_PRECHAUFFAGE_MS = 50
+
+
+def classe_vue(nom: str) -> type:
+    """
+    Retourne la classe de fenêtre `nom` ("cruds", "fiche"), en important
+    son module au premier appel.
+
+    :param nom: Clé de VUES_DIFFEREES
+    :return:    Classe de la fenêtre
+    """
+    module, classe = VUES_DIFFEREES[nom]
+    return getattr(importlib.import_module(module), classe)
+
+
+def prechauffer_vues(widget, noms: tuple[str, ...] = ("cruds", "fiche")) -> None:
+    """
+    Importe les modules des fenêtres filles un par un, quand la boucle Tk
+    est inoccupée, pour que leur première ouverture soit immédiate.
+
+    :param widget: Widget Tk servant à programmer le travail (la racine)
+    :param noms:   Vues à préchauffer, dans l'ordre
+    """
+    restants = list(noms)
+
+    def etape() -> None:
+        if not restants:
+            return
+        try:
+            classe_vue(restants.pop(0))
+        except Exception:
+            pass  # l'erreur réapparaîtra à la première utilisation
+        if restants:
+            widget.after(DELAI_PRECHAUFFAGE_MS, lambda: widget.after_idle(etape))
+
+    widget.after(DELAI_PRECHAUFFAGE_MS, lambda: widget.after_idle(etape))